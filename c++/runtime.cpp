@@ -0,0 +1,12 @@
+// c++/runtime.cpp
+//
+// The cold part of the runtime as a library: compiled once, with
+// -DFANGLESS_RUNTIME_LIBRARY, into libfangless.a (see the Makefile).
+// Programs compiled with the same flag link it instead of compiling
+// runtime_cold.hpp themselves.
+#ifndef FANGLESS_RUNTIME_LIBRARY
+#error "compile runtime.cpp with -DFANGLESS_RUNTIME_LIBRARY"
+#endif
+
+#include "runtime.hpp"
+#include "runtime_cold.hpp"
@@ -1,23 +1,597 @@
-#pragma once
+#ifndef FANGLESS_RUNTIME_HPP
+#define FANGLESS_RUNTIME_HPP
 
+#include <algorithm>
+#include <charconv>
 #include <string>
+#include <string_view>
+#include <cstddef>
 #include <vector>
+#include <cmath>
+#include <cstring>
+#include <cstdlib>
+#include <exception>
+#include <iterator>
+#include <initializer_list>
+#include <new>
+#include <utility>
+#ifdef FANGLESS_PROFILE
+#include <chrono>
+#include <cstdio>
+#endif
+#if defined(FANGLESS_ALLOC_STATS) || defined(FANGLESS_ALLOC_SITES)
+#include <cstdio>
 #include <map>
-#include <unordered_map>
-#include <iostream>
-#include <stdexcept>
-#include <sstream>
+#include <type_traits>
+#endif
+
+// The runtime is a header of inline fast paths plus cold code (formatting,
+// printing, error messages, sorting, set algebra, list deoptimization, hash
+// table rebuilds, the allocation and profile reports) kept in
+// runtime_cold.hpp. By default the cold part is included at the end of
+// this header as inline functions, so a program needs nothing but this
+// file. Compile with -DFANGLESS_RUNTIME_LIBRARY to leave it out and link
+// libfangless.a (built from runtime.cpp by `make -C c++`) instead: every
+// program then compiles only the fast paths it uses. The Makefile also
+// builds runtime.hpp.gch, a precompiled header for both modes.
+#ifdef FANGLESS_RUNTIME_LIBRARY
+#define PY_COLD
+#else
+#define PY_COLD inline
+#endif
+
+// Runtime errors are std::runtime_error with Python's message
+// ("TypeError: ..."); thrown out of line to keep the callers small. A
+// literal message goes through the const char* overload, so the caller
+// doesn't build the std::string either.
+[[noreturn]] PY_COLD void py_raise(const std::string& message);
+[[noreturn]] PY_COLD void py_raise(const char* message);
+
+struct PyValue;
+
+// Errors whose message names a value's type or shows the value, put
+// together in the cold part. before + the type name of v + after:
+[[noreturn]] PY_COLD void py_type_error(const char* before, const PyValue& v, const char* after);
+// "TypeError: <kind> indices must be integers" for an index that is not an
+// int, else "IndexError: <kind> index out of range":
+[[noreturn]] PY_COLD void py_sequence_index_error(const PyValue& index, const char* kind);
+// "KeyError: key not found: <key>"
+[[noreturn]] PY_COLD void py_key_error(const PyValue& key);
+
+// Allocation accounting
+//
+// Compile with -DFANGLESS_ALLOC_STATS to count, per value type, the
+// PyValues constructed, copied and moved and the boxes allocated, and per
+// element kind the container buffers allocated (count and bytes), with the
+// pool's totals and peak live bytes. The summary goes to stderr at exit.
+// -DFANGLESS_ALLOC_SITES also counts copies per source line that made them:
+// a line of the generated program, or of the runtime for copies made inside
+// it. Both need the runtime in header mode (or libfangless.a built with the
+// same flag). Without them PY_COUNT compiles to nothing.
+#if defined(FANGLESS_ALLOC_SITES) && !defined(FANGLESS_ALLOC_STATS)
+#define FANGLESS_ALLOC_STATS
+#endif
+
+#ifdef FANGLESS_ALLOC_STATS
+
+struct PyAllocStats {
+    // Rows of the per-type counters, in the order of PyValue::Type
+    static constexpr int TYPES = 9;
+    static constexpr const char* TYPE_NAMES[TYPES] = {
+        "None", "int", "float", "bool", "str", "list", "dict", "tuple", "set"
+    };
+
+    enum Buffer { INT_ITEMS, FLOAT_ITEMS, VALUE_ITEMS, PAIRS, TABLE_SLOTS, OTHER, BUFFERS };
+    static constexpr const char* BUFFER_NAMES[BUFFERS] = {
+        "int list items", "float list items", "value items", "dict display pairs",
+        "hash slots", "hash entries, views"
+    };
+
+    unsigned long long constructed[TYPES] = {};
+    unsigned long long copied[TYPES] = {};
+    unsigned long long moved[TYPES] = {};
+    unsigned long long boxes[TYPES] = {};
+    unsigned long long buffers[BUFFERS] = {};
+    unsigned long long buffer_bytes[BUFFERS] = {};
+    unsigned long long pool_allocations = 0;
+    unsigned long long pool_bytes = 0;
+    long long live_bytes = 0;
+    long long peak_bytes = 0;
+    // Copies per (file, line); a file may show up under several pointers
+    std::map<std::pair<const char*, int>, unsigned long long> copy_sites;
+    // Call site of the runtime entry point running (see PySiteScope), where
+    // the copies it makes are counted
+    const char* site_file = nullptr;
+    int site_line = 0;
+
+    ~PyAllocStats() {
+        report();
+    }
+
+    void copy(int type, const char* file = nullptr, int line = 0) {
+        ++copied[type];
+        if (site_file != nullptr) {
+            file = site_file;
+            line = site_line;
+        }
+        if (file != nullptr) {
+            ++copy_sites[{ file, line }];
+        }
+    }
+
+    void allocate(std::size_t size) {
+        ++pool_allocations;
+        pool_bytes += size;
+        live_bytes += static_cast<long long>(size);
+        peak_bytes = std::max(peak_bytes, live_bytes);
+    }
+
+    void deallocate(std::size_t size) {
+        live_bytes -= static_cast<long long>(size);
+    }
+
+    void buffer(Buffer kind, std::size_t size) {
+        ++buffers[kind];
+        buffer_bytes[kind] += size;
+    }
+
+    void report() const;
+};
+
+struct PyValue;
+
+// Kind of a container buffer, from its element type
+template <typename T>
+constexpr PyAllocStats::Buffer py_buffer_kind() {
+    if constexpr (std::is_same_v<T, long long>) {
+        return PyAllocStats::INT_ITEMS;
+    } else if constexpr (std::is_same_v<T, double>) {
+        return PyAllocStats::FLOAT_ITEMS;
+    } else if constexpr (std::is_same_v<T, PyValue>) {
+        return PyAllocStats::VALUE_ITEMS;
+    } else if constexpr (std::is_same_v<T, std::pair<PyValue, PyValue>>) {
+        return PyAllocStats::PAIRS;
+    } else if constexpr (std::is_same_v<T, int>) {
+        return PyAllocStats::TABLE_SLOTS;
+    } else {
+        return PyAllocStats::OTHER;
+    }
+}
+
+// Built on first use, before any static PyValue, so it is destroyed (and
+// reports) after them:
+inline PyAllocStats& py_alloc_stats() {
+    static PyAllocStats stats;
+    return stats;
+}
+
+#define PY_COUNT(statement) statement
+
+#else
+#define PY_COUNT(statement)
+#endif
+
+// Where a copy was made. The copy constructor takes its caller's file and
+// line as default arguments, but most copies happen inside the runtime or
+// the standard library (a vector copying a display's items, std::pair's
+// constructor), where that caller is a runtime or library line. So the
+// entry points the generated code calls (py_list, py_getitem, py_setitem,
+// PyIterator::next, ...) take the same default arguments and open a
+// PySiteScope: every copy made until they return is counted at the line of
+// the program that called them. Entry points called by other ones keep the
+// outer scope.
+#ifdef FANGLESS_ALLOC_SITES
+struct PySiteScope {
+    bool entered;
+
+    PySiteScope(const char* file, int line) : entered(py_alloc_stats().site_file == nullptr) {
+        if (entered) {
+            py_alloc_stats().site_file = file;
+            py_alloc_stats().site_line = line;
+        }
+    }
+
+    ~PySiteScope() {
+        if (entered) {
+            py_alloc_stats().site_file = nullptr;
+        }
+    }
+
+    PySiteScope(const PySiteScope&) = delete;
+    PySiteScope& operator=(const PySiteScope&) = delete;
+};
+
+#define PY_COPY_SITE , const char* site_file = __builtin_FILE(), int site_line = __builtin_LINE()
+#define PY_COPY_SITE_ARGS , site_file, site_line
+#define PY_SITE_SCOPE PySiteScope site_scope(site_file, site_line)
+#else
+#define PY_COPY_SITE
+#define PY_COPY_SITE_ARGS
+#define PY_SITE_SCOPE
+#endif
+
+// Memory pool for boxes and container buffers. Programs allocate and free
+// the same few small sizes over and over (a list literal in a loop, the
+// pair returned by a helper), so freed blocks of up to MAX_BLOCK bytes are
+// kept in a free list per size class and handed out again, and new ones are
+// carved from CHUNK-sized chunks. Values are reference counted, so a block
+// comes back to the pool as soon as its last value dies: a container built
+// and dropped in one loop iteration reuses the same memory in the next one.
+// Larger blocks go straight to operator new. Compile with
+// -DFANGLESS_SYSTEM_ALLOC to allocate everything with operator new.
+struct PyPool {
+    static constexpr std::size_t GRAIN = 16;
+    static constexpr std::size_t MAX_BLOCK = 512;
+    static constexpr std::size_t CHUNK = 64 * 1024;
+
+    struct FreeBlock {
+        FreeBlock* next;
+    };
+
+    FreeBlock* free_lists[MAX_BLOCK / GRAIN] = {};
+    char* chunk_pos = nullptr;
+    char* chunk_end = nullptr;
+    void* chunks = nullptr;    // every chunk starts with a pointer to the previous one
+
+    void* allocate(std::size_t size) {
+        PY_COUNT(py_alloc_stats().allocate(size));
+#ifdef FANGLESS_SYSTEM_ALLOC
+        return ::operator new(size);
+#else
+        if (size > MAX_BLOCK || size == 0) {
+            return ::operator new(size);
+        }
+        std::size_t index = (size - 1) / GRAIN;
+        FreeBlock* block = free_lists[index];
+        if (block != nullptr) {
+            free_lists[index] = block->next;
+            return block;
+        }
+        std::size_t bytes = (index + 1) * GRAIN;
+        if (static_cast<std::size_t>(chunk_end - chunk_pos) < bytes) {
+            new_chunk();
+        }
+        void* result = chunk_pos;
+        chunk_pos += bytes;
+        return result;
+#endif
+    }
+
+    void deallocate(void* p, [[maybe_unused]] std::size_t size) noexcept {
+        PY_COUNT(py_alloc_stats().deallocate(size));
+#ifdef FANGLESS_SYSTEM_ALLOC
+        ::operator delete(p);
+#else
+        if (size > MAX_BLOCK || size == 0) {
+            ::operator delete(p);
+            return;
+        }
+        FreeBlock* block = static_cast<FreeBlock*>(p);
+        std::size_t index = (size - 1) / GRAIN;
+        block->next = free_lists[index];
+        free_lists[index] = block;
+#endif
+    }
+
+    // The rest of the current chunk is dropped (at most MAX_BLOCK bytes)
+    void new_chunk() {
+        char* chunk = static_cast<char*>(::operator new(CHUNK));
+        *reinterpret_cast<void**>(chunk) = chunks;
+        chunks = chunk;
+        chunk_pos = chunk + GRAIN;
+        chunk_end = chunk + CHUNK;
+    }
+};
+
+// Constant-initialized, so it is ready before any static PyValue is built.
+// Chunks are never given back: the pool lives as long as the program.
+inline PyPool py_pool;
+
+// std::vector allocator drawing from py_pool:
+template <typename T>
+struct PyAllocator {
+    using value_type = T;
+
+    PyAllocator() noexcept = default;
+    template <typename U>
+    PyAllocator(const PyAllocator<U>&) noexcept {}
+
+    T* allocate(std::size_t n) {
+        if (n > static_cast<std::size_t>(-1) / sizeof(T)) {
+            throw std::bad_alloc();
+        }
+        PY_COUNT(py_alloc_stats().buffer(py_buffer_kind<T>(), n * sizeof(T)));
+        return static_cast<T*>(py_pool.allocate(n * sizeof(T)));
+    }
+
+    void deallocate(T* p, std::size_t n) noexcept {
+        py_pool.deallocate(p, n * sizeof(T));
+    }
+
+    template <typename U>
+    bool operator==(const PyAllocator<U>&) const noexcept { return true; }
+    template <typename U>
+    bool operator!=(const PyAllocator<U>&) const noexcept { return false; }
+};
+
+// Storage of every container
+template <typename T>
+using PyVector = std::vector<T, PyAllocator<T>>;
 
 // Forward declaration
 struct PyValue;
 
-using PyList  = std::vector<PyValue>;
-using PyDict  = std::map<std::string, PyValue>;
-using PyTuple = std::vector<PyValue>;
-using PySet   = std::unordered_map<std::string, PyValue>;
+// Items of a list or tuple display and (key, value) pairs of a dict display:
+// the buffer of a PyItems temporary passed to py_list / py_tuple becomes the
+// container's.
+#ifdef FANGLESS_ALLOC_SITES
+// Copies a display makes of its items (out of the initializer_list) are
+// counted at the display's line
+template <typename T>
+struct PyDisplay : PyVector<T> {
+    using PyVector<T>::PyVector;
+
+    PyDisplay(std::initializer_list<T> items PY_COPY_SITE) {
+        PY_SITE_SCOPE;
+        this->assign(items);
+    }
+};
+
+using PyItems = PyDisplay<PyValue>;
+using PyPairs = PyDisplay<std::pair<PyValue, PyValue>>;
+#else
+using PyItems = PyVector<PyValue>;
+using PyPairs = PyVector<std::pair<PyValue, PyValue>>;
+#endif
+
+struct PyList;
+
+// Where a slice view reads its elements: [start, start + length) of source.
+// slot is the view's position in source->views.
+struct PyListView {
+    PyList* source;
+    std::size_t start;
+    std::size_t length;
+    std::size_t slot;
+
+    static void* operator new(std::size_t size) {
+        return py_pool.allocate(size);
+    }
+
+    static void operator delete(void* p, std::size_t size) noexcept {
+        py_pool.deallocate(p, size);
+    }
+};
+
+// Lists of only ints or only floats are stored unboxed in a contiguous
+// vector; the first element of another type moves every element to boxed
+// PyValue storage (the list stays generic from then on, until emptied).
+// Compile with -DFANGLESS_GENERIC_LISTS to always use boxed storage.
+//
+// A slice (a[i:j], sublist) is a VIEW: it reads the elements of the list it
+// was taken from instead of copying them. The first change to either side
+// copies the view's range into the view (the source tells every view it
+// has before changing, or before it is destroyed), so a slice behaves as
+// the independent list Python builds. Compile with -DFANGLESS_COPY_SLICES
+// to copy every slice instead.
+struct PyList {
+    enum Storage {
+        INTS,
+        FLOATS,
+        GENERIC,
+        VIEW
+    };
+
+    // Shorter slices are copied: less work than registering a view
+    static constexpr std::size_t MIN_VIEW = 16;
+
+    Storage storage;
+
+    PyVector<long long> ints;
+    PyVector<double>    floats;
+    PyItems             items;
+
+    // A VIEW reads the range in view; any other list keeps its views in
+    // views (nullptr while it has none)
+    union {
+        PyListView* view;
+        PyVector<PyList*>* views;
+    };
+
+    PyList() : storage(INTS), views(nullptr) {}
+    PyList(const PyItems& values);
+    PyList(PyItems&& values);  // boxed elements are moved in
+    PyList(const std::vector<PyValue>& values);
+    PyList(std::vector<PyValue>&& values);
+
+    // A copy of a view is another view of the same elements; a moved list
+    // takes its place in the bookkeeping of views.
+    PyList(const PyList& other);
+    PyList(PyList&& other) noexcept;
+    PyList& operator=(const PyList& other);
+    PyList& operator=(PyList&& other) noexcept;
+    ~PyList();
+
+    std::size_t size() const {
+        switch (storage) {
+            case INTS:    return ints.size();
+            case FLOATS:  return floats.size();
+            case GENERIC: return items.size();
+            default:      return view->length;
+        }
+    }
+
+    bool empty() const {
+        return size() == 0;
+    }
+
+    // Element access (bounds are checked by the callers). Stored values are
+    // forwarded: a PyValue rvalue is moved in, anything else copied.
+    PyValue get(std::size_t i) const;
+    // Boxed elements by reference, unboxed ones built in scratch
+    const PyValue& get_ref(std::size_t i, PyValue& scratch) const;
+    template <typename V> void set(std::size_t i, V&& v);
+    template <typename V> void push_back(V&& v);
+    void erase(std::size_t i);
+    // Elements [start, end): a view, or a copy when short
+    PyList slice(std::size_t start, std::size_t end) const;
+
+    // Storage that can hold v without boxing
+    Storage storage_for(const PyValue& v) const;
+
+    // Boxes every element, storage becomes GENERIC
+    void deoptimize();
+
+    // Called before every change: a view copies its elements out of its
+    // source, a list with views gives each of them its copy first
+    void unshare() {
+        if (storage == VIEW) {
+            materialize();
+        } else if (views != nullptr) {
+            detach_views();
+        }
+    }
+
+private:
+    void materialize();
+    void detach_views();
+    // Copies elements [start, start + length) of source into this list
+    void copy_range(const PyList& source, std::size_t start, std::size_t length);
+    // Makes this list a view of source's elements [start, start + length)
+    void attach(const PyList& source, std::size_t start, std::size_t length);
+    // Moves other's elements and bookkeeping into this (empty) list
+    void take(PyList& other) noexcept;
+    // Points the bookkeeping of views at this list's new address
+    void follow_move() noexcept;
+    // Stops being a view, without copying the elements
+    void leave_source() noexcept;
+    // Back to an empty list owning its (no) elements
+    void reset() noexcept;
+};
+
+// Dicts are hash tables keyed by PyValue, laid out like CPython's: entries
+// (hash, key, value) are appended to a dense vector in insertion order, and
+// a sparse open-addressing table of positions in that vector is probed by
+// hash (see py_table_lookup).
+struct PyDict {
+    struct Entry;
+
+    PyVector<Entry> entries;
+    PyVector<int>   slots;
+    std::size_t     used;      // live entries
+
+    PyDict() : used(0) {}
+
+    std::size_t size() const {
+        return used;
+    }
 
+    bool empty() const {
+        return used == 0;
+    }
+
+    // Value stored for key, nullptr if missing
+    const PyValue* find(const PyValue& key) const;
+    PyValue* find(const PyValue& key);
+
+    // Adds key or replaces its value (an existing key object is kept),
+    // an rvalue value is moved in
+    void set(const PyValue& key, const PyValue& value);
+    void set(const PyValue& key, PyValue&& value);
+
+    // Value stored for key, added as None if missing
+    PyValue& slot_for(const PyValue& key);
+
+    // Removes key, false if it was missing
+    bool erase(const PyValue& key);
+
+    // Drops the removed entries and resizes the slots for min_used entries
+    void rebuild(std::size_t min_used);
+};
+
+// Sets use the same table as dicts, with no values. They are iterated in
+// slot order like CPython's sets, so small ints come out sorted.
+struct PySet {
+    struct Entry;
+
+    PyVector<Entry> entries;
+    PyVector<int>   slots;
+    std::size_t     used;      // live members
+
+    PySet() : used(0) {}
+
+    std::size_t size() const {
+        return used;
+    }
+
+    bool empty() const {
+        return used == 0;
+    }
+
+    bool contains(const PyValue& value) const;
+    bool contains(const PyValue& value, std::size_t hash) const;
+
+    // Adds value (moved in if it is an rvalue), false if it was already there
+    template <typename V> bool add(V&& value);
+    template <typename V> bool add(V&& value, std::size_t hash);
+
+    // Removes value, false if it was missing
+    bool erase(const PyValue& value);
+
+    // Makes room for n more members without rehashing on the way
+    void reserve(std::size_t n);
+
+    // Drops the removed entries and resizes the slots for min_used members
+    void rebuild(std::size_t min_used);
+};
+
+using PyTuple = PyItems;
+
+// Number formatting
+//
+// Values are formatted by appending to a caller-owned string (see
+// PyValue::format_into), numbers through std::to_chars without any stream.
+
+inline void py_format_int(long long v, std::string& out) {
+    char buf[24];
+    auto res = std::to_chars(buf, buf + sizeof(buf), v);
+    out.append(buf, res.ptr);
+}
+
+// Same text as Python's repr(float): shortest round-trip digits, fixed
+// notation for exponents in [-4, 16), always with a fractional part.
+PY_COLD void py_format_float(double v, std::string& out);
+
+// Heap storage for what doesn't fit in a PyValue: strings longer than
+// PyValue::SMALL_CAPACITY and every container. Boxes are reference counted
+// and shared between copies, so copying a PyValue never copies a container
+// (as in Python, two names bound to the same list see each other's changes).
+struct PyBoxBase {
+    long refcount;
+};
+
+template <typename T>
+struct PyBox : PyBoxBase {
+    T value;
+
+    template <typename U>
+    explicit PyBox(U&& v) : PyBoxBase{ 1 }, value(std::forward<U>(v)) {}
+
+    static void* operator new(std::size_t size) {
+        return py_pool.allocate(size);
+    }
+
+    static void operator delete(void* p, std::size_t size) noexcept {
+        py_pool.deallocate(p, size);
+    }
+};
+
+// A value takes 16 bytes: an 8-byte payload (the int, float or bool, or the
+// pointer to a box), 6 more bytes only used by strings, the inline string
+// length and the type tag. Strings of up to SMALL_CAPACITY chars are kept
+// inline in the first 14 bytes, so they never allocate.
 struct PyValue {
-    enum Type {
+    enum Type : unsigned char {
         NONE,
         INT,
         FLOAT,
@@ -29,94 +603,199 @@ struct PyValue {
         SET
     };
 
-    Type type;
+    static constexpr std::size_t   SMALL_CAPACITY = 14;
+    static constexpr unsigned char BOXED = 0xff;  // small_size of a boxed value
 
-    long long     int_value;
-    double        float_value;
-    bool          bool_value;
-    std::string   string_value;
-    PyList        list_value;
-    PyDict        dict_value;
-    PyTuple       tuple_value;
-    PySet         set_value;
+    union {
+        long long  int_value;
+        double     float_value;
+        bool       bool_value;
+        PyBoxBase* box;
+    };
+    char          small_tail[6];  // bytes 8..13 of an inline string
+    unsigned char small_size;     // inline string length, or BOXED
+    Type          type;
 
     // Constructors
 
-    PyValue()
-        : type(NONE),
-          int_value(0),
-          float_value(0.0),
-          bool_value(false) {}
-
-    PyValue(long long v)
-        : type(INT),
-          int_value(v),
-          float_value(0.0),
-          bool_value(false) {}
-
-    PyValue(int v)
-        : type(INT),
-          int_value(v),
-          float_value(0.0),
-          bool_value(false) {}
-
-    PyValue(double v)
-        : type(FLOAT),
-          int_value(0),
-          float_value(v),
-          bool_value(false) {}
-
-    PyValue(bool v)
-        : type(BOOL),
-          int_value(0),
-          float_value(0.0),
-          bool_value(v) {}
-
-    PyValue(const std::string& s)
-        : type(STRING),
-          int_value(0),
-          float_value(0.0),
-          bool_value(false),
-          string_value(s) {}
-
-    PyValue(const char* s)
-        : type(STRING),
-          int_value(0),
-          float_value(0.0),
-          bool_value(false),
-          string_value(s) {}
-
-    PyValue(const PyList& lst)
-        : type(LIST),
-          int_value(0),
-          float_value(0.0),
-          bool_value(false),
-          list_value(lst) {}
-
-    PyValue(const PyDict& dict)
-        : type(DICT),
-          int_value(0),
-          float_value(0.0),
-          bool_value(false),
-          dict_value(dict) {}
+    PyValue() : int_value(0), small_size(0), type(NONE) {
+        PY_COUNT(++py_alloc_stats().constructed[NONE]);
+    }
 
-    // Helpers 
+    PyValue(long long v) : int_value(v), small_size(0), type(INT) {
+        PY_COUNT(++py_alloc_stats().constructed[INT]);
+    }
 
-    std::string type_name() const {
-        switch (type) {
-            case NONE:   return "None";
-            case INT:    return "int";
-            case FLOAT:  return "float";
-            case BOOL:   return "bool";
-            case STRING: return "str";
-            case LIST:   return "list";
-            case DICT:   return "dict";
-            case TUPLE:  return "tuple";
-            case SET:    return "set";
-            default:     return "unknown";
+    PyValue(int v) : int_value(v), small_size(0), type(INT) {
+        PY_COUNT(++py_alloc_stats().constructed[INT]);
+    }
+
+    PyValue(double v) : float_value(v), small_size(0), type(FLOAT) {
+        PY_COUNT(++py_alloc_stats().constructed[FLOAT]);
+    }
+
+    PyValue(bool v) : int_value(0), small_size(0), type(BOOL) {
+        bool_value = v;
+        PY_COUNT(++py_alloc_stats().constructed[BOOL]);
+    }
+
+    PyValue(std::string_view s) : int_value(0), small_size(0), type(STRING) {
+        PY_COUNT(++py_alloc_stats().constructed[STRING]);
+        if (s.size() <= SMALL_CAPACITY) {
+            std::memcpy(small_data(), s.data(), s.size());
+            small_size = static_cast<unsigned char>(s.size());
+        } else {
+            box = new PyBox<std::string>(s);
+            small_size = BOXED;
+            PY_COUNT(++py_alloc_stats().boxes[STRING]);
+        }
+    }
+
+    PyValue(const char* s) : PyValue(std::string_view(s)) {}
+
+    PyValue(const std::string& s) : PyValue(std::string_view(s)) {}
+
+    PyValue(std::string&& s) : int_value(0), small_size(0), type(STRING) {
+        PY_COUNT(++py_alloc_stats().constructed[STRING]);
+        if (s.size() <= SMALL_CAPACITY) {
+            std::memcpy(small_data(), s.data(), s.size());
+            small_size = static_cast<unsigned char>(s.size());
+        } else {
+            box = new PyBox<std::string>(std::move(s));
+            small_size = BOXED;
+            PY_COUNT(++py_alloc_stats().boxes[STRING]);
+        }
+    }
+
+    // Containers are moved (or copied) into a new box, defined below
+    PyValue(const PyList& lst);
+    PyValue(PyList&& lst);
+    PyValue(const PyDict& dict);
+    PyValue(PyDict&& dict);
+    PyValue(const PySet& set);
+    PyValue(PySet&& set);
+
+    // Takes over a fresh box (refcount 1) holding a value of type t
+    PyValue(Type t, PyBoxBase* b) : box(b), small_size(BOXED), type(t) {
+        PY_COUNT(++py_alloc_stats().constructed[t]);
+        PY_COUNT(++py_alloc_stats().boxes[t]);
+    }
+
+    // Copies share the box, moves leave None behind
+
+    PyValue(const PyValue& other PY_COPY_SITE) {
+        std::memcpy(static_cast<void*>(this), &other, sizeof(PyValue));
+        if (small_size == BOXED) {
+            ++box->refcount;
         }
+        PY_COUNT(py_alloc_stats().copy(type PY_COPY_SITE_ARGS));
+    }
+
+    PyValue(PyValue&& other) noexcept {
+        std::memcpy(static_cast<void*>(this), &other, sizeof(PyValue));
+        other.small_size = 0;
+        other.type = NONE;
+        PY_COUNT(++py_alloc_stats().moved[type]);
+    }
+
+    // The slow paths count through the copy / move constructor
+    PyValue& operator=(const PyValue& other) {
+        if (small_size != BOXED && other.small_size != BOXED) {
+            std::memcpy(static_cast<void*>(this), &other, sizeof(PyValue));
+            PY_COUNT(py_alloc_stats().copy(type));
+            return *this;
+        }
+        // other may live inside the box released here: copy it first
+        PyValue copy(other);
+        swap(copy);
+        return *this;
+    }
+
+    PyValue& operator=(PyValue&& other) noexcept {
+        if (small_size != BOXED && this != &other) {
+            std::memcpy(static_cast<void*>(this), &other, sizeof(PyValue));
+            other.small_size = 0;
+            other.type = NONE;
+            PY_COUNT(++py_alloc_stats().moved[type]);
+            return *this;
+        }
+        PyValue moved(std::move(other));
+        swap(moved);
+        return *this;
+    }
+
+    ~PyValue() {
+        if (small_size == BOXED) {
+            release();
+        }
+    }
+
+    void swap(PyValue& other) noexcept {
+        char tmp[sizeof(PyValue)];
+        std::memcpy(tmp, static_cast<void*>(this), sizeof(PyValue));
+        std::memcpy(static_cast<void*>(this), &other, sizeof(PyValue));
+        std::memcpy(static_cast<void*>(&other), tmp, sizeof(PyValue));
+    }
+
+    void release() {
+        if (--box->refcount == 0) {
+            destroy_box();
+        }
+    }
+
+    // Deletes the box with its real type (defined after the containers)
+    void destroy_box();
+
+    // Payload access, only valid for the matching type
+
+    char* small_data() {
+        return reinterpret_cast<char*>(this);
+    }
+
+    const char* small_data() const {
+        return reinterpret_cast<const char*>(this);
+    }
+
+    std::string_view string_value() const {
+        if (small_size == BOXED) {
+            return static_cast<const PyBox<std::string>*>(box)->value;
+        }
+        return std::string_view(small_data(), small_size);
+    }
+
+    PyList& list_value() {
+        return static_cast<PyBox<PyList>*>(box)->value;
+    }
+
+    const PyList& list_value() const {
+        return static_cast<const PyBox<PyList>*>(box)->value;
+    }
+
+    PyDict& dict_value() {
+        return static_cast<PyBox<PyDict>*>(box)->value;
+    }
+
+    const PyDict& dict_value() const {
+        return static_cast<const PyBox<PyDict>*>(box)->value;
+    }
+
+    const PyTuple& tuple_value() const {
+        return static_cast<const PyBox<PyTuple>*>(box)->value;
+    }
+
+    PySet& set_value() {
+        return static_cast<PyBox<PySet>*>(box)->value;
+    }
+
+    const PySet& set_value() const {
+        return static_cast<const PyBox<PySet>*>(box)->value;
     }
 
+    // Helpers 
+
+    // Python's name of the type, for error messages
+    std::string type_name() const;
+
     bool is_truthy() const {
         switch (type) {
             case NONE:
@@ -128,96 +807,551 @@ struct PyValue {
             case BOOL:
                 return bool_value;
             case STRING:
-                return !string_value.empty();
+                return small_size != 0;
             case LIST:
-                return !list_value.empty();
+                return !list_value().empty();
             case DICT:
-                return !dict_value.empty();
+                return !dict_value().empty();
             case TUPLE:
-                return !tuple_value.empty();
+                return !tuple_value().empty();
             case SET:
-                return !set_value.empty();
+                return !set_value().empty();
             default:
                 return false;
         }
     }
 
+    // Appends the printed form of the value to out (no temporaries, nested
+    // containers write into the same string):
+    void format_into(std::string& out) const;
+
     std::string to_string() const {
-        std::ostringstream oss;
+        std::string out;
+        format_into(out);
+        return out;
+    }
+};
 
-        switch (type) {
-            case NONE:
-                oss << "None";
-                break;
-            case INT:
-                oss << int_value;
-                break;
-            case FLOAT:
-                oss << float_value;
-                break;
-            case BOOL:
-                oss << (bool_value ? "True" : "False");
-                break;
-            case STRING:
-                oss << string_value;
-                break;
-            case LIST: {
-                oss << "[";
-                for (std::size_t i = 0; i < list_value.size(); ++i) {
-                    if (i > 0) {
-                        oss << ", ";
-                    }
-                    oss << list_value[i].to_string();
-                }
-                oss << "]";
-                break;
+static_assert(sizeof(PyValue) == 16, "PyValue must stay 16 bytes");
+static_assert(offsetof(PyValue, small_tail) == 8, "inline strings must be contiguous");
+
+// PyList members that need a complete PyValue
+
+inline PyList::Storage PyList::storage_for(const PyValue& v) const {
+#ifdef FANGLESS_GENERIC_LISTS
+    (void)v;
+    return GENERIC;
+#else
+    if (v.type == PyValue::INT) {
+        return INTS;
+    }
+    if (v.type == PyValue::FLOAT) {
+        return FLOATS;
+    }
+    return GENERIC;
+#endif
+}
+
+inline PyList::PyList(PyItems&& values) : storage(INTS), views(nullptr) {
+    if (!values.empty()) {
+        storage = storage_for(values[0]);
+    }
+    for (const auto& v : values) {
+        if (storage_for(v) != storage) {
+            storage = GENERIC;
+            break;
+        }
+    }
+    switch (storage) {
+        case INTS:
+            ints.reserve(values.size());
+            for (const auto& v : values) {
+                ints.push_back(v.int_value);
             }
-            case DICT: {
-                oss << "{";
-                bool first = true;
-                for (const auto& kv : dict_value) {
-                    if (!first) {
-                        oss << ", ";
-                    }
-                    first = false;
-                    oss << kv.first << ": " << kv.second.to_string();
-                }
-                oss << "}";
-                break;
+            break;
+        case FLOATS:
+            floats.reserve(values.size());
+            for (const auto& v : values) {
+                floats.push_back(v.float_value);
             }
-            case TUPLE: {
-                oss << "(";
-                for (std::size_t i = 0; i < tuple_value.size(); ++i) {
-                    if (i > 0) {
-                        oss << ", ";
-                    }
-                    oss << tuple_value[i].to_string();
-                }
-                // Single element tuple, add trailing comma
-                if (tuple_value.size() == 1) {
-                    oss << ",";
-                }
-                oss << ")";
-                break;
+            break;
+        default:
+            items = std::move(values);
+            break;
+    }
+}
+
+inline PyList::PyList(const PyList& other) : storage(INTS), views(nullptr) {
+    if (other.storage == VIEW) {
+        attach(*other.view->source, other.view->start, other.view->length);
+    } else {
+        storage = other.storage;
+        ints = other.ints;
+        floats = other.floats;
+        items = other.items;
+    }
+}
+
+inline PyList::PyList(PyList&& other) noexcept
+    : storage(other.storage),
+      ints(std::move(other.ints)),
+      floats(std::move(other.floats)),
+      items(std::move(other.items)),
+      views(other.views) {
+    follow_move();
+    other.storage = INTS;
+    other.views = nullptr;
+}
+
+inline PyList& PyList::operator=(const PyList& other) {
+    if (this != &other) {
+        PyList copy(other);
+        *this = std::move(copy);
+    }
+    return *this;
+}
+
+inline PyList& PyList::operator=(PyList&& other) noexcept {
+    if (this != &other) {
+        // other may be a view of this list: it gets its copy here
+        reset();
+        take(other);
+    }
+    return *this;
+}
+
+inline PyList::~PyList() {
+    if (storage == VIEW) {
+        leave_source();
+    } else if (views != nullptr) {
+        detach_views();
+    }
+}
+
+inline void PyList::reset() noexcept {
+    if (storage == VIEW) {
+        leave_source();
+    } else if (views != nullptr) {
+        detach_views();
+    }
+    storage = INTS;
+    ints.clear();
+    floats.clear();
+    items.clear();
+}
+
+inline void PyList::take(PyList& other) noexcept {
+    storage = other.storage;
+    ints = std::move(other.ints);
+    floats = std::move(other.floats);
+    items = std::move(other.items);
+    views = other.views;
+    follow_move();
+    other.storage = INTS;
+    other.views = nullptr;
+}
+
+inline void PyList::follow_move() noexcept {
+    if (storage == VIEW) {
+        (*view->source->views)[view->slot] = this;
+    } else if (views != nullptr) {
+        for (PyList* v : *views) {
+            v->view->source = this;
+        }
+    }
+}
+
+inline PyValue PyList::get(std::size_t i) const {
+    switch (storage) {
+        case INTS:    return PyValue(ints[i]);
+        case FLOATS:  return PyValue(floats[i]);
+        case GENERIC: return items[i];
+        default:      return view->source->get(view->start + i);
+    }
+}
+
+// scratch is an empty PyValue: unboxed numbers are built straight into it
+// (an assignment would first check for a box to release)
+inline const PyValue& PyList::get_ref(std::size_t i, PyValue& scratch) const {
+    switch (storage) {
+        case INTS:    ::new (static_cast<void*>(&scratch)) PyValue(ints[i]); return scratch;
+        case FLOATS:  ::new (static_cast<void*>(&scratch)) PyValue(floats[i]); return scratch;
+        case GENERIC: return items[i];
+        default:      return view->source->get_ref(view->start + i, scratch);
+    }
+}
+
+template <typename V>
+inline void PyList::set(std::size_t i, V&& v) {
+    unshare();
+    if (storage != GENERIC && storage_for(v) != storage) {
+        deoptimize();
+    }
+    switch (storage) {
+        case INTS:   ints[i] = v.int_value; break;
+        case FLOATS: floats[i] = v.float_value; break;
+        default:     items[i] = std::forward<V>(v); break;
+    }
+}
+
+template <typename V>
+inline void PyList::push_back(V&& v) {
+    unshare();
+    // An empty list takes the storage of its first element
+    if (empty()) {
+        storage = storage_for(v);
+        items.clear();
+    } else if (storage != GENERIC && storage_for(v) != storage) {
+        deoptimize();
+    }
+    switch (storage) {
+        case INTS:   ints.push_back(v.int_value); break;
+        case FLOATS: floats.push_back(v.float_value); break;
+        default:     items.push_back(std::forward<V>(v)); break;
+    }
+}
+
+inline void PyList::erase(std::size_t i) {
+    unshare();
+    switch (storage) {
+        case INTS:   ints.erase(ints.begin() + i); break;
+        case FLOATS: floats.erase(floats.begin() + i); break;
+        default:     items.erase(items.begin() + i); break;
+    }
+}
+
+// end already clamped to size()
+inline PyList PyList::slice(std::size_t start, std::size_t end) const {
+    PyList result;
+    if (start >= end) {
+        return result;
+    }
+#ifndef FANGLESS_COPY_SLICES
+    if (end - start >= MIN_VIEW) {
+        result.attach(*this, start, end - start);
+        return result;
+    }
+#endif
+    if (storage == VIEW) {
+        result.copy_range(*view->source, view->start + start, end - start);
+    } else {
+        result.copy_range(*this, start, end - start);
+    }
+    return result;
+}
+
+// Hashing and key equality
+//
+// Equal numbers hash alike whatever their type, so 1, 1.0 and True are the
+// same dict key as in Python. Ints hash to themselves as in CPython (the
+// probe sequence mixes in the high bits). Lists, dicts and sets are
+// unhashable.
+
+inline std::size_t py_hash_mix(unsigned long long x) {
+    x ^= x >> 33;
+    x *= 0xff51afd7ed558ccdULL;
+    x ^= x >> 33;
+    x *= 0xc4ceb9fe1a85ec53ULL;
+    x ^= x >> 33;
+    return static_cast<std::size_t>(x);
+}
+
+inline std::size_t py_hash(const PyValue& v) {
+    switch (v.type) {
+        case PyValue::NONE:
+            return py_hash_mix(0x9e3779b97f4a7c15ULL);
+        case PyValue::INT:
+            return static_cast<std::size_t>(v.int_value);
+        case PyValue::BOOL:
+            return v.bool_value ? 1 : 0;
+        case PyValue::FLOAT: {
+            double f = v.float_value;
+            if (f == std::floor(f) && std::fabs(f) < 9.2e18) {
+                return static_cast<std::size_t>(static_cast<long long>(f));
+            }
+            unsigned long long bits;
+            std::memcpy(&bits, &f, sizeof(bits));
+            return py_hash_mix(bits);
+        }
+        case PyValue::STRING:
+            return std::hash<std::string_view>()(v.string_value());
+        case PyValue::TUPLE: {
+            std::size_t h = 0x345678;
+            for (const PyValue& item : v.tuple_value()) {
+                h = (h ^ py_hash(item)) * 1000003;
             }
-            case SET: {
-                oss << "{";
-                bool first = true;
-                for (const auto& kv : set_value) {
-                    if (!first) {
-                        oss << ", ";
+            return h;
+        }
+        default:
+            py_type_error("TypeError: unhashable type: '", v, "'");
+    }
+}
+
+inline bool py_key_equal(const PyValue& a, const PyValue& b) {
+    if (a.type == b.type) {
+        switch (a.type) {
+            case PyValue::NONE:
+                return true;
+            case PyValue::INT:
+                return a.int_value == b.int_value;
+            case PyValue::FLOAT:
+                return a.float_value == b.float_value;
+            case PyValue::BOOL:
+                return a.bool_value == b.bool_value;
+            case PyValue::STRING:
+                return a.string_value() == b.string_value();
+            case PyValue::TUPLE:
+                if (a.tuple_value().size() != b.tuple_value().size()) {
+                    return false;
+                }
+                for (std::size_t i = 0; i < a.tuple_value().size(); ++i) {
+                    if (!py_key_equal(a.tuple_value()[i], b.tuple_value()[i])) {
+                        return false;
                     }
-                    first = false;
-                    oss << kv.second.to_string();
                 }
-                oss << "}";
-                break;
+                return true;
+            default:
+                return false;
+        }
+    }
+
+    // Mixed int / float / bool: compare the numbers
+    bool a_number = a.type == PyValue::INT || a.type == PyValue::FLOAT || a.type == PyValue::BOOL;
+    bool b_number = b.type == PyValue::INT || b.type == PyValue::FLOAT || b.type == PyValue::BOOL;
+    if (!a_number || !b_number) {
+        return false;
+    }
+    if (a.type == PyValue::FLOAT || b.type == PyValue::FLOAT) {
+        double da = (a.type == PyValue::FLOAT) ? a.float_value
+                  : (a.type == PyValue::INT) ? static_cast<double>(a.int_value) : (a.bool_value ? 1.0 : 0.0);
+        double db = (b.type == PyValue::FLOAT) ? b.float_value
+                  : (b.type == PyValue::INT) ? static_cast<double>(b.int_value) : (b.bool_value ? 1.0 : 0.0);
+        return da == db;
+    }
+    long long ia = (a.type == PyValue::INT) ? a.int_value : (a.bool_value ? 1 : 0);
+    long long ib = (b.type == PyValue::INT) ? b.int_value : (b.bool_value ? 1 : 0);
+    return ia == ib;
+}
+
+// Hash tables (PyDict and PySet)
+//
+// Both keep their entries in a dense vector in insertion order and probe a
+// power-of-two table of positions in it. Entries carry hash, key and a
+// removed flag; a removed entry stays as a hole until the next rebuild.
+
+const int PY_SLOT_EMPTY = -1;  // slot never used
+const int PY_SLOT_DUMMY = -2;  // slot of a removed entry (probing goes on)
+
+// Slot holding key, or the one it would be inserted into (the first dummy
+// passed on the way, else the empty slot that ended the probe).
+template <typename Entry>
+std::size_t py_table_lookup(const PyVector<int>& slots, const PyVector<Entry>& entries,
+                            const PyValue& key, std::size_t hash, bool& found) {
+    const std::size_t none = static_cast<std::size_t>(-1);
+    std::size_t mask = slots.size() - 1;
+    std::size_t i = hash & mask;
+    std::size_t perturb = hash;
+    std::size_t free_slot = none;
+
+    // Same probe sequence as CPython: every slot is reached eventually
+    while (true) {
+        int ix = slots[i];
+        if (ix == PY_SLOT_EMPTY) {
+            found = false;
+            return (free_slot != none) ? free_slot : i;
+        }
+        if (ix == PY_SLOT_DUMMY) {
+            if (free_slot == none) {
+                free_slot = i;
+            }
+        } else {
+            const Entry& entry = entries[static_cast<std::size_t>(ix)];
+            if (entry.hash == hash && py_key_equal(entry.key, key)) {
+                found = true;
+                return i;
             }
         }
+        perturb >>= 5;
+        i = (i * 5 + perturb + 1) & mask;
+    }
+}
+
+// PyDict members that need a complete PyValue
+
+struct PyDict::Entry {
+    std::size_t hash;
+    PyValue     key;
+    PyValue     value;
+    bool        removed;
+};
+
+inline const PyValue* PyDict::find(const PyValue& key) const {
+    std::size_t hash = py_hash(key);  // also rejects unhashable keys
+    if (used == 0) {
+        return nullptr;
+    }
+    bool found;
+    std::size_t slot = py_table_lookup(slots, entries, key, hash, found);
+    return found ? &entries[static_cast<std::size_t>(slots[slot])].value : nullptr;
+}
+
+inline PyValue* PyDict::find(const PyValue& key) {
+    return const_cast<PyValue*>(static_cast<const PyDict*>(this)->find(key));
+}
+
+inline PyValue& PyDict::slot_for(const PyValue& key) {
+    std::size_t hash = py_hash(key);
+    // Entries (holes included) fill at most 2/3 of the slots
+    if ((entries.size() + 1) * 3 > slots.size() * 2) {
+        rebuild(used + 1);
+    }
+
+    bool found;
+    std::size_t slot = py_table_lookup(slots, entries, key, hash, found);
+    if (found) {
+        return entries[static_cast<std::size_t>(slots[slot])].value;
+    }
+    slots[slot] = static_cast<int>(entries.size());
+    entries.push_back(Entry{ hash, key, PyValue(), false });
+    ++used;
+    return entries.back().value;
+}
+
+inline void PyDict::set(const PyValue& key, const PyValue& value) {
+    // value may be one of this dict's own entries, which slot_for can move
+    PyValue copy(value);
+    slot_for(key) = std::move(copy);
+}
+
+inline void PyDict::set(const PyValue& key, PyValue&& value) {
+    slot_for(key) = std::move(value);
+}
+
+inline bool PyDict::erase(const PyValue& key) {
+    std::size_t hash = py_hash(key);
+    if (used == 0) {
+        return false;
+    }
+    bool found;
+    std::size_t slot = py_table_lookup(slots, entries, key, hash, found);
+    if (!found) {
+        return false;
+    }
+
+    Entry& entry = entries[static_cast<std::size_t>(slots[slot])];
+    entry.removed = true;
+    entry.key = PyValue();
+    entry.value = PyValue();
+    slots[slot] = PY_SLOT_DUMMY;
+    --used;
+
+    if (used == 0) {
+        entries.clear();
+        std::fill(slots.begin(), slots.end(), PY_SLOT_EMPTY);
+    }
+    return true;
+}
+
+// PySet members that need a complete PyValue
+
+struct PySet::Entry {
+    std::size_t hash;
+    PyValue     key;
+    bool        removed;
+};
+
+inline bool PySet::contains(const PyValue& value) const {
+    return contains(value, py_hash(value));  // also rejects unhashable values
+}
+
+inline bool PySet::contains(const PyValue& value, std::size_t hash) const {
+    if (used == 0) {
+        return false;
+    }
+    bool found;
+    py_table_lookup(slots, entries, value, hash, found);
+    return found;
+}
+
+template <typename V>
+inline bool PySet::add(V&& value) {
+    std::size_t hash = py_hash(value);
+    return add(std::forward<V>(value), hash);
+}
+
+template <typename V>
+inline bool PySet::add(V&& value, std::size_t hash) {
+    if ((entries.size() + 1) * 3 > slots.size() * 2) {
+        rebuild(used + 1);
+    }
+
+    bool found;
+    std::size_t slot = py_table_lookup(slots, entries, value, hash, found);
+    if (found) {
+        return false;
+    }
+    slots[slot] = static_cast<int>(entries.size());
+    entries.push_back(Entry{ hash, std::forward<V>(value), false });
+    ++used;
+    return true;
+}
+
+inline bool PySet::erase(const PyValue& value) {
+    std::size_t hash = py_hash(value);
+    if (used == 0) {
+        return false;
+    }
+    bool found;
+    std::size_t slot = py_table_lookup(slots, entries, value, hash, found);
+    if (!found) {
+        return false;
+    }
 
-        return oss.str();
+    Entry& entry = entries[static_cast<std::size_t>(slots[slot])];
+    entry.removed = true;
+    entry.key = PyValue();
+    slots[slot] = PY_SLOT_DUMMY;
+    --used;
+
+    if (used == 0) {
+        entries.clear();
+        std::fill(slots.begin(), slots.end(), PY_SLOT_EMPTY);
     }
-};
+    return true;
+}
+
+inline void PySet::reserve(std::size_t n) {
+    if ((entries.size() + n) * 3 > slots.size() * 2) {
+        rebuild(used + n);
+    }
+}
+
+// Boxed PyValues (need complete containers)
+
+inline PyValue::PyValue(const PyList& lst) : PyValue(LIST, new PyBox<PyList>(lst)) {}
+
+inline PyValue::PyValue(PyList&& lst) : PyValue(LIST, new PyBox<PyList>(std::move(lst))) {}
+
+inline PyValue::PyValue(const PyDict& dict) : PyValue(DICT, new PyBox<PyDict>(dict)) {}
+
+inline PyValue::PyValue(PyDict&& dict) : PyValue(DICT, new PyBox<PyDict>(std::move(dict))) {}
+
+inline PyValue::PyValue(const PySet& set) : PyValue(SET, new PyBox<PySet>(set)) {}
+
+inline PyValue::PyValue(PySet&& set) : PyValue(SET, new PyBox<PySet>(std::move(set))) {}
+
+// Kept out of line: with the pool's deallocate inlined into every container
+// destructor, inlining it bloated each ~PyValue in hot loops.
+__attribute__((noinline)) inline void PyValue::destroy_box() {
+    switch (type) {
+        case STRING: delete static_cast<PyBox<std::string>*>(box); break;
+        case LIST:   delete static_cast<PyBox<PyList>*>(box); break;
+        case DICT:   delete static_cast<PyBox<PyDict>*>(box); break;
+        case TUPLE:  delete static_cast<PyBox<PyTuple>*>(box); break;
+        case SET:    delete static_cast<PyBox<PySet>*>(box); break;
+        default:     break;
+    }
+}
 
 // Small reusable integer constants to avoid recreating PyValue(0/1/2) everywhere.
 static const PyValue PY_ZERO(0);
@@ -225,22 +1359,110 @@ static const PyValue PY_ONE(1);
 static const PyValue PY_TWO(2);
 
 // Printing
+//
+// print() appends to one process-wide buffer instead of flushing stdout on
+// every line. The buffer is written out when it fills up, on py_flush(), at
+// exit and before std::terminate, so an uncaught runtime error still shows
+// everything printed before it. Compile with -DFANGLESS_LINE_BUFFERED to
+// flush after every line (interactive use).
+struct PyOutput {
+    static const std::size_t CAPACITY = 1 << 16;
+
+    std::string buffer;
+    std::terminate_handler previous_terminate;
+
+    PyOutput();
+
+    ~PyOutput() {
+        flush();
+    }
 
-inline void py_print(const PyValue& v) {
-    std::cout << v.to_string() << std::endl;
-}
+    // Writes the buffer to std::cout
+    void flush();
 
-inline void py_print_many(const std::vector<PyValue>& args) {
-    for (std::size_t i = 0; i < args.size(); ++i) {
-        if (i > 0) {
-            std::cout << " ";
+    void end_line() {
+        buffer.push_back('\n');
+#ifdef FANGLESS_LINE_BUFFERED
+        flush();
+#else
+        if (buffer.size() >= CAPACITY) {
+            flush();
         }
-        std::cout << args[i].to_string();
+#endif
     }
-    std::cout << std::endl;
+
+    static void on_terminate();
+};
+
+inline PyOutput& py_output() {
+    static PyOutput output;
+    return output;
+}
+
+// Writes pending output now (e.g. before using std::cout directly):
+inline void py_flush() {
+    py_output().flush();
 }
 
+inline void py_print(const PyValue& v) {
+    PyOutput& output = py_output();
+    v.format_into(output.buffer);
+    output.end_line();
+}
+
+// print(): an empty line.
+inline void py_print() {
+    py_output().end_line();
+}
+
+// One argument of py_print({a, b, ...}), bound by reference: temporaries
+// live until the end of the print statement, so nothing is copied.
+struct PyPrintArg {
+    const PyValue* value;
+    PyPrintArg(const PyValue& v) : value(&v) {}
+};
+
+// print(a, b, ...): arguments separated by spaces, no temporary vector.
+// Taken as a braced list rather than as function arguments, because the
+// elements of a braced list are evaluated left to right and function
+// arguments in no fixed order: print(f(1), f(2)) must call f(1) first.
+PY_COLD void py_print(std::initializer_list<PyPrintArg> args);
+
+PY_COLD void py_print_many(const std::vector<PyValue>& args);
+
 // Arithmetic helpers
+//
+// Every binary operator tests for two ints first, then switches once on both
+// operand types: int / float mixing, then the other supported pairs. Bools
+// compare as the numbers 0 and 1.
+
+constexpr int py_type_pair(PyValue::Type a, PyValue::Type b) {
+    return a * 16 + b;
+}
+
+inline bool py_is_number(const PyValue& v) {
+    return v.type == PyValue::INT || v.type == PyValue::FLOAT || v.type == PyValue::BOOL;
+}
+
+// Value of an int, float or bool as a double
+inline double py_number_value(const PyValue& v) {
+    if (v.type == PyValue::INT) {
+        return static_cast<double>(v.int_value);
+    }
+    if (v.type == PyValue::FLOAT) {
+        return v.float_value;
+    }
+    return v.bool_value ? 1.0 : 0.0;
+}
+
+// True when one operand is a bool and the other a number
+inline bool py_bool_operands(const PyValue& a, const PyValue& b) {
+    return (a.type == PyValue::BOOL || b.type == PyValue::BOOL) &&
+           py_is_number(a) && py_is_number(b);
+}
+
+[[noreturn]] PY_COLD void py_operand_error(const char* op, const PyValue& a, const PyValue& b);
+[[noreturn]] PY_COLD void py_order_error(const char* op, const PyValue& a, const PyValue& b);
 
 inline double as_double_for_arith(const PyValue& v) {
     if (v.type == PyValue::INT) {
@@ -249,135 +1471,308 @@ inline double as_double_for_arith(const PyValue& v) {
     if (v.type == PyValue::FLOAT) {
         return v.float_value;
     }
-    throw std::runtime_error("TypeError: expected numeric type, got " + v.type_name());
+    py_type_error("TypeError: expected numeric type, got ", v, "");
 }
 
 inline long long as_int_for_mod(const PyValue& v) {
     if (v.type == PyValue::INT) {
         return v.int_value;
     }
-    throw std::runtime_error("TypeError: expected int for modulus, got " + v.type_name());
+    py_type_error("TypeError: expected int for modulus, got ", v, "");
 }
 
 // a + b
 inline PyValue py_add(const PyValue& a, const PyValue& b) {
-    // int + int = int
+    // Exact int fast path, before the jump table
     if (a.type == PyValue::INT && b.type == PyValue::INT) {
         return PyValue(a.int_value + b.int_value);
     }
-
-    // numeric (int/float) + numeric (int/float) = float
-    if ((a.type == PyValue::INT || a.type == PyValue::FLOAT) &&
-        (b.type == PyValue::INT || b.type == PyValue::FLOAT)) {
-        double da = as_double_for_arith(a);
-        double db = as_double_for_arith(b);
-        return PyValue(da + db);
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+            return PyValue(a.float_value + b.float_value);
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+            return PyValue(static_cast<double>(a.int_value) + b.float_value);
+        case py_type_pair(PyValue::FLOAT, PyValue::INT):
+            return PyValue(a.float_value + static_cast<double>(b.int_value));
+        case py_type_pair(PyValue::STRING, PyValue::STRING): {
+            std::string_view sa = a.string_value();
+            std::string_view sb = b.string_value();
+            // Short results are built inline, without a temporary std::string
+            if (sa.size() + sb.size() <= PyValue::SMALL_CAPACITY) {
+                char buf[PyValue::SMALL_CAPACITY];
+                std::memcpy(buf, sa.data(), sa.size());
+                std::memcpy(buf + sa.size(), sb.data(), sb.size());
+                return PyValue(std::string_view(buf, sa.size() + sb.size()));
+            }
+            std::string s;
+            s.reserve(sa.size() + sb.size());
+            s.append(sa).append(sb);
+            return PyValue(std::move(s));
+        }
+        default:
+            py_operand_error("+", a, b);
     }
+}
 
-    // str + str = str
-    if (a.type == PyValue::STRING && b.type == PyValue::STRING) {
-        return PyValue(a.string_value + b.string_value);
+// a + b consuming a: a long string nobody else holds is extended in place,
+// so `s = s + t` in a loop appends to s instead of copying it every time.
+inline PyValue py_add(PyValue&& a, const PyValue& b) {
+    if (a.type == PyValue::INT && b.type == PyValue::INT) {
+        return PyValue(a.int_value + b.int_value);
     }
-
-    throw std::runtime_error(
-        "TypeError: unsupported operand types for +: '" +
-        a.type_name() + "' and '" + b.type_name() + "'"
-    );
+    if (a.type == PyValue::STRING && b.type == PyValue::STRING &&
+        a.small_size == PyValue::BOXED && a.box->refcount == 1) {
+        static_cast<PyBox<std::string>*>(a.box)->value.append(b.string_value());
+        return std::move(a);
+    }
+    return py_add(static_cast<const PyValue&>(a), b);
 }
 
 // a - b
 inline PyValue py_sub(const PyValue& a, const PyValue& b) {
-    // int - int = int
     if (a.type == PyValue::INT && b.type == PyValue::INT) {
         return PyValue(a.int_value - b.int_value);
     }
-
-    // numeric = float
-    if ((a.type == PyValue::INT || a.type == PyValue::FLOAT) &&
-        (b.type == PyValue::INT || b.type == PyValue::FLOAT)) {
-        double da = as_double_for_arith(a);
-        double db = as_double_for_arith(b);
-        return PyValue(da - db);
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+            return PyValue(a.float_value - b.float_value);
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+            return PyValue(static_cast<double>(a.int_value) - b.float_value);
+        case py_type_pair(PyValue::FLOAT, PyValue::INT):
+            return PyValue(a.float_value - static_cast<double>(b.int_value));
+        default:
+            py_operand_error("-", a, b);
     }
-
-    throw std::runtime_error(
-        "TypeError: unsupported operand types for -: '" +
-        a.type_name() + "' and '" + b.type_name() + "'"
-    );
 }
 
 // a * b
 inline PyValue py_mul(const PyValue& a, const PyValue& b) {
-    // int * int = int
     if (a.type == PyValue::INT && b.type == PyValue::INT) {
         return PyValue(a.int_value * b.int_value);
     }
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+            return PyValue(a.float_value * b.float_value);
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+            return PyValue(static_cast<double>(a.int_value) * b.float_value);
+        case py_type_pair(PyValue::FLOAT, PyValue::INT):
+            return PyValue(a.float_value * static_cast<double>(b.int_value));
+        default:
+            py_operand_error("*", a, b);
+    }
+}
+
+// Native versions of the operators that can fail, used directly by
+// functions specialized on int / float arguments:
+
+inline double py_div(double a, double b) {
+    if (b == 0.0) {
+        py_raise("ZeroDivisionError: division by zero");
+    }
+    return a / b;
+}
+
+// % and // floor, so a == (a // b) * b + a % b and the remainder takes
+// the sign of b. b == -1 is answered first: LLONG_MIN / -1 overflows (UB
+// in C++), and the quotient wraps to LLONG_MIN like every int overflow.
+inline long long py_mod(long long a, long long b) {
+    if (b == 0) {
+        py_raise("ZeroDivisionError: integer modulo by zero");
+    }
+    if (b == -1) {
+        return 0;
+    }
+    // C++ % takes the sign of a: move it to the sign of b
+    long long r = a % b;
+    if (r != 0 && ((r < 0) != (b < 0))) {
+        r += b;
+    }
+    return r;
+}
 
-    // numeric = float
-    if ((a.type == PyValue::INT || a.type == PyValue::FLOAT) &&
-        (b.type == PyValue::INT || b.type == PyValue::FLOAT)) {
-        double da = as_double_for_arith(a);
-        double db = as_double_for_arith(b);
-        return PyValue(da * db);
+inline long long py_floordiv(long long a, long long b) {
+    if (b == 0) {
+        py_raise("ZeroDivisionError: integer division or modulo by zero");
     }
+    if (b == -1) {
+        return static_cast<long long>(0ULL - static_cast<unsigned long long>(a));
+    }
+    // C++ truncates toward zero: step down when the signs differ
+    long long q = a / b;
+    if ((a % b != 0) && ((a < 0) != (b < 0))) {
+        --q;
+    }
+    return q;
+}
 
-    throw std::runtime_error(
-        "TypeError: unsupported operand types for *: '" +
-        a.type_name() + "' and '" + b.type_name() + "'"
-    );
+// CPython's float floor division: floor(a / b) rounds up when a / b lands
+// just below a whole number (1.0 // 0.1 is 9.0, not 10.0), so the quotient
+// is rebuilt from the exact remainder fmod(a, b) instead.
+inline double py_floordiv(double a, double b) {
+    if (b == 0.0) {
+        py_raise("ZeroDivisionError: float floor division by zero");
+    }
+    double mod = std::fmod(a, b);
+    double div = (a - mod) / b;
+    if (mod != 0.0 && ((b < 0.0) != (mod < 0.0))) {
+        div -= 1.0;
+    }
+    if (div == 0.0) {
+        return std::copysign(0.0, a / b);
+    }
+    double floordiv = std::floor(div);
+    if (div - floordiv > 0.5) {
+        floordiv += 1.0;
+    }
+    return floordiv;
 }
 
 // a / b
 inline PyValue py_div(const PyValue& a, const PyValue& b) {
+    return PyValue(py_div(as_double_for_arith(a), as_double_for_arith(b)));
+}
+
+// a % b (integers only)
+inline PyValue py_mod(const PyValue& a, const PyValue& b) {
+    return PyValue(py_mod(as_int_for_mod(a), as_int_for_mod(b)));
+}
+
+// a ** b
+inline PyValue py_pow(const PyValue& a, const PyValue& b) {
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::INT, PyValue::INT):
+            // int ** non-negative int = int, exponentiation by squaring
+            if (b.int_value >= 0) {
+                // Unsigned arithmetic: overflow wraps like py_mul instead of being UB
+                unsigned long long base   = static_cast<unsigned long long>(a.int_value);
+                unsigned long long result = 1;
+                long long exp = b.int_value;
+                while (exp > 0) {
+                    if (exp & 1) {
+                        result *= base;
+                    }
+                    base *= base;
+                    exp >>= 1;
+                }
+                return PyValue(static_cast<long long>(result));
+            }
+            break;
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+        case py_type_pair(PyValue::FLOAT, PyValue::INT):
+            break;
+        default:
+            py_operand_error("**", a, b);
+    }
+
+    // numeric ** numeric (or int ** negative int) = float
     double da = as_double_for_arith(a);
     double db = as_double_for_arith(b);
-    if (db == 0.0) {
-        throw std::runtime_error("ZeroDivisionError: division by zero");
+    if (da == 0.0 && db < 0.0) {
+        py_raise(
+            "ZeroDivisionError: 0.0 cannot be raised to a negative power"
+        );
     }
-    return PyValue(da / db);
+    if (da < 0.0 && db != std::floor(db)) {
+        py_raise(
+            "ValueError: negative number cannot be raised to a fractional power"
+        );
+    }
+    return PyValue(std::pow(da, db));
 }
 
-// a % b (integers only)
-inline PyValue py_mod(const PyValue& a, const PyValue& b) {
-    long long ia = as_int_for_mod(a);
-    long long ib = as_int_for_mod(b);
-    if (ib == 0) {
-        throw std::runtime_error("ZeroDivisionError: integer modulo by zero");
+// a // b (rounds toward negative infinity)
+inline PyValue py_floordiv(const PyValue& a, const PyValue& b) {
+    if (a.type == PyValue::INT && b.type == PyValue::INT) {
+        return PyValue(py_floordiv(a.int_value, b.int_value));
+    }
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+        case py_type_pair(PyValue::FLOAT, PyValue::INT): {
+            return PyValue(py_floordiv(as_double_for_arith(a), as_double_for_arith(b)));
+        }
+        default:
+            py_operand_error("//", a, b);
     }
-    return PyValue(ia % ib);
 }
 
 
 // Comparisons
 
-inline PyValue py_eq(const PyValue& a, const PyValue& b) {
-    // Same type basic comparison
-    if (a.type == b.type) {
-        switch (a.type) {
-            case PyValue::NONE:
-                return PyValue(true);
-            case PyValue::INT:
-                return PyValue(a.int_value == b.int_value);
-            case PyValue::FLOAT:
-                return PyValue(a.float_value == b.float_value);
-            case PyValue::BOOL:
-                return PyValue(a.bool_value == b.bool_value);
-            case PyValue::STRING:
-                return PyValue(a.string_value == b.string_value);
-            default:
-                return PyValue(false);
-        }
+// Exact order of an int and a float that is not NaN: -1, 0 or 1. Going
+// through double would round ints above 2**53.
+inline int py_int_float_order(long long i, double f) {
+    if (f >= 9223372036854775808.0) {       // 2**63, or inf
+        return -1;
+    }
+    if (f < -9223372036854775808.0) {
+        return 1;
+    }
+    double whole = std::trunc(f);
+    long long w = static_cast<long long>(whole);
+    if (i != w) {
+        return i < w ? -1 : 1;
     }
+    return f > whole ? -1 : (f < whole ? 1 : 0);
+}
+
+// The comparison operators, applied to two operands of one type or to a
+// three-way result and 0:
+struct PyLess         { template <typename T> bool operator()(T x, T y) const { return x <  y; } };
+struct PyLessEqual    { template <typename T> bool operator()(T x, T y) const { return x <= y; } };
+struct PyGreater      { template <typename T> bool operator()(T x, T y) const { return x >  y; } };
+struct PyGreaterEqual { template <typename T> bool operator()(T x, T y) const { return x >= y; } };
+struct PyEqual        { template <typename T> bool operator()(T x, T y) const { return x == y; } };
+struct PyNotEqual     { template <typename T> bool operator()(T x, T y) const { return x != y; } };
+
+// Ints of at most 53 bits convert to double exactly
+inline bool py_exact_double(long long i) {
+    return i > -(1LL << 53) && i < (1LL << 53);
+}
+
+// int <op> float and float <op> int, exact. A NaN gives what the float
+// comparison gives (only != is true).
+template <typename Cmp>
+inline bool py_compare(long long a, double b, Cmp cmp) {
+    if (py_exact_double(a) || std::isnan(b)) {
+        return cmp(static_cast<double>(a), b);
+    }
+    return cmp(py_int_float_order(a, b), 0);
+}
 
-    // int == float or float == int
-    if ((a.type == PyValue::INT || a.type == PyValue::FLOAT) &&
-        (b.type == PyValue::INT || b.type == PyValue::FLOAT)) {
-        double da = as_double_for_arith(a);
-        double db = as_double_for_arith(b);
-        return PyValue(da == db);
+template <typename Cmp>
+inline bool py_compare(double a, long long b, Cmp cmp) {
+    if (py_exact_double(b) || std::isnan(a)) {
+        return cmp(a, static_cast<double>(b));
     }
+    return cmp(0, py_int_float_order(b, a));
+}
 
-    return PyValue(false);
+inline PyValue py_eq(const PyValue& a, const PyValue& b) {
+    if (a.type == PyValue::INT && b.type == PyValue::INT) {
+        return PyValue(a.int_value == b.int_value);
+    }
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+            return PyValue(a.float_value == b.float_value);
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+            return PyValue(py_compare(a.int_value, b.float_value, PyEqual()));
+        case py_type_pair(PyValue::FLOAT, PyValue::INT):
+            return PyValue(py_compare(a.float_value, b.int_value, PyEqual()));
+        case py_type_pair(PyValue::STRING, PyValue::STRING):
+            return PyValue(a.string_value() == b.string_value());
+        case py_type_pair(PyValue::BOOL, PyValue::BOOL):
+            return PyValue(a.bool_value == b.bool_value);
+        case py_type_pair(PyValue::NONE, PyValue::NONE):
+            return PyValue(true);
+        default:
+            // A bool with a number: 0 and 1 are exact doubles
+            if (py_bool_operands(a, b)) {
+                return PyValue(py_number_value(a) == py_number_value(b));
+            }
+            return PyValue(false);
+    }
 }
 
 inline PyValue py_ne(const PyValue& a, const PyValue& b) {
@@ -385,31 +1780,46 @@ inline PyValue py_ne(const PyValue& a, const PyValue& b) {
     return PyValue(!eq.bool_value);
 }
 
+// a < b, a <= b, a > b and a >= b: numbers by value, strings lexicographically
+template <typename Cmp>
+inline bool py_order(const PyValue& a, const PyValue& b, Cmp cmp, const char* op) {
+    if (a.type == PyValue::INT && b.type == PyValue::INT) {
+        return cmp(a.int_value, b.int_value);
+    }
+    switch (py_type_pair(a.type, b.type)) {
+        case py_type_pair(PyValue::FLOAT, PyValue::FLOAT):
+            return cmp(a.float_value, b.float_value);
+        case py_type_pair(PyValue::INT, PyValue::FLOAT):
+            return py_compare(a.int_value, b.float_value, cmp);
+        case py_type_pair(PyValue::FLOAT, PyValue::INT):
+            return py_compare(a.float_value, b.int_value, cmp);
+        case py_type_pair(PyValue::STRING, PyValue::STRING):
+            return cmp(a.string_value().compare(b.string_value()), 0);
+        default:
+            // A bool with a number: 0 and 1 are exact doubles
+            if (py_bool_operands(a, b)) {
+                return cmp(py_number_value(a), py_number_value(b));
+            }
+            py_order_error(op, a, b);
+    }
+}
+
 inline PyValue py_lt(const PyValue& a, const PyValue& b) {
-    double da = as_double_for_arith(a);
-    double db = as_double_for_arith(b);
-    return PyValue(da < db);
+    return PyValue(py_order(a, b, PyLess(), "<"));
 }
 
 inline PyValue py_le(const PyValue& a, const PyValue& b) {
-    double da = as_double_for_arith(a);
-    double db = as_double_for_arith(b);
-    return PyValue(da <= db);
+    return PyValue(py_order(a, b, PyLessEqual(), "<="));
 }
 
 inline PyValue py_gt(const PyValue& a, const PyValue& b) {
-    double da = as_double_for_arith(a);
-    double db = as_double_for_arith(b);
-    return PyValue(da > db);
+    return PyValue(py_order(a, b, PyGreater(), ">"));
 }
 
 inline PyValue py_ge(const PyValue& a, const PyValue& b) {
-    double da = as_double_for_arith(a);
-    double db = as_double_for_arith(b);
-    return PyValue(da >= db);
+    return PyValue(py_order(a, b, PyGreaterEqual(), ">="));
 }
 
-
 // Logical ops (and, or, not)
 
 inline PyValue py_not(const PyValue& v) {
@@ -436,314 +1846,545 @@ inline PyValue py_or(const PyValue& a, const PyValue& b) {
 // Builtins str() and len()
 
 inline PyValue py_str(const PyValue& v) {
+    if (v.type == PyValue::STRING) {
+        return v;  // shares the box of a long string
+    }
     return PyValue(v.to_string());
 }
 
 inline PyValue py_len(const PyValue& v) {
     switch (v.type) {
         case PyValue::STRING:
-            return PyValue(static_cast<long long>(v.string_value.size()));
+            return PyValue(static_cast<long long>(v.string_value().size()));
         case PyValue::LIST:
-            return PyValue(static_cast<long long>(v.list_value.size()));
+            return PyValue(static_cast<long long>(v.list_value().size()));
         case PyValue::DICT:
-            return PyValue(static_cast<long long>(v.dict_value.size()));
+            return PyValue(static_cast<long long>(v.dict_value().size()));
         case PyValue::TUPLE:
-            return PyValue(static_cast<long long>(v.tuple_value.size()));
+            return PyValue(static_cast<long long>(v.tuple_value().size()));
         case PyValue::SET:
-            return PyValue(static_cast<long long>(v.set_value.size()));
+            return PyValue(static_cast<long long>(v.set_value().size()));
         default:
-            throw std::runtime_error(
-                "TypeError: object of type '" + v.type_name() + "' has no len()"
-            );
+            py_type_error("TypeError: object of type '", v, "' has no len()");
     }
 }
 
 
 // Containers: list, dict, tuple, set
 
-// Build a list from items.
-inline PyValue py_list(const std::vector<PyValue>& items) {
-    return PyValue(items);
+// Build a list / dict / tuple from a std::vector (code written by hand; the
+// generated code builds displays from PyItems / PyPairs below).
+PY_COLD PyValue py_list(const std::vector<PyValue>& items);
+PY_COLD PyValue py_list(std::vector<PyValue>&& items);
+PY_COLD PyValue py_dict(const std::vector<std::pair<PyValue, PyValue>>& items);
+PY_COLD PyValue py_dict(std::vector<std::pair<PyValue, PyValue>>&& items);
+PY_COLD PyValue py_tuple(const std::vector<PyValue>& items);
+PY_COLD PyValue py_tuple(std::vector<PyValue>&& items);
+
+inline PyValue py_list(PyItems&& items PY_COPY_SITE) {
+    PY_SITE_SCOPE;
+    return PyValue(PyValue::LIST, new PyBox<PyList>(std::move(items)));
+}
+
+// A (key, value) pair of a dict display
+template <typename K, typename V>
+inline std::pair<PyValue, PyValue> py_pair(K&& key, V&& value PY_COPY_SITE) {
+    PY_SITE_SCOPE;
+    return { std::forward<K>(key), std::forward<V>(value) };
 }
 
-// Build a dict from (key, value) pairs, keys use to_string().
-inline PyValue py_dict(const std::vector<std::pair<PyValue, PyValue>>& items) {
+inline PyValue py_dict(PyPairs&& items PY_COPY_SITE) {
+    PY_SITE_SCOPE;
     PyDict dict;
 
-    for (const auto& kv : items) {
-        const PyValue& k = kv.first;
-        const PyValue& v = kv.second;
-        std::string key_str = k.to_string();
-        dict[key_str] = v;
+    for (auto& kv : items) {
+        dict.set(kv.first, std::move(kv.second));
     }
 
-    return PyValue(dict);
+    return PyValue(std::move(dict));
 }
 
-// Build a tuple from items.
-inline PyValue py_tuple(const std::vector<PyValue>& items) {
-    PyValue v;
-    v.type        = PyValue::TUPLE;
-    v.int_value   = 0;
-    v.float_value = 0.0;
-    v.bool_value  = false;
-    v.tuple_value = items;
-    return v;
+inline PyValue py_tuple(PyItems&& items PY_COPY_SITE) {
+    PY_SITE_SCOPE;
+    return PyValue(PyValue::TUPLE, new PyBox<PyTuple>(std::move(items)));
 }
 
-// Build a set from a list/tuple
-inline PyValue py_set_from_list(const PyValue& iterable) {
-    if (iterable.type != PyValue::LIST && iterable.type != PyValue::TUPLE) {
-        throw std::runtime_error(
-            "TypeError: set() expects a list or tuple"
-        );
-    }
+// Build a set from a list/tuple, sized for all the items up front.
+PY_COLD PyValue py_set_from_list(const PyValue& iterable);
 
-    PyValue v;
-    v.type        = PyValue::SET;
-    v.int_value   = 0;
-    v.float_value = 0.0;
-    v.bool_value  = false;
+// Set algebra: a.union(b), a.intersection(b) and a.difference(b) build a new
+// set; b may be a set, list or tuple.
+PY_COLD PyValue py_set_union(const PyValue& a, const PyValue& b);
+PY_COLD PyValue py_set_intersection(const PyValue& a, const PyValue& b);
+PY_COLD PyValue py_set_difference(const PyValue& a, const PyValue& b);
 
-    if (iterable.type == PyValue::LIST) {
-        for (const auto& item : iterable.list_value) {
-            std::string key_str = item.to_string();
-            v.set_value[key_str] = item;
-        }
-    } else { // TUPLE
-        for (const auto& item : iterable.tuple_value) {
-            std::string key_str = item.to_string();
-            v.set_value[key_str] = item;
+// Position of index in a list, tuple or string (kind) of n elements
+inline std::size_t py_sequence_index(const PyValue& index, std::size_t n, const char* kind) {
+    if (index.type != PyValue::INT) {
+        py_sequence_index_error(index, kind);
+    }
+    long long i = index.int_value;
+    if (i < 0 || i >= static_cast<long long>(n)) {
+        py_sequence_index_error(index, kind);
+    }
+    return static_cast<std::size_t>(i);
+}
+
+// dict[key], or the error for a container that is not a list, tuple or string
+inline const PyValue& py_mapping_item(const PyValue& container, const PyValue& key) {
+    // dict[key]
+    if (container.type == PyValue::DICT) {
+        const PyValue* value = container.dict_value().find(key);
+        if (value == nullptr) {
+            py_key_error(key);
         }
+        return *value;
+    }
+
+    // set is not subscriptable
+    if (container.type == PyValue::SET) {
+        py_raise(
+            "TypeError: 'set' object is not subscriptable"
+        );
     }
 
-    return v;
+    // Not subscriptable
+    py_type_error("TypeError: object of type '", container, "' is not subscriptable");
 }
 
-inline PyValue py_getitem(const PyValue& container, const PyValue& index) {
-    // list[index]
-    if (container.type == PyValue::LIST) {
-        if (index.type != PyValue::INT) {
-            throw std::runtime_error("TypeError: list indices must be integers");
+inline PyValue py_getitem(const PyValue& container, const PyValue& index PY_COPY_SITE) {
+    PY_SITE_SCOPE;
+    switch (container.type) {
+        case PyValue::LIST: {
+            const PyList& list = container.list_value();
+            return list.get(py_sequence_index(index, list.size(), "list"));
         }
-        long long i = index.int_value;
-        if (i < 0 || i >= static_cast<long long>(container.list_value.size())) {
-            throw std::runtime_error("IndexError: list index out of range");
+        case PyValue::TUPLE: {
+            const PyTuple& tuple = container.tuple_value();
+            return tuple[py_sequence_index(index, tuple.size(), "tuple")];
+        }
+        case PyValue::STRING: {
+            // string[index] = a 1-character string
+            std::string_view text = container.string_value();
+            return PyValue(text.substr(py_sequence_index(index, text.size(), "string"), 1));
         }
-        return container.list_value[static_cast<std::size_t>(i)];
+        default:
+            return py_mapping_item(container, index);
     }
+}
 
-    // tuple[index]
-    if (container.type == PyValue::TUPLE) {
-        if (index.type != PyValue::INT) {
-            throw std::runtime_error("TypeError: tuple indices must be integers");
+// container[index] for reading only: a reference to the element inside the
+// container, so reading a boxed element (a nested list, a long string) costs
+// no reference count update. Elements that are not stored as a PyValue
+// (unboxed numbers, string characters) are built in scratch, an empty
+// temporary that lives until the end of the caller's full-expression: the
+// reference must not be kept past it, nor used after the container changes.
+inline const PyValue& py_getitem_ref(const PyValue& container, const PyValue& index,
+                                     PyValue&& scratch = PyValue()) {
+    switch (container.type) {
+        case PyValue::LIST: {
+            const PyList& list = container.list_value();
+            return list.get_ref(py_sequence_index(index, list.size(), "list"), scratch);
         }
-        long long i = index.int_value;
-        if (i < 0 || i >= static_cast<long long>(container.tuple_value.size())) {
-            throw std::runtime_error("IndexError: tuple index out of range");
+        case PyValue::TUPLE: {
+            const PyTuple& tuple = container.tuple_value();
+            return tuple[py_sequence_index(index, tuple.size(), "tuple")];
+        }
+        case PyValue::STRING: {
+            std::string_view text = container.string_value();
+            scratch = PyValue(text.substr(py_sequence_index(index, text.size(), "string"), 1));
+            return scratch;
         }
-        return container.tuple_value[static_cast<std::size_t>(i)];
+        default:
+            return py_mapping_item(container, index);
     }
+}
 
-    // string[index] = a 1-character string
-    if (container.type == PyValue::STRING) {
-        if (index.type != PyValue::INT) {
-            throw std::runtime_error("TypeError: string indices must be integers");
-        }
-        long long i = index.int_value;
-        if (i < 0 || i >= static_cast<long long>(container.string_value.size())) {
-            throw std::runtime_error("IndexError: string index out of range");
-        }
-        char c = container.string_value[static_cast<std::size_t>(i)];
-        return PyValue(std::string(1, c));
+// Bound of a[start:end] for a sequence of n elements: None is omitted, a
+// negative bound counts from the end, then it is clamped to [0, n].
+inline std::size_t py_slice_bound(const PyValue& bound, std::size_t n, std::size_t omitted) {
+    if (bound.type == PyValue::NONE) {
+        return omitted;
     }
+    if (bound.type != PyValue::INT) {
+        py_raise("TypeError: slice indices must be integers or None");
+    }
+    long long i = bound.int_value;
+    if (i < 0) {
+        i += static_cast<long long>(n);
+        return i < 0 ? 0 : static_cast<std::size_t>(i);
+    }
+    return i > static_cast<long long>(n) ? n : static_cast<std::size_t>(i);
+}
 
-    // dict[key]
-    if (container.type == PyValue::DICT) {
-        std::string key_str;
+// container[start:end] for lists (a view, see PyList), tuples and strings
+inline PyValue py_getslice(const PyValue& container, const PyValue& start, const PyValue& end) {
+    std::size_t n;
+    switch (container.type) {
+        case PyValue::LIST:   n = container.list_value().size(); break;
+        case PyValue::TUPLE:  n = container.tuple_value().size(); break;
+        case PyValue::STRING: n = container.string_value().size(); break;
+        default:
+            py_type_error("TypeError: '", container, "' object is not subscriptable");
+    }
+    std::size_t s = py_slice_bound(start, n, 0);
+    std::size_t e = py_slice_bound(end, n, n);
+    if (e < s) {
+        e = s;
+    }
 
-        if (index.type == PyValue::STRING) {
-            key_str = index.string_value;
-        } else {
-            key_str = index.to_string();
+    switch (container.type) {
+        case PyValue::LIST:
+            return PyValue(container.list_value().slice(s, e));
+        case PyValue::TUPLE: {
+            const PyTuple& tuple = container.tuple_value();
+            return py_tuple(PyItems(tuple.begin() + s, tuple.begin() + e));
         }
+        default:
+            return PyValue(container.string_value().substr(s, e - s));
+    }
+}
 
-        auto it = container.dict_value.find(key_str);
-        if (it == container.dict_value.end()) {
-            throw std::runtime_error("KeyError: key not found: " + key_str);
+// Iteration
+
+// Walks any container for `for x in container:` loops. The iterator holds a
+// reference to the container's box (no copy), so rebinding the loop's source
+// variable doesn't change what is iterated. Lists, tuples, strings, dict
+// entries (yielding keys) and set slots are walked by index.
+struct PyIterator {
+    PyValue container;
+    std::size_t index;
+    std::size_t expected_size;
+
+    PyIterator()
+        : index(0),
+          expected_size(0) {}
+
+    explicit PyIterator(const PyValue& iterable PY_COPY_SITE)
+        : container(iterable PY_COPY_SITE_ARGS),
+          index(0),
+          expected_size(0) {
+        switch (iterable.type) {
+            case PyValue::LIST:
+            case PyValue::TUPLE:
+            case PyValue::STRING:
+                break;
+            case PyValue::DICT:
+                expected_size = iterable.dict_value().size();
+                break;
+            case PyValue::SET:
+                expected_size = iterable.set_value().size();
+                break;
+            default:
+                py_type_error("TypeError: '", iterable, "' object is not iterable");
         }
-        return it->second;
     }
 
-    // set is not subscriptable
-    if (container.type == PyValue::SET) {
-        throw std::runtime_error(
-            "TypeError: 'set' object is not subscriptable"
-        );
+    // Stores the next element in out, returns false once exhausted.
+    bool next(PyValue& out PY_COPY_SITE) {
+        PY_SITE_SCOPE;
+        switch (container.type) {
+            case PyValue::LIST:
+                // Re-check the size each step: the body may append or remove.
+                if (index >= container.list_value().size()) {
+                    return false;
+                }
+                out = container.list_value().get(index++);
+                return true;
+            case PyValue::TUPLE:
+                if (index >= container.tuple_value().size()) {
+                    return false;
+                }
+                out = container.tuple_value()[index++];
+                return true;
+            case PyValue::STRING:
+                if (index >= container.string_value().size()) {
+                    return false;
+                }
+                out = PyValue(container.string_value().substr(index++, 1));
+                return true;
+            case PyValue::DICT:
+                if (container.dict_value().size() != expected_size) {
+                    py_raise(
+                        "RuntimeError: dictionary changed size during iteration"
+                    );
+                }
+                // Keys in insertion order, skipping removed entries
+                while (index < container.dict_value().entries.size()) {
+                    const PyDict::Entry& entry = container.dict_value().entries[index++];
+                    if (!entry.removed) {
+                        out = entry.key;
+                        return true;
+                    }
+                }
+                return false;
+            case PyValue::SET:
+                if (container.set_value().size() != expected_size) {
+                    py_raise(
+                        "RuntimeError: set changed size during iteration"
+                    );
+                }
+                while (index < container.set_value().slots.size()) {
+                    int ix = container.set_value().slots[index++];
+                    if (ix >= 0) {
+                        out = container.set_value().entries[static_cast<std::size_t>(ix)].key;
+                        return true;
+                    }
+                }
+                return false;
+            default:
+                return false;
+        }
     }
+};
 
-    // Not subscriptable
-    throw std::runtime_error(
-        "TypeError: object of type '" + container.type_name() + "' is not subscriptable"
-    );
-}
-
-// Assign into containers container[index] = value
-inline void py_setitem(PyValue &container, const PyValue &index, const PyValue &value) {
+// Assign into containers container[index] = value (moved in if it is an rvalue)
+template <typename V>
+inline void py_setitem(PyValue &container, const PyValue &index, V&& value PY_COPY_SITE) {
+    PY_SITE_SCOPE;
     // list[index] = value
     if (container.type == PyValue::LIST) {
         if (index.type != PyValue::INT) {
-            throw std::runtime_error("TypeError: list indices must be integers");
+            py_raise("TypeError: list indices must be integers");
         }
         long long i = index.int_value;
-        if (i < 0 || i >= static_cast<long long>(container.list_value.size())) {
-            throw std::runtime_error("IndexError: list assignment index out of range");
+        if (i < 0 || i >= static_cast<long long>(container.list_value().size())) {
+            py_raise("IndexError: list assignment index out of range");
         }
-        container.list_value[static_cast<std::size_t>(i)] = value;
+        container.list_value().set(static_cast<std::size_t>(i), std::forward<V>(value));
         return;
     }
 
     // dict[key] = value
     if (container.type == PyValue::DICT) {
-        std::string key_str =
-            (index.type == PyValue::STRING) ? index.string_value : index.to_string();
-        container.dict_value[key_str] = value;
+        container.dict_value().set(index, std::forward<V>(value));
         return;
     }
 
     // Tuple assignment is not allowed
     if (container.type == PyValue::TUPLE) {
-        throw std::runtime_error(
+        py_raise(
             "TypeError: 'tuple' object does not support item assignment"
         );
     }
 
-    throw std::runtime_error(
-        "TypeError: object of type '" + container.type_name() +
-        "' does not support item assignment"
-    );
+    py_type_error("TypeError: object of type '", container, "' does not support item assignment");
 }
 
 // List helpers (methods)
 
-// list.append(x) = mutates list, returns None.
-inline PyValue py_list_append(PyValue& list, const PyValue& item) {
+// list.append(x) = mutates list (x is moved in if it is an rvalue), returns None.
+template <typename V>
+inline PyValue py_list_append(PyValue& list, V&& item PY_COPY_SITE) {
+    PY_SITE_SCOPE;
     if (list.type != PyValue::LIST) {
-        throw std::runtime_error("TypeError: append() only valid on list");
+        py_raise("TypeError: append() only valid on list");
     }
-    list.list_value.push_back(item);
+    list.list_value().push_back(std::forward<V>(item));
     return PyValue();  // None
 }
 
-// list.sublist(start, end) = returns new list with slice [start, end).
-inline PyValue py_list_sublist(const PyValue& list,
-                               const PyValue& start,
-                               const PyValue& end) {
+// list.sublist(start, end) = returns new list with slice [start, end)
+// (a view of list's elements until one of them changes).
+PY_COLD PyValue py_list_sublist(const PyValue& list, const PyValue& start, const PyValue& end);
+
+// Sorting (std::sort is an introsort, instantiated per comparator)
+
+// Python ordering: numbers (bools included) with numbers, str with str and
+// lists / tuples element by element. Any other pair is a TypeError.
+PY_COLD bool py_sort_less(const PyValue& a, const PyValue& b);
+
+// Sorts a list in place, with a specialized comparator when every element
+// has the same type.
+PY_COLD void py_sort_list(PyList& list);
+
+// list.sort() = sorts in place, returns None.
+inline PyValue py_list_sort(PyValue& list) {
     if (list.type != PyValue::LIST) {
-        throw std::runtime_error("TypeError: sublist() only valid on list");
-    }
-    if (start.type != PyValue::INT || end.type != PyValue::INT) {
-        throw std::runtime_error("TypeError: sublist indices must be integers");
+        py_raise("TypeError: sort() only valid on list");
     }
+    py_sort_list(list.list_value());
+    return PyValue();  // None
+}
 
-    long long s = start.int_value;
-    long long e = end.int_value;
-    if (s < 0) s = 0;
-    if (e < s) e = s;
+// sorted(iterable) = new sorted list with the elements of any iterable.
+PY_COLD PyValue py_sorted(const PyValue& iterable);
 
-    PyList result;
-    for (long long i = s; i < e && i < (long long)list.list_value.size(); ++i) {
-        result.push_back(list.list_value[(std::size_t)i]);
+// sorted() of a list nobody else holds sorts it in place.
+inline PyValue py_sorted(PyValue&& iterable) {
+    if (iterable.type == PyValue::LIST && iterable.box->refcount == 1) {
+        py_sort_list(iterable.list_value());
+        return std::move(iterable);
     }
-    return PyValue(result);
+    return py_sorted(static_cast<const PyValue&>(iterable));
 }
 
 
 // Dict / Set helpers (methods)
 
-// dict.add(key, value) or set.add(value)
-inline PyValue py_dict_or_set_add(PyValue& container,
-                                  const PyValue& key_or_value) {
+// dict.add(key, value) or set.add(value), rvalues are moved in
+template <typename V>
+inline PyValue py_dict_or_set_add(PyValue& container, V&& key_or_value PY_COPY_SITE) {
+    PY_SITE_SCOPE;
     // Used for set.add(value)
     if (container.type != PyValue::SET) {
-        throw std::runtime_error("TypeError: single-arg add() only valid on set");
+        py_raise("TypeError: single-arg add() only valid on set");
     }
 
-    std::string key_str = key_or_value.to_string();
-    container.set_value[key_str] = key_or_value;
+    container.set_value().add(std::forward<V>(key_or_value));
     return PyValue();  // None
 }
 
-inline PyValue py_dict_or_set_add(PyValue& container,
-                                  const PyValue& key,
-                                  const PyValue& value) {
+template <typename V>
+inline PyValue py_dict_or_set_add(PyValue& container, const PyValue& key, V&& value PY_COPY_SITE) {
+    PY_SITE_SCOPE;
     // Used for dict.add(key, value)
     if (container.type != PyValue::DICT) {
-        throw std::runtime_error("TypeError: two-arg add() only valid on dict");
+        py_raise("TypeError: two-arg add() only valid on dict");
     }
 
-    std::string key_str = key.to_string();
-    container.dict_value[key_str] = value;
+    container.dict_value().set(key, std::forward<V>(value));
     return PyValue();  // None
 }
 
 // dict.get(key) = value or None
 // set.get(value) = True/False
 inline PyValue py_dict_or_set_get(const PyValue& container,
-                                  const PyValue& key_or_value) {
+                                  const PyValue& key_or_value PY_COPY_SITE) {
+    PY_SITE_SCOPE;
     if (container.type == PyValue::DICT) {
-        std::string key_str = key_or_value.to_string();
-        auto it = container.dict_value.find(key_str);
-        if (it == container.dict_value.end()) {
+        const PyValue* value = container.dict_value().find(key_or_value);
+        if (value == nullptr) {
             // Python's dict.get() returns None if missing.
             return PyValue();
         }
-        return it->second;
+        return *value;
     }
 
     if (container.type == PyValue::SET) {
-        std::string key_str = key_or_value.to_string();
-        auto it = container.set_value.find(key_str);
-        return PyValue(it != container.set_value.end());
+        return PyValue(container.set_value().contains(key_or_value));
     }
 
-    throw std::runtime_error("TypeError: get() only valid on dict or set");
+    py_raise("TypeError: get() only valid on dict or set");
 }
 
+
 // remove for list, dict, set.
-inline PyValue py_container_remove(PyValue& container,
-                                   const PyValue& key_or_index) {
-    if (container.type == PyValue::LIST) {
-        if (key_or_index.type != PyValue::INT) {
-            throw std::runtime_error("TypeError: list remove() index must be int");
-        }
-        long long idx = key_or_index.int_value;
-        if (idx < 0 || idx >= (long long)container.list_value.size()) {
-            throw std::runtime_error("IndexError: list index out of range in remove()");
+PY_COLD PyValue py_container_remove(PyValue& container, const PyValue& key_or_index);
+
+// Profiling
+//
+// Code transpiled with CppTranspiler(instrument=True) defines
+// FANGLESS_PROFILE and marks every function with PY_PROFILE_FUNCTION, and
+// every loop with PY_PROFILE_LOOP plus PY_PROFILE_ITERATION in its body.
+// Each mark is a node of a call tree (a function called from two places has
+// two nodes) counting its entries, iterations and inclusive time. At exit
+// the tree is written to fangless_profile.json (calls, loop trip counts,
+// inclusive and exclusive time per function and loop) and to
+// fangless_profile.folded (exclusive microseconds per call path, the input
+// of flamegraph.pl); FANGLESS_PROFILE_OUT changes the file name prefix.
+// Without FANGLESS_PROFILE the marks expand to nothing.
+#ifdef FANGLESS_PROFILE
+
+struct PyProfiler {
+    struct Node {
+        const char* site;  // the literal of its mark, compared by address
+        bool loop;
+        int parent;
+        unsigned long long entries = 0;
+        unsigned long long iterations = 0;
+        long long inclusive_ns = 0;
+        std::vector<int> children;
+    };
+
+    std::vector<Node> nodes;  // nodes[0] is the root
+    int current = 0;
+
+    PyProfiler() {
+        nodes.push_back(Node{ "", false, -1, 0, 0, 0, {} });
+    }
+
+    ~PyProfiler() {
+        dump();
+    }
+
+    int enter(const char* site, bool loop) {
+        for (int child : nodes[current].children) {
+            if (nodes[child].site == site) {
+                return current = child;
+            }
         }
-        container.list_value.erase(container.list_value.begin() + (std::size_t)idx);
-        return PyValue();
+        int child = static_cast<int>(nodes.size());
+        nodes.push_back(Node{ site, loop, current, 0, 0, 0, {} });
+        nodes[current].children.push_back(child);
+        return current = child;
     }
 
-    if (container.type == PyValue::DICT) {
-        std::string key_str = key_or_index.to_string();
-        auto it = container.dict_value.find(key_str);
-        if (it == container.dict_value.end()) {
-            throw std::runtime_error("KeyError: key not found in dict remove()");
+    void leave(int node, long long elapsed_ns) {
+        nodes[node].entries++;
+        nodes[node].inclusive_ns += elapsed_ns;
+        current = nodes[node].parent;
+    }
+
+    long long exclusive_ns(const Node& node) const {
+        long long ns = node.inclusive_ns;
+        for (int child : node.children) {
+            ns -= nodes[child].inclusive_ns;
         }
-        container.dict_value.erase(it);
-        return PyValue();
+        return ns;
     }
 
-    if (container.type == PyValue::SET) {
-        std::string key_str = key_or_index.to_string();
-        auto it = container.set_value.find(key_str);
-        if (it == container.set_value.end()) {
-            throw std::runtime_error("KeyError: value not found in set remove()");
+    // Whether a node's time is already counted by an enclosing call of the
+    // same site (recursion)
+    bool nested(const Node& node) const {
+        for (int n = node.parent; n > 0; n = nodes[n].parent) {
+            if (nodes[n].site == node.site) {
+                return true;
+            }
         }
-        container.set_value.erase(it);
-        return PyValue();
+        return false;
     }
 
-    throw std::runtime_error("TypeError: remove() only valid on list, dict or set");
+    void dump() const;
+};
+
+inline PyProfiler& py_profiler() {
+    static PyProfiler profiler;
+    return profiler;
 }
+
+// Times one function call or one whole loop; iteration() counts a trip
+struct PyProfileScope {
+    int node;
+    std::chrono::steady_clock::time_point start;
+
+    PyProfileScope(const char* site, bool loop)
+        : node(py_profiler().enter(site, loop)), start(std::chrono::steady_clock::now()) {}
+
+    ~PyProfileScope() {
+        std::chrono::nanoseconds elapsed = std::chrono::steady_clock::now() - start;
+        py_profiler().leave(node, elapsed.count());
+    }
+
+    void iteration() {
+        py_profiler().nodes[node].iterations++;
+    }
+};
+
+#define PY_PROFILE_FUNCTION(name) PyProfileScope __profile_function(name, false)
+#define PY_PROFILE_LOOP(name) PyProfileScope __profile_loop(name, true)
+#define PY_PROFILE_ITERATION() __profile_loop.iteration()
+
+#else
+
+#define PY_PROFILE_FUNCTION(name)
+#define PY_PROFILE_LOOP(name)
+#define PY_PROFILE_ITERATION()
+
+#endif
+
+#ifndef FANGLESS_RUNTIME_LIBRARY
+#include "runtime_cold.hpp"
+#endif
+
+#endif
@@ -0,0 +1,863 @@
+#ifndef FANGLESS_RUNTIME_COLD_HPP
+#define FANGLESS_RUNTIME_COLD_HPP
+
+// Cold part of the runtime: code that runs once per print, error, sort,
+// table resize or slice view rather than once per element, and the helpers
+// generated code rarely calls. runtime.hpp includes it as inline
+// functions unless FANGLESS_RUNTIME_LIBRARY is defined; runtime.cpp
+// compiles it once into libfangless.a.
+
+#include "runtime.hpp"
+
+#include <algorithm>
+#include <iostream>
+#include <stdexcept>
+
+// Errors
+
+PY_COLD void py_raise(const std::string& message) {
+    throw std::runtime_error(message);
+}
+
+PY_COLD void py_raise(const char* message) {
+    throw std::runtime_error(message);
+}
+
+PY_COLD std::string PyValue::type_name() const {
+    switch (type) {
+        case NONE:   return "None";
+        case INT:    return "int";
+        case FLOAT:  return "float";
+        case BOOL:   return "bool";
+        case STRING: return "str";
+        case LIST:   return "list";
+        case DICT:   return "dict";
+        case TUPLE:  return "tuple";
+        case SET:    return "set";
+        default:     return "unknown";
+    }
+}
+
+PY_COLD void py_type_error(const char* before, const PyValue& v, const char* after) {
+    py_raise(before + v.type_name() + after);
+}
+
+PY_COLD void py_sequence_index_error(const PyValue& index, const char* kind) {
+    if (index.type != PyValue::INT) {
+        py_raise(std::string("TypeError: ") + kind + " indices must be integers");
+    }
+    py_raise(std::string("IndexError: ") + kind + " index out of range");
+}
+
+PY_COLD void py_key_error(const PyValue& key) {
+    py_raise("KeyError: key not found: " + key.to_string());
+}
+
+// Number formatting
+
+PY_COLD void py_format_float(double v, std::string& out) {
+    if (std::isnan(v)) {
+        out += "nan";
+        return;
+    }
+    if (std::isinf(v)) {
+        out += (v < 0) ? "-inf" : "inf";
+        return;
+    }
+
+    // Shortest digits as d.ddde[+-]x, laid out again below
+    char buf[32];
+    auto res = std::to_chars(buf, buf + sizeof(buf), v, std::chars_format::scientific);
+    const char* p = buf;
+    if (*p == '-') {
+        out.push_back('-');
+        ++p;
+    }
+    char digits[20];
+    int n_digits = 0;
+    for (; *p != 'e'; ++p) {
+        if (*p != '.') {
+            digits[n_digits++] = *p;
+        }
+    }
+    int exponent = 0;
+    std::from_chars(p[1] == '+' ? p + 2 : p + 1, res.ptr, exponent);
+
+    if (exponent >= 16 || exponent < -4) {
+        out.push_back(digits[0]);
+        if (n_digits > 1) {
+            out.push_back('.');
+            out.append(digits + 1, n_digits - 1);
+        }
+        out += (exponent < 0) ? "e-" : "e+";
+        int magnitude = exponent < 0 ? -exponent : exponent;
+        if (magnitude < 10) {
+            out.push_back('0');
+        }
+        py_format_int(magnitude, out);
+    } else if (exponent < 0) {
+        out += "0.";
+        out.append(static_cast<std::size_t>(-exponent - 1), '0');
+        out.append(digits, n_digits);
+    } else if (n_digits > exponent + 1) {
+        out.append(digits, exponent + 1);
+        out.push_back('.');
+        out.append(digits + exponent + 1, n_digits - exponent - 1);
+    } else {
+        out.append(digits, n_digits);
+        out.append(static_cast<std::size_t>(exponent + 1 - n_digits), '0');
+        out += ".0";
+    }
+}
+
+// Lists
+
+PY_COLD PyList::PyList(const PyItems& values) : storage(INTS), views(nullptr) {
+    if (!values.empty()) {
+        storage = storage_for(values[0]);
+    }
+    for (const auto& v : values) {
+        if (storage != GENERIC && storage_for(v) != storage) {
+            // Heterogeneous literal: keep every element boxed
+            storage = GENERIC;
+            ints.clear();
+            floats.clear();
+            items = values;
+            return;
+        }
+        if (storage == INTS) {
+            ints.push_back(v.int_value);
+        } else if (storage == FLOATS) {
+            floats.push_back(v.float_value);
+        }
+    }
+    if (storage == GENERIC) {
+        items = values;
+    }
+}
+
+PY_COLD PyList::PyList(const std::vector<PyValue>& values)
+    : PyList(PyItems(values.begin(), values.end())) {}
+
+PY_COLD PyList::PyList(std::vector<PyValue>&& values)
+    : PyList(PyItems(std::make_move_iterator(values.begin()),
+                     std::make_move_iterator(values.end()))) {}
+
+// Slicing: registering a view or copying a range allocates anyway, next to
+// which the call is nothing.
+PY_COLD void PyList::attach(const PyList& source, std::size_t start, std::size_t length) {
+    const PyList* base = &source;
+    if (source.storage == VIEW) {
+        // A slice of a view reads the same elements
+        start += source.view->start;
+        base = source.view->source;
+    }
+    PyList* source_list = const_cast<PyList*>(base);
+    if (source_list->views == nullptr) {
+        source_list->views = new PyVector<PyList*>();
+    }
+    view = new PyListView{ source_list, start, length, source_list->views->size() };
+    source_list->views->push_back(this);
+    storage = VIEW;
+}
+
+PY_COLD void PyList::copy_range(const PyList& source, std::size_t start, std::size_t length) {
+    storage = source.storage;
+    switch (storage) {
+        case INTS:
+            ints.assign(source.ints.begin() + start, source.ints.begin() + start + length);
+            break;
+        case FLOATS:
+            floats.assign(source.floats.begin() + start, source.floats.begin() + start + length);
+            break;
+        default:
+            items.assign(source.items.begin() + start, source.items.begin() + start + length);
+            break;
+    }
+}
+
+PY_COLD void PyList::leave_source() noexcept {
+    // The last view of the source takes this one's slot
+    PyList* source = view->source;
+    PyVector<PyList*>& siblings = *source->views;
+    PyList* last = siblings.back();
+    siblings[view->slot] = last;
+    last->view->slot = view->slot;
+    siblings.pop_back();
+    if (siblings.empty()) {
+        delete source->views;
+        source->views = nullptr;
+    }
+
+    delete view;
+    storage = INTS;
+    views = nullptr;
+}
+
+// The two ways out of sharing are kept out of line, off the path of every
+// set / push_back.
+__attribute__((noinline)) PY_COLD void PyList::materialize() {
+    const PyList& source = *view->source;
+    std::size_t start = view->start;
+    std::size_t length = view->length;
+    leave_source();
+    copy_range(source, start, length);
+}
+
+__attribute__((noinline)) PY_COLD void PyList::detach_views() {
+    for (PyList* v : *views) {
+        PyListView* range = v->view;
+        v->views = nullptr;
+        v->copy_range(*this, range->start, range->length);
+        delete range;
+    }
+    delete views;
+    views = nullptr;
+}
+
+PY_COLD void PyList::deoptimize() {
+    unshare();
+    if (storage == INTS) {
+        items.reserve(ints.size());
+        for (long long v : ints) {
+            items.push_back(PyValue(v));
+        }
+        ints.clear();
+        ints.shrink_to_fit();
+    } else if (storage == FLOATS) {
+        items.reserve(floats.size());
+        for (double v : floats) {
+            items.push_back(PyValue(v));
+        }
+        floats.clear();
+        floats.shrink_to_fit();
+    }
+    storage = GENERIC;
+}
+
+// Containers built from std::vector
+
+PY_COLD PyValue py_list(const std::vector<PyValue>& items) {
+    return PyValue(PyList(items));
+}
+
+// A temporary vector: its items are moved in.
+PY_COLD PyValue py_list(std::vector<PyValue>&& items) {
+    return PyValue(PyList(std::move(items)));
+}
+
+// A repeated key keeps the last value.
+PY_COLD PyValue py_dict(const std::vector<std::pair<PyValue, PyValue>>& items) {
+    PyDict dict;
+
+    for (const auto& kv : items) {
+        dict.set(kv.first, kv.second);
+    }
+
+    return PyValue(dict);
+}
+
+PY_COLD PyValue py_dict(std::vector<std::pair<PyValue, PyValue>>&& items) {
+    PyDict dict;
+
+    for (auto& kv : items) {
+        dict.set(kv.first, std::move(kv.second));
+    }
+
+    return PyValue(std::move(dict));
+}
+
+PY_COLD PyValue py_tuple(const std::vector<PyValue>& items) {
+    return PyValue(PyValue::TUPLE, new PyBox<PyTuple>(PyTuple(items.begin(), items.end())));
+}
+
+PY_COLD PyValue py_tuple(std::vector<PyValue>&& items) {
+    return PyValue(PyValue::TUPLE, new PyBox<PyTuple>(PyTuple(
+        std::make_move_iterator(items.begin()), std::make_move_iterator(items.end()))));
+}
+
+// List, dict and set methods
+
+PY_COLD PyValue py_list_sublist(const PyValue& list, const PyValue& start, const PyValue& end) {
+    if (list.type != PyValue::LIST) {
+        py_raise("TypeError: sublist() only valid on list");
+    }
+    if (start.type != PyValue::INT || end.type != PyValue::INT) {
+        py_raise("TypeError: sublist indices must be integers");
+    }
+
+    long long s = start.int_value;
+    long long e = end.int_value;
+    long long n = (long long)list.list_value().size();
+    if (s < 0) s = 0;
+    if (e > n) e = n;
+    if (e < s) e = s;
+
+    return PyValue(list.list_value().slice((std::size_t)s, (std::size_t)e));
+}
+
+PY_COLD PyValue py_container_remove(PyValue& container, const PyValue& key_or_index) {
+    if (container.type == PyValue::LIST) {
+        if (key_or_index.type != PyValue::INT) {
+            py_raise("TypeError: list remove() index must be int");
+        }
+        long long idx = key_or_index.int_value;
+        if (idx < 0 || idx >= (long long)container.list_value().size()) {
+            py_raise("IndexError: list index out of range in remove()");
+        }
+        container.list_value().erase((std::size_t)idx);
+        return PyValue();
+    }
+
+    if (container.type == PyValue::DICT) {
+        if (!container.dict_value().erase(key_or_index)) {
+            py_raise("KeyError: key not found in dict remove()");
+        }
+        return PyValue();
+    }
+
+    if (container.type == PyValue::SET) {
+        if (!container.set_value().erase(key_or_index)) {
+            py_raise("KeyError: value not found in set remove()");
+        }
+        return PyValue();
+    }
+
+    py_raise("TypeError: remove() only valid on list, dict or set");
+}
+
+// Hash tables
+
+// Drops the holes and sizes the slots for min_used entries at 1/3 load.
+template <typename Entry>
+void py_table_rebuild(PyVector<int>& slots, PyVector<Entry>& entries, std::size_t min_used) {
+    std::size_t kept = 0;
+    for (std::size_t i = 0; i < entries.size(); ++i) {
+        if (!entries[i].removed) {
+            if (kept != i) {
+                entries[kept] = std::move(entries[i]);
+            }
+            ++kept;
+        }
+    }
+    entries.resize(kept);
+
+    std::size_t size = 8;
+    while (size < min_used * 3) {
+        size *= 2;
+    }
+    slots.assign(size, PY_SLOT_EMPTY);
+    entries.reserve(size * 2 / 3);
+
+    std::size_t mask = size - 1;
+    for (std::size_t e = 0; e < entries.size(); ++e) {
+        std::size_t i = entries[e].hash & mask;
+        std::size_t perturb = entries[e].hash;
+        while (slots[i] != PY_SLOT_EMPTY) {
+            perturb >>= 5;
+            i = (i * 5 + perturb + 1) & mask;
+        }
+        slots[i] = static_cast<int>(e);
+    }
+}
+
+PY_COLD void PyDict::rebuild(std::size_t min_used) {
+    py_table_rebuild(slots, entries, min_used);
+}
+
+PY_COLD void PySet::rebuild(std::size_t min_used) {
+    py_table_rebuild(slots, entries, min_used);
+}
+
+// Formatting (needs complete containers)
+
+PY_COLD void PyValue::format_into(std::string& out) const {
+    switch (type) {
+        case NONE:
+            out += "None";
+            break;
+        case INT:
+            py_format_int(int_value, out);
+            break;
+        case FLOAT:
+            py_format_float(float_value, out);
+            break;
+        case BOOL:
+            out += bool_value ? "True" : "False";
+            break;
+        case STRING:
+            out += string_value();
+            break;
+        case LIST: {
+            // A view writes its range of the source's elements
+            const PyList* list = &list_value();
+            std::size_t start = 0;
+            std::size_t end = list->size();
+            if (list->storage == PyList::VIEW) {
+                start = list->view->start;
+                end = start + list->view->length;
+                list = list->view->source;
+            }
+            out.push_back('[');
+            // Unboxed lists are written without building a PyValue per element
+            if (list->storage == PyList::INTS) {
+                for (std::size_t i = start; i < end; ++i) {
+                    if (i > start) {
+                        out += ", ";
+                    }
+                    py_format_int(list->ints[i], out);
+                }
+            } else if (list->storage == PyList::FLOATS) {
+                for (std::size_t i = start; i < end; ++i) {
+                    if (i > start) {
+                        out += ", ";
+                    }
+                    py_format_float(list->floats[i], out);
+                }
+            } else {
+                for (std::size_t i = start; i < end; ++i) {
+                    if (i > start) {
+                        out += ", ";
+                    }
+                    list->items[i].format_into(out);
+                }
+            }
+            out.push_back(']');
+            break;
+        }
+        case DICT: {
+            out.push_back('{');
+            bool first = true;
+            for (const PyDict::Entry& entry : dict_value().entries) {
+                if (entry.removed) {
+                    continue;
+                }
+                if (!first) {
+                    out += ", ";
+                }
+                first = false;
+                entry.key.format_into(out);
+                out += ": ";
+                entry.value.format_into(out);
+            }
+            out.push_back('}');
+            break;
+        }
+        case TUPLE: {
+            out.push_back('(');
+            for (std::size_t i = 0; i < tuple_value().size(); ++i) {
+                if (i > 0) {
+                    out += ", ";
+                }
+                tuple_value()[i].format_into(out);
+            }
+            // Single element tuple, add trailing comma
+            if (tuple_value().size() == 1) {
+                out.push_back(',');
+            }
+            out.push_back(')');
+            break;
+        }
+        case SET: {
+            // {} is the empty dict
+            if (set_value().empty()) {
+                out += "set()";
+                break;
+            }
+            out.push_back('{');
+            bool first = true;
+            for (int ix : set_value().slots) {
+                if (ix < 0) {
+                    continue;
+                }
+                if (!first) {
+                    out += ", ";
+                }
+                first = false;
+                set_value().entries[static_cast<std::size_t>(ix)].key.format_into(out);
+            }
+            out.push_back('}');
+            break;
+        }
+    }
+}
+
+// Printing
+
+PY_COLD PyOutput::PyOutput() {
+    buffer.reserve(CAPACITY);
+    previous_terminate = std::set_terminate(on_terminate);
+}
+
+PY_COLD void PyOutput::flush() {
+    if (!buffer.empty()) {
+        std::cout.write(buffer.data(), static_cast<std::streamsize>(buffer.size()));
+        buffer.clear();
+    }
+    std::cout.flush();
+}
+
+PY_COLD void PyOutput::on_terminate() {
+    PyOutput& output = py_output();
+    output.flush();
+    if (output.previous_terminate) {
+        output.previous_terminate();
+    }
+    std::abort();
+}
+
+PY_COLD void py_print(std::initializer_list<PyPrintArg> args) {
+    PyOutput& output = py_output();
+    bool first = true;
+    for (const PyPrintArg& arg : args) {
+        if (!first) {
+            output.buffer.push_back(' ');
+        }
+        first = false;
+        arg.value->format_into(output.buffer);
+    }
+    output.end_line();
+}
+
+PY_COLD void py_print_many(const std::vector<PyValue>& args) {
+    PyOutput& output = py_output();
+    for (std::size_t i = 0; i < args.size(); ++i) {
+        if (i > 0) {
+            output.buffer.push_back(' ');
+        }
+        args[i].format_into(output.buffer);
+    }
+    output.end_line();
+}
+
+// Operator errors
+
+[[noreturn]] PY_COLD void py_operand_error(const char* op, const PyValue& a, const PyValue& b) {
+    py_raise(
+        std::string("TypeError: unsupported operand types for ") + op + ": '" +
+        a.type_name() + "' and '" + b.type_name() + "'"
+    );
+}
+
+[[noreturn]] PY_COLD void py_order_error(const char* op, const PyValue& a, const PyValue& b) {
+    py_raise(
+        std::string("TypeError: '") + op + "' not supported between instances of '" +
+        a.type_name() + "' and '" + b.type_name() + "'"
+    );
+}
+
+// Sets
+
+PY_COLD PyValue py_set_from_list(const PyValue& iterable) {
+    if (iterable.type != PyValue::LIST && iterable.type != PyValue::TUPLE) {
+        py_raise(
+            "TypeError: set() expects a list or tuple"
+        );
+    }
+
+    PySet set;
+    if (iterable.type == PyValue::LIST) {
+        set.reserve(iterable.list_value().size());
+        for (std::size_t i = 0; i < iterable.list_value().size(); ++i) {
+            set.add(iterable.list_value().get(i));
+        }
+    } else { // TUPLE
+        set.reserve(iterable.tuple_value().size());
+        for (const auto& item : iterable.tuple_value()) {
+            set.add(item);
+        }
+    }
+
+    return PyValue(set);
+}
+
+static void py_check_set(const PyValue& v, const char* method) {
+    if (v.type != PyValue::SET) {
+        py_raise(
+            "AttributeError: '" + v.type_name() + "' object has no attribute '" + method + "'"
+        );
+    }
+}
+
+// b as a set (lists and tuples are converted into tmp)
+static const PySet& py_set_operand(const PyValue& b, PyValue& tmp) {
+    if (b.type == PyValue::SET) {
+        return b.set_value();
+    }
+    if (b.type != PyValue::LIST && b.type != PyValue::TUPLE) {
+        py_raise(
+            "TypeError: '" + b.type_name() + "' object is not iterable"
+        );
+    }
+    tmp = py_set_from_list(b);
+    return tmp.set_value();
+}
+
+PY_COLD PyValue py_set_union(const PyValue& a, const PyValue& b) {
+    py_check_set(a, "union");
+    PyValue tmp;
+    const PySet& other = py_set_operand(b, tmp);
+
+    PySet result = a.set_value();
+    result.reserve(other.size());
+    for (const PySet::Entry& entry : other.entries) {
+        if (!entry.removed) {
+            result.add(entry.key, entry.hash);
+        }
+    }
+    return PyValue(result);
+}
+
+PY_COLD PyValue py_set_intersection(const PyValue& a, const PyValue& b) {
+    py_check_set(a, "intersection");
+    PyValue tmp;
+    const PySet& other = py_set_operand(b, tmp);
+
+    // Walk the smaller set, probe the larger one
+    const PySet& small = (a.set_value().size() <= other.size()) ? a.set_value() : other;
+    const PySet& large = (&small == &other) ? a.set_value() : other;
+    PySet result;
+    for (const PySet::Entry& entry : small.entries) {
+        if (!entry.removed && large.contains(entry.key, entry.hash)) {
+            result.add(entry.key, entry.hash);
+        }
+    }
+    return PyValue(result);
+}
+
+PY_COLD PyValue py_set_difference(const PyValue& a, const PyValue& b) {
+    py_check_set(a, "difference");
+    PyValue tmp;
+    const PySet& other = py_set_operand(b, tmp);
+
+    PySet result;
+    result.reserve(a.set_value().size());
+    for (const PySet::Entry& entry : a.set_value().entries) {
+        if (!entry.removed && !other.contains(entry.key, entry.hash)) {
+            result.add(entry.key, entry.hash);
+        }
+    }
+    return PyValue(result);
+}
+
+// Sorting
+
+PY_COLD bool py_sort_less(const PyValue& a, const PyValue& b) {
+    if (a.type == PyValue::INT && b.type == PyValue::INT) {
+        return a.int_value < b.int_value;
+    }
+    if (py_is_number(a) && py_is_number(b)) {
+        return py_number_value(a) < py_number_value(b);
+    }
+    if (a.type == PyValue::STRING && b.type == PyValue::STRING) {
+        return a.string_value() < b.string_value();
+    }
+    if (a.type == b.type && (a.type == PyValue::LIST || a.type == PyValue::TUPLE)) {
+        bool is_list = a.type == PyValue::LIST;
+        std::size_t na = is_list ? a.list_value().size() : a.tuple_value().size();
+        std::size_t nb = is_list ? b.list_value().size() : b.tuple_value().size();
+        for (std::size_t i = 0; i < na && i < nb; ++i) {
+            PyValue x = is_list ? a.list_value().get(i) : a.tuple_value()[i];
+            PyValue y = is_list ? b.list_value().get(i) : b.tuple_value()[i];
+            if (py_sort_less(x, y)) {
+                return true;
+            }
+            if (py_sort_less(y, x)) {
+                return false;
+            }
+        }
+        return na < nb;
+    }
+    py_raise(
+        "TypeError: '<' not supported between instances of '" +
+        a.type_name() + "' and '" + b.type_name() + "'"
+    );
+}
+
+PY_COLD void py_sort_list(PyList& list) {
+    list.unshare();
+    if (list.storage == PyList::INTS) {
+        std::sort(list.ints.begin(), list.ints.end());
+        return;
+    }
+    if (list.storage == PyList::FLOATS) {
+        std::sort(list.floats.begin(), list.floats.end());
+        return;
+    }
+
+    PyItems& items = list.items;
+    if (items.size() < 2) {
+        return;
+    }
+    PyValue::Type first = items[0].type;
+    bool same_type = std::all_of(items.begin(), items.end(),
+                                 [first](const PyValue& v) { return v.type == first; });
+
+    if (same_type && first == PyValue::INT) {
+        std::sort(items.begin(), items.end(), [](const PyValue& a, const PyValue& b) {
+            return a.int_value < b.int_value;
+        });
+    } else if (same_type && first == PyValue::FLOAT) {
+        std::sort(items.begin(), items.end(), [](const PyValue& a, const PyValue& b) {
+            return a.float_value < b.float_value;
+        });
+    } else if (same_type && first == PyValue::STRING) {
+        std::sort(items.begin(), items.end(), [](const PyValue& a, const PyValue& b) {
+            return a.string_value() < b.string_value();
+        });
+    } else {
+        // Mixed values (1 and 1.0 compare equal): keep Python's stable order
+        std::stable_sort(items.begin(), items.end(), py_sort_less);
+    }
+}
+
+PY_COLD PyValue py_sorted(const PyValue& iterable) {
+    PyList result;
+    switch (iterable.type) {
+        case PyValue::LIST:
+            result = iterable.list_value();
+            break;
+        case PyValue::TUPLE:
+            result = PyList(iterable.tuple_value());
+            break;
+        case PyValue::STRING:
+            for (std::size_t i = 0; i < iterable.string_value().size(); ++i) {
+                result.push_back(PyValue(iterable.string_value().substr(i, 1)));
+            }
+            break;
+        case PyValue::DICT:
+            for (const PyDict::Entry& entry : iterable.dict_value().entries) {
+                if (!entry.removed) {
+                    result.push_back(entry.key);
+                }
+            }
+            break;
+        case PyValue::SET:
+            for (int ix : iterable.set_value().slots) {
+                if (ix >= 0) {
+                    result.push_back(iterable.set_value().entries[static_cast<std::size_t>(ix)].key);
+                }
+            }
+            break;
+        default:
+            py_type_error("TypeError: '", iterable, "' object is not iterable");
+    }
+    py_sort_list(result);
+    return PyValue(std::move(result));
+}
+
+// Allocation and profile reports, printed at exit
+
+#ifdef FANGLESS_ALLOC_STATS
+PY_COLD void PyAllocStats::report() const {
+    std::fprintf(stderr, "\n=== ALLOCATIONS ===\n");
+    std::fprintf(stderr, "%-8s %14s %14s %14s %14s\n", "type", "constructed", "copied", "moved", "boxes");
+    for (int t = 0; t < TYPES; ++t) {
+        if (constructed[t] + copied[t] + moved[t] + boxes[t] != 0) {
+            std::fprintf(stderr, "%-8s %14llu %14llu %14llu %14llu\n", TYPE_NAMES[t],
+                         constructed[t], copied[t], moved[t], boxes[t]);
+        }
+    }
+    std::fprintf(stderr, "%-22s %14s %14s\n", "buffer", "allocations", "bytes");
+    for (int b = 0; b < BUFFERS; ++b) {
+        if (buffers[b] != 0) {
+            std::fprintf(stderr, "%-22s %14llu %14llu\n", BUFFER_NAMES[b], buffers[b], buffer_bytes[b]);
+        }
+    }
+    std::fprintf(stderr, "pool: %llu allocations, %llu bytes, peak %lld bytes live\n",
+                 pool_allocations, pool_bytes, peak_bytes);
+
+    if (copy_sites.empty()) {
+        return;
+    }
+    // Merged per "file:line" (without the directory), most copies first
+    std::map<std::string, unsigned long long> merged;
+    for (const auto& [site, count] : copy_sites) {
+        const char* slash = std::strrchr(site.first, '/');
+        merged[std::string(slash != nullptr ? slash + 1 : site.first) + ":" + std::to_string(site.second)] += count;
+    }
+    std::vector<std::pair<unsigned long long, std::string>> sites;
+    for (const auto& [site, count] : merged) {
+        sites.emplace_back(count, site);
+    }
+    std::sort(sites.begin(), sites.end(), [](const auto& a, const auto& b) { return a.first > b.first; });
+    std::fprintf(stderr, "copies by site:\n");
+    for (std::size_t i = 0; i < sites.size() && i < 20; ++i) {
+        std::fprintf(stderr, "  %-40s %14llu\n", sites[i].second.c_str(), sites[i].first);
+    }
+}
+#endif
+
+#ifdef FANGLESS_PROFILE
+PY_COLD void PyProfiler::dump() const {
+    const char* prefix = std::getenv("FANGLESS_PROFILE_OUT");
+    std::string base = prefix ? prefix : "fangless_profile";
+
+    // Folded stacks: "main;for i #1;fibonacci 1234"
+    std::FILE* folded = std::fopen((base + ".folded").c_str(), "w");
+    // Per site totals, in order of first appearance
+    struct Site {
+        const char* name;
+        bool loop;
+        unsigned long long entries, iterations;
+        long long inclusive_ns, exclusive_ns;
+    };
+    std::vector<Site> sites;
+    for (std::size_t i = 1; i < nodes.size(); ++i) {
+        const Node& node = nodes[i];
+        long long exclusive = exclusive_ns(node);
+        if (folded && exclusive >= 1000) {
+            std::string path;
+            for (int n = static_cast<int>(i); n > 0; n = nodes[n].parent) {
+                path.insert(0, path.empty() ? nodes[n].site : std::string(nodes[n].site) + ";");
+            }
+            std::fprintf(folded, "%s %lld\n", path.c_str(), exclusive / 1000);
+        }
+        Site* site = nullptr;
+        for (Site& s : sites) {
+            if (s.name == node.site) {
+                site = &s;
+                break;
+            }
+        }
+        if (!site) {
+            sites.push_back(Site{ node.site, node.loop, 0, 0, 0, 0 });
+            site = &sites.back();
+        }
+        site->entries += node.entries;
+        site->iterations += node.iterations;
+        site->exclusive_ns += exclusive;
+        if (!nested(node)) {
+            site->inclusive_ns += node.inclusive_ns;
+        }
+    }
+    if (folded) {
+        std::fclose(folded);
+    }
+
+    std::sort(sites.begin(), sites.end(), [](const Site& a, const Site& b) {
+        return a.exclusive_ns > b.exclusive_ns;
+    });
+    std::FILE* json = std::fopen((base + ".json").c_str(), "w");
+    if (!json) {
+        return;
+    }
+    std::fprintf(json, "{\n  \"scopes\": [");
+    for (std::size_t i = 0; i < sites.size(); ++i) {
+        const Site& s = sites[i];
+        std::fprintf(json, "%s\n    {\"name\": \"%s\", \"kind\": \"%s\", \"%s\": %llu, ",
+                     i ? "," : "", s.name, s.loop ? "loop" : "function",
+                     s.loop ? "entries" : "calls", s.entries);
+        if (s.loop) {
+            std::fprintf(json, "\"iterations\": %llu, ", s.iterations);
+        }
+        std::fprintf(json, "\"inclusive_ms\": %.3f, \"exclusive_ms\": %.3f}",
+                     s.inclusive_ns / 1e6, s.exclusive_ns / 1e6);
+    }
+    std::fprintf(json, "\n  ]\n}\n");
+    std::fclose(json);
+    std::fprintf(stderr, "profile written to %s.json and %s.folded\n", base.c_str(), base.c_str());
+}
+#endif
+
+#endif
@@ -1,5 +1,6 @@
 // c++/test_runtime.cpp
 #include "runtime.hpp"
+#include <iostream>
 
 int main() {
     // ----- cambio de tipo en la misma variable -----
@@ -22,17 +23,106 @@ int main() {
     PyValue vlist(lst);
     py_print(vlist);            // [1, mundo, True]
 
+    // ----- listas homogéneas (almacenamiento sin boxing) -----
+    PyValue nums = py_list(std::vector<PyValue>{ PyValue(1), PyValue(2) });
+    py_list_append(nums, PyValue(3));
+    py_print(PyValue(nums.list_value().storage == PyList::INTS));   // True
+    py_setitem(nums, PyValue(0), PyValue(0.5));                     // pasa a genérica
+    py_print(PyValue(nums.list_value().storage == PyList::GENERIC));  // True
+    py_print(nums);             // [0.5, 2, 3]
+
+    // ----- ordenamiento -----
+    py_list_sort(nums);
+    py_print(nums);             // [0.5, 2, 3]
+    py_print(py_sorted(py_list(std::vector<PyValue>{ PyValue("b"), PyValue("a") })));  // [a, b]
+
+    // ----- diccionarios (claves PyValue, orden de inserción) -----
+    PyValue dic = py_dict(std::vector<std::pair<PyValue, PyValue>>{
+        { PyValue(2), PyValue("b") }, { PyValue("2"), PyValue("s") }
+    });
+    py_setitem(dic, PyValue(2.0), PyValue("float"));   // misma clave que 2
+    py_container_remove(dic, PyValue("2"));
+    py_setitem(dic, PyValue(true), PyValue("uno"));
+    py_print(dic);              // {2: float, True: uno}
+    py_print(py_getitem(dic, PyValue(1)));              // uno
+
+    // ----- lectura sin copia (referencia al elemento) -----
+    PyValue filas = py_list(PyItems{ py_list(PyItems{ PyValue(1), PyValue(2) }), PyValue("x") });
+    py_print(&py_getitem_ref(filas, PyValue(0)) == &filas.list_value().items[0]);  // True
+    py_print(py_getitem_ref(py_getitem_ref(filas, PyValue(0)), PyValue(1)));      // 2
+
+    // ----- rebanadas: vistas que se copian al cambiar -----
+    PyItems cuarenta;
+    for (long long i = 0; i < 40; ++i) {
+        cuarenta.push_back(PyValue(i));
+    }
+    PyValue base = py_list(std::move(cuarenta));
+    PyValue vista = py_getslice(base, PyValue(20), PyValue());
+    py_print({PyValue(vista.list_value().storage == PyList::VIEW), py_len(vista)});   // True 20
+    py_setitem(base, PyValue(20), PyValue("x"));
+    py_print({PyValue(vista.list_value().storage == PyList::VIEW), py_getitem(vista, PyValue(0))});  // False 20
+    py_print(py_getslice(PyValue("compilador"), PyValue(-4), PyValue()));  // ador
+
+    // ----- conjuntos -----
+    PyValue s1 = py_set_from_list(py_list(std::vector<PyValue>{ PyValue(3), PyValue(1), PyValue(2), PyValue(1.0) }));
+    PyValue s2 = py_set_from_list(py_tuple(std::vector<PyValue>{ PyValue(2), PyValue(3), PyValue(4) }));
+    py_print(s1);                                   // {1, 2, 3}
+    py_print(py_set_union(s1, s2));                 // {1, 2, 3, 4}
+    py_print(py_set_intersection(s1, s2));          // {2, 3}
+    py_print(py_set_difference(s1, s1));            // set()
+
+    // ----- temporales consumidos (std::move) -----
+    PyValue texto = PyValue(std::string("una cadena larga, "));
+    PyValue alias = texto;
+    texto = py_add(std::move(texto), PyValue("extendida"));   // alias comparte la caja: copia
+    py_print(alias);            // una cadena larga,
+    texto = py_add(std::move(texto), PyValue("!"));           // única dueña: se extiende en sitio
+    py_print(texto);            // una cadena larga, extendida!
+    PyValue desordenada = py_list(std::vector<PyValue>{ PyValue(3), PyValue(1), PyValue(2) });
+    PyValue copia = desordenada;
+    py_print({py_sorted(std::move(desordenada)), copia});   // [1, 2, 3] [3, 1, 2]
+
+    // ----- pool de memoria -----
+    void* bloque = py_pool.allocate(48);
+    py_pool.deallocate(bloque, 48);
+    py_print(PyValue(py_pool.allocate(40) == bloque));   // True (misma clase de tamaño)
+    PyValue tupla = py_tuple(PyItems{ PyValue(1), PyValue("a") });
+    py_print(tupla);            // (1, a)
+
     // ----- comparación y truthiness -----
     PyValue cond = py_lt(PyValue(3), PyValue(10));  // 3 < 10
     if (cond.bool_value) {      // cond es un PyValue BOOL
         py_print(std::string("3 is less than 10"));
     }
+    PyValue grande = PyValue(9007199254740993LL);                  // 2**53 + 1
+    py_print(py_gt(grande, PyValue(9007199254740992LL)));          // True (exacto)
+    py_print(py_eq(grande, PyValue(9007199254740992.0)));          // False
+    py_print(py_lt(PyValue("abc"), PyValue("abd")));               // True
+    py_print({py_eq(PyValue(1), PyValue(true)), py_lt(PyValue(false), PyValue(0.5))});  // True True
+
+    // ----- potencia y división entera -----
+    py_print(py_pow(PyValue(2), PyValue(10)));          // 1024
+    py_print(py_pow(PyValue(2), PyValue(-1)));          // 0.5
+    py_print(py_floordiv(PyValue(-7), PyValue(2)));     // -4
+    py_print(py_floordiv(PyValue(7.5), PyValue(2)));    // 3.0
+    py_print(py_floordiv(PyValue(1.0), PyValue(0.1)));  // 9.0
+
+    // ----- versiones nativas (funciones especializadas) -----
+    py_print(PyValue(py_floordiv(-7LL, 2LL)));         // -4
+    py_print(PyValue(py_mod(7LL, 3LL)));               // 1
+    py_print(PyValue(py_div(7.0, 2.0)));               // 3.5
+    py_print(PyValue(py_floordiv(7.0, 0.1)));          // 69.0
+
+    // ----- salida con buffer -----
+    py_print({PyValue(1), PyValue("dos"), PyValue(3.5)});  // 1 dos 3.5
+    py_print();                                          // (línea vacía)
 
     // ----- operación que debería fallar (int + str) -----
     try {
         PyValue bad = py_add(PyValue(1), PyValue(std::string("x")));
         py_print(bad);
     } catch (const std::exception &ex) {
+        py_flush();             // lo impreso antes de escribir directo en std::cout
         std::cout << "Caught error: " << ex.what() << std::endl;
     }
 
@@ -1,24 +1,162 @@
+import argparse
 import os
+import subprocess
+import sys
+import time
+import tracemalloc
 from pprint import pformat
 
+from src.Lexer import Lexer
 from src.Parser import Parser
+from src.build import DEFAULT_PROFILE, PROFILES, BinaryCache, CompileError
+from src.bytecode import BytecodeCompiler, BytecodeError, format_program
 from src.cpp_transpiler import CppTranspiler
+from src.ir_builder import IRBuilder
+from src.ir_cpp_backend import IRCppBackend
+from src.ir_passes import PASSES, PassManager
+from src.pass_timer import PassTimer
+from src.vm import VM, VMError
+from src.workload import VM_BUDGET, estimate_steps
 
 # Input Fangless Python source file
 FILE = "./performance_eval/minus.py"
 
+# Runtime build of --alloc-stats
+ALLOC_STATS_FLAGS = {
+    "types": ["-DFANGLESS_ALLOC_STATS"],
+    "sites": ["-DFANGLESS_ALLOC_SITES"],
+}
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description="Fangless Python to C++ transpiler")
+    arg_parser.add_argument("file", nargs="?", default=FILE, help="Fangless Python source file")
+    arg_parser.add_argument(
+        "--ir", action="store_true",
+        help="generate C++ through the SSA IR and its optimization passes",
+    )
+    arg_parser.add_argument(
+        "--dump-ir", action="store_true",
+        help="print the IR after it is built and after every pass (implies --ir)",
+    )
+    arg_parser.add_argument(
+        "--disable-pass", action="append", default=[], metavar="NAME", choices=sorted(PASSES),
+        help="skip an IR pass (can be repeated)",
+    )
+    arg_parser.add_argument(
+        "--no-specialize", action="store_true",
+        help="do not clone functions per argument types (AST transpiler only)",
+    )
+    arg_parser.add_argument(
+        "--instrument", action="store_true",
+        help="count and time every function and loop, written to fangless_profile.json / .folded "
+             "at exit (AST transpiler only)",
+    )
+    arg_parser.add_argument(
+        "--time-passes", action="store_true",
+        help="report the time and Python memory peak of each front-end phase",
+    )
+    arg_parser.add_argument(
+        "--time-passes-json", metavar="PATH",
+        help="also write that report as JSON (implies --time-passes)",
+    )
+    arg_parser.add_argument(
+        "--compile", action="store_true",
+        help="compile the generated C++ (binaries are cached by content)",
+    )
+    arg_parser.add_argument(
+        "--run", action="store_true",
+        help="compile the generated C++ and run the program (implies --compile)",
+    )
+    arg_parser.add_argument(
+        "--profile", default=DEFAULT_PROFILE, choices=list(PROFILES),
+        help=f"optimization flags for --compile / --run (default: {DEFAULT_PROFILE})",
+    )
+    arg_parser.add_argument(
+        "--pgo", action="store_true",
+        help="profile-guided optimization: build instrumented, run once, rebuild with the profile",
+    )
+    arg_parser.add_argument(
+        "--alloc-stats", nargs="?", const="types", choices=["types", "sites"],
+        help="count PyValue constructions, copies, moves and allocations, printed at exit; "
+             "'sites' also counts copies per source line (--compile / --run)",
+    )
+    arg_parser.add_argument(
+        "--engine", default="native", choices=["native", "vm", "auto"],
+        help="how --run runs the program: the compiled C++, the bytecode VM (no C++ is "
+             "generated), or the VM unless the program looks too long for it; "
+             "vm and auto imply --run (default: native)",
+    )
+    arg_parser.add_argument(
+        "--dump-bytecode", action="store_true",
+        help="print the bytecode the VM runs",
+    )
+    arg_parser.add_argument(
+        "--no-cache", action="store_true",
+        help="always run g++, even when the binary is cached",
+    )
+    arg_parser.add_argument(
+        "--cache-dir", metavar="DIR",
+        help="where compiled binaries are cached (default: $FANGLESS_CACHE or ~/.cache/fangless)",
+    )
+    return arg_parser.parse_args()
+
+
+# VM or native build for --engine auto, decided before any C++ is
+# generated. Native when a flag only the native build honours is given, or
+# when the program is estimated to run more statements than the VM gets
+# through in the time of a g++ build:
+def choose_engine(args, ast):
+    if args.compile or args.pgo or args.alloc_stats or args.instrument or args.dump_ir:
+        return "native", "native build requested"
+    steps = estimate_steps(ast)
+    if steps > VM_BUDGET:
+        return "native", f"~{steps} statements"
+    return "vm", f"~{steps} statements"
+
+
+# Seconds spent in each stage of the build, in order:
+def stage_report(timings) -> str:
+    lines = ["=== STAGES ==="]
+    for name, seconds in timings:
+        lines.append(f"{name:<22} {seconds * 1000:10.3f} ms")
+    return "\n".join(lines)
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    FILE = args.file
+    time_passes = args.time_passes or args.time_passes_json is not None
+    timer = PassTimer()
+    if time_passes:
+        # Memory peaks per phase; tracing also makes every phase slower
+        tracemalloc.start()
+
     # Build parser (and its lexer)
     parser = Parser(debug=False)
-    parser.build(build_lexer=True)
+    with timer.phase("build parser"):
+        parser.build(build_lexer=True)
 
     # Read source file
     with open(FILE, "r", encoding="utf-8") as f:
         data = f.read()
 
+    if time_passes:
+        # The parser pulls its tokens on demand, so lexing alone is timed
+        # on a separate pass over the input (and counted again in "parse")
+        lexer = Lexer([])
+        lexer.build()
+        lexer.input(data)
+        with timer.phase("lex"):
+            while lexer.token() is not None:
+                pass
+
     # Parse to AST
-    ast = parser.parse(data)
+    timings = []
+    start = time.perf_counter()
+    with timer.phase("parse"):
+        ast = parser.parse(data)
+    timings.append(("parse", time.perf_counter() - start))
 
     # Report parser errors (if any) and stop before code generation
     print("\n=== ERRORS ===")
@@ -30,27 +168,115 @@ if __name__ == "__main__":
         # Do not attempt to transpile if the program has syntax errors
         raise SystemExit("Aborting: parser reported errors.")
 
-    # Print AST to console
-    print("=== AST ===")
-    print(ast)
+    with timer.phase("write AST"):
+        # Print AST to console
+        print("=== AST ===")
+        print(ast)
 
-    # Save AST to a .txt file next to the input
-    ast_out_path = os.path.splitext(FILE)[0] + ".ast.txt"
-    with open(ast_out_path, "w", encoding="utf-8") as outf:
-        outf.write(pformat(ast, width=1000))
-        outf.write("\n")
+        # Save AST to a .txt file next to the input
+        ast_out_path = os.path.splitext(FILE)[0] + ".ast.txt"
+        with open(ast_out_path, "w", encoding="utf-8") as outf:
+            outf.write(pformat(ast, width=1000))
+            outf.write("\n")
 
     print(f"\nAST saved to: {ast_out_path}")
 
-    # Transpile AST to C++ using the simple CppTranspiler
-    transpiler = CppTranspiler()
-    cpp_code = transpiler.transpile(ast)
+    engine = args.engine
+    if engine == "auto":
+        engine, reason = choose_engine(args, ast)
+        print(f"Engine: {engine} ({reason})")
+
+    if engine == "native":
+        start = time.perf_counter()
+        with timer.phase("transpile"):
+            if args.ir or args.dump_ir:
+                # Lower to SSA IR, run the passes and generate C++ from the result
+                with timer.phase("build IR"):
+                    module = IRBuilder().build(ast)
+                pass_manager = PassManager(
+                    disabled=args.disable_pass,
+                    dump=print if args.dump_ir else None,
+                )
+                with timer.phase("IR passes"):
+                    pass_manager.run(module)
+                print(pass_manager.report())
+                with timer.phase("emit C++"):
+                    cpp_code = IRCppBackend().generate(module)
+            else:
+                # Transpile AST to C++ using the simple CppTranspiler
+                transpiler = CppTranspiler(specialize=not args.no_specialize, instrument=args.instrument,
+                                           timer=timer)
+                cpp_code = transpiler.transpile(ast)
+                print(transpiler.specializer.report())
+        timings.append(("transpile", time.perf_counter() - start))
+
+        # Save generated C++ file next to the input, changing extension to .cpp
+        cpp_out_path = os.path.splitext(FILE)[0] + ".cpp"
+        with timer.phase("write C++"):
+            with open(cpp_out_path, "w", encoding="utf-8") as cppf:
+                cppf.write(cpp_code)
+
+        print(f"C++ code saved to: {cpp_out_path}")
+    if time_passes:
+        tracemalloc.stop()
+        print(timer.report())
+        if args.time_passes_json:
+            with open(args.time_passes_json, "w", encoding="utf-8") as f:
+                f.write(timer.to_json(file=FILE, source_lines=data.count("\n") + 1,
+                                      python=sys.version.split()[0]))
+            print(f"Pass report saved to: {args.time_passes_json}")
+    returncode = 0
+    if engine == "vm" or args.dump_bytecode:
+        start = time.perf_counter()
+        try:
+            bytecode = BytecodeCompiler().compile(ast)
+        except (BytecodeError, NotImplementedError) as e:
+            raise SystemExit(f"Aborting: {e}")
+        timings.append(("bytecode", time.perf_counter() - start))
+        if args.dump_bytecode:
+            print("\n=== BYTECODE ===")
+            print(format_program(bytecode))
+    if engine == "vm":
+        # Run on the VM: no C++ and no g++ at all
+        print("\n=== OUTPUT ===", flush=True)
+        start = time.perf_counter()
+        try:
+            VM(bytecode).run()
+        except VMError as e:
+            print(e, file=sys.stderr)
+            returncode = 1
+        timings.append(("run (vm)", time.perf_counter() - start))
+        print()
+    elif args.compile or args.run or args.engine == "auto":
+        # Compile (or take the binary from the cache) and run it
+        cache = BinaryCache(args.cache_dir, enabled=not args.no_cache)
+        start = time.perf_counter()
+        try:
+            exe_path, cached = cache.compile(cpp_code, args.profile, ALLOC_STATS_FLAGS.get(args.alloc_stats),
+                                             pgo=args.pgo, source_name=cpp_out_path)
+        except CompileError as e:
+            print(e, file=sys.stderr)
+            raise SystemExit("Aborting: g++ reported errors.")
+        if cached:
+            timings.append(("compile (cached)", time.perf_counter() - start))
+        else:
+            timings.extend(cache.stages)
+        build = args.profile + (" + pgo" if args.pgo else "")
+        print(f"Binary ({build}{', cached' if cached else ''}): {exe_path}")
 
-    # Save generated C++ file next to the input, changing extension to .cpp
-    cpp_out_path = os.path.splitext(FILE)[0] + ".cpp"
-    with open(cpp_out_path, "w", encoding="utf-8") as cppf:
-        cppf.write(cpp_code)
+        if args.run or args.engine == "auto":
+            print("\n=== OUTPUT ===", flush=True)
+            start = time.perf_counter()
+            returncode = subprocess.run([exe_path]).returncode
+            timings.append(("run", time.perf_counter() - start))
+            print()
+    else:
+        print("You can compile it with something like:")
+        print(f"  g++ -std=c++17 {cpp_out_path} -o program")
+        print("or, with the runtime prebuilt by `make -C c++`:")
+        print(f"  g++ -std=c++17 -O3 -DFANGLESS_RUNTIME_LIBRARY {cpp_out_path} c++/libfangless.a -o program")
+        print("or let main.py do it: --compile / --run, or run it without g++: --engine vm")
 
-    print(f"C++ code saved to: {cpp_out_path}")
-    print("You can compile it with something like:")
-    print(f"  g++ -std=c++17 {cpp_out_path} -o program")
+    print(stage_report(timings))
+    if returncode != 0:
+        raise SystemExit(f"Program exited with status {returncode}.")
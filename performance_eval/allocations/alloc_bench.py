@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Times allocations.py transpiled and compiled with the runtime's memory pool,
+# with every allocation going to operator new (-DFANGLESS_SYSTEM_ALLOC), and
+# the hand-made C++ version.
+
+if __name__ == "__main__":
+    generated = CppTranspiler().transpile(make_parser().parse(read_benchmark("allocations", ".py")))
+    cache = BinaryCache()
+    for variant, cpp_code, flags in (
+        ("memory pool", generated, []),
+        ("operator new", generated, ["-DFANGLESS_SYSTEM_ALLOC"]),
+        ("hand-made", read_benchmark("allocations", "_hm.cpp"), []),
+    ):
+        print(f"{variant:<13} {best_run(compile_cpp(cache, cpp_code, flags)):8.3f} s")
@@ -0,0 +1,77 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue("id");
+static const PyValue __const1 = PyValue("row");
+static const PyValue __const2 = PyValue("point");
+static const PyValue __const3 = PyValue(100);
+
+PyValue point(const PyValue& x, const PyValue& y);
+PyValue point__int_int(long long x, long long y);
+PyValue neighbours(const PyValue& i);
+PyValue neighbours__int(long long i);
+
+PyValue point(const PyValue& x, const PyValue& y) {
+    return py_tuple(PyItems{ x, y });
+    return PyValue();
+}
+
+PyValue point__int_int(long long x, long long y) {
+    return py_tuple(PyItems{ PyValue(x), PyValue(y) });
+    return PyValue();
+}
+
+PyValue neighbours(const PyValue& i) {
+    return py_list(PyItems{ py_sub(i, PY_ONE), i, py_add(i, PY_ONE) });
+    return PyValue();
+}
+
+PyValue neighbours__int(long long i) {
+    return py_list(PyItems{ PyValue((i - 1LL)), PyValue(i), PyValue((i + 1LL)) });
+    return PyValue();
+}
+
+int main() {
+    PyValue batch;
+    long long batches = 0;
+    long long i = 0;
+    PyValue p;
+    PyValue record;
+    PyValue row;
+    PyValue total;
+    total = PY_ZERO;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 1000000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            p = point__int_int(i, i * 2LL);
+            row = neighbours__int(i);
+            record = py_dict(PyPairs{ py_pair(__const0, PyValue(i)), py_pair(__const1, row), py_pair(__const2, p) });
+            total = py_add(py_add(py_add(std::move(total), py_getitem_ref(p, PY_ONE)), py_getitem_ref(row, PY_TWO)), py_len(record));
+        }
+    }
+    py_print(total);
+    batch = py_list(PyItems{});
+    batches = 0LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 500000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_list_append(batch, py_list(PyItems{ PyValue(i), py_str(PyValue(i)) }));
+            if (py_eq(py_len(batch), __const3).is_truthy()) {
+                batch = py_list(PyItems{});
+                batches = batches + 1LL;
+            }
+        }
+    }
+    py_print({PyValue(batches), py_len(batch)});
+    return 0;
+}
\ No newline at end of file
@@ -0,0 +1,26 @@
+# Short-lived containers in hot loops: every iteration builds a tuple, a
+# list and a dict literal that die with it, and the helpers return a fresh
+# container per call.
+def point(x, y):
+    return (x, y)
+
+def neighbours(i):
+    return [i - 1, i, i + 1]
+
+total = 0
+for i in range(1000000):
+    p = point(i, i * 2)
+    row = neighbours(i)
+    record = {"id": i, "row": row, "point": p}
+    total = total + p[1] + row[2] + len(record)
+print(total)
+
+# Batches of small lists, dropped every 100 items
+batch = []
+batches = 0
+for i in range(500000):
+    batch.append([i, str(i)])
+    if len(batch) == 100:
+        batch = []
+        batches = batches + 1
+print(batches, len(batch))
@@ -0,0 +1,38 @@
+#include <iostream>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+using namespace std;
+
+pair<long long, long long> point(long long x, long long y) {
+    return {x, y};
+}
+
+vector<long long> neighbours(long long i) {
+    return {i - 1, i, i + 1};
+}
+
+int main() {
+    long long total = 0;
+    for (long long i = 0; i < 1000000; i++) {
+        pair<long long, long long> p = point(i, i * 2);
+        vector<long long> row = neighbours(i);
+        unordered_map<string, long long> record = {{"id", i}, {"row", 0}, {"point", 0}};
+        total = total + p.second + row[2] + (long long)record.size();
+    }
+    cout << total << "\n";
+
+    vector<pair<long long, string>> batch;
+    long long batches = 0;
+    for (long long i = 0; i < 500000; i++) {
+        batch.push_back({i, to_string(i)});
+        if (batch.size() == 100) {
+            batch = {};
+            batches = batches + 1;
+        }
+    }
+    cout << batches << " " << batch.size() << "\n";
+    return 0;
+}
@@ -0,0 +1,62 @@
+import glob
+import os
+import subprocess
+import sys
+import time
+
+# Make the project root importable when running this script directly
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from src.Parser import Parser
+from src.build import BinaryCache
+
+# Helpers shared by harness.py and the bench scripts of performance_eval/.
+# Programs are compiled through a BinaryCache, so a variant whose code and
+# flags did not change since the last run is not rebuilt, and timed as the
+# best wall time of a few runs.
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPEAT = 3
+
+
+# Names of the benchmark directories (<name>/ holding <name>.py), all of
+# them or the ones asked for:
+def find_benchmarks(names: list = ()) -> list:
+    found = []
+    for path in sorted(glob.glob(os.path.join(HERE, "*", "*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if os.path.basename(os.path.dirname(path)) == name and (not names or name in names):
+            found.append(name)
+    missing = set(names) - set(found)
+    if missing:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(sorted(missing))}")
+    return found
+
+
+def make_parser() -> Parser:
+    parser = Parser(debug=False)
+    parser.build(build_lexer=True)
+    return parser
+
+
+# Contents of <name>/<name><suffix>, e.g. ".py" or "_hm.cpp":
+def read_benchmark(name: str, suffix: str) -> str:
+    with open(os.path.join(HERE, name, name + suffix), encoding="utf-8") as f:
+        return f.read()
+
+
+# Path of the binary built from cpp_code with the default profile plus flags:
+def compile_cpp(cache: BinaryCache, cpp_code: str, flags: list = ()) -> str:
+    return cache.compile(cpp_code, extra_flags=list(flags))[0]
+
+
+# Best wall time over repeat runs, with the output discarded or written to
+# out_path:
+def best_run(exe_path: str, repeat: int = REPEAT, out_path: str = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        with open(out_path or os.devnull, "w") as out:
+            t0 = time.perf_counter()
+            subprocess.run([exe_path], check=True, stdout=out)
+            best = min(best, time.perf_counter() - t0)
+    return best
@@ -1,36 +1,200 @@
 // Generated by simple Fangless Python transpiler
 #include "../../c++/runtime.hpp"
-#include <iostream>
-#include <vector>
-#include <chrono>
 
-using namespace std::chrono;
-using namespace std;
 // Compile with something like:
 //   g++ -std=c++17 -O3 output.cpp -o program
 
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(47);
+static const PyValue __const1 = PyValue(102);
+static const PyValue __const2 = PyValue(5);
+static const PyValue __const3 = PyValue(88);
+static const PyValue __const4 = PyValue(13);
+static const PyValue __const5 = PyValue(6);
+static const PyValue __const6 = PyValue(91);
+static const PyValue __const7 = PyValue(54);
+static const PyValue __const8 = PyValue(33);
+static const PyValue __const9 = PyValue(120);
+static const PyValue __const10 = PyValue(12);
+static const PyValue __const11 = PyValue(85);
+static const PyValue __const12 = PyValue(7);
+static const PyValue __const13 = PyValue(140);
+static const PyValue __const14 = PyValue(59);
+static const PyValue __const15 = PyValue(3);
+static const PyValue __const16 = PyValue(77);
+static const PyValue __const17 = PyValue(92);
+static const PyValue __const18 = PyValue(18);
+static const PyValue __const19 = PyValue(64);
+static const PyValue __const20 = PyValue(201);
+static const PyValue __const21 = PyValue(45);
+static const PyValue __const22 = PyValue(9);
+static const PyValue __const23 = PyValue(156);
+static const PyValue __const24 = PyValue(28);
+static const PyValue __const25 = PyValue(111);
+static const PyValue __const26 = PyValue(70);
+static const PyValue __const27 = PyValue(134);
+static const PyValue __const28 = PyValue(101);
+static const PyValue __const29 = PyValue(4);
+static const PyValue __const30 = PyValue(67);
+static const PyValue __const31 = PyValue(89);
+static const PyValue __const32 = PyValue(155);
+static const PyValue __const33 = PyValue(200);
+static const PyValue __const34 = PyValue(78);
+static const PyValue __const35 = PyValue(145);
+static const PyValue __const36 = PyValue(55);
+static const PyValue __const37 = PyValue(8);
+static const PyValue __const38 = PyValue(250);
+static const PyValue __const39 = PyValue(41);
+static const PyValue __const40 = PyValue(19);
+static const PyValue __const41 = PyValue(173);
+static const PyValue __const42 = PyValue(66);
+static const PyValue __const43 = PyValue(42);
+static const PyValue __const44 = PyValue(187);
+static const PyValue __const45 = PyValue(14);
+static const PyValue __const46 = PyValue(130);
+static const PyValue __const47 = PyValue(71);
+static const PyValue __const48 = PyValue(210);
+static const PyValue __const49 = PyValue(99);
+static const PyValue __const50 = PyValue(160);
+static const PyValue __const51 = PyValue(72);
+static const PyValue __const52 = PyValue(190);
+static const PyValue __const53 = PyValue(150);
+static const PyValue __const54 = PyValue(21);
+static const PyValue __const55 = PyValue(301);
+static const PyValue __const56 = PyValue(16);
+static const PyValue __const57 = PyValue(57);
+static const PyValue __const58 = PyValue(203);
+static const PyValue __const59 = PyValue(74);
+static const PyValue __const60 = PyValue(166);
+static const PyValue __const61 = PyValue(81);
+static const PyValue __const62 = PyValue(254);
+static const PyValue __const63 = PyValue(122);
+static const PyValue __const64 = PyValue(199);
+static const PyValue __const65 = PyValue(80);
+static const PyValue __const66 = PyValue(267);
+static const PyValue __const67 = PyValue(29);
+static const PyValue __const68 = PyValue(305);
+static const PyValue __const69 = PyValue(90);
+static const PyValue __const70 = PyValue(10);
+static const PyValue __const71 = PyValue(176);
+static const PyValue __const72 = PyValue(230);
+static const PyValue __const73 = PyValue(300);
+static const PyValue __const74 = PyValue(15);
+static const PyValue __const75 = PyValue(211);
+static const PyValue __const76 = PyValue(73);
+static const PyValue __const77 = PyValue(22);
+static const PyValue __const78 = PyValue(98);
+static const PyValue __const79 = PyValue(333);
+static const PyValue __const80 = PyValue(17);
+static const PyValue __const81 = PyValue(180);
+static const PyValue __const82 = PyValue(131);
+static const PyValue __const83 = PyValue(95);
+static const PyValue __const84 = PyValue(288);
+static const PyValue __const85 = PyValue(399);
+static const PyValue __const86 = PyValue(270);
+static const PyValue __const87 = PyValue(24);
+static const PyValue __const88 = PyValue(56);
+static const PyValue __const89 = PyValue(310);
+static const PyValue __const90 = PyValue(209);
+static const PyValue __const91 = PyValue(171);
+static const PyValue __const92 = PyValue(350);
+static const PyValue __const93 = PyValue(11);
+static const PyValue __const94 = PyValue(48);
+static const PyValue __const95 = PyValue(133);
+static const PyValue __const96 = PyValue(110);
+static const PyValue __const97 = PyValue(412);
+static const PyValue __const98 = PyValue(320);
+static const PyValue __const99 = PyValue(278);
+static const PyValue __const100 = PyValue(44);
+static const PyValue __const101 = PyValue(75);
+static const PyValue __const102 = PyValue(266);
+static const PyValue __const103 = PyValue(141);
+static const PyValue __const104 = PyValue(184);
+static const PyValue __const105 = PyValue(349);
+static const PyValue __const106 = PyValue(61);
+static const PyValue __const107 = PyValue(143);
+static const PyValue __const108 = PyValue(35);
+static const PyValue __const109 = PyValue(58);
+static const PyValue __const110 = PyValue(260);
+static const PyValue __const111 = PyValue(400);
+static const PyValue __const112 = PyValue(205);
+static const PyValue __const113 = PyValue(222);
+static const PyValue __const114 = PyValue(76);
+static const PyValue __const115 = PyValue(109);
+static const PyValue __const116 = PyValue(345);
+static const PyValue __const117 = PyValue(30);
+static const PyValue __const118 = PyValue(299);
+static const PyValue __const119 = PyValue(280);
+static const PyValue __const120 = PyValue(340);
+static const PyValue __const121 = PyValue(181);
+static const PyValue __const122 = PyValue(265);
+static const PyValue __const123 = PyValue(129);
+static const PyValue __const124 = PyValue(62);
+static const PyValue __const125 = PyValue(39);
+static const PyValue __const126 = PyValue(83);
+static const PyValue __const127 = PyValue(112);
+static const PyValue __const128 = PyValue(96);
+static const PyValue __const129 = PyValue(390);
+static const PyValue __const130 = PyValue(306);
+static const PyValue __const131 = PyValue(154);
+static const PyValue __const132 = PyValue(395);
+static const PyValue __const133 = PyValue(60);
+static const PyValue __const134 = PyValue(255);
+static const PyValue __const135 = PyValue(100);
+static const PyValue __const136 = PyValue(175);
+static const PyValue __const137 = PyValue(311);
+static const PyValue __const138 = PyValue(165);
+static const PyValue __const139 = PyValue(371);
+static const PyValue __const140 = PyValue(31);
+static const PyValue __const141 = PyValue(240);
+static const PyValue __const142 = PyValue(49);
+static const PyValue __const143 = PyValue(52);
+static const PyValue __const144 = PyValue(152);
+static const PyValue __const145 = PyValue(304);
+static const PyValue __const146 = PyValue(178);
+static const PyValue __const147 = PyValue(40);
+static const PyValue __const148 = PyValue(289);
+static const PyValue __const149 = PyValue(410);
+static const PyValue __const150 = PyValue(94);
+static const PyValue __const151 = PyValue(295);
+static const PyValue __const152 = PyValue(123);
+static const PyValue __const153 = PyValue(213);
+static const PyValue __const154 = PyValue(307);
+static const PyValue __const155 = PyValue(34);
+static const PyValue __const156 = PyValue(264);
+static const PyValue __const157 = PyValue(177);
+static const PyValue __const158 = PyValue(360);
+static const PyValue __const159 = PyValue(342);
+static const PyValue __const160 = PyValue(366);
+static const PyValue __const161 = PyValue(142);
+static const PyValue __const162 = PyValue(245);
+static const PyValue __const163 = PyValue(164);
+static const PyValue __const164 = PyValue(344);
+
+PyValue bubble_sort(PyValue array);
+
 PyValue bubble_sort(PyValue array) {
-    PyValue i;
-    PyValue j;
-    PyValue n;
+    long long i = 0;
+    long long j = 0;
+    long long n = 0;
     PyValue t;
-    n = py_len(array);
+    n = py_len(array).int_value;
     {
-        PyValue __range_start = PY_ZERO;
-        PyValue __range_stop = n;
-        PyValue __range_step = PY_ONE;
-        for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-            i = PyValue(__i);
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
             {
-                PyValue __range_start = PY_ZERO;
-                PyValue __range_stop = py_sub(py_sub(n, i), PY_ONE);
-                PyValue __range_step = PY_ONE;
-                for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-                    j = PyValue(__i);
-                    if (py_gt(py_getitem(array, j), py_getitem(array, py_add(j, PY_ONE))).is_truthy()) {
-                        t = py_getitem(array, j);
-                        py_setitem(array, j, py_getitem(array, py_add(j, PY_ONE)));
-                        py_setitem(array, py_add(j, PY_ONE), t);
+                long long __range_start = 0LL;
+                long long __range_stop = (n - i) - 1LL;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    j = __i;
+                    if (py_gt(py_getitem_ref(array, PyValue(j)), py_getitem_ref(array, PyValue((j + 1LL)))).is_truthy()) {
+                        t = py_getitem(array, PyValue(j));
+                        py_setitem(array, PyValue(j), py_getitem(array, PyValue((j + 1LL))));
+                        py_setitem(array, PyValue((j + 1LL)), std::move(t));
                     }
                 }
             }
@@ -52,43 +216,27 @@ int main() {
     PyValue array8;
     PyValue array9;
     PyValue arrays;
-    PyValue i;
+    long long i = 0;
     PyValue sorted;
-    array1 = py_list(std::vector<PyValue>{ PyValue(47), PyValue(102), PyValue(5), PyValue(88), PyValue(13), PyValue(6), PyValue(91), PyValue(54), PyValue(33), PyValue(120) });
-    array2 = py_list(std::vector<PyValue>{ PyValue(12), PyValue(85), PyValue(33), PyValue(7), PyValue(140), PyValue(59), PyValue(3), PyValue(77), PyValue(92), PyValue(18), PyValue(64), PyValue(201), PyValue(45), PyValue(9), PyValue(156), PyValue(28), PyValue(111), PyValue(70), PyValue(5), PyValue(134) });
-    array3 = py_list(std::vector<PyValue>{ PyValue(101), PyValue(4), PyValue(67), PyValue(89), PyValue(33), PyValue(12), PyValue(155), PyValue(200), PyValue(3), PyValue(78), PyValue(145), PyValue(55), PyValue(91), PyValue(8), PyValue(250), PyValue(41), PyValue(19), PyValue(173), PyValue(66), PyValue(42), PyValue(5), PyValue(187), PyValue(92), PyValue(14), PyValue(130), PyValue(71), PyValue(210), PyValue(6), PyValue(99), PyValue(160) });
-    array4 = py_list(std::vector<PyValue>{ PyValue(72), PyValue(190), PyValue(5), PyValue(33), PyValue(150), PyValue(88), PyValue(47), PyValue(21), PyValue(9), PyValue(301), PyValue(145), PY_TWO, PyValue(67), PyValue(99), PyValue(210), PyValue(16), PyValue(57), PyValue(203), PyValue(18), PyValue(74), PyValue(166), PyValue(13), PyValue(81), PyValue(254), PyValue(45), PyValue(122), PyValue(199), PyValue(6), PyValue(72), PyValue(80), PyValue(14), PyValue(267), PyValue(111), PyValue(29), PyValue(305), PyValue(90), PyValue(10), PyValue(54), PyValue(176), PyValue(230) });
-    array5 = py_list(std::vector<PyValue>{ PyValue(300), PyValue(15), PyValue(89), PyValue(4), PyValue(211), PyValue(73), PyValue(199), PyValue(155), PyValue(22), PyValue(98), PyValue(67), PyValue(201), PyValue(45), PyValue(120), PyValue(9), PyValue(333), PyValue(17), PyValue(5), PyValue(66), PyValue(180), PyValue(250), PyValue(131), PyValue(42), PyValue(9), PyValue(57), PyValue(72), PyValue(95), PyValue(111), PyValue(288), PyValue(3), PyValue(399), PyValue(210), PyValue(14), PyValue(160), PyValue(270), PyValue(55), PyValue(92), PyValue(140), PyValue(77), PyValue(24), PyValue(56), PyValue(8), PyValue(134), PyValue(310), PyValue(89), PyValue(41), PyValue(209), PyValue(19), PyValue(6), PyValue(171) });
-    array6 = py_list(std::vector<PyValue>{ PyValue(22), PyValue(350), PyValue(11), PyValue(77), PyValue(4), PyValue(99), PyValue(203), PyValue(15), PyValue(6), PyValue(190), PyValue(47), PyValue(210), PyValue(122), PyValue(300), PyValue(5), PyValue(9), PyValue(48), PyValue(133), PyValue(201), PyValue(110), PyValue(88), PyValue(412), PyValue(67), PyValue(55), PyValue(320), PyValue(14), PyValue(101), PyValue(278), PyValue(44), PyValue(33), PyValue(10), PyValue(75), PyValue(266), PyValue(5), PyValue(90), PyValue(141), PyValue(230), PyValue(300), PyValue(160), PyValue(3), PyValue(199), PyValue(184), PyValue(56), PyValue(270), PyValue(349), PyValue(80), PyValue(99), PyValue(12), PyValue(61), PyValue(143), PyValue(210), PyValue(66), PyValue(35), PyValue(310), PyValue(7), PyValue(180), PyValue(21), PyValue(58), PyValue(145), PyValue(260) });
-    array7 = py_list(std::vector<PyValue>{ PyValue(301), PyValue(99), PyValue(22), PyValue(17), PyValue(400), PyValue(8), PyValue(66), PyValue(55), PyValue(190), PyValue(300), PyValue(120), PyValue(205), PyValue(91), PyValue(42), PyValue(333), PyValue(10), PyValue(4), PyValue(12), PyValue(150), PyValue(222), PyValue(5), PyValue(76), PyValue(88), PyValue(109), PyValue(56), PyValue(345), PyValue(210), PyValue(47), PyValue(30), PyValue(299), PyValue(130), PyValue(77), PyValue(141), PyValue(280), PyValue(6), PyValue(24), PyValue(160), PyValue(95), PyValue(14), PyValue(340), PyValue(181), PyValue(3), PyValue(265), PyValue(129), PyValue(90), PyValue(44), PyValue(201), PyValue(67), PyValue(58), PyValue(176), PyValue(13), PyValue(28), PyValue(101), PyValue(62), PyValue(254), PyValue(399), PyValue(39), PyValue(187), PyValue(270), PyValue(83), PyValue(12), PyValue(155), PyValue(57), PyValue(112), PyValue(96), PyValue(300), PyValue(45), PyValue(166), PyValue(19), PyValue(72) });
-    array8 = py_list(std::vector<PyValue>{ PyValue(140), PyValue(300), PyValue(55), PyValue(44), PyValue(120), PyValue(390), PyValue(18), PyValue(250), PyValue(73), PyValue(9), PyValue(33), PyValue(11), PyValue(200), PyValue(5), PyValue(101), PyValue(67), PyValue(4), PyValue(15), PyValue(306), PyValue(99), PyValue(48), PyValue(129), PyValue(222), PyValue(42), PyValue(310), PyValue(141), PyValue(266), PyValue(199), PyValue(67), PyValue(8), PyValue(71), PyValue(180), PyValue(154), PyValue(395), PyValue(250), PyValue(16), PyValue(12), PyValue(320), PyValue(60), PyValue(77), PyValue(33), PyValue(255), PyValue(5), PyValue(6), PyValue(14), PyValue(100), PyValue(175), PyValue(311), PyValue(56), PyValue(230), PyValue(29), PyValue(165), PyValue(203), PyValue(371), PyValue(91), PyValue(31), PyValue(240), PyValue(57), PyValue(88), PyValue(390), PyValue(10), PyValue(49), PyValue(270), PyValue(133), PyValue(66), PyValue(52), PyValue(17), PyValue(210), PyValue(152), PyValue(304), PyValue(80), PyValue(12), PyValue(45), PyValue(59), PyValue(122), PyValue(178), PyValue(3), PyValue(270), PyValue(160), PyValue(44) });
-    array9 = py_list(std::vector<PyValue>{ PyValue(40), PyValue(19), PyValue(66), PyValue(91), PyValue(203), PyValue(17), PyValue(310), PyValue(98), PyValue(201), PyValue(5), PyValue(299), PyValue(72), PyValue(4), PyValue(333), PyValue(12), PyValue(150), PyValue(77), PyValue(289), PyValue(100), PyValue(255), PyValue(6), PyValue(410), PyValue(55), PyValue(83), PyValue(31), PyValue(200), PyValue(112), PyValue(94), PyValue(350), PyValue(8), PyValue(266), PyValue(14), PyValue(295), PyValue(171), PyValue(42), PyValue(10), PyValue(187), PyValue(399), PyValue(123), PyValue(76), PyValue(90), PyValue(45), PyValue(230), PyValue(199), PyValue(3), PyValue(66), PyValue(140), PyValue(160), PyValue(33), PyValue(152), PyValue(222), PyValue(11), PyValue(395), PyValue(96), PyValue(101), PyValue(213), PyValue(270), PyValue(129), PyValue(88), PyValue(67), PyValue(300), PyValue(15), PyValue(58), PyValue(76), PyValue(44), PyValue(141), PyValue(175), PyValue(307), PyValue(21), PyValue(34), PyValue(66), PyValue(12), PyValue(203), PyValue(264), PyValue(180), PyValue(72), PyValue(98), PyValue(110), PyValue(59), PyValue(145), PyValue(230), PyValue(320), PyValue(6), PyValue(340), PyValue(173), PyValue(210), PyValue(47), PyValue(55), PyValue(12) });
-    array10 = py_list(std::vector<PyValue>{ PyValue(320), PyValue(14), PyValue(200), PyValue(55), PyValue(3), PyValue(91), PyValue(177), PyValue(250), PyValue(11), PyValue(66), PyValue(99), PyValue(340), PyValue(7), PyValue(18), PyValue(270), PyValue(31), PyValue(72), PyValue(203), PyValue(6), PyValue(120), PyValue(190), PyValue(260), PyValue(88), PyValue(44), PyValue(210), PyValue(12), PyValue(412), PyValue(101), PyValue(150), PyValue(78), PyValue(33), PyValue(299), PyValue(49), PyValue(57), PyValue(140), PyValue(9), PyValue(300), PyValue(360), PyValue(5), PyValue(230), PyValue(111), PyValue(17), PyValue(52), PyValue(289), PyValue(80), PyValue(16), PyValue(134), PyValue(66), PyValue(14), PyValue(199), PyValue(342), PyValue(95), PyValue(187), PyValue(130), PyValue(310), PyValue(10), PyValue(67), PyValue(45), PyValue(254), PyValue(12), PyValue(366), PyValue(22), PyValue(203), PyValue(142), PyValue(88), PyValue(74), PyValue(41), PyValue(90), PyValue(5), PyValue(270), PyValue(320), PyValue(109), PyValue(13), PyValue(260), PyValue(101), PyValue(56), PyValue(81), PyValue(245), PyValue(399), PyValue(164), PyValue(28), PyValue(52), PyValue(111), PyValue(310), PyValue(6), PyValue(21), PyValue(344), PyValue(203), PyValue(133), PyValue(7), PyValue(166), PyValue(254), PyValue(44), PyValue(260), PyValue(180), PyValue(301), PyValue(10), PyValue(72), PyValue(58), PyValue(99) });
-    arrays = py_list(std::vector<PyValue>{ array1, array2, array3, array4, array5, array6, array7, array8, array9, array10 });
+    array1 = py_list(PyItems{ __const0, __const1, __const2, __const3, __const4, __const5, __const6, __const7, __const8, __const9 });
+    array2 = py_list(PyItems{ __const10, __const11, __const8, __const12, __const13, __const14, __const15, __const16, __const17, __const18, __const19, __const20, __const21, __const22, __const23, __const24, __const25, __const26, __const2, __const27 });
+    array3 = py_list(PyItems{ __const28, __const29, __const30, __const31, __const8, __const10, __const32, __const33, __const15, __const34, __const35, __const36, __const6, __const37, __const38, __const39, __const40, __const41, __const42, __const43, __const2, __const44, __const17, __const45, __const46, __const47, __const48, __const5, __const49, __const50 });
+    array4 = py_list(PyItems{ __const51, __const52, __const2, __const8, __const53, __const3, __const0, __const54, __const22, __const55, __const35, PY_TWO, __const30, __const49, __const48, __const56, __const57, __const58, __const18, __const59, __const60, __const4, __const61, __const62, __const21, __const63, __const64, __const5, __const51, __const65, __const45, __const66, __const25, __const67, __const68, __const69, __const70, __const7, __const71, __const72 });
+    array5 = py_list(PyItems{ __const73, __const74, __const31, __const29, __const75, __const76, __const64, __const32, __const77, __const78, __const30, __const20, __const21, __const9, __const22, __const79, __const80, __const2, __const42, __const81, __const38, __const82, __const43, __const22, __const57, __const51, __const83, __const25, __const84, __const15, __const85, __const48, __const45, __const50, __const86, __const36, __const17, __const13, __const16, __const87, __const88, __const37, __const27, __const89, __const31, __const39, __const90, __const40, __const5, __const91 });
+    array6 = py_list(PyItems{ __const77, __const92, __const93, __const16, __const29, __const49, __const58, __const74, __const5, __const52, __const0, __const48, __const63, __const73, __const2, __const22, __const94, __const95, __const20, __const96, __const3, __const97, __const30, __const36, __const98, __const45, __const28, __const99, __const100, __const8, __const70, __const101, __const102, __const2, __const69, __const103, __const72, __const73, __const50, __const15, __const64, __const104, __const88, __const86, __const105, __const65, __const49, __const10, __const106, __const107, __const48, __const42, __const108, __const89, __const12, __const81, __const54, __const109, __const35, __const110 });
+    array7 = py_list(PyItems{ __const55, __const49, __const77, __const80, __const111, __const37, __const42, __const36, __const52, __const73, __const9, __const112, __const6, __const43, __const79, __const70, __const29, __const10, __const53, __const113, __const2, __const114, __const3, __const115, __const88, __const116, __const48, __const0, __const117, __const118, __const46, __const16, __const103, __const119, __const5, __const87, __const50, __const83, __const45, __const120, __const121, __const15, __const122, __const123, __const69, __const100, __const20, __const30, __const109, __const71, __const4, __const24, __const28, __const124, __const62, __const85, __const125, __const44, __const86, __const126, __const10, __const32, __const57, __const127, __const128, __const73, __const21, __const60, __const40, __const51 });
+    array8 = py_list(PyItems{ __const13, __const73, __const36, __const100, __const9, __const129, __const18, __const38, __const76, __const22, __const8, __const93, __const33, __const2, __const28, __const30, __const29, __const74, __const130, __const49, __const94, __const123, __const113, __const43, __const89, __const103, __const102, __const64, __const30, __const37, __const47, __const81, __const131, __const132, __const38, __const56, __const10, __const98, __const133, __const16, __const8, __const134, __const2, __const5, __const45, __const135, __const136, __const137, __const88, __const72, __const67, __const138, __const58, __const139, __const6, __const140, __const141, __const57, __const3, __const129, __const70, __const142, __const86, __const95, __const42, __const143, __const80, __const48, __const144, __const145, __const65, __const10, __const21, __const14, __const63, __const146, __const15, __const86, __const50, __const100 });
+    array9 = py_list(PyItems{ __const147, __const40, __const42, __const6, __const58, __const80, __const89, __const78, __const20, __const2, __const118, __const51, __const29, __const79, __const10, __const53, __const16, __const148, __const135, __const134, __const5, __const149, __const36, __const126, __const140, __const33, __const127, __const150, __const92, __const37, __const102, __const45, __const151, __const91, __const43, __const70, __const44, __const85, __const152, __const114, __const69, __const21, __const72, __const64, __const15, __const42, __const13, __const50, __const8, __const144, __const113, __const93, __const132, __const128, __const28, __const153, __const86, __const123, __const3, __const30, __const73, __const74, __const109, __const114, __const100, __const103, __const136, __const154, __const54, __const155, __const42, __const10, __const58, __const156, __const81, __const51, __const78, __const96, __const14, __const35, __const72, __const98, __const5, __const120, __const41, __const48, __const0, __const36, __const10 });
+    array10 = py_list(PyItems{ __const98, __const45, __const33, __const36, __const15, __const6, __const157, __const38, __const93, __const42, __const49, __const120, __const12, __const18, __const86, __const140, __const51, __const58, __const5, __const9, __const52, __const110, __const3, __const100, __const48, __const10, __const97, __const28, __const53, __const34, __const8, __const118, __const142, __const57, __const13, __const22, __const73, __const158, __const2, __const72, __const25, __const80, __const143, __const148, __const65, __const56, __const27, __const42, __const45, __const64, __const159, __const83, __const44, __const46, __const89, __const70, __const30, __const21, __const62, __const10, __const160, __const77, __const58, __const161, __const3, __const59, __const39, __const69, __const2, __const86, __const98, __const115, __const4, __const110, __const28, __const88, __const61, __const162, __const85, __const163, __const24, __const143, __const25, __const89, __const5, __const54, __const164, __const58, __const95, __const12, __const60, __const62, __const100, __const110, __const81, __const55, __const70, __const51, __const109, __const49 });
+    arrays = py_list(PyItems{ array1, array2, array3, array4, array5, array6, array7, array8, array9, array10 });
     {
-        PyValue __range_start = PY_ZERO;
-        PyValue __range_stop = PyValue(10);
-        PyValue __range_step = PY_ONE;
-        vector<string> t_list;
-        for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-            i = PyValue(__i);
-
-            auto t1 = high_resolution_clock::now();
-            sorted = bubble_sort(py_getitem(arrays, i));
-            auto t2 = high_resolution_clock::now();
-
+        long long __range_start = 0;
+        long long __range_stop = 10LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            sorted = bubble_sort(py_getitem(arrays, PyValue(i)));
             py_print(sorted);
-            
-            duration<double> d = t2 - t1;
-            string time = std::to_string(d.count());
-            // Replace '.' with ',':
-            for (char &c : time) {
-                if (c == '.') c = ',';
-            }
-            t_list.push_back(time);
-        }
-        for(int i = 0; i < 10; i++) {
-            cout << t_list.at(i) << "\n";
         }
     }
     return 0;
@@ -1,8 +1,6 @@
 #include <iostream>
 #include <vector>
-#include <chrono>
 
-using namespace std::chrono;
 using namespace std;
 
 vector<int> bubble_sort(vector<int> array) {
@@ -35,17 +33,13 @@ int main() {
 
     vector<int> arrays[10] = {array1, array2, array3, array4, array5, array6, array7, array8, array9, array10};
 
-    vector<double> t_list;
-    for(int i = 0; i < 10; i++){
-        auto t1 = high_resolution_clock::now();
-
-        bubble_sort(arrays[i]);
-
-        auto t2 = high_resolution_clock::now();
-        duration<double> d = t2 - t1;
-        t_list.push_back(d.count());
+    for (int i = 0; i < 10; i++) {
+        vector<int> sorted = bubble_sort(arrays[i]);
+        cout << "[";
+        for (size_t k = 0; k < sorted.size(); k++) {
+            cout << (k > 0 ? ", " : "") << sorted[k];
+        }
+        cout << "]\n";
     }
-    for(auto t : t_list) cout << t << endl;
-    
     return 0;
 }
@@ -0,0 +1,84 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Make the project root importable when running this script directly
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from performance_eval.bench_utils import find_benchmarks, make_parser, read_benchmark
+from src.cpp_transpiler import CppTranspiler
+
+# Times g++ (compile and link, -O3) on the C++ generated for every program in
+# performance_eval/, four ways: with the whole runtime inline in each program
+# (the default), linking the prebuilt libfangless.a
+# (-DFANGLESS_RUNTIME_LIBRARY), and both again with the precompiled
+# runtime.hpp.gch. The runtime is copied to a temporary directory first, so
+# a runtime.hpp.gch already built in c++/ does not leak into the first two.
+REPEAT = 3
+CXXFLAGS = ["-std=c++17", "-O3"]
+LIBFLAGS = ["-DFANGLESS_RUNTIME_LIBRARY"]
+
+
+def make(runtime_dir: str, *targets: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(
+        ["make", "-s", "-C", runtime_dir, f"CXXFLAGS={' '.join(CXXFLAGS)}", *targets],
+        check=True,
+    )
+    return time.perf_counter() - t0
+
+
+def best_compile(cpp_path: str, flags: list, libs: list) -> float:
+    exe_path = os.path.splitext(cpp_path)[0]
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        subprocess.run(["g++", *CXXFLAGS, *flags, cpp_path, "-o", exe_path, *libs], check=True)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    parser = make_parser()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # '../c++/runtime.hpp' of the generated files resolves to tmp/c++
+        runtime_dir = os.path.join(tmp, "c++")
+        os.makedirs(runtime_dir)
+        for name in ("runtime.hpp", "runtime_cold.hpp", "runtime.cpp", "Makefile"):
+            shutil.copy(os.path.join(ROOT, "c++", name), runtime_dir)
+        programs_dir = os.path.join(tmp, "programs")
+        os.makedirs(programs_dir)
+
+        programs = []
+        for name in find_benchmarks():
+            ast = parser.parse(read_benchmark(name, ".py"))
+            cpp_path = os.path.join(programs_dir, name + ".cpp")
+            with open(cpp_path, "w", encoding="utf-8") as f:
+                f.write(CppTranspiler().transpile(ast))
+            programs.append((name, cpp_path))
+
+        library = os.path.join(runtime_dir, "libfangless.a")
+        variants = [
+            ("header", [], []),
+            ("library", LIBFLAGS, [library]),
+            ("header+pch", [], []),
+            ("library+pch", LIBFLAGS, [library]),
+        ]
+        times = {name: {} for name, _ in programs}
+        print(f"libfangless.a built in {make(runtime_dir, 'libfangless.a'):.2f} s")
+        for variant, flags, libs in variants:
+            if variant == "header+pch":
+                print(f"runtime.hpp.gch built in {make(runtime_dir):.2f} s")
+            for name, cpp_path in programs:
+                times[name][variant] = best_compile(cpp_path, flags, libs)
+
+        print(f"{'program':<18}" + "".join(f"{variant:>14}" for variant, _, _ in variants))
+        for name, _ in programs:
+            print(f"{name:<18}" + "".join(f"{times[name][v]:12.2f} s" for v, _, _ in variants))
+        means = [sum(times[name][v] for name, _ in programs) / len(programs) for v, _, _ in variants]
+        print(f"{'mean':<18}" + "".join(f"{mean:12.2f} s" for mean in means))
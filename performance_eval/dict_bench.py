@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Compiles the generated and the hand-made C++ of the dict and set workloads
+# (word_count: string keys, histogram: int keys, set_ops: set() of large int
+# lists, set algebra and membership) and reports the best run time of each.
+BENCHMARKS = ["word_count", "histogram", "set_ops"]
+
+if __name__ == "__main__":
+    parser = make_parser()
+    cache = BinaryCache()
+    print(f"{'benchmark':<12} {'generated s':>12} {'hand-made s':>12}")
+    for name in BENCHMARKS:
+        times = []
+        for cpp_code in (CppTranspiler().transpile(parser.parse(read_benchmark(name, ".py"))),
+                         read_benchmark(name, "_hm.cpp")):
+            times.append(best_run(compile_cpp(cache, cpp_code)))
+        print(f"{name:<12} {times[0]:>12.3f} {times[1]:>12.3f}")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Times element_access.py transpiled as is (elements only read are borrowed
+# with py_getitem_ref), with every read copying the element out (py_getitem),
+# and the hand-made C++ version.
+
+if __name__ == "__main__":
+    generated = CppTranspiler().transpile(make_parser().parse(read_benchmark("element_access", ".py")))
+    cache = BinaryCache()
+    for variant, cpp_code in (
+        ("borrowed", generated),
+        ("copied", generated.replace("py_getitem_ref(", "py_getitem(")),
+        ("hand-made", read_benchmark("element_access", "_hm.cpp")),
+    ):
+        print(f"{variant:<10} {best_run(compile_cpp(cache, cpp_code)):8.3f} s")
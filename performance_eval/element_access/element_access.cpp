@@ -0,0 +1,145 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue("a rather long name number ");
+static const PyValue __const1 = PyValue(27);
+static const PyValue __const2 = PyValue("even");
+static const PyValue __const3 = PyValue("odd");
+
+int main() {
+    PyValue even;
+    PyValue grid;
+    PyValue groups;
+    long long i = 0;
+    long long j = 0;
+    long long k = 0;
+    long long n = 0;
+    PyValue names;
+    PyValue odd;
+    PyValue row;
+    long long same = 0;
+    PyValue total;
+    PyValue trace;
+    PyValue value;
+    n = 300LL;
+    grid = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            row = py_list(PyItems{});
+            {
+                long long __range_start = 0;
+                long long __range_stop = n;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    j = __i;
+                    py_list_append(row, PyValue(py_mod((i * j), 7LL)));
+                }
+            }
+            py_list_append(grid, std::move(row));
+        }
+    }
+    trace = PY_ZERO;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 10LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            k = __i;
+            {
+                long long __range_start = 0;
+                long long __range_stop = n;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    i = __i;
+                    {
+                        long long __range_start = 0;
+                        long long __range_stop = n;
+                        long long __range_step = 1;
+                        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                            j = __i;
+                            trace = py_add(std::move(trace), py_mul(py_getitem_ref(py_getitem_ref(grid, PyValue(i)), PyValue(j)), py_getitem_ref(py_getitem_ref(grid, PyValue(j)), PyValue(i))));
+                        }
+                    }
+                }
+            }
+        }
+    }
+    py_print(trace);
+    names = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = 1000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_list_append(names, py_add(__const0, py_str(PyValue(py_mod(i, 50LL)))));
+        }
+    }
+    same = 0LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 200LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            k = __i;
+            {
+                long long __range_start = 0;
+                long long __range_stop = 999LL;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    i = __i;
+                    if (py_eq(py_getitem_ref(names, PyValue(i)), py_getitem_ref(names, PyValue((i + 1LL)))).is_truthy()) {
+                        same = same + 1LL;
+                    }
+                    if (py_gt(py_len(py_getitem_ref(names, PyValue(i))), __const1).is_truthy()) {
+                        same = same + 1LL;
+                    }
+                }
+            }
+        }
+    }
+    py_print(PyValue(same));
+    groups = py_dict(PyPairs{ py_pair(__const2, py_list(PyItems{})), py_pair(__const3, py_list(PyItems{})) });
+    {
+        long long __range_start = 0;
+        long long __range_stop = 100LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            if (py_mod(i, 2LL) == 0LL) {
+                even = py_getitem(groups, __const2);
+                py_list_append(even, PyValue(i));
+            }
+            else {
+                odd = py_getitem(groups, __const3);
+                py_list_append(odd, PyValue(i));
+            }
+        }
+    }
+    total = PY_ZERO;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 20000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            k = __i;
+            {
+                PyIterator __it(py_getitem_ref(groups, __const2));
+                while (__it.next(value)) {
+                    total = py_add(std::move(total), value);
+                }
+            }
+            total = py_add(std::move(total), py_len(py_getitem_ref(groups, __const3)));
+        }
+    }
+    py_print(total);
+    return 0;
+}
\ No newline at end of file
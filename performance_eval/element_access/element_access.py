@@ -0,0 +1,43 @@
+# Reading elements of containers whose items are boxed: rows of a matrix,
+# long strings and lists stored in a dict. Every a[i] below is only read.
+n = 300
+grid = []
+for i in range(n):
+    row = []
+    for j in range(n):
+        row.append((i * j) % 7)
+    grid.append(row)
+
+trace = 0
+for k in range(10):
+    for i in range(n):
+        for j in range(n):
+            trace = trace + grid[i][j] * grid[j][i]
+print(trace)
+
+names = []
+for i in range(1000):
+    names.append("a rather long name number " + str(i % 50))
+same = 0
+for k in range(200):
+    for i in range(999):
+        if names[i] == names[i + 1]:
+            same = same + 1
+        if len(names[i]) > 27:
+            same = same + 1
+print(same)
+
+groups = {"even": [], "odd": []}
+for i in range(100):
+    if i % 2 == 0:
+        even = groups["even"]
+        even.append(i)
+    else:
+        odd = groups["odd"]
+        odd.append(i)
+total = 0
+for k in range(20000):
+    for value in groups["even"]:
+        total = total + value
+    total = total + len(groups["odd"])
+print(total)
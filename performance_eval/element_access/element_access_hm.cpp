@@ -0,0 +1,59 @@
+#include <iostream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+using namespace std;
+
+int main() {
+    const long long n = 300;
+    vector<vector<long long>> grid;
+    for (long long i = 0; i < n; i++) {
+        vector<long long> row;
+        for (long long j = 0; j < n; j++) {
+            row.push_back((i * j) % 7);
+        }
+        grid.push_back(row);
+    }
+
+    long long trace = 0;
+    for (long long k = 0; k < 10; k++) {
+        for (long long i = 0; i < n; i++) {
+            for (long long j = 0; j < n; j++) {
+                trace = trace + grid[i][j] * grid[j][i];
+            }
+        }
+    }
+    cout << trace << "\n";
+
+    vector<string> names;
+    for (long long i = 0; i < 1000; i++) {
+        names.push_back("a rather long name number " + to_string(i % 50));
+    }
+    long long same = 0;
+    for (long long k = 0; k < 200; k++) {
+        for (long long i = 0; i < 999; i++) {
+            if (names[i] == names[i + 1]) {
+                same = same + 1;
+            }
+            if (names[i].size() > 27) {
+                same = same + 1;
+            }
+        }
+    }
+    cout << same << "\n";
+
+    unordered_map<string, vector<long long>> groups = {{"even", {}}, {"odd", {}}};
+    for (long long i = 0; i < 100; i++) {
+        groups[i % 2 == 0 ? "even" : "odd"].push_back(i);
+    }
+    long long total = 0;
+    for (long long k = 0; k < 20000; k++) {
+        for (long long value : groups["even"]) {
+            total = total + value;
+        }
+        total = total + (long long)groups["odd"].size();
+    }
+    cout << total << "\n";
+    return 0;
+}
@@ -1,63 +1,71 @@
 // Generated by simple Fangless Python transpiler
 #include "../../c++/runtime.hpp"
-#include <iostream>
-#include <vector>
-#include <chrono>
-#include <string>
 
-using namespace std::chrono;
-using namespace std;
 // Compile with something like:
 //   g++ -std=c++17 -O3 output.cpp -o program
 
+PyValue fibonacci(const PyValue& n);
+long long fibonacci__int(long long n);
+
 PyValue fibonacci(const PyValue& n) {
-    PyValue _;
-    PyValue a;
-    PyValue b;
-    PyValue t;
+    long long _ = 0;
+    long long a = 0;
+    long long b = 0;
+    long long t = 0;
     if (py_le(n, PY_ONE).is_truthy()) {
         return n;
     }
-    a = PY_ZERO;
-    b = PY_ONE;
+    a = 0LL;
+    b = 1LL;
     {
-        PyValue __range_start = PY_ZERO;
-        PyValue __range_stop = py_sub(n, PY_ONE);
-        PyValue __range_step = PY_ONE;
-        for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-            _ = PyValue(__i);
-            t = py_add(a, b);
+        long long __range_start = 0;
+        long long __range_stop = py_sub(n, PY_ONE).int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            _ = __i;
+            t = a + b;
             a = b;
             b = t;
         }
     }
-    return b;
+    return PyValue(b);
     return PyValue();
 }
 
-int main() {
-    PyValue i;
+long long fibonacci__int(long long n) {
+    long long _ = 0;
+    long long a = 0;
+    long long b = 0;
+    long long t = 0;
+    if (n <= 1LL) {
+        return n;
+    }
+    a = 0LL;
+    b = 1LL;
     {
-        vector<string> t_list;
-        PyValue __range_start = PY_ONE;
-        PyValue __range_stop = PyValue(51);
-        PyValue __range_step = PY_ONE;
-        for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-            i = PyValue(__i);
-
-            auto t1 = high_resolution_clock::now();
-            py_print(fibonacci(i));
-            auto t2 = high_resolution_clock::now();
-            duration<double> d = t2 - t1;
-            string time = std::to_string(d.count());
-            // Replace '.' with ',':
-            for (char &c : time) {
-                if (c == '.') c = ',';
-            }
-            t_list.push_back(time);
+        long long __range_start = 0;
+        long long __range_stop = n - 1LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            _ = __i;
+            t = a + b;
+            a = b;
+            b = t;
         }
-        for(int i = 0; i < 50; i++) {
-            cout << t_list.at(i) << "\n";
+    }
+    return b;
+    return 0;
+}
+
+int main() {
+    long long i = 0;
+    {
+        long long __range_start = 1LL;
+        long long __range_stop = 51LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_print(PyValue(fibonacci__int(i)));
         }
     }
     return 0;
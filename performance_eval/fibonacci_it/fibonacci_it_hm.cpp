@@ -1,19 +1,15 @@
 #include <iostream>
-#include <vector>
-#include <chrono>
-#include <string>
 
-using namespace std::chrono;
 using namespace std;
 
-int fibonacci(int n) {
+long long fibonacci(long long n) {
     if (n <= 1) {
         return n;
     }
-    int a = 0;
-    int b = 1;
-    for (int i = 0; i < n-1; i++) {
-        int t = a + b;
+    long long a = 0;
+    long long b = 1;
+    for (long long i = 0; i < n - 1; i++) {
+        long long t = a + b;
         a = b;
         b = t;
     }
@@ -21,24 +17,8 @@ int fibonacci(int n) {
 }
 
 int main() {
-
-    vector<string> t_list;
-    for(int i = 1; i <= 50; i++) {
-        auto t1 = high_resolution_clock::now();
-
-        cout << "Fibonacci(" << i << "): " << fibonacci(i) << "\n";
-
-        auto t2 = high_resolution_clock::now();
-        duration<double> d = t2 - t1;
-        string time = std::to_string(d.count());
-        // Replace '.' with ',':
-        for (char &c : time) {
-            if (c == '.') c = ',';
-        }
-        t_list.push_back(time);
-    }
-    for(int i = 0; i < 50; i++) {
-        cout << t_list.at(i) << "\n";
+    for (int i = 1; i <= 50; i++) {
+        cout << fibonacci(i) << "\n";
     }
     return 0;
 }
@@ -1,15 +1,12 @@
 // Generated by simple Fangless Python transpiler
 #include "../../c++/runtime.hpp"
-#include <iostream>
-#include <vector>
-#include <chrono>
-#include <string>
 
-using namespace std::chrono;
-using namespace std;
 // Compile with something like:
 //   g++ -std=c++17 -O3 output.cpp -o program
 
+PyValue fibonacci(const PyValue& n);
+long long fibonacci__int(long long n);
+
 PyValue fibonacci(const PyValue& n) {
     if (py_le(n, PY_ONE).is_truthy()) {
         return n;
@@ -18,35 +15,25 @@ PyValue fibonacci(const PyValue& n) {
     return PyValue();
 }
 
+long long fibonacci__int(long long n) {
+    if (n <= 1LL) {
+        return n;
+    }
+    return fibonacci__int(n - 1LL) + fibonacci__int(n - 2LL);
+    return 0;
+}
+
 int main() {
-    PyValue i;
+    long long i = 0;
     PyValue times;
-    times = py_list(std::vector<PyValue>{});
+    times = py_list(PyItems{});
     {
-        vector<string> t_list;
-        PyValue __range_start = PY_ONE;
-        PyValue __range_stop = PyValue(51);
-        PyValue __range_step = PY_ONE;
-        for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-
-            auto t1 = high_resolution_clock::now();
-            i = PyValue(__i);
-
-            py_print(fibonacci(i));
-
-            auto t2 = high_resolution_clock::now();
-            duration<double> d = t2 - t1;
-            string time = std::to_string(d.count());
-            // Replace '.' with ',':
-            for (char &c : time) {
-                if (c == '.') c = ',';
-            }
-            t_list.push_back(time);
-            cout << "tiempo(" << __i << "): " << time << "\n";
-        }
-
-        for(int i = 0; i < 50; i++) {
-            cout << t_list.at(i) << "\n";
+        long long __range_start = 1LL;
+        long long __range_stop = 51LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_print(PyValue(fibonacci__int(i)));
         }
     }
     return 0;
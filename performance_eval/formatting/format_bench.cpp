@@ -0,0 +1,83 @@
+// Microbenchmarks for value formatting: str() of large nested lists and
+// dicts, built directly with the runtime.
+// Compile with something like:
+//   g++ -std=c++17 -O3 format_bench.cpp -o format_bench
+#include "../../c++/runtime.hpp"
+
+#include <chrono>
+
+using namespace std::chrono;
+
+const int REPEAT = 20;
+
+// Times REPEAT conversions of v to text and prints the best one.
+void bench(const char* name, const PyValue& v) {
+    double best = 1e30;
+    std::size_t length = 0;
+    for (int r = 0; r < REPEAT; r++) {
+        auto t1 = high_resolution_clock::now();
+        std::string text = v.to_string();
+        auto t2 = high_resolution_clock::now();
+        duration<double> d = t2 - t1;
+        best = std::min(best, d.count());
+        length = text.size();
+    }
+    std::printf("%-28s %10zu chars %9.3f ms\n", name, length, best * 1000);
+}
+
+int main() {
+    // 2000 x 50 ints, unboxed rows inside a boxed list
+    PyValue int_rows = py_list(std::vector<PyValue>{});
+    for (long long i = 0; i < 2000; i++) {
+        PyValue row = py_list(std::vector<PyValue>{});
+        for (long long j = 0; j < 50; j++) {
+            py_list_append(row, PyValue(i * j));
+        }
+        py_list_append(int_rows, row);
+    }
+    bench("list of int lists", int_rows);
+
+    // Same shape with floats
+    PyValue float_rows = py_list(std::vector<PyValue>{});
+    for (long long i = 0; i < 2000; i++) {
+        PyValue row = py_list(std::vector<PyValue>{});
+        for (long long j = 0; j < 50; j++) {
+            py_list_append(row, PyValue(i * 0.25 + j / 3.0));
+        }
+        py_list_append(float_rows, row);
+    }
+    bench("list of float lists", float_rows);
+
+    // Boxed mixed lists three levels deep
+    PyValue nested = py_list(std::vector<PyValue>{});
+    for (long long i = 0; i < 200; i++) {
+        PyValue middle = py_list(std::vector<PyValue>{});
+        for (long long j = 0; j < 20; j++) {
+            middle.list_value().push_back(py_list(std::vector<PyValue>{
+                PyValue(i), PyValue(j * 1.5), PyValue("x"), PyValue(true)
+            }));
+        }
+        py_list_append(nested, middle);
+    }
+    bench("nested mixed lists", nested);
+
+    // dict int -> small tuple
+    PyValue table = py_dict(std::vector<std::pair<PyValue, PyValue>>{});
+    for (long long i = 0; i < 20000; i++) {
+        py_setitem(table, PyValue(i), py_tuple(std::vector<PyValue>{ PyValue(i), PyValue(i * 0.5) }));
+    }
+    bench("dict of tuples", table);
+
+    // dict str -> dict
+    PyValue outer = py_dict(std::vector<std::pair<PyValue, PyValue>>{});
+    for (long long i = 0; i < 500; i++) {
+        PyValue inner = py_dict(std::vector<std::pair<PyValue, PyValue>>{});
+        for (long long j = 0; j < 20; j++) {
+            py_setitem(inner, PyValue(j), PyValue(i + j));
+        }
+        py_setitem(outer, PyValue("key" + std::to_string(i)), inner);
+    }
+    bench("dict of dicts", outer);
+
+    return 0;
+}
@@ -0,0 +1,61 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue("v");
+
+int main() {
+    long long i = 0;
+    long long j = 0;
+    long long k = 0;
+    PyValue row;
+    PyValue rows;
+    PyValue table;
+    long long total = 0;
+    rows = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = 2000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            row = py_list(PyItems{});
+            {
+                long long __range_start = 0;
+                long long __range_stop = 50LL;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    j = __i;
+                    py_list_append(row, PyValue((i * j)));
+                }
+            }
+            py_list_append(rows, std::move(row));
+        }
+    }
+    table = py_dict(PyPairs{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = 20000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_setitem(table, PyValue(i), py_list(PyItems{ PyValue(i), PyValue((i * 0.5)), __const0 }));
+        }
+    }
+    total = 0LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 20LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            k = __i;
+            total = py_add(PyValue(total), py_len(py_str(rows))).int_value;
+            total = py_add(PyValue(total), py_len(py_str(table))).int_value;
+        }
+    }
+    py_print(PyValue(total));
+    return 0;
+}
\ No newline at end of file
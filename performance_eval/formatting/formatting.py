@@ -0,0 +1,17 @@
+# Builds large nested lists and dicts and converts them to text with str()
+rows = []
+for i in range(2000):
+    row = []
+    for j in range(50):
+        row.append(i * j)
+    rows.append(row)
+
+table = {}
+for i in range(20000):
+    table[i] = [i, i * 0.5, "v"]
+
+total = 0
+for k in range(20):
+    total = total + len(str(rows))
+    total = total + len(str(table))
+print(total)
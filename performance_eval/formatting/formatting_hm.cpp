@@ -0,0 +1,67 @@
+#include <charconv>
+#include <iostream>
+#include <string>
+#include <vector>
+
+using namespace std;
+
+void append_int(string& out, long long v) {
+    char buf[24];
+    auto res = to_chars(buf, buf + sizeof(buf), v);
+    out.append(buf, res.ptr);
+}
+
+void append_float(string& out, double v) {
+    char buf[32];
+    auto res = to_chars(buf, buf + sizeof(buf), v);
+    out.append(buf, res.ptr);
+}
+
+int main() {
+    vector<vector<long long>> rows;
+    for (long long i = 0; i < 2000; i++) {
+        vector<long long> row;
+        for (long long j = 0; j < 50; j++) {
+            row.push_back(i * j);
+        }
+        rows.push_back(row);
+    }
+
+    // Keys in insertion order, as in the Python version
+    vector<pair<long long, double>> table;
+    for (long long i = 0; i < 20000; i++) {
+        table.push_back({i, i * 0.5});
+    }
+
+    long long total = 0;
+    for (int k = 0; k < 20; k++) {
+        string text = "[";
+        for (size_t i = 0; i < rows.size(); i++) {
+            if (i > 0) text += ", ";
+            text += "[";
+            for (size_t j = 0; j < rows[i].size(); j++) {
+                if (j > 0) text += ", ";
+                append_int(text, rows[i][j]);
+            }
+            text += "]";
+        }
+        text += "]";
+        total += text.size();
+
+        text = "{";
+        for (size_t i = 0; i < table.size(); i++) {
+            if (i > 0) text += ", ";
+            append_int(text, table[i].first);
+            text += ": [";
+            append_int(text, table[i].first);
+            text += ", ";
+            append_float(text, table[i].second);
+            if (table[i].second == (long long)table[i].second) text += ".0";
+            text += ", v]";   // strings in containers without quotes, like the runtime
+        }
+        text += "}";
+        total += text.size();
+    }
+    cout << total << endl;
+    return 0;
+}
@@ -0,0 +1,247 @@
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Make the project root importable when running this script directly
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from performance_eval.bench_utils import HERE, find_benchmarks, make_parser
+from src.Parser import Parser
+from src.build import DEFAULT_PROFILE, PROFILES, BinaryCache, CompileError
+from src.cpp_transpiler import CppTranspiler
+
+# Runs every benchmark of performance_eval/ (a directory <name>/ holding
+# <name>.py) three ways: the transpiled and compiled program, the hand-made
+# <name>_hm.cpp when there is one, and the .py under CPython. Each variant
+# runs --warmup times untimed and --runs times timed; the report gives the
+# median and 10th / 90th percentile wall time, the peak RSS, and whether the
+# output matched the generated program's (CPython's with the quotes it
+# prints around strings removed), or "not compared" when there is no
+# output to match. A variant that fails to build, exits with an error or
+# prints something else is reported and the run goes on.
+# Results can be written as JSON and CSV, saved as a baseline, and compared
+# with one: a median more than --threshold above the baseline's is a
+# regression. Failures and regressions end with exit status 1.
+VARIANTS = ["generated", "hand-made", "python"]   # the first one's output is the reference
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+# Benchmarks using methods CPython doesn't have (set.get), not run under it:
+FANGLESS_ONLY = {"set_ops"}
+# Benchmarks whose output differs from CPython's by design: len(str(...)) of
+# a container counts the quotes CPython prints around its strings
+CPYTHON_OUTPUT_DIFFERS = {"formatting"}
+
+# Status of a run that finished but had no reference output to match
+NOT_COMPARED = "not compared"
+
+
+# Command running each variant of a benchmark (variants it lacks are left
+# out), or the reason it could not be built:
+def build_variants(name: str, parser: Parser, cache: BinaryCache, profile: str, variants: list) -> dict:
+    folder = os.path.join(HERE, name)
+    commands = {}
+    if "generated" in variants:
+        with open(os.path.join(folder, f"{name}.py"), encoding="utf-8") as f:
+            source = f.read()
+        try:
+            cpp_code = CppTranspiler().transpile(parser.parse(source))
+            commands["generated"] = [cache.compile(cpp_code, profile)[0]]
+        except NotImplementedError as e:
+            commands["generated"] = f"transpile failed: {e}"
+        except CompileError:
+            commands["generated"] = "g++ failed"
+    hand_made = os.path.join(folder, f"{name}_hm.cpp")
+    if "hand-made" in variants and os.path.exists(hand_made):
+        with open(hand_made, encoding="utf-8") as f:
+            try:
+                commands["hand-made"] = [cache.compile(f.read(), profile)[0]]
+            except CompileError:
+                commands["hand-made"] = "g++ failed"
+    if "python" in variants and name not in FANGLESS_ONLY:
+        commands["python"] = [sys.executable, os.path.join(folder, f"{name}.py")]
+    return commands
+
+
+# Output of CPython compared with Fangless's, which prints strings inside
+# containers without quotes:
+def unquoted(output: bytes) -> bytes:
+    return output.replace(b"'", b"").replace(b'"', b"")
+
+
+# One run through measure.cpp: (wall seconds, peak RSS in KB, exit status,
+# stdout), or None when it took more than timeout seconds
+def run_once(launcher: str, command: list, timeout: float):
+    result = subprocess.run([launcher, str(math.ceil(timeout)), *command], capture_output=True)
+    report = result.stderr.decode().split()
+    if report == ["timeout"]:
+        return None
+    elapsed, peak_rss, status = float(report[0]), int(report[1]), int(report[2])
+    return elapsed, peak_rss, status, result.stdout
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+# expected: the reference output, or None to compare with nothing;
+# normalize: applied to both outputs before comparing them
+def measure(launcher: str, command: list, runs: int, warmup: int, timeout: float, expected,
+            normalize=None) -> dict:
+    times = []
+    peak_rss = 0
+    output = None
+    for i in range(warmup + runs):
+        result = run_once(launcher, command, timeout)
+        if result is None:
+            return {"status": "timeout", "runs": len(times)}
+        elapsed, rss, status, output = result
+        if status != 0:
+            return {"status": f"exit status {status}", "runs": len(times)}
+        peak_rss = max(peak_rss, rss)
+        if i >= warmup:
+            times.append(elapsed)
+    if normalize is not None and expected is not None:
+        same = normalize(output) == normalize(expected)
+    else:
+        same = expected is None or output == expected
+    return {
+        "status": "ok" if same else "wrong output",
+        "runs": runs,
+        "median_s": statistics.median(times),
+        "p10_s": percentile(times, 0.10),
+        "p90_s": percentile(times, 0.90),
+        "min_s": min(times),
+        "max_s": max(times),
+        "peak_rss_kb": peak_rss,
+        "output": output,
+    }
+
+
+# Benchmarks whose median grew more than threshold over the baseline's:
+def regressions(results: dict, baseline: dict, threshold: float) -> list:
+    found = []
+    for name, variants in results.items():
+        for variant, stats in variants.items():
+            before = baseline.get(name, {}).get(variant, {})
+            if "median_s" in stats and "median_s" in before:
+                ratio = stats["median_s"] / before["median_s"]
+                if ratio > 1 + threshold:
+                    found.append((name, variant, before["median_s"], stats["median_s"], ratio))
+    return found
+
+
+def write_csv(path: str, results: dict) -> None:
+    fields = ["benchmark", "variant", "status", "runs", "median_s", "p10_s", "p90_s",
+              "min_s", "max_s", "peak_rss_kb"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for name, variants in results.items():
+            for variant, stats in variants.items():
+                writer.writerow({"benchmark": name, "variant": variant, **stats})
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description="Python vs generated C++ vs hand-made C++")
+    arg_parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    arg_parser.add_argument("--runs", type=int, default=5, help="timed runs per variant")
+    arg_parser.add_argument("--warmup", type=int, default=1, help="untimed runs before them")
+    arg_parser.add_argument("--timeout", type=float, default=60.0,
+                            help="seconds before a run is stopped and the variant skipped")
+    arg_parser.add_argument("--variant", action="append", choices=VARIANTS,
+                            help="variant to run (can be repeated, default: all)")
+    arg_parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=list(PROFILES),
+                            help="optimization flags of the compiled variants")
+    arg_parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    arg_parser.add_argument("--csv", metavar="PATH", help="write the results as CSV")
+    arg_parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                            help="store the results as the baseline (default: performance_eval/baseline.json)")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, metavar="PATH",
+                            help="baseline to compare with, when it exists")
+    arg_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="median slowdown over the baseline reported as a regression")
+    return arg_parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    variants = args.variant or VARIANTS
+    parser = make_parser()
+    cache = BinaryCache()
+    with open(os.path.join(HERE, "measure.cpp"), encoding="utf-8") as f:
+        launcher = cache.compile(f.read(), "O2")[0]
+
+    results = {}
+    failures = []
+    print(f"{'benchmark':<18} {'variant':<10} {'median s':>9} {'p10 s':>9} {'p90 s':>9} {'peak RSS':>10}")
+    for name in find_benchmarks(args.names):
+        commands = build_variants(name, parser, cache, args.profile, variants)
+        results[name] = {}
+        expected = None
+        for variant in VARIANTS:
+            if variant not in commands:
+                continue
+            command = commands[variant]
+            reference = None if variant == "python" and name in CPYTHON_OUTPUT_DIFFERS else expected
+            if isinstance(command, str):
+                stats = {"status": command, "runs": 0}
+            elif variant == "python":
+                stats = measure(launcher, command, args.runs, args.warmup, args.timeout, reference,
+                                normalize=unquoted)
+            else:
+                stats = measure(launcher, command, args.runs, args.warmup, args.timeout, reference)
+            if variant == VARIANTS[0] and stats["status"] == "ok":
+                expected = stats["output"]
+            elif reference is None and stats["status"] == "ok":
+                # Nothing to match it with: the generated program failed, or
+                # CPython's output differs by design
+                stats["status"] = NOT_COMPARED
+            stats.pop("output", None)
+            results[name][variant] = stats
+            if stats["status"] == "timeout":
+                print(f"{name:<18} {variant:<10} {'timeout':>9}")
+                continue
+            if "median_s" not in stats:
+                failures.append((name, variant, stats["status"]))
+                print(f"{name:<18} {variant:<10} {stats['status']}")
+                continue
+            if stats["status"] not in ("ok", NOT_COMPARED):
+                failures.append((name, variant, stats["status"]))
+            flag = "" if stats["status"] == "ok" else f"  {stats['status']}"
+            print(f"{name:<18} {variant:<10} {stats['median_s']:9.3f} {stats['p10_s']:9.3f} "
+                  f"{stats['p90_s']:9.3f} {stats['peak_rss_kb'] / 1024:7.1f} MB{flag}")
+
+    report = {"profile": args.profile, "runs": args.runs, "warmup": args.warmup, "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.csv:
+        write_csv(args.csv, results)
+
+    found = []
+    if os.path.exists(args.baseline) and args.save_baseline != args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = regressions(results, json.load(f)["results"], args.threshold)
+        print(f"\n{len(found)} regression(s) against {os.path.relpath(args.baseline)}")
+        for name, variant, before, after, ratio in found:
+            print(f"  {name:<18} {variant:<10} {before:.3f} s -> {after:.3f} s ({ratio:.2f}x)")
+    if failures:
+        print(f"\n{len(failures)} failure(s)")
+        for name, variant, status in failures:
+            print(f"  {name:<18} {variant:<10} {status}")
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if found or failures:
+        raise SystemExit(1)
@@ -0,0 +1,95 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(10006);
+
+PyValue histogram(const PyValue& n, const PyValue& buckets);
+PyValue histogram__int_int(long long n, long long buckets);
+
+PyValue histogram(const PyValue& n, const PyValue& buckets) {
+    long long b = 0;
+    PyValue hist;
+    long long i = 0;
+    PyValue key;
+    long long seed = 0;
+    hist = py_dict(PyPairs{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = buckets.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            b = __i;
+            py_setitem(hist, PyValue(b), PY_ZERO);
+        }
+    }
+    seed = 7LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            key = py_mod(PyValue(seed), buckets);
+            py_setitem(hist, key, py_add(py_getitem_ref(hist, key), PY_ONE));
+        }
+    }
+    return hist;
+    return PyValue();
+}
+
+PyValue histogram__int_int(long long n, long long buckets) {
+    long long b = 0;
+    PyValue hist;
+    long long i = 0;
+    long long key = 0;
+    long long seed = 0;
+    hist = py_dict(PyPairs{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = buckets;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            b = __i;
+            py_setitem(hist, PyValue(b), PY_ZERO);
+        }
+    }
+    seed = 7LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            key = py_mod(seed, buckets);
+            py_setitem(hist, PyValue(key), py_add(py_getitem_ref(hist, PyValue(key)), PY_ONE));
+        }
+    }
+    return hist;
+    return PyValue();
+}
+
+int main() {
+    PyValue hist;
+    PyValue key;
+    PyValue total;
+    hist = histogram__int_int(3000000LL, 10007LL);
+    py_print(py_len(hist));
+    py_print(py_getitem_ref(hist, PY_ZERO));
+    py_print(py_getitem_ref(hist, __const0));
+    total = PY_ZERO;
+    {
+        const PyValue& __iter = hist;
+        PyIterator __it(__iter);
+        while (__it.next(key)) {
+            total = py_add(std::move(total), py_getitem_ref(hist, key));
+        }
+    }
+    py_print(total);
+    return 0;
+}
\ No newline at end of file
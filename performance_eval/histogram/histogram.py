@@ -0,0 +1,20 @@
+def histogram(n, buckets):
+    hist = {}
+    for b in range(buckets):
+        hist[b] = 0
+    seed = 7
+    for i in range(n):
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        key = seed % buckets
+        hist[key] = hist[key] + 1
+    return hist
+
+hist = histogram(3000000, 10007)
+print(len(hist))
+print(hist[0])
+print(hist[10006])
+
+total = 0
+for key in hist:
+    total = total + hist[key]
+print(total)
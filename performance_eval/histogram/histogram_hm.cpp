@@ -0,0 +1,30 @@
+#include <iostream>
+#include <unordered_map>
+
+using namespace std;
+
+unordered_map<long long, long long> histogram(long long n, long long buckets) {
+    unordered_map<long long, long long> hist;
+    for (long long b = 0; b < buckets; b++) {
+        hist[b] = 0;
+    }
+    long long seed = 7;
+    for (long long i = 0; i < n; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        hist[seed % buckets] += 1;
+    }
+    return hist;
+}
+
+int main() {
+    unordered_map<long long, long long> hist = histogram(3000000, 10007);
+    cout << hist.size() << "\n";
+    cout << hist[0] << "\n";
+    cout << hist[10006] << "\n";
+    long long total = 0;
+    for (const auto& kv : hist) {
+        total += kv.second;
+    }
+    cout << total << "\n";
+    return 0;
+}
@@ -0,0 +1,48 @@
+// Runs one benchmark program for harness.py:
+//
+//   measure <timeout seconds> <program> [args...]
+//
+// The program's stdout goes through, its stderr is discarded. Afterwards
+// "<wall seconds> <peak RSS in KB> <exit status>" is written to stderr, or
+// "timeout" when the program ran out of time (SIGALRM, set before exec).
+// The program is forked from this small process and not from Python: the
+// peak RSS of a child counts the memory of the process it was forked from.
+#include <chrono>
+#include <csignal>
+#include <cstdio>
+#include <cstdlib>
+#include <fcntl.h>
+#include <sys/resource.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+int main(int argc, char** argv) {
+    if (argc < 3) {
+        std::fprintf(stderr, "usage: measure <timeout seconds> <program> [args...]\n");
+        return 2;
+    }
+    unsigned timeout = static_cast<unsigned>(std::atoi(argv[1]));
+
+    auto start = std::chrono::steady_clock::now();
+    pid_t pid = fork();
+    if (pid == 0) {
+        int null = open("/dev/null", O_WRONLY);
+        dup2(null, STDERR_FILENO);
+        alarm(timeout);
+        execv(argv[2], argv + 2);
+        _exit(127);
+    }
+
+    int status = 0;
+    rusage usage{};
+    wait4(pid, &status, 0, &usage);
+    std::chrono::duration<double> elapsed = std::chrono::steady_clock::now() - start;
+
+    if (WIFSIGNALED(status) && WTERMSIG(status) == SIGALRM) {
+        std::fprintf(stderr, "timeout\n");
+        return 0;
+    }
+    int exit_status = WIFEXITED(status) ? WEXITSTATUS(status) : 128 + WTERMSIG(status);
+    std::fprintf(stderr, "%.6f %ld %d\n", elapsed.count(), usage.ru_maxrss, exit_status);
+    return 0;
+}
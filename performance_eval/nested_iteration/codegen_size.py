@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Make the project root importable when running this script directly
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+from src.Parser import Parser
+from src.cpp_transpiler import CppTranspiler
+
+# Nesting depths to measure and width of the list walked at every level
+DEPTHS = range(1, 7)
+WIDTH = 10
+
+
+# Fangless program with `depth` nested for-loops over the same list:
+def nested_program(depth: int) -> str:
+    lines = ["row = [" + ", ".join(str(i) for i in range(WIDTH)) + "]", "s = 0"]
+    for level in range(depth):
+        lines.append("    " * level + f"for x{level} in row:")
+    lines.append("    " * depth + f"s = s + x{depth - 1}")
+    lines.append("print(s)")
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    parser = Parser(debug=False)
+    parser.build(build_lexer=True)
+
+    print(f"{'depth':>5} {'lines':>7} {'bytes':>9} {'compile s':>10} {'run s':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for depth in DEPTHS:
+            ast = parser.parse(nested_program(depth))
+            cpp_code = CppTranspiler().transpile(ast)
+
+            cpp_path = os.path.join(tmp, f"nested_{depth}.cpp")
+            exe_path = os.path.join(tmp, f"nested_{depth}")
+            with open(cpp_path, "w", encoding="utf-8") as f:
+                f.write(cpp_code)
+
+            # '../c++/runtime.hpp' resolves against -I <root>/c++
+            t0 = time.perf_counter()
+            subprocess.run(
+                ["g++", "-std=c++17", "-O3", "-I", os.path.join(ROOT, "c++"),
+                 cpp_path, "-o", exe_path],
+                check=True,
+            )
+            compile_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            subprocess.run([exe_path], check=True, stdout=subprocess.DEVNULL)
+            run_s = time.perf_counter() - t0
+
+            n_lines = cpp_code.count("\n") + 1
+            print(f"{depth:>5} {n_lines:>7} {len(cpp_code):>9} {compile_s:>10.3f} {run_s:>8.3f}")
@@ -0,0 +1,136 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+PyValue make_cube(const PyValue& n);
+PyValue make_cube__int(long long n);
+PyValue cube_sum(const PyValue& cube);
+
+PyValue make_cube(const PyValue& n) {
+    PyValue cube;
+    long long i = 0;
+    long long j = 0;
+    long long k = 0;
+    PyValue plane;
+    PyValue row;
+    cube = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = n.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            plane = py_list(PyItems{});
+            {
+                long long __range_start = 0;
+                long long __range_stop = n.int_value;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    j = __i;
+                    row = py_list(PyItems{});
+                    {
+                        long long __range_start = 0;
+                        long long __range_stop = n.int_value;
+                        long long __range_step = 1;
+                        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                            k = __i;
+                            py_list_append(row, py_add(py_add(py_mul(py_mul(PyValue(i), n), n), py_mul(PyValue(j), n)), PyValue(k)));
+                        }
+                    }
+                    py_list_append(plane, std::move(row));
+                }
+            }
+            py_list_append(cube, std::move(plane));
+        }
+    }
+    return cube;
+    return PyValue();
+}
+
+PyValue make_cube__int(long long n) {
+    PyValue cube;
+    long long i = 0;
+    long long j = 0;
+    long long k = 0;
+    PyValue plane;
+    PyValue row;
+    cube = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            plane = py_list(PyItems{});
+            {
+                long long __range_start = 0;
+                long long __range_stop = n;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    j = __i;
+                    row = py_list(PyItems{});
+                    {
+                        long long __range_start = 0;
+                        long long __range_stop = n;
+                        long long __range_step = 1;
+                        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                            k = __i;
+                            py_list_append(row, PyValue(((((i * n) * n) + (j * n)) + k)));
+                        }
+                    }
+                    py_list_append(plane, std::move(row));
+                }
+            }
+            py_list_append(cube, std::move(plane));
+        }
+    }
+    return cube;
+    return PyValue();
+}
+
+PyValue cube_sum(const PyValue& cube) {
+    PyValue plane;
+    PyValue row;
+    PyValue s;
+    PyValue x;
+    s = PY_ZERO;
+    {
+        const PyValue& __iter = cube;
+        PyIterator __it(__iter);
+        while (__it.next(plane)) {
+            {
+                const PyValue& __iter = plane;
+                PyIterator __it(__iter);
+                while (__it.next(row)) {
+                    {
+                        const PyValue& __iter = row;
+                        PyIterator __it(__iter);
+                        while (__it.next(x)) {
+                            s = py_add(std::move(s), x);
+                        }
+                    }
+                }
+            }
+        }
+    }
+    return s;
+    return PyValue();
+}
+
+int main() {
+    PyValue cube;
+    long long r = 0;
+    cube = make_cube__int(60LL);
+    {
+        long long __range_start = 0;
+        long long __range_stop = 20LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            r = __i;
+            py_print(cube_sum(cube));
+        }
+    }
+    return 0;
+}
\ No newline at end of file
@@ -0,0 +1,23 @@
+def make_cube(n):
+    cube = []
+    for i in range(n):
+        plane = []
+        for j in range(n):
+            row = []
+            for k in range(n):
+                row.append(i * n * n + j * n + k)
+            plane.append(row)
+        cube.append(plane)
+    return cube
+
+def cube_sum(cube):
+    s = 0
+    for plane in cube:
+        for row in plane:
+            for x in row:
+                s = s + x
+    return s
+
+cube = make_cube(60)
+for r in range(20):
+    print(cube_sum(cube))
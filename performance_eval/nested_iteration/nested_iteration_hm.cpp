@@ -0,0 +1,41 @@
+#include <iostream>
+#include <vector>
+
+using namespace std;
+
+vector<vector<vector<long long>>> make_cube(int n) {
+    vector<vector<vector<long long>>> cube;
+    for (int i = 0; i < n; i++) {
+        vector<vector<long long>> plane;
+        for (int j = 0; j < n; j++) {
+            vector<long long> row;
+            for (int k = 0; k < n; k++) {
+                row.push_back((long long)i * n * n + j * n + k);
+            }
+            plane.push_back(row);
+        }
+        cube.push_back(plane);
+    }
+    return cube;
+}
+
+long long cube_sum(const vector<vector<vector<long long>>>& cube) {
+    long long s = 0;
+    for (const auto& plane : cube) {
+        for (const auto& row : plane) {
+            for (long long x : row) {
+                s = s + x;
+            }
+        }
+    }
+    return s;
+}
+
+int main() {
+    auto cube = make_cube(60);
+
+    for (int r = 0; r < 20; r++) {
+        cout << cube_sum(cube) << "\n";
+    }
+    return 0;
+}
@@ -0,0 +1,142 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(0.0);
+static const PyValue __const1 = PyValue(0.5);
+static const PyValue __const2 = PyValue(1500);
+static const PyValue __const3 = PyValue(2999);
+
+PyValue build(const PyValue& n);
+PyValue build__int(long long n);
+PyValue total(const PyValue& values);
+PyValue scaled_total(const PyValue& values);
+PyValue bubble_sort(PyValue values);
+
+PyValue build(const PyValue& n) {
+    long long i = 0;
+    long long seed = 0;
+    PyValue values;
+    values = py_list(PyItems{});
+    seed = 12345LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(values, PyValue(py_mod(seed, 100000LL)));
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+PyValue build__int(long long n) {
+    long long i = 0;
+    long long seed = 0;
+    PyValue values;
+    values = py_list(PyItems{});
+    seed = 12345LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(values, PyValue(py_mod(seed, 100000LL)));
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+PyValue total(const PyValue& values) {
+    PyValue s;
+    PyValue v;
+    s = PY_ZERO;
+    {
+        const PyValue& __iter = values;
+        PyIterator __it(__iter);
+        while (__it.next(v)) {
+            s = py_add(std::move(s), v);
+        }
+    }
+    return s;
+    return PyValue();
+}
+
+PyValue scaled_total(const PyValue& values) {
+    long long i = 0;
+    PyValue s;
+    s = __const0;
+    {
+        long long __range_start = 0;
+        long long __range_stop = py_len(values).int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            s = py_add(std::move(s), py_mul(py_getitem_ref(values, PyValue(i)), __const1));
+        }
+    }
+    return s;
+    return PyValue();
+}
+
+PyValue bubble_sort(PyValue values) {
+    long long i = 0;
+    long long j = 0;
+    long long n = 0;
+    PyValue t;
+    n = py_len(values).int_value;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            {
+                long long __range_start = 0;
+                long long __range_stop = (n - i) - 1LL;
+                long long __range_step = 1;
+                for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+                    j = __i;
+                    if (py_gt(py_getitem_ref(values, PyValue(j)), py_getitem_ref(values, PyValue((j + 1LL)))).is_truthy()) {
+                        t = py_getitem(values, PyValue(j));
+                        py_setitem(values, PyValue(j), py_getitem(values, PyValue((j + 1LL))));
+                        py_setitem(values, PyValue((j + 1LL)), std::move(t));
+                    }
+                }
+            }
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+int main() {
+    PyValue data;
+    long long k = 0;
+    PyValue ordered;
+    data = build__int(1000000LL);
+    {
+        long long __range_start = 0;
+        long long __range_stop = 10LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            k = __i;
+            py_print(total(data));
+        }
+    }
+    py_print(scaled_total(std::move(data)));
+    ordered = bubble_sort(build__int(3000LL));
+    py_print(py_getitem_ref(ordered, PY_ZERO));
+    py_print(py_getitem_ref(ordered, __const2));
+    py_print(py_getitem_ref(ordered, __const3));
+    return 0;
+}
\ No newline at end of file
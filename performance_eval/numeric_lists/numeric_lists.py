@@ -0,0 +1,39 @@
+def build(n):
+    values = []
+    seed = 12345
+    for i in range(n):
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        values.append(seed % 100000)
+    return values
+
+def total(values):
+    s = 0
+    for v in values:
+        s = s + v
+    return s
+
+def scaled_total(values):
+    s = 0.0
+    for i in range(len(values)):
+        s = s + values[i] * 0.5
+    return s
+
+def bubble_sort(values):
+    n = len(values)
+    for i in range(n):
+        for j in range(n - i - 1):
+            if values[j] > values[j + 1]:
+                t = values[j]
+                values[j] = values[j + 1]
+                values[j + 1] = t
+    return values
+
+data = build(1000000)
+for k in range(10):
+    print(total(data))
+print(scaled_total(data))
+
+ordered = bubble_sort(build(3000))
+print(ordered[0])
+print(ordered[1500])
+print(ordered[2999])
@@ -0,0 +1,68 @@
+#include <charconv>
+#include <iostream>
+#include <vector>
+
+using namespace std;
+
+vector<long long> build(long long n) {
+    vector<long long> values;
+    long long seed = 12345;
+    for (long long i = 0; i < n; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        values.push_back(seed % 100000);
+    }
+    return values;
+}
+
+long long total(const vector<long long>& values) {
+    long long s = 0;
+    for (long long v : values) {
+        s += v;
+    }
+    return s;
+}
+
+double scaled_total(const vector<long long>& values) {
+    double s = 0.0;
+    for (size_t i = 0; i < values.size(); i++) {
+        s += values[i] * 0.5;
+    }
+    return s;
+}
+
+// Shortest round-trip digits, with ".0" on whole numbers, like Python's float repr
+void print_float(double v) {
+    char buf[32];
+    auto res = to_chars(buf, buf + sizeof(buf), v);
+    cout.write(buf, res.ptr - buf);
+    if (v == (long long)v) cout << ".0";
+    cout << "\n";
+}
+
+vector<long long> bubble_sort(vector<long long> values) {
+    size_t n = values.size();
+    for (size_t i = 0; i < n; i++) {
+        for (size_t j = 0; j + 1 < n - i; j++) {
+            if (values[j] > values[j + 1]) {
+                long long t = values[j];
+                values[j] = values[j + 1];
+                values[j + 1] = t;
+            }
+        }
+    }
+    return values;
+}
+
+int main() {
+    vector<long long> data = build(1000000);
+    for (int k = 0; k < 10; k++) {
+        cout << total(data) << "\n";
+    }
+    print_float(scaled_total(data));
+
+    vector<long long> ordered = bubble_sort(build(3000));
+    cout << ordered[0] << "\n";
+    cout << ordered[1500] << "\n";
+    cout << ordered[2999] << "\n";
+    return 0;
+}
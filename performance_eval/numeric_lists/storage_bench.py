@@ -0,0 +1,24 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Compiles numeric_lists.py with unboxed list storage and with
+# -DFANGLESS_GENERIC_LISTS (every element boxed in a PyValue), next to the
+# hand-made version, and reports the best run time of each.
+
+if __name__ == "__main__":
+    generated = CppTranspiler().transpile(make_parser().parse(read_benchmark("numeric_lists", ".py")))
+    cache = BinaryCache()
+    print(f"{'variant':<15} {'run s':>8}")
+    for name, cpp_code, flags in (
+        ("generic lists", generated, ["-DFANGLESS_GENERIC_LISTS"]),
+        ("typed lists", generated, []),
+        ("hand-made", read_benchmark("numeric_lists", "_hm.cpp"), []),
+    ):
+        print(f"{name:<15} {best_run(compile_cpp(cache, cpp_code, flags)):>8.3f}")
@@ -0,0 +1,76 @@
+// Microbenchmarks for the PyValue binary operators: cost per operation of
+// py_add, py_mul, py_lt and py_eq for each pair of operand types.
+// Compile with something like:
+//   g++ -std=c++17 -O3 operator_bench.cpp -o operator_bench
+#include "../../c++/runtime.hpp"
+
+#include <chrono>
+
+using namespace std::chrono;
+
+const int REPEAT = 5;
+const int N = 2000000;
+
+// Applies op to every (a[i], b[i]) and prints the best time per operation.
+template <typename Op>
+void bench(const char* name, const std::vector<PyValue>& a, const std::vector<PyValue>& b, Op op) {
+    double best = 1e30;
+    long long checksum = 0;
+    try {
+        for (int r = 0; r < REPEAT; r++) {
+            checksum = 0;
+            auto t1 = high_resolution_clock::now();
+            for (std::size_t i = 0; i < a.size(); i++) {
+                PyValue result = op(a[i], b[i]);
+                if (result.type == PyValue::INT) {
+                    checksum += result.int_value;
+                } else if (result.type == PyValue::FLOAT) {
+                    checksum += static_cast<long long>(result.float_value);
+                } else {
+                    checksum += result.bool_value;
+                }
+            }
+            auto t2 = high_resolution_clock::now();
+            duration<double> d = t2 - t1;
+            best = std::min(best, d.count());
+        }
+    } catch (const std::exception& ex) {
+        std::printf("%-24s %s\n", name, ex.what());
+        return;
+    }
+    std::printf("%-24s %8.2f ns/op  (%lld)\n", name, best * 1e9 / a.size(), checksum);
+}
+
+int main() {
+    std::vector<PyValue> ints, other_ints, floats, other_floats, strings, other_strings;
+    long long seed = 12345;
+    for (int i = 0; i < N; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        ints.push_back(PyValue(seed % 1000));
+        other_ints.push_back(PyValue((seed / 1000) % 1000));
+        floats.push_back(PyValue((seed % 1000) * 0.5));
+        other_floats.push_back(PyValue((seed / 1000) % 1000 * 0.25));
+        strings.push_back(PyValue("key" + std::to_string(seed % 100)));
+        other_strings.push_back(PyValue("key" + std::to_string(seed / 100 % 100)));
+    }
+
+    auto add = [](const PyValue& x, const PyValue& y) { return py_add(x, y); };
+    auto mul = [](const PyValue& x, const PyValue& y) { return py_mul(x, y); };
+    auto lt  = [](const PyValue& x, const PyValue& y) { return py_lt(x, y); };
+    auto eq  = [](const PyValue& x, const PyValue& y) { return py_eq(x, y); };
+
+    bench("int + int", ints, other_ints, add);
+    bench("float + float", floats, other_floats, add);
+    bench("int + float", ints, other_floats, add);
+    bench("int * int", ints, other_ints, mul);
+    bench("float * int", floats, other_ints, mul);
+    bench("int < int", ints, other_ints, lt);
+    bench("float < float", floats, other_floats, lt);
+    bench("int < float", ints, other_floats, lt);
+    bench("str < str", strings, other_strings, lt);
+    bench("int == int", ints, other_ints, eq);
+    bench("int == float", ints, other_floats, eq);
+    bench("str == str", strings, other_strings, eq);
+
+    return 0;
+}
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from performance_eval.bench_utils import best_run, find_benchmarks, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Times every program in performance_eval/ compiled with -O3, and with -O3
+# plus profile-guided optimization (BinaryCache(pgo=True): instrumented
+# build, one training run, rebuild with the profile).
+
+if __name__ == "__main__":
+    parser = make_parser()
+    cache = BinaryCache()
+    print(f"{'program':<18}{'O3':>10}{'O3 + pgo':>12}{'speedup':>10}")
+    for name in find_benchmarks():
+        cpp_code = CppTranspiler().transpile(parser.parse(read_benchmark(name, ".py")))
+        plain = best_run(cache.compile(cpp_code)[0])
+        pgo = best_run(cache.compile(cpp_code, pgo=True)[0])
+        print(f"{name:<18}{plain:8.3f} s{pgo:10.3f} s{plain / pgo:9.2f}x")
@@ -0,0 +1,29 @@
+import os
+import sys
+import tempfile
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Compiles printing.py with the buffered runtime output and with
+# -DFANGLESS_LINE_BUFFERED (a flush after every line, as std::endl did),
+# next to the hand-made version, and reports the best run time of each with
+# stdout redirected to a file.
+
+if __name__ == "__main__":
+    generated = CppTranspiler().transpile(make_parser().parse(read_benchmark("printing", ".py")))
+    cache = BinaryCache()
+    print(f"{'variant':<15} {'run s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "out.txt")
+        for name, cpp_code, flags in (
+            ("line buffered", generated, ["-DFANGLESS_LINE_BUFFERED"]),
+            ("buffered", generated, []),
+            ("hand-made", read_benchmark("printing", "_hm.cpp"), []),
+        ):
+            exe_path = compile_cpp(cache, cpp_code, flags)
+            print(f"{name:<15} {best_run(exe_path, out_path=out_path):>8.3f}")
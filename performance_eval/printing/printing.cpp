@@ -0,0 +1,36 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue("done");
+
+PyValue square(const PyValue& n);
+long long square__int(long long n);
+
+PyValue square(const PyValue& n) {
+    return py_mul(n, n);
+    return PyValue();
+}
+
+long long square__int(long long n) {
+    return n * n;
+    return 0;
+}
+
+int main() {
+    long long i = 0;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 1000000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_print({PyValue(i), PyValue(square__int(i))});
+        }
+    }
+    py_print(__const0);
+    return 0;
+}
\ No newline at end of file
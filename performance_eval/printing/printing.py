@@ -0,0 +1,6 @@
+def square(n):
+    return n * n
+
+for i in range(1000000):
+    print(i, square(i))
+print("done")
@@ -0,0 +1,13 @@
+#include <cstdio>
+
+long long square(long long n) {
+    return n * n;
+}
+
+int main() {
+    for (long long i = 0; i < 1000000; i++) {
+        std::printf("%lld %lld\n", i, square(i));
+    }
+    std::printf("done\n");
+    return 0;
+}
@@ -0,0 +1,75 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(1103515245);
+static const PyValue __const1 = PyValue(12345);
+static const PyValue __const2 = PyValue(2147483648LL);
+
+PyValue build(const PyValue& n, PyValue seed, const PyValue& modulo);
+PyValue build__int_int_int(long long n, long long seed, long long modulo);
+
+PyValue build(const PyValue& n, PyValue seed, const PyValue& modulo) {
+    long long i = 0;
+    PyValue values;
+    values = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = n.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(py_add(py_mul(seed, __const0), __const1), __const2);
+            py_list_append(values, py_mod(seed, modulo));
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+PyValue build__int_int_int(long long n, long long seed, long long modulo) {
+    long long i = 0;
+    PyValue values;
+    values = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(values, PyValue(py_mod(seed, modulo)));
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+int main() {
+    PyValue a;
+    PyValue b;
+    long long found = 0;
+    PyValue x;
+    a = py_set_from_list(build__int_int_int(1000000LL, 1LL, 500000LL));
+    b = py_set_from_list(build__int_int_int(1000000LL, 2LL, 500000LL));
+    py_print(py_len(a));
+    py_print(py_len(b));
+    py_print(py_len(py_set_union(a, b)));
+    py_print(py_len(py_set_intersection(a, b)));
+    py_print(py_len(py_set_difference(a, b)));
+    found = 0LL;
+    {
+        const PyValue& __iter = build__int_int_int(1000000LL, 3LL, 1000000LL);
+        PyIterator __it(__iter);
+        while (__it.next(x)) {
+            if (py_dict_or_set_get(a, x).is_truthy()) {
+                found = found + 1LL;
+            }
+        }
+    }
+    py_print(PyValue(found));
+    return 0;
+}
\ No newline at end of file
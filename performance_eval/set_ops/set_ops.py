@@ -0,0 +1,23 @@
+def build(n, seed, modulo):
+    values = []
+    for i in range(n):
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        values.append(seed % modulo)
+    return values
+
+# Distinct values of a list with many repeats
+a = set(build(1000000, 1, 500000))
+b = set(build(1000000, 2, 500000))
+print(len(a))
+print(len(b))
+
+print(len(a.union(b)))
+print(len(a.intersection(b)))
+print(len(a.difference(b)))
+
+# Membership tests
+found = 0
+for x in build(1000000, 3, 1000000):
+    if a.get(x):
+        found = found + 1
+print(found)
@@ -0,0 +1,46 @@
+#include <iostream>
+#include <unordered_set>
+#include <vector>
+
+using namespace std;
+
+vector<long long> build(long long n, long long seed, long long modulo) {
+    vector<long long> values;
+    for (long long i = 0; i < n; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        values.push_back(seed % modulo);
+    }
+    return values;
+}
+
+int main() {
+    vector<long long> va = build(1000000, 1, 500000);
+    vector<long long> vb = build(1000000, 2, 500000);
+    unordered_set<long long> a(va.begin(), va.end());
+    unordered_set<long long> b(vb.begin(), vb.end());
+    cout << a.size() << "\n";
+    cout << b.size() << "\n";
+
+    unordered_set<long long> u = a;
+    u.insert(b.begin(), b.end());
+    unordered_set<long long> in, d;
+    for (long long x : a) {
+        if (b.count(x)) {
+            in.insert(x);
+        } else {
+            d.insert(x);
+        }
+    }
+    cout << u.size() << "\n";
+    cout << in.size() << "\n";
+    cout << d.size() << "\n";
+
+    long long found = 0;
+    for (long long x : build(1000000, 3, 1000000)) {
+        if (a.count(x)) {
+            found = found + 1;
+        }
+    }
+    cout << found << "\n";
+    return 0;
+}
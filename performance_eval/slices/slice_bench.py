@@ -0,0 +1,22 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Times slices.py transpiled and compiled with slices as views, with every
+# slice copied (-DFANGLESS_COPY_SLICES), and the hand-made C++ version.
+
+if __name__ == "__main__":
+    generated = CppTranspiler().transpile(make_parser().parse(read_benchmark("slices", ".py")))
+    cache = BinaryCache()
+    for variant, cpp_code, flags in (
+        ("views", generated, []),
+        ("copies", generated, ["-DFANGLESS_COPY_SLICES"]),
+        ("hand-made", read_benchmark("slices", "_hm.cpp"), []),
+    ):
+        print(f"{variant:<10} {best_run(compile_cpp(cache, cpp_code, flags)):8.3f} s")
@@ -0,0 +1,141 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(false);
+static const PyValue __const1 = PyValue(true);
+static const PyValue __const2 = PyValue(100000);
+static const PyValue __const3 = PyValue(199999);
+static const PyValue __const4 = PyValue(199);
+
+PyValue merge_sort(const PyValue& items);
+PyValue contains(const PyValue& items, const PyValue& target);
+bool contains__any_int(const PyValue& items, long long target);
+
+PyValue merge_sort(const PyValue& items) {
+    long long i = 0;
+    long long j = 0;
+    PyValue left;
+    PyValue merged;
+    long long mid = 0;
+    PyValue right;
+    PyValue value;
+    if (py_le(py_len(items), PY_ONE).is_truthy()) {
+        return items;
+    }
+    mid = py_floordiv(py_len(items), PY_TWO).int_value;
+    left = merge_sort(py_getslice(items, PyValue(), PyValue(mid)));
+    right = merge_sort(py_getslice(items, PyValue(mid), PyValue()));
+    merged = py_list(PyItems{});
+    i = 0LL;
+    j = 0LL;
+    while (py_and(py_lt(PyValue(i), py_len(left)), py_lt(PyValue(j), py_len(right))).is_truthy()) {
+        if (py_le(py_getitem_ref(left, PyValue(i)), py_getitem_ref(right, PyValue(j))).is_truthy()) {
+            py_list_append(merged, py_getitem(left, PyValue(i)));
+            i = i + 1LL;
+        }
+        else {
+            py_list_append(merged, py_getitem(right, PyValue(j)));
+            j = j + 1LL;
+        }
+    }
+    {
+        const PyValue& __iter = py_getslice(left, PyValue(i), PyValue());
+        PyIterator __it(__iter);
+        while (__it.next(value)) {
+            py_list_append(merged, std::move(value));
+        }
+    }
+    {
+        const PyValue& __iter = py_getslice(right, PyValue(j), PyValue());
+        PyIterator __it(__iter);
+        while (__it.next(value)) {
+            py_list_append(merged, std::move(value));
+        }
+    }
+    return merged;
+    return PyValue();
+}
+
+PyValue contains(const PyValue& items, const PyValue& target) {
+    long long mid = 0;
+    if (py_eq(py_len(items), PY_ZERO).is_truthy()) {
+        return __const0;
+    }
+    mid = py_floordiv(py_len(items), PY_TWO).int_value;
+    if (py_eq(py_getitem_ref(items, PyValue(mid)), target).is_truthy()) {
+        return __const1;
+    }
+    if (py_lt(py_getitem_ref(items, PyValue(mid)), target).is_truthy()) {
+        return contains(py_getslice(items, PyValue((mid + 1LL)), PyValue()), target);
+    }
+    return contains(py_getslice(items, PyValue(), PyValue(mid)), target);
+    return PyValue();
+}
+
+bool contains__any_int(const PyValue& items, long long target) {
+    long long mid = 0;
+    if (py_eq(py_len(items), PY_ZERO).is_truthy()) {
+        return false;
+    }
+    mid = py_floordiv(py_len(items), PY_TWO).int_value;
+    if (py_eq(py_getitem_ref(items, PyValue(mid)), PyValue(target)).is_truthy()) {
+        return true;
+    }
+    if (py_lt(py_getitem_ref(items, PyValue(mid)), PyValue(target)).is_truthy()) {
+        return contains__any_int(py_getslice(items, PyValue((mid + 1LL)), PyValue()), target);
+    }
+    return contains__any_int(py_getslice(items, PyValue(), PyValue(mid)), target);
+    return false;
+}
+
+int main() {
+    long long found = 0;
+    long long i = 0;
+    PyValue ordered;
+    long long target = 0;
+    PyValue values;
+    PyValue window;
+    PyValue window_total;
+    values = py_list(PyItems{});
+    {
+        long long __range_start = 0;
+        long long __range_stop = 200000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_list_append(values, PyValue(py_mod((i * 7919LL), 200003LL)));
+        }
+    }
+    ordered = merge_sort(values);
+    py_print({py_getitem_ref(ordered, PY_ZERO), py_getitem_ref(ordered, __const2), py_getitem_ref(ordered, __const3)});
+    found = 0LL;
+    {
+        long long __range_start = 0LL;
+        long long __range_stop = 400000LL;
+        long long __range_step = 401LL;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            target = __i;
+            if (contains__any_int(ordered, target)) {
+                found = found + 1LL;
+            }
+        }
+    }
+    py_print(PyValue(found));
+    window_total = PY_ZERO;
+    {
+        long long __range_start = 0LL;
+        long long __range_stop = 20000LL;
+        long long __range_step = 2LL;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            window = py_getslice(values, PyValue(i), PyValue((i + 200LL)));
+            window_total = py_add(py_add(py_add(std::move(window_total), py_getitem_ref(window, PY_ZERO)), py_getitem_ref(window, __const4)), py_len(window));
+        }
+    }
+    py_print(window_total);
+    return 0;
+}
\ No newline at end of file
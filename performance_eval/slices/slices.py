@@ -0,0 +1,52 @@
+# Divide and conquer on slices: merge sort splits its input with a[:mid] /
+# a[mid:] at every level, the binary search recurses on half of the list,
+# and a sliding window sums a[i:i + w] along a list.
+def merge_sort(items):
+    if len(items) <= 1:
+        return items
+    mid = len(items) // 2
+    left = merge_sort(items[:mid])
+    right = merge_sort(items[mid:])
+    merged = []
+    i = 0
+    j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i = i + 1
+        else:
+            merged.append(right[j])
+            j = j + 1
+    for value in left[i:]:
+        merged.append(value)
+    for value in right[j:]:
+        merged.append(value)
+    return merged
+
+def contains(items, target):
+    if len(items) == 0:
+        return False
+    mid = len(items) // 2
+    if items[mid] == target:
+        return True
+    if items[mid] < target:
+        return contains(items[mid + 1:], target)
+    return contains(items[:mid], target)
+
+values = []
+for i in range(200000):
+    values.append((i * 7919) % 200003)
+ordered = merge_sort(values)
+print(ordered[0], ordered[100000], ordered[199999])
+
+found = 0
+for target in range(0, 400000, 401):
+    if contains(ordered, target):
+        found = found + 1
+print(found)
+
+window_total = 0
+for i in range(0, 20000, 2):
+    window = values[i:i + 200]
+    window_total = window_total + window[0] + window[199] + len(window)
+print(window_total)
@@ -0,0 +1,66 @@
+#include <iostream>
+#include <vector>
+
+using namespace std;
+
+// Slices as (pointer, length) ranges of the same vector: nothing is copied.
+vector<long long> merge_sort(const long long* items, size_t n) {
+    if (n <= 1) {
+        return vector<long long>(items, items + n);
+    }
+    size_t mid = n / 2;
+    vector<long long> left = merge_sort(items, mid);
+    vector<long long> right = merge_sort(items + mid, n - mid);
+    vector<long long> merged;
+    size_t i = 0;
+    size_t j = 0;
+    while (i < left.size() && j < right.size()) {
+        if (left[i] <= right[j]) {
+            merged.push_back(left[i++]);
+        } else {
+            merged.push_back(right[j++]);
+        }
+    }
+    merged.insert(merged.end(), left.begin() + i, left.end());
+    merged.insert(merged.end(), right.begin() + j, right.end());
+    return merged;
+}
+
+bool contains(const long long* items, size_t n, long long target) {
+    if (n == 0) {
+        return false;
+    }
+    size_t mid = n / 2;
+    if (items[mid] == target) {
+        return true;
+    }
+    if (items[mid] < target) {
+        return contains(items + mid + 1, n - mid - 1, target);
+    }
+    return contains(items, mid, target);
+}
+
+int main() {
+    vector<long long> values;
+    for (long long i = 0; i < 200000; i++) {
+        values.push_back((i * 7919) % 200003);
+    }
+    vector<long long> ordered = merge_sort(values.data(), values.size());
+    cout << ordered[0] << " " << ordered[100000] << " " << ordered[199999] << "\n";
+
+    long long found = 0;
+    for (long long target = 0; target < 400000; target += 401) {
+        if (contains(ordered.data(), ordered.size(), target)) {
+            found = found + 1;
+        }
+    }
+    cout << found << "\n";
+
+    long long window_total = 0;
+    for (long long i = 0; i < 20000; i += 2) {
+        const long long* window = values.data() + i;
+        window_total = window_total + window[0] + window[199] + 200;
+    }
+    cout << window_total << "\n";
+    return 0;
+}
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Make the project root importable when running this script directly
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+from src.Parser import Parser
+from src.cpp_transpiler import CppTranspiler
+
+# List sizes; bubble sort is O(n^2) and only runs up to BUBBLE_LIMIT
+SIZES = [1000, 10000, 100000, 1000000]
+BUBBLE_LIMIT = 10000
+
+BUILD = """
+def build(n):
+    values = []
+    seed = 12345
+    for i in range(n):
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        values.append(seed % 1000000)
+    return values
+"""
+
+# Same bubble sort as performance_eval/bubble_sort/bubble_sort.py
+BUBBLE_SORT = """
+def bubble_sort(array):
+    n = len(array)
+    for i in range(n):
+        for j in range(0, n - i - 1):
+            if array[j] > array[j + 1]:
+                t = array[j]
+                array[j] = array[j + 1]
+                array[j + 1] = t
+    return array
+"""
+
+
+def program(n: int, algorithm: str) -> str:
+    if algorithm == "bubble":
+        return BUILD + BUBBLE_SORT + f"print(bubble_sort(build({n}))[0])\n"
+    return BUILD + f"print(sorted(build({n}))[0])\n"
+
+
+def compile_and_time(cpp_code: str, tmp: str, name: str) -> float:
+    cpp_path = os.path.join(tmp, name + ".cpp")
+    exe_path = os.path.join(tmp, name)
+    with open(cpp_path, "w", encoding="utf-8") as f:
+        f.write(cpp_code)
+    # '../c++/runtime.hpp' resolves against -I <root>/c++
+    subprocess.run(
+        ["g++", "-std=c++17", "-O3", "-I", os.path.join(ROOT, "c++"), cpp_path, "-o", exe_path],
+        check=True,
+    )
+    t0 = time.perf_counter()
+    subprocess.run([exe_path], check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    parser = Parser(debug=False)
+    parser.build(build_lexer=True)
+
+    print(f"{'n':>9} {'sorted() s':>11} {'bubble sort s':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            builtin = compile_and_time(
+                CppTranspiler().transpile(parser.parse(program(n, "sorted"))), tmp, f"sorted_{n}"
+            )
+            if n <= BUBBLE_LIMIT:
+                bubble = compile_and_time(
+                    CppTranspiler().transpile(parser.parse(program(n, "bubble"))), tmp, f"bubble_{n}"
+                )
+                bubble_text = f"{bubble:>14.3f}"
+            else:
+                bubble_text = f"{'-':>14}"
+            print(f"{n:>9} {builtin:>11.3f} {bubble_text}")
@@ -0,0 +1,65 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(500000);
+static const PyValue __const1 = PyValue(999999);
+
+PyValue build(const PyValue& n);
+PyValue build__int(long long n);
+
+PyValue build(const PyValue& n) {
+    long long i = 0;
+    long long seed = 0;
+    PyValue values;
+    values = py_list(PyItems{});
+    seed = 12345LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(values, PyValue(py_mod(seed, 1000000LL)));
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+PyValue build__int(long long n) {
+    long long i = 0;
+    long long seed = 0;
+    PyValue values;
+    values = py_list(PyItems{});
+    seed = 12345LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(values, PyValue(py_mod(seed, 1000000LL)));
+        }
+    }
+    return values;
+    return PyValue();
+}
+
+int main() {
+    PyValue data;
+    PyValue ordered;
+    data = build__int(1000000LL);
+    ordered = py_sorted(data);
+    py_print(py_getitem_ref(ordered, PY_ZERO));
+    py_print(py_getitem_ref(ordered, __const0));
+    py_print(py_getitem_ref(ordered, __const1));
+    py_list_sort(data);
+    py_print(py_getitem_ref(data, __const1));
+    return 0;
+}
\ No newline at end of file
@@ -0,0 +1,16 @@
+def build(n):
+    values = []
+    seed = 12345
+    for i in range(n):
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        values.append(seed % 1000000)
+    return values
+
+data = build(1000000)
+ordered = sorted(data)
+print(ordered[0])
+print(ordered[500000])
+print(ordered[999999])
+
+data.sort()
+print(data[999999])
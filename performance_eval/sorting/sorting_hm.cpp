@@ -0,0 +1,28 @@
+#include <algorithm>
+#include <iostream>
+#include <vector>
+
+using namespace std;
+
+vector<long long> build(long long n) {
+    vector<long long> values;
+    long long seed = 12345;
+    for (long long i = 0; i < n; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        values.push_back(seed % 1000000);
+    }
+    return values;
+}
+
+int main() {
+    vector<long long> data = build(1000000);
+    vector<long long> ordered = data;
+    sort(ordered.begin(), ordered.end());
+    cout << ordered[0] << "\n";
+    cout << ordered[500000] << "\n";
+    cout << ordered[999999] << "\n";
+
+    sort(data.begin(), data.end());
+    cout << data[999999] << "\n";
+    return 0;
+}
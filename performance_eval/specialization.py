@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Benchmarks compared against their hand-made C++ version, and the default
+# upper bound of their driver loop (the committed programs go up to 50,
+# which takes minutes for the generic recursive version):
+BENCHMARKS = {"fibonacci_rec": 32, "fibonacci_it": 50}
+
+
+# Replaces the driver loop bound, failing loudly if the source changed:
+def with_limit(source: str, old: str, new: str) -> str:
+    if old not in source:
+        raise SystemExit(f"Driver loop '{old}' not found, update {__file__}")
+    return source.replace(old, new)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(
+        description="Generic vs specialized generated C++ vs hand-made C++"
+    )
+    arg_parser.add_argument("--limit", type=int, help="driver loop bound (default per benchmark)")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per binary, best is kept")
+    args = arg_parser.parse_args()
+
+    parser = make_parser()
+    cache = BinaryCache()
+
+    print(f"{'benchmark':<15} {'n':>4} {'generic s':>10} {'specialized s':>14} {'hand-made s':>12} {'speedup':>8}")
+
+    for name, default_limit in BENCHMARKS.items():
+        limit = args.limit or default_limit
+        source = with_limit(read_benchmark(name, ".py"), "range(1, 51)", f"range(1, {limit + 1})")
+        hand_made = with_limit(read_benchmark(name, "_hm.cpp"), "i <= 50", f"i <= {limit}")
+
+        ast = parser.parse(source)
+        times = {}
+        for variant, cpp_code in (
+            ("generic", CppTranspiler(specialize=False).transpile(ast)),
+            ("specialized", CppTranspiler().transpile(ast)),
+            ("hand-made", hand_made),
+        ):
+            times[variant] = best_run(compile_cpp(cache, cpp_code), args.repeat)
+
+        speedup = times["generic"] / times["specialized"]
+        print(f"{name:<15} {limit:>4} {times['generic']:>10.3f} {times['specialized']:>14.3f} "
+              f"{times['hand-made']:>12.3f} {speedup:>7.1f}x")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Make the project root importable when running this script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from performance_eval.bench_utils import best_run, compile_cpp, make_parser, read_benchmark
+from src.build import BinaryCache
+from src.cpp_transpiler import CppTranspiler
+
+# Times string_loops.py transpiled with literals constructed where they
+# appear, with literals hoisted into the constant table, and the hand-made
+# C++ version.
+
+if __name__ == "__main__":
+    ast = make_parser().parse(read_benchmark("string_loops", ".py"))
+    cache = BinaryCache()
+    for variant, cpp_code in (
+        ("inline literals", CppTranspiler(hoist_constants=False).transpile(ast)),
+        ("hoisted literals", CppTranspiler().transpile(ast)),
+        ("hand-made", read_benchmark("string_loops", "_hm.cpp")),
+    ):
+        print(f"{variant:<17} {best_run(compile_cpp(cache, cpp_code)):8.3f} s")
@@ -0,0 +1,84 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue("if");
+static const PyValue __const1 = PyValue("while");
+static const PyValue __const2 = PyValue("return");
+static const PyValue __const3 = PyValue("total");
+static const PyValue __const4 = PyValue("index");
+static const PyValue __const5 = PyValue("value");
+static const PyValue __const6 = PyValue("+");
+static const PyValue __const7 = PyValue("-");
+static const PyValue __const8 = PyValue("42");
+static const PyValue __const9 = PyValue("3.14");
+static const PyValue __const10 = PyValue("keyword");
+static const PyValue __const11 = PyValue("operator");
+static const PyValue __const12 = PyValue("number");
+static const PyValue __const13 = PyValue("name");
+static const PyValue __const14 = PyValue("<token kind=");
+static const PyValue __const15 = PyValue(" text=");
+static const PyValue __const16 = PyValue(">");
+
+int main() {
+    PyValue counts;
+    long long i = 0;
+    PyValue kind;
+    PyValue label;
+    long long label_chars = 0;
+    long long rep = 0;
+    long long seed = 0;
+    PyValue token;
+    PyValue tokens;
+    PyValue words;
+    words = py_list(PyItems{ __const0, __const1, __const2, __const3, __const4, __const5, __const6, __const7, __const8, __const9 });
+    tokens = py_list(PyItems{});
+    seed = 12345LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 100000LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(tokens, py_getitem(words, PyValue(py_mod(py_floordiv(seed, 65536LL), 10LL))));
+        }
+    }
+    counts = py_dict(PyPairs{ py_pair(__const10, PY_ZERO), py_pair(__const11, PY_ZERO), py_pair(__const12, PY_ZERO), py_pair(__const13, PY_ZERO) });
+    label_chars = 0LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = 10LL;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            rep = __i;
+            {
+                const PyValue& __iter = tokens;
+                PyIterator __it(__iter);
+                while (__it.next(token)) {
+                    if (py_or(py_or(py_eq(token, __const0), py_eq(token, __const1)), py_eq(token, __const2)).is_truthy()) {
+                        kind = __const10;
+                    }
+                    else if (py_or(py_eq(token, __const6), py_eq(token, __const7)).is_truthy()) {
+                        kind = __const11;
+                    }
+                    else if (py_or(py_eq(token, __const8), py_eq(token, __const9)).is_truthy()) {
+                        kind = __const12;
+                    }
+                    else {
+                        kind = __const13;
+                    }
+                    py_setitem(counts, kind, py_add(py_getitem_ref(counts, kind), PY_ONE));
+                    label = py_add(py_add(py_add(py_add(__const14, kind), __const15), token), __const16);
+                    label_chars = py_add(PyValue(label_chars), py_len(label)).int_value;
+                }
+            }
+        }
+    }
+    py_print({py_getitem_ref(counts, __const10), py_getitem_ref(counts, __const11), py_getitem_ref(counts, __const12), py_getitem_ref(counts, __const13)});
+    py_print(PyValue(label_chars));
+    return 0;
+}
\ No newline at end of file
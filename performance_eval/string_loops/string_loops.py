@@ -0,0 +1,28 @@
+# String literals in hot loops: every token is compared against keyword
+# literals, counted in a dict under a literal key and wrapped in a label
+# built from literals.
+words = ["if", "while", "return", "total", "index", "value", "+", "-", "42", "3.14"]
+tokens = []
+seed = 12345
+for i in range(100000):
+    seed = (seed * 1103515245 + 12345) % 2147483648
+    tokens.append(words[(seed // 65536) % 10])
+
+counts = {"keyword": 0, "operator": 0, "number": 0, "name": 0}
+label_chars = 0
+for rep in range(10):
+    for token in tokens:
+        if token == "if" or token == "while" or token == "return":
+            kind = "keyword"
+        elif token == "+" or token == "-":
+            kind = "operator"
+        elif token == "42" or token == "3.14":
+            kind = "number"
+        else:
+            kind = "name"
+        counts[kind] = counts[kind] + 1
+        label = "<token kind=" + kind + " text=" + token + ">"
+        label_chars = label_chars + len(label)
+
+print(counts["keyword"], counts["operator"], counts["number"], counts["name"])
+print(label_chars)
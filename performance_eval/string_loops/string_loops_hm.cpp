@@ -0,0 +1,40 @@
+#include <iostream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+using namespace std;
+
+int main() {
+    const vector<string> words = {"if", "while", "return", "total", "index", "value", "+", "-", "42", "3.14"};
+    vector<string> tokens;
+    long long seed = 12345;
+    for (long long i = 0; i < 100000; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        tokens.push_back(words[(seed / 65536) % 10]);
+    }
+
+    unordered_map<string, long long> counts = {{"keyword", 0}, {"operator", 0}, {"number", 0}, {"name", 0}};
+    long long label_chars = 0;
+    for (int rep = 0; rep < 10; rep++) {
+        for (const string& token : tokens) {
+            string kind;
+            if (token == "if" || token == "while" || token == "return") {
+                kind = "keyword";
+            } else if (token == "+" || token == "-") {
+                kind = "operator";
+            } else if (token == "42" || token == "3.14") {
+                kind = "number";
+            } else {
+                kind = "name";
+            }
+            counts[kind] += 1;
+            string label = "<token kind=" + kind + " text=" + token + ">";
+            label_chars += label.size();
+        }
+    }
+
+    cout << counts["keyword"] << " " << counts["operator"] << " " << counts["number"] << " " << counts["name"] << "\n";
+    cout << label_chars << "\n";
+    return 0;
+}
@@ -0,0 +1,73 @@
+import glob
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Make the project root importable when running this script directly
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from src.Parser import Parser
+from src.build import BinaryCache, CompileError
+from src.bytecode import BytecodeCompiler, BytecodeError
+from src.cpp_transpiler import CppTranspiler
+from src.vm import VM, VMError
+from src.workload import VM_BUDGET, estimate_steps
+
+# Latency of every program in tests/ from its AST to the end of its output:
+# bytecode compile + VM run against transpile + g++ (never cached) + run of
+# the binary. Also checks that both print the same and shows the engine
+# main.py --engine auto would pick.
+TESTS = os.path.join(ROOT, "tests")
+REPEAT = 3
+
+
+def vm_latency(ast):
+    best = float("inf")
+    for _ in range(REPEAT):
+        out = io.StringIO()
+        t0 = time.perf_counter()
+        try:
+            VM(BytecodeCompiler().compile(ast), out).run()
+            failed = False
+        except VMError:
+            failed = True
+        best = min(best, time.perf_counter() - t0)
+    return best, out.getvalue(), failed
+
+
+def native_latency(ast, cache: BinaryCache):
+    t0 = time.perf_counter()
+    exe_path, _ = cache.compile(CppTranspiler().transpile(ast))
+    result = subprocess.run([exe_path], capture_output=True, text=True)
+    return time.perf_counter() - t0, result.stdout, result.returncode != 0
+
+
+if __name__ == "__main__":
+    parser = Parser(debug=False)
+    parser.build(build_lexer=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = BinaryCache(tmp, enabled=False)
+        print(f"{'program':<26}{'vm':>10}{'g++ + run':>12}{'speedup':>10}{'same':>6}{'auto':>8}")
+        for path in sorted(glob.glob(os.path.join(TESTS, "test_*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            parser.errors.clear()  # shared with the lexer, kept across parses
+            with open(path, encoding="utf-8") as f:
+                ast = parser.parse(f.read())
+            if parser.errors:
+                print(f"{name:<26}parse errors")
+                continue
+            try:
+                vm_time, vm_out, vm_failed = vm_latency(ast)
+                native_time, native_out, native_failed = native_latency(ast, cache)
+            except (NotImplementedError, BytecodeError, CompileError) as e:
+                print(f"{name:<26}skipped: {str(e).splitlines()[0]}")
+                continue
+            same = "yes" if (vm_out, vm_failed) == (native_out, native_failed) else "NO"
+            auto = "vm" if estimate_steps(ast) <= VM_BUDGET else "native"
+            print(f"{name:<26}{vm_time * 1000:7.1f} ms{native_time:10.3f} s"
+                  f"{native_time / vm_time:9.0f}x{same:>6}{auto:>8}")
@@ -0,0 +1,98 @@
+// Generated by simple Fangless Python transpiler
+#include "../../c++/runtime.hpp"
+
+// Compile with something like:
+//   g++ -std=c++17 -O3 output.cpp -o program
+
+// Literals, constructed once:
+static const PyValue __const0 = PyValue("casa");
+static const PyValue __const1 = PyValue("perro");
+static const PyValue __const2 = PyValue("gato");
+static const PyValue __const3 = PyValue("arbol");
+static const PyValue __const4 = PyValue("rio");
+static const PyValue __const5 = PyValue("luz");
+static const PyValue __const6 = PyValue("mar");
+static const PyValue __const7 = PyValue("sol");
+static const PyValue __const8 = PyValue("pan");
+static const PyValue __const9 = PyValue("flor");
+static const PyValue __const10 = PyValue("casa7");
+static const PyValue __const11 = PyValue("sol4999");
+
+PyValue make_words(const PyValue& n);
+PyValue make_words__int(long long n);
+PyValue count_words(const PyValue& words);
+
+PyValue make_words(const PyValue& n) {
+    long long i = 0;
+    long long seed = 0;
+    PyValue stems;
+    PyValue words;
+    stems = py_list(PyItems{ __const0, __const1, __const2, __const3, __const4, __const5, __const6, __const7, __const8, __const9 });
+    words = py_list(PyItems{});
+    seed = 42LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n.int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(words, py_add(py_getitem(stems, PyValue(py_mod(py_floordiv(seed, 65536LL), 10LL))), py_str(PyValue(py_mod(py_floordiv(seed, 16LL), 5000LL)))));
+        }
+    }
+    return words;
+    return PyValue();
+}
+
+PyValue make_words__int(long long n) {
+    long long i = 0;
+    long long seed = 0;
+    PyValue stems;
+    PyValue words;
+    stems = py_list(PyItems{ __const0, __const1, __const2, __const3, __const4, __const5, __const6, __const7, __const8, __const9 });
+    words = py_list(PyItems{});
+    seed = 42LL;
+    {
+        long long __range_start = 0;
+        long long __range_stop = n;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            seed = py_mod(((seed * 1103515245LL) + 12345LL), 2147483648LL);
+            py_list_append(words, py_add(py_getitem(stems, PyValue(py_mod(py_floordiv(seed, 65536LL), 10LL))), py_str(PyValue(py_mod(py_floordiv(seed, 16LL), 5000LL)))));
+        }
+    }
+    return words;
+    return PyValue();
+}
+
+PyValue count_words(const PyValue& words) {
+    PyValue counts;
+    PyValue w;
+    counts = py_dict(PyPairs{});
+    {
+        const PyValue& __iter = words;
+        PyIterator __it(__iter);
+        while (__it.next(w)) {
+            if (py_dict_or_set_get(counts, w).is_truthy()) {
+                py_setitem(counts, w, py_add(py_getitem_ref(counts, w), PY_ONE));
+            }
+            else {
+                py_setitem(counts, w, PY_ONE);
+            }
+        }
+    }
+    return counts;
+    return PyValue();
+}
+
+int main() {
+    PyValue counts;
+    PyValue words;
+    words = make_words__int(1000000LL);
+    counts = count_words(std::move(words));
+    py_print(py_len(counts));
+    py_print(py_getitem_ref(counts, __const10));
+    py_print(py_getitem_ref(counts, __const11));
+    return 0;
+}
\ No newline at end of file
@@ -0,0 +1,23 @@
+def make_words(n):
+    stems = ["casa", "perro", "gato", "arbol", "rio", "luz", "mar", "sol", "pan", "flor"]
+    words = []
+    seed = 42
+    for i in range(n):
+        seed = (seed * 1103515245 + 12345) % 2147483648
+        words.append(stems[(seed // 65536) % 10] + str((seed // 16) % 5000))
+    return words
+
+def count_words(words):
+    counts = {}
+    for w in words:
+        if counts.get(w):
+            counts[w] = counts[w] + 1
+        else:
+            counts[w] = 1
+    return counts
+
+words = make_words(1000000)
+counts = count_words(words)
+print(len(counts))
+print(counts["casa7"])
+print(counts["sol4999"])
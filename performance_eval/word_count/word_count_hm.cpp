@@ -0,0 +1,34 @@
+#include <iostream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+using namespace std;
+
+vector<string> make_words(long long n) {
+    const vector<string> stems = {"casa", "perro", "gato", "arbol", "rio", "luz", "mar", "sol", "pan", "flor"};
+    vector<string> words;
+    long long seed = 42;
+    for (long long i = 0; i < n; i++) {
+        seed = (seed * 1103515245 + 12345) % 2147483648LL;
+        words.push_back(stems[(seed / 65536) % 10] + to_string((seed / 16) % 5000));
+    }
+    return words;
+}
+
+unordered_map<string, long long> count_words(const vector<string>& words) {
+    unordered_map<string, long long> counts;
+    for (const string& w : words) {
+        counts[w] += 1;
+    }
+    return counts;
+}
+
+int main() {
+    vector<string> words = make_words(1000000);
+    unordered_map<string, long long> counts = count_words(words);
+    cout << counts.size() << "\n";
+    cout << counts["casa7"] << "\n";
+    cout << counts["sol4999"] << "\n";
+    return 0;
+}
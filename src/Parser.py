@@ -23,6 +23,7 @@ from src.ast_nodes import (
     Call,
     Attribute,
     Index,
+    Slice,
     ListLiteral,
     TupleLiteral,
     DictLiteral,
@@ -374,6 +375,16 @@ class Parser:
         """primary : primary LBRACKET expression RBRACKET"""
         p[0] = Index(value=p[1], index=p[3])
 
+    def p_primary_slice(self, p):
+        """primary : primary LBRACKET slice_bound COLON slice_bound RBRACKET"""
+        p[0] = Slice(value=p[1], lower=p[3], upper=p[5])
+
+    def p_slice_bound(self, p):
+        """slice_bound : expression
+        | empty"""
+        # An omitted bound is None:
+        p[0] = None if p[1] == [] else p[1]
+
     def p_primary_atom(self, p):
         """primary : atom"""
         p[0] = p[1]
@@ -43,6 +43,18 @@ class Assign(Node):
     value: Node
 
 
+# Augmented assignment op --> BinaryOp op (x += y is x = x + y):
+AUGMENTED_OPS = {
+    "PLUS_EQUAL": "ADD",
+    "MINUS_EQUAL": "MINUS",
+    "TIMES_EQUAL": "TIMES",
+    "DIVIDE_EQUAL": "DIVIDE",
+    "MODULE_EQUAL": "MODULE",
+    "FLOORDIV_EQUAL": "FLOORDIV",
+    "POWER_EQUAL": "POWER",
+}
+
+
 # Reserved words:
 
 @dataclass
@@ -134,6 +146,12 @@ class Index(Node): # value[index]
     value: Node
     index: Node
 
+@dataclass
+class Slice(Node): # value[lower:upper], a bound may be omitted (None)
+    value: Node
+    lower: Optional[Node] = None
+    upper: Optional[Node] = None
+
 @dataclass
 class ListLiteral(Node): # [1, 2, 3]
     elements: List[Node] = field(default_factory=list)
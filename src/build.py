@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+# Compiles generated C++ and caches the binaries. A binary is stored under
+# the hash of everything that determines it: the generated code, the
+# runtime headers and the compiler command, so compiling an unchanged
+# program again skips g++.
+#
+# With pgo=True the binary is built with profile-guided optimization: an
+# instrumented build (-fprofile-generate) runs the program once, and the
+# program is compiled again with -fprofile-use. The profile is kept in
+# <key>.pgo/ next to the binary; the key hashes the generated code, so a
+# changed program never reuses an old profile.
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RUNTIME_DIR = os.path.join(ROOT, "c++")
+RUNTIME_HEADERS = ("runtime.hpp", "runtime_cold.hpp")
+
+CXX = "g++"
+CXXFLAGS = ["-std=c++17"]
+
+# Optimization profiles, selected with main.py --profile
+PROFILES: Dict[str, List[str]] = {
+    "O2": ["-O2"],
+    "O3": ["-O3"],
+    "native": ["-O3", "-march=native"],
+    "lto": ["-O3", "-flto"],
+    "native-lto": ["-O3", "-march=native", "-flto"],
+}
+DEFAULT_PROFILE = "O3"
+
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get("FANGLESS_CACHE", os.path.join(cache_home, "fangless"))
+
+
+# Full compiler command for a profile, without the input and output files:
+def compile_command(profile: str, extra_flags: Optional[List[str]] = None) -> List[str]:
+    # '../c++/runtime.hpp' of the generated code resolves against -I <root>/c++
+    return [CXX, *CXXFLAGS, *PROFILES[profile], *(extra_flags or []), "-I", RUNTIME_DIR]
+
+
+# Hash of the generated code, the runtime headers and the compiler command:
+def cache_key(cpp_code: str, command: List[str]) -> str:
+    digest = hashlib.sha256()
+    digest.update(cpp_code.encode("utf-8"))
+    for name in RUNTIME_HEADERS:
+        with open(os.path.join(RUNTIME_DIR, name), "rb") as f:
+            digest.update(f.read())
+    digest.update("\0".join(command).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class BinaryCache:
+    def __init__(self, directory: Optional[str] = None, enabled: bool = True):
+        self.directory = directory or default_cache_dir()
+        self.enabled = enabled
+        # (stage, seconds) of the last compile(), when it ran g++
+        self.stages: List[Tuple[str, float]] = []
+
+    # Path of the binary for cpp_code, compiled only when it is not cached.
+    # source_name is the file g++ names in errors and __builtin_FILE (the
+    # --alloc-stats sites), e.g. the .cpp saved next to the program, instead
+    # of the temporary program.cpp. Returns (path, True if it came from the cache):
+    def compile(self, cpp_code: str, profile: str = DEFAULT_PROFILE,
+                extra_flags: Optional[List[str]] = None, pgo: bool = False,
+                source_name: Optional[str] = None) -> Tuple[str, bool]:
+        if source_name is not None:
+            escaped = source_name.replace("\\", "\\\\").replace('"', '\\"')
+            cpp_code = f'#line 1 "{escaped}"\n{cpp_code}'
+        command = compile_command(profile, extra_flags)
+        exe_path = os.path.join(self.directory, cache_key(cpp_code, command + ["pgo"] * pgo))
+        self.stages = []
+        if self.enabled and os.path.exists(exe_path):
+            return exe_path, True
+
+        os.makedirs(self.directory, exist_ok=True)
+        if pgo:
+            self.compile_pgo(cpp_code, command, exe_path)
+            return exe_path, False
+        with tempfile.TemporaryDirectory(dir=self.directory) as tmp:
+            cpp_path = os.path.join(tmp, "program.cpp")
+            with open(cpp_path, "w", encoding="utf-8") as f:
+                f.write(cpp_code)
+            tmp_exe = os.path.join(tmp, "program")
+            self.run_stage("compile", [*command, cpp_path, "-o", tmp_exe])
+            # Renamed into place, so a concurrent build never sees half a binary
+            os.replace(tmp_exe, exe_path)
+        return exe_path, False
+
+    # Instrumented build, training run, optimized build. The profile
+    # (program.gcda) is only found again under the same file names, so both
+    # builds run in the same work directory:
+    def compile_pgo(self, cpp_code: str, command: List[str], exe_path: str) -> None:
+        work = exe_path + ".pgo"
+        shutil.rmtree(work, ignore_errors=True)  # left by an interrupted build
+        os.makedirs(work)
+        with open(os.path.join(work, "program.cpp"), "w", encoding="utf-8") as f:
+            f.write(cpp_code)
+
+        build = ["program.cpp", "-o", "program"]
+        self.run_stage("compile (instrumented)", [*command, "-fprofile-generate", *build], cwd=work)
+        # The program is its own training input. A run that ends in an
+        # uncaught error writes no profile, and -fprofile-use then builds
+        # the program as without PGO.
+        start = time.perf_counter()
+        subprocess.run([os.path.join(work, "program")], cwd=work,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.stages.append(("train", time.perf_counter() - start))
+        self.run_stage("compile (pgo)", [*command, "-fprofile-use", "-fprofile-correction", *build], cwd=work)
+        os.replace(os.path.join(work, "program"), exe_path)
+
+    def run_stage(self, stage: str, command: List[str], cwd: Optional[str] = None) -> None:
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+        self.stages.append((stage, time.perf_counter() - start))
+        if result.returncode != 0:
+            raise CompileError(result.stderr)
+
+
+class CompileError(Exception):
+    pass
@@ -0,0 +1,621 @@
+from __future__ import annotations
+
+import ast as py_ast
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.ast_nodes import (
+    AUGMENTED_OPS,
+    Program,
+    FunctionDef,
+    Name,
+    Constant,
+    Assign,
+    Return,
+    Pass,
+    Break,
+    Continue,
+    If,
+    While,
+    For,
+    Call,
+    BinaryOp,
+    UnaryOp,
+    ListLiteral,
+    TupleLiteral,
+    DictLiteral,
+    Index,
+    Slice,
+    Attribute,
+    Node,
+)
+
+# Bytecode for the VM (src/vm.py), which runs a program without compiling
+# any C++.
+#
+# Every function, and "main" for the global statements, becomes a Code: a
+# flat array of ints where each opcode is followed by its operands
+# (OPERANDS says how many), plus a constant pool. Variables are slots
+# numbered at compile time, parameters first, so a frame is a plain list
+# and no name is looked up at run time. The state of a for loop (range
+# counter, stop and step, or the iterator) lives in hidden slots after the
+# variables. Jump targets are positions in the array.
+#
+# The compiler accepts what CppTranspiler accepts, and rejects with a
+# BytecodeError what g++ would reject in the generated C++ (undefined
+# names, calls with the wrong number of arguments).
+
+# Opcodes without operands:
+POP = 0
+DUP = 1
+ADD = 2
+SUB = 3
+MUL = 4
+DIV = 5
+MOD = 6
+FLOORDIV = 7
+POW = 8
+EQ = 9
+NE = 10
+LT = 11
+LE = 12
+GT = 13
+GE = 14
+AND = 15
+OR = 16
+NOT = 17
+NEG = 18
+GET_ITEM = 19
+SET_ITEM = 20
+GET_SLICE = 21
+RETURN = 22
+
+# One operand:
+LOAD_CONST = 23      # constant index
+LOAD_LOCAL = 24      # slot
+STORE_LOCAL = 25     # slot
+JUMP = 26            # target
+JUMP_IF_FALSE = 27   # target (pops the condition)
+BUILD_LIST = 28      # number of elements
+BUILD_TUPLE = 29     # number of elements
+BUILD_DICT = 30      # number of key / value pairs
+CALL = 31            # function index (its parameter count of arguments)
+CALL_BUILTIN = 32    # index in BUILTINS
+CALL_METHOD = 33     # index in METHODS (receiver below the arguments)
+PRINT = 34           # number of arguments
+RANGE_INIT = 35      # first of 3 hidden slots: counter, stop, step
+GET_ITER = 36        # hidden slot for the iterator
+
+# Three operands (hidden slot, loop variable slot, exit target):
+FOR_RANGE = 37
+FOR_ITER = 38
+
+# Fused instructions for the commonest sequences:
+LOAD_LOCAL_LOCAL = 39    # slot, slot
+LOAD_LOCAL_CONST = 40    # slot, constant index
+INCREMENT = 41           # slot, constant index: slot = slot + constant
+COMPARE_JUMP = 42        # comparison opcode, target: jump if false
+
+OPCODE_NAMES = [
+    "POP", "DUP", "ADD", "SUB", "MUL", "DIV", "MOD", "FLOORDIV", "POW",
+    "EQ", "NE", "LT", "LE", "GT", "GE", "AND", "OR", "NOT", "NEG",
+    "GET_ITEM", "SET_ITEM", "GET_SLICE", "RETURN",
+    "LOAD_CONST", "LOAD_LOCAL", "STORE_LOCAL", "JUMP", "JUMP_IF_FALSE",
+    "BUILD_LIST", "BUILD_TUPLE", "BUILD_DICT", "CALL", "CALL_BUILTIN", "CALL_METHOD",
+    "PRINT", "RANGE_INIT", "GET_ITER", "FOR_RANGE", "FOR_ITER",
+    "LOAD_LOCAL_LOCAL", "LOAD_LOCAL_CONST", "INCREMENT", "COMPARE_JUMP",
+]
+
+OPERANDS = [0] * LOAD_CONST + [1] * (FOR_RANGE - LOAD_CONST) + [3] * 2 + [2] * 4
+
+# AST operator --> opcode:
+BINARY_OPCODES = {
+    "ADD": ADD,
+    "MINUS": SUB,
+    "TIMES": MUL,
+    "DIVIDE": DIV,
+    "MODULE": MOD,
+    "FLOORDIV": FLOORDIV,
+    "POWER": POW,
+    "EQUAL_EQUAL": EQ,
+    "NOT_EQUAL": NE,
+    "LESS": LT,
+    "LESS_EQUAL": LE,
+    "GREATER": GT,
+    "GREATER_EQUAL": GE,
+    "AND": AND,
+    "OR": OR,
+}
+COMPARE_OPCODES = (EQ, NE, LT, LE, GT, GE)
+
+# Builtins callable as f(x), and container methods with their argument
+# counts (add is set.add with one argument, dict.add with two):
+BUILTINS = ("str", "len", "set", "sorted")
+METHODS = (
+    ("append", 1),
+    ("sublist", 2),
+    ("sort", 0),
+    ("add", 1),
+    ("add", 2),
+    ("get", 1),
+    ("union", 1),
+    ("intersection", 1),
+    ("difference", 1),
+    ("remove", 1),
+)
+MUTATING_METHODS = ("append", "add", "remove", "sort")
+METHOD_ARGUMENTS = {
+    "append": "exactly 1 argument",
+    "sublist": "exactly 2 arguments",
+    "sort": "no arguments",
+    "add": "1 or 2 arguments",
+    "get": "exactly 1 argument",
+    "union": "exactly 1 argument",
+    "intersection": "exactly 1 argument",
+    "difference": "exactly 1 argument",
+    "remove": "exactly 1 argument",
+}
+
+
+class BytecodeError(Exception):
+    pass
+
+
+@dataclass
+class Code:
+    name: str
+    params: int
+    slots: List[str] = field(default_factory=list)   # hidden slots are named ".<n>"
+    ops: array = field(default_factory=lambda: array("i"))
+    constants: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class BytecodeProgram:
+    functions: List[Code] = field(default_factory=list)
+    main: Optional[Code] = None
+
+
+# Names a function (or main) keeps in slots: whatever is assigned, used as
+# a loop variable or changed by a method call, like the locals CppTranspiler
+# declares.
+def local_names(stmts: List[Node]) -> List[str]:
+    names: Dict[str, None] = {}
+
+    def expression(node: Optional[Node]) -> None:
+        if isinstance(node, Call):
+            if (isinstance(node.func, Attribute) and isinstance(node.func.value, Name)
+                    and node.func.attr.id in MUTATING_METHODS):
+                names[node.func.value.id] = None
+            for arg in node.args:
+                expression(arg)
+        elif isinstance(node, BinaryOp):
+            expression(node.left)
+            expression(node.right)
+        elif isinstance(node, UnaryOp):
+            expression(node.operand)
+        elif isinstance(node, (ListLiteral, TupleLiteral)):
+            for element in node.elements:
+                expression(element)
+        elif isinstance(node, DictLiteral):
+            for pair in node.pairs:
+                expression(pair.key)
+                expression(pair.value)
+        elif isinstance(node, Index):
+            expression(node.value)
+            expression(node.index)
+        elif isinstance(node, Slice):
+            expression(node.value)
+            expression(node.lower)
+            expression(node.upper)
+
+    def block(body: List[Node]) -> None:
+        for stmt in body:
+            if isinstance(stmt, Assign):
+                if isinstance(stmt.target, Name):
+                    names[stmt.target.id] = None
+                elif isinstance(stmt.target, Index) and isinstance(stmt.target.value, Name):
+                    names[stmt.target.value.id] = None
+                expression(stmt.value)
+            elif isinstance(stmt, Return):
+                expression(stmt.value)
+            elif isinstance(stmt, If):
+                expression(stmt.condition)
+                block(stmt.body)
+                for elif_clause in stmt.elifs:
+                    expression(elif_clause.condition)
+                    block(elif_clause.body)
+                block(stmt.orelse)
+            elif isinstance(stmt, While):
+                expression(stmt.condition)
+                block(stmt.body)
+            elif isinstance(stmt, For):
+                names[stmt.target.id] = None
+                expression(stmt.iterable)
+                block(stmt.body)
+            elif isinstance(stmt, Call):
+                expression(stmt)
+
+    block(stmts)
+    return list(names)
+
+
+class BytecodeCompiler:
+    def __init__(self) -> None:
+        self.function_index: Dict[str, int] = {}
+        self.arity: List[int] = []
+        self.code: Optional[Code] = None
+        self.ops: List[int] = []
+        self.slot: Dict[str, int] = {}
+        self.constant_index: Dict[Tuple[type, Any], int] = {}
+        # (continue target, break jumps to patch) of the enclosing loops:
+        self.loops: List[Tuple[int, List[int]]] = []
+
+    def compile(self, program: Program) -> BytecodeProgram:
+        functions: List[FunctionDef] = []
+        globals: List[Node] = []
+        for node in program.body:
+            if isinstance(node, FunctionDef):
+                functions.append(node)
+            else:
+                globals.append(node)
+
+        # Every function is known before any body is compiled, so calls can
+        # go forward (the C++ declares them all first):
+        for func in functions:
+            if func.name.id in self.function_index:
+                raise BytecodeError(f"function '{func.name.id}' is defined twice")
+            self.function_index[func.name.id] = len(self.arity)
+            self.arity.append(len(func.params))
+
+        result = BytecodeProgram()
+        for func in functions:
+            params = [p.name.id for p in func.params]
+            result.functions.append(self.compile_code(func.name.id, params, func.body))
+        result.main = self.compile_code("main", [], globals)
+        return result
+
+    def compile_code(self, name: str, params: List[str], body: List[Node]) -> Code:
+        slots = list(params) + [n for n in local_names(body) if n not in params]
+        self.code = Code(name, len(params), slots)
+        self.ops = []
+        self.slot = {n: i for i, n in enumerate(slots)}
+        self.constant_index = {}
+
+        for stmt in body:
+            self.statement(stmt)
+        # Falling off the end returns None:
+        self.emit(LOAD_CONST, self.constant(None))
+        self.emit(RETURN)
+
+        self.code.ops = array("i", self.ops)
+        code, self.code = self.code, None
+        return code
+
+    def emit(self, opcode: int, *operands: int) -> int:
+        self.ops.append(opcode)
+        self.ops.extend(operands)
+        return len(self.ops) - 1  # position of the last operand, for patching
+
+    def here(self) -> int:
+        return len(self.ops)
+
+    def patch(self, position: int) -> None:
+        self.ops[position] = self.here()
+
+    def constant(self, value: Any) -> int:
+        # 1, 1.0 and True are equal as dict keys: the type is part of the key
+        key = (type(value), value)
+        if key not in self.constant_index:
+            self.constant_index[key] = len(self.code.constants)
+            self.code.constants.append(value)
+        return self.constant_index[key]
+
+    def hidden_slots(self, n: int) -> int:
+        first = len(self.code.slots)
+        self.code.slots.extend(f".{first + i}" for i in range(n))
+        return first
+
+    def local(self, name: str) -> int:
+        if name not in self.slot:
+            raise BytecodeError(f"name '{name}' is not defined in {self.code.name}()")
+        return self.slot[name]
+
+    # Statements:
+    def statement(self, node: Node) -> None:
+        if isinstance(node, Assign):
+            self.assign(node)
+        elif isinstance(node, Return):
+            if self.code.name == "main":
+                raise BytecodeError("'return' outside function")
+            self.expression(node.value if node.value is not None else Constant(None))
+            self.emit(RETURN)
+        elif isinstance(node, If):
+            self.if_statement(node)
+        elif isinstance(node, While):
+            self.while_statement(node)
+        elif isinstance(node, For):
+            self.for_statement(node)
+        elif isinstance(node, Call):
+            if isinstance(node.func, Name) and node.func.id == "print":
+                for arg in node.args:
+                    self.expression(arg)
+                self.emit(PRINT, len(node.args))
+            else:
+                self.expression(node)
+                self.emit(POP)
+        elif isinstance(node, Pass):
+            pass
+        elif isinstance(node, Break):
+            if not self.loops:
+                raise BytecodeError("'break' outside loop")
+            self.loops[-1][1].append(self.emit(JUMP, 0))
+        elif isinstance(node, Continue):
+            if not self.loops:
+                raise BytecodeError("'continue' outside loop")
+            self.emit(JUMP, self.loops[-1][0])
+        else:
+            raise NotImplementedError(f"Unsupported statement: {type(node).__name__}")
+
+    def assign(self, stmt: Assign) -> None:
+        # Augmented assignment: x op= expr is x = x op expr
+        value = stmt.value
+        if stmt.op != "=":
+            value = BinaryOp(op=AUGMENTED_OPS[stmt.op], left=stmt.target, right=stmt.value)
+
+        if isinstance(stmt.target, Name):
+            slot = self.local(stmt.target.id)
+            # x = x + 1 in one instruction:
+            if (isinstance(value, BinaryOp) and value.op == "ADD"
+                    and isinstance(value.left, Name) and value.left.id == stmt.target.id
+                    and isinstance(value.right, Constant) and type(value.right.value) in (int, float)):
+                self.emit(INCREMENT, slot, self.constant(value.right.value))
+                return
+            self.expression(value)
+            self.emit(STORE_LOCAL, slot)
+            return
+
+        if isinstance(stmt.target, Index):
+            if not isinstance(stmt.target.value, Name):
+                raise NotImplementedError(
+                    "Only simple indexed assignment like a[i] = value is supported"
+                )
+            self.expression(stmt.target.value)
+            self.expression(stmt.target.index)
+            self.expression(value)
+            self.emit(SET_ITEM)
+            return
+
+        raise NotImplementedError(
+            f"Unsupported assignment target type: {type(stmt.target).__name__}"
+        )
+
+    def body(self, stmts: List[Node]) -> None:
+        for stmt in stmts:
+            self.statement(stmt)
+
+    # Jumps past the block when the condition is false, returns the
+    # position of that jump's target:
+    def condition(self, node: Node) -> int:
+        if isinstance(node, BinaryOp) and BINARY_OPCODES.get(node.op) in COMPARE_OPCODES:
+            self.expression(node.left)
+            self.expression(node.right)
+            return self.emit(COMPARE_JUMP, BINARY_OPCODES[node.op], 0)
+        self.expression(node)
+        return self.emit(JUMP_IF_FALSE, 0)
+
+    def if_statement(self, stmt: If) -> None:
+        ends: List[int] = []
+        clauses = [(stmt.condition, stmt.body)] + [(c.condition, c.body) for c in stmt.elifs]
+        for condition, body in clauses:
+            skip = self.condition(condition)
+            self.body(body)
+            ends.append(self.emit(JUMP, 0))
+            self.patch(skip)
+        self.body(stmt.orelse)
+        for end in ends:
+            self.patch(end)
+
+    def while_statement(self, stmt: While) -> None:
+        head = self.here()
+        exit_jump = self.condition(stmt.condition)
+        self.loop_body(head, stmt.body)
+        self.emit(JUMP, head)
+        self.patch(exit_jump)
+        self.end_loop()
+
+    def loop_body(self, head: int, body: List[Node]) -> None:
+        self.loops.append((head, []))
+        self.body(body)
+
+    def end_loop(self) -> None:
+        for jump in self.loops.pop()[1]:
+            self.patch(jump)
+
+    def for_statement(self, stmt: For) -> None:
+        target = self.local(stmt.target.id)
+        iterable = stmt.iterable
+
+        # for i in range(...): the C++ loop counts in a variable of its own
+        if isinstance(iterable, Call) and isinstance(iterable.func, Name) and iterable.func.id == "range":
+            args = iterable.args
+            if len(args) == 1:
+                bounds = [Constant(0), args[0], Constant(1)]
+            elif len(args) == 2:
+                bounds = [args[0], args[1], Constant(1)]
+            elif len(args) == 3:
+                bounds = list(args)
+            else:
+                raise NotImplementedError(
+                    "range() with more than 3 arguments is not supported"
+                )
+            for bound in bounds:
+                self.expression(bound)
+            counter = self.hidden_slots(3)
+            self.emit(RANGE_INIT, counter)
+            head = self.here()
+            exit_jump = self.emit(FOR_RANGE, counter, target, 0)
+        # for x in iterable:
+        else:
+            self.expression(iterable)
+            iterator = self.hidden_slots(1)
+            self.emit(GET_ITER, iterator)
+            head = self.here()
+            exit_jump = self.emit(FOR_ITER, iterator, target, 0)
+
+        self.loop_body(head, stmt.body)
+        self.emit(JUMP, head)
+        self.patch(exit_jump)
+        self.end_loop()
+
+    # Expressions (leave one value on the stack):
+    def expression(self, node: Node) -> None:
+        if isinstance(node, Name):
+            self.emit(LOAD_LOCAL, self.local(node.id))
+        elif isinstance(node, Constant):
+            self.emit(LOAD_CONST, self.constant(self.literal(node)))
+        elif isinstance(node, BinaryOp):
+            self.binary(node)
+        elif isinstance(node, UnaryOp):
+            self.expression(node.operand)
+            if node.op == "NOT":
+                self.emit(NOT)
+            elif node.op == "NEG":
+                self.emit(NEG)
+            else:
+                raise NotImplementedError(f"Unsupported unary op: {node.op}")
+        elif isinstance(node, Call):
+            self.call(node)
+        elif isinstance(node, ListLiteral):
+            for element in node.elements:
+                self.expression(element)
+            self.emit(BUILD_LIST, len(node.elements))
+        elif isinstance(node, TupleLiteral):
+            for element in node.elements:
+                self.expression(element)
+            self.emit(BUILD_TUPLE, len(node.elements))
+        elif isinstance(node, DictLiteral):
+            for pair in node.pairs:
+                self.expression(pair.key)
+                self.expression(pair.value)
+            self.emit(BUILD_DICT, len(node.pairs))
+        elif isinstance(node, Index):
+            self.expression(node.value)
+            self.expression(node.index)
+            self.emit(GET_ITEM)
+        elif isinstance(node, Slice):
+            self.expression(node.value)
+            self.expression(node.lower if node.lower is not None else Constant(None))
+            self.expression(node.upper if node.upper is not None else Constant(None))
+            self.emit(GET_SLICE)
+        else:
+            raise NotImplementedError(f"Unsupported expression: {type(node).__name__}")
+
+    def literal(self, node: Constant) -> Any:
+        # String tokens keep their quotes and escapes:
+        if isinstance(node.value, str):
+            return py_ast.literal_eval(node.value)
+        return node.value
+
+    def binary(self, node: BinaryOp) -> None:
+        if node.op not in BINARY_OPCODES:
+            raise NotImplementedError(f"Unsupported binary op: {node.op}")
+
+        # x ** 2 and x ** 3 are multiplications, as in the C++:
+        right = node.right
+        if node.op == "POWER" and isinstance(right, Constant) and type(right.value) is int \
+                and right.value in (2, 3):
+            self.expression(node.left)
+            for _ in range(right.value - 1):
+                self.emit(DUP)
+            for _ in range(right.value - 1):
+                self.emit(MUL)
+            return
+
+        left = node.left
+        if isinstance(left, Name) and isinstance(right, Name):
+            self.emit(LOAD_LOCAL_LOCAL, self.local(left.id), self.local(right.id))
+        elif isinstance(left, Name) and isinstance(right, Constant):
+            self.emit(LOAD_LOCAL_CONST, self.local(left.id), self.constant(self.literal(right)))
+        else:
+            self.expression(left)
+            self.expression(right)
+        self.emit(BINARY_OPCODES[node.op])
+
+    def call(self, node: Call) -> None:
+        if isinstance(node.func, Name):
+            name = node.func.id
+            if name in BUILTINS:
+                if len(node.args) != 1:
+                    raise NotImplementedError(f"{name}() with != 1 argument is not supported")
+                self.expression(node.args[0])
+                self.emit(CALL_BUILTIN, BUILTINS.index(name))
+                return
+            if name not in self.function_index:
+                raise BytecodeError(f"function '{name}' is not defined")
+            index = self.function_index[name]
+            if len(node.args) != self.arity[index]:
+                raise BytecodeError(
+                    f"{name}() takes {self.arity[index]} arguments ({len(node.args)} given)"
+                )
+            for arg in node.args:
+                self.expression(arg)
+            self.emit(CALL, index)
+            return
+
+        if isinstance(node.func, Attribute):
+            if not isinstance(node.func.value, Name):
+                raise NotImplementedError(
+                    "Container methods are only supported on simple variables"
+                )
+            method_name = node.func.attr.id
+            if method_name not in {m for m, _ in METHODS}:
+                raise NotImplementedError(f"Unsupported container method: {method_name}")
+            if (method_name, len(node.args)) not in METHODS:
+                raise NotImplementedError(f"{method_name}() expects {METHOD_ARGUMENTS[method_name]}")
+            self.expression(node.func.value)
+            for arg in node.args:
+                self.expression(arg)
+            self.emit(CALL_METHOD, METHODS.index((method_name, len(node.args))))
+            return
+
+        raise NotImplementedError(
+            "Only simple function calls and basic container methods are supported for now"
+        )
+
+
+# Readable listing of a Code, one instruction per line:
+def disassemble(code: Code) -> str:
+    lines = [f"code {code.name}({', '.join(code.slots[:code.params])}) "
+             f"slots={len(code.slots)} words={len(code.ops)}"]
+    ops = code.ops
+    pc = 0
+    while pc < len(ops):
+        opcode = ops[pc]
+        operands = list(ops[pc + 1:pc + 1 + OPERANDS[opcode]])
+        text = [str(o) for o in operands]
+        if opcode in (LOAD_CONST,):
+            text = [repr(code.constants[operands[0]])]
+        elif opcode in (LOAD_LOCAL, STORE_LOCAL):
+            text = [code.slots[operands[0]]]
+        elif opcode in (LOAD_LOCAL_LOCAL,):
+            text = [code.slots[operands[0]], code.slots[operands[1]]]
+        elif opcode in (LOAD_LOCAL_CONST, INCREMENT):
+            text = [code.slots[operands[0]], repr(code.constants[operands[1]])]
+        elif opcode == COMPARE_JUMP:
+            text = [OPCODE_NAMES[operands[0]], str(operands[1])]
+        elif opcode in (FOR_RANGE, FOR_ITER):
+            text = [code.slots[operands[0]], code.slots[operands[1]], str(operands[2])]
+        elif opcode == CALL_BUILTIN:
+            text = [BUILTINS[operands[0]]]
+        elif opcode == CALL_METHOD:
+            text = [METHODS[operands[0]][0]]
+        lines.append(f"  {pc:5d}  {OPCODE_NAMES[opcode]:<18} {' '.join(text)}".rstrip())
+        pc += 1 + OPERANDS[opcode]
+    return "\n".join(lines)
+
+
+def format_program(program: BytecodeProgram) -> str:
+    codes = program.functions + [program.main]
+    return "\n\n".join(disassemble(code) for code in codes)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+
+# Escapes a Python string as a C++ string literal:
+def cpp_string_literal(text: str) -> str:
+    out = []
+    for byte in text.encode("utf-8"):
+        ch = chr(byte)
+        if ch == "\\":
+            out.append("\\\\")
+        elif ch == '"':
+            out.append('\\"')
+        elif ch == "\n":
+            out.append("\\n")
+        elif ch == "\t":
+            out.append("\\t")
+        elif 32 <= byte < 127:
+            out.append(ch)
+        else:
+            out.append(f"\\{byte:03o}")
+    return '"' + "".join(out) + '"'
+
+
+# Expression that constructs a PyValue holding a Python constant:
+def cpp_constant(value) -> str:
+    if value is None:
+        return "PyValue()"
+    if isinstance(value, bool):
+        return "PyValue(true)" if value else "PyValue(false)"
+    if isinstance(value, int):
+        if value in (0, 1, 2):
+            return ("PY_ZERO", "PY_ONE", "PY_TWO")[value]
+        if -2**31 <= value < 2**31:
+            return f"PyValue({value})"
+        if value == -2**63:
+            # 9223372036854775808LL itself doesn't fit, so can't be negated
+            return "PyValue(-9223372036854775807LL - 1)"
+        return f"PyValue({value}LL)"
+    if isinstance(value, float):
+        return f"PyValue({value!r})"
+    return f"PyValue({cpp_string_literal(value)})"
+
+
+# Call printing the C++ PyValue expressions args. Two or more go in a
+# braced list, the only form whose elements are evaluated left to right:
+def print_call(args: Iterable[str]) -> str:
+    args = list(args)
+    if not args:
+        return "py_print()"
+    if len(args) == 1:
+        return f"py_print({args[0]})"
+    return f"py_print({{{', '.join(args)}}})"
+
+
+# The literals of one program, each built once as a file-scope
+# `static const PyValue` and referenced by name wherever it appears, so a
+# string literal in a loop doesn't construct a new value every iteration.
+# Disabled, every literal is constructed where it appears.
+class ConstantTable:
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.names: Dict[Tuple[str, str], str] = {}
+        self.definitions: List[str] = []
+
+    # Name of the shared value for a constant (None and the runtime's own
+    # PY_ZERO / PY_ONE / PY_TWO are used as they are):
+    def reference(self, value) -> str:
+        if not self.enabled or value is None or (type(value) is int and value in (0, 1, 2)):
+            return cpp_constant(value)
+
+        # 1, 1.0 and True (or 0.0 and -0.0) are different literals:
+        key = (type(value).__name__, repr(value))
+        name = self.names.get(key)
+        if name is None:
+            name = f"__const{len(self.definitions)}"
+            self.names[key] = name
+            self.definitions.append(f"static const PyValue {name} = {cpp_constant(value)};")
+        return name
+
+    # Definitions to emit at file scope, before any function:
+    def declarations(self) -> List[str]:
+        if not self.definitions:
+            return []
+        return ["// Literals, constructed once:"] + self.definitions + [""]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Set
+import ast as py_ast
+from typing import Dict, List, Optional, Set, Tuple
 
 from src.ast_nodes import (
+    AUGMENTED_OPS,
     Program,
     FunctionDef,
     Name,
@@ -23,24 +25,158 @@ from src.ast_nodes import (
     DictLiteral,
     KeyValue,
     Index,
+    Slice,
     Attribute,
     Node,
 )
+from src.cpp_constants import ConstantTable, print_call
+from src.ir import COMPARISONS
+from src.liveness import Liveness, statement_reads
+from src.pass_timer import PassTimer
+from src.specializer import NATIVE_DEFAULTS, NATIVE_TYPES, Specialization, Specializer
+
+# C++ operators for natively typed operands:
+NATIVE_OPS = {
+    "ADD": "+",
+    "MINUS": "-",
+    "TIMES": "*",
+    "EQUAL_EQUAL": "==",
+    "NOT_EQUAL": "!=",
+    "LESS": "<",
+    "LESS_EQUAL": "<=",
+    "GREATER": ">",
+    "GREATER_EQUAL": ">=",
+    "AND": "&&",
+    "OR": "||",
+}
+
+# Runtime comparison functors, for int / float operands (compared exactly):
+NATIVE_COMPARATORS = {
+    "EQUAL_EQUAL": "PyEqual",
+    "NOT_EQUAL": "PyNotEqual",
+    "LESS": "PyLess",
+    "LESS_EQUAL": "PyLessEqual",
+    "GREATER": "PyGreater",
+    "GREATER_EQUAL": "PyGreaterEqual",
+}
+
+
+# Calls that never change a container:
+READ_ONLY_BUILTINS = ("print", "str", "len", "set", "sorted")
+READ_ONLY_METHODS = ("get", "sublist", "union", "intersection", "difference")
+
+
+# True if evaluating the expression can't change any container (no user
+# function calls, no append / add / remove / sort):
+def changes_nothing(node: Optional[Node]) -> bool:
+    if node is None or isinstance(node, (Name, Constant)):
+        return True
+    if isinstance(node, BinaryOp):
+        return changes_nothing(node.left) and changes_nothing(node.right)
+    if isinstance(node, UnaryOp):
+        return changes_nothing(node.operand)
+    if isinstance(node, Call):
+        if isinstance(node.func, Name):
+            read_only = node.func.id in READ_ONLY_BUILTINS
+        else:
+            read_only = isinstance(node.func, Attribute) and node.func.attr.id in READ_ONLY_METHODS
+        return read_only and all(changes_nothing(a) for a in node.args)
+    if isinstance(node, (ListLiteral, TupleLiteral)):
+        return all(changes_nothing(e) for e in node.elements)
+    if isinstance(node, DictLiteral):
+        return all(changes_nothing(p.key) and changes_nothing(p.value) for p in node.pairs)
+    if isinstance(node, Index):
+        return changes_nothing(node.value) and changes_nothing(node.index)
+    if isinstance(node, Slice):
+        return all(changes_nothing(n) for n in (node.value, node.lower, node.upper))
+    return False
+
+
+# Expressions a statement evaluates itself (not those of its body):
+def header_expressions(stmt: Node) -> List[Optional[Node]]:
+    if isinstance(stmt, Assign):
+        return [stmt.target, stmt.value]
+    if isinstance(stmt, Return):
+        return [stmt.value]
+    if isinstance(stmt, If):
+        return [stmt.condition] + [e.condition for e in stmt.elifs]
+    if isinstance(stmt, While):
+        return [stmt.condition]
+    if isinstance(stmt, For):
+        return [stmt.iterable]
+    if isinstance(stmt, Call):
+        return [stmt]
+    return []
+
+
+# Drops the parentheses around a whole native expression, "(a + b)" -> "a + b":
+def strip_parens(code: str) -> str:
+    if not (code.startswith("(") and code.endswith(")")):
+        return code
+    depth = 0
+    for i, ch in enumerate(code):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0 and i != len(code) - 1:
+                return code
+    return code[1:-1]
 
 
 class CppTranspiler:
-    def __init__(self) -> None:
+    def __init__(self, specialize: bool = True, hoist_constants: bool = True,
+                 instrument: bool = False, timer: Optional[PassTimer] = None) -> None:
         self.lines: List[str] = []
         self.indent_level: int = 0
+        self.specialize = specialize
+        self.specializer: Optional[Specializer] = None
+
+        # Variable types of the scope being emitted and its native return type:
+        self.env: Dict[str, str] = {}
+        self.return_type: Optional[str] = None
+
+        # Liveness of the scope being emitted, its const PyValue& params and
+        # the variables the current statement reads for the last time:
+        self.liveness: Optional[Liveness] = None
+        self.by_reference: Set[str] = set()
+        self.movable: Set[str] = set()
+
+        # Whether the current statement may read container elements by
+        # reference (py_getitem_ref), i.e. it changes no container:
+        self.borrow: bool = False
+
+        # Literals of the program, emitted once at file scope:
+        self.hoist_constants = hoist_constants
+        self.constants = ConstantTable(hoist_constants)
+
+        # Profiling marks on every function and loop (FANGLESS_PROFILE in
+        # runtime.hpp), named after the C++ function and loops numbered in it:
+        self.instrument = instrument
+        self.function_name: str = ""
+        self.loop_count: int = 0
+
+        # Time (and memory) of each phase of transpile(), for --time-passes:
+        self.timer = timer or PassTimer()
 
     # Generates C++ code from program node:
     def transpile(self, program: Program) -> str:
         self.lines = []
         self.indent_level = 0
 
+        # Infer types and decide which functions get cloned per argument types:
+        with self.timer.phase("specialize"):
+            self.specializer = Specializer(program, enabled=self.specialize)
+            self.specializer.run()
+
+        self.constants = ConstantTable(self.hoist_constants)
         self._emit_preamble()
+        table_at = len(self.lines)
         self.emit_program(program)
 
+        # Literals are known once the whole program is emitted:
+        with self.timer.phase("constants"):
+            self.lines[table_at:table_at] = self.constants.declarations()
         return "\n".join(self.lines)
 
     # Adds a line with a 4 space indent:
@@ -59,6 +195,8 @@ class CppTranspiler:
     # Header statements and includes:
     def _emit_preamble(self) -> None:
         self.emit("// Generated by simple Fangless Python transpiler")
+        if self.instrument:
+            self.emit("#define FANGLESS_PROFILE")
         self.emit('#include "../c++/runtime.hpp"')
         self.emit("")
         self.emit("// Compile with something like:")
@@ -76,13 +214,24 @@ class CppTranspiler:
             else:
                 globals.append(node)
 
-        # Emits all function definitions first:
-        for func in functions:
-            self.emit_function(func)
-            self.emit("")
+        # Declares every version first, so clones can call each other:
+        with self.timer.phase("declarations"):
+            if functions:
+                for func in functions:
+                    for spec in self.specializer.specs_for(func.name.id):
+                        self.emit(f"{self.function_header(spec)};")
+                self.emit("")
+
+        # Emits all function definitions (generic version, then its clones):
+        with self.timer.phase("functions"):
+            for func in functions:
+                for spec in self.specializer.specs_for(func.name.id):
+                    self.emit_function(spec)
+                    self.emit("")
 
         # Emits main method with all global statements:
-        self.emit_main(globals)
+        with self.timer.phase("main"):
+            self.emit_main(globals)
 
     # Indicates which identifiers are modified by methods:
     def collect_mutated_names_in_expr(self, node: Node) -> Set[str]:
@@ -95,8 +244,8 @@ class CppTranspiler:
                 method_name = node.func.attr.id
                 obj_name = node.func.value.id
 
-                # If append, add or remove, we assume object is modified:
-                if method_name in ("append", "add", "remove"):
+                # If append, add, remove or sort, we assume object is modified:
+                if method_name in ("append", "add", "remove", "sort"):
                     mutated.add(obj_name)
 
             # Recursive call for arguments:
@@ -183,24 +332,25 @@ class CppTranspiler:
 
         return names
 
-    # Functions:
-    def emit_function(self, func: FunctionDef) -> None:
-        # Get parameters' names:
-        param_names = [p.name.id for p in func.params]
-
+    # Function signature, with native types for the params of a clone:
+    def function_header(self, spec: Specialization) -> str:
         # Get all names assigned or modified inside body:
-        assigned_or_mutated = self.collect_assigned_names_in_stmts(func.body)
+        assigned_or_mutated = self.collect_assigned_names_in_stmts(spec.func.body)
 
         # Build parameter declarations:
+        # if a param has a native type: pass it by value
         # if a param is never assigned / mutated: generate a const PyValue&
         # if it is assigned / mutated: generate a PyValue by value
 
         param_decls: List[str] = []
 
-        for p in func.params:
+        for p, param_type in zip(spec.func.params, spec.param_types):
             name = p.name.id
-            
-            if name in assigned_or_mutated:
+
+            if param_type in NATIVE_TYPES:
+                param_decls.append(f"{NATIVE_TYPES[param_type]} {name}")
+
+            elif name in assigned_or_mutated:
                 param_decls.append(f"PyValue {name}")
 
             else:
@@ -208,17 +358,39 @@ class CppTranspiler:
 
         # Joins with ',' for multiple parameters:
         params_code = ", ".join(param_decls)
+        return_code = NATIVE_TYPES.get(spec.native_return, "PyValue")
+        return f"{return_code} {spec.cpp_name}({params_code})"
+
+    # Functions:
+    def emit_function(self, spec: Specialization) -> None:
+        func = spec.func
+        self.env = spec.var_types
+        self.return_type = spec.native_return
+
+        # Get parameters' names:
+        param_names = [p.name.id for p in func.params]
+
+        # Get all names assigned or modified inside body:
+        assigned_or_mutated = self.collect_assigned_names_in_stmts(func.body)
+
+        # Params passed as const PyValue& can't be moved from:
+        self.liveness = Liveness(func.body)
+        self.by_reference = {
+            name for name, param_type in zip(param_names, spec.param_types)
+            if param_type not in NATIVE_TYPES and name not in assigned_or_mutated
+        }
 
         # Function header and brackets:
-        self.emit(f"PyValue {func.name.id}({params_code}) {{")
+        self.emit(f"{self.function_header(spec)} {{")
         self.indent()
+        self.enter_profile_function(spec.cpp_name)
 
         # Variables (assigned or mutated) that are not parameters are considered local:
         local_vars = assigned_or_mutated.difference(param_names)
 
         # Declare all local variables at the beginning:
         for var in sorted(local_vars):
-            self.emit(f"PyValue {var};")
+            self.emit(f"{self.declaration(var)};")
 
         # Set of all declared names inside function:
         declared: Set[str] = set(param_names) | local_vars
@@ -227,17 +399,59 @@ class CppTranspiler:
         for stmt in func.body:
             self.emit_stmt(stmt, declared)
 
-        # If control reaches here, return None (all functions must return PyValue)
-        self.emit("return PyValue();")
+        # If control reaches here, return None (all functions must return PyValue).
+        # Clones with a native return type always return before this.
+        if self.return_type is not None:
+            self.emit(f"return {NATIVE_DEFAULTS[self.return_type]};")
+        else:
+            self.emit("return PyValue();")
 
         # Close function:
         self.dedent()
         self.emit("}")
 
+        self.env = {}
+        self.return_type = None
+        self.liveness = None
+        self.by_reference = set()
+
+    # Profiling mark of a function, loops inside it are numbered from 1:
+    def enter_profile_function(self, name: str) -> None:
+        self.function_name = name
+        self.loop_count = 0
+        if self.instrument:
+            self.emit(f'PY_PROFILE_FUNCTION("{name}");')
+
+    # Profiling mark of a loop, at the top of the block around it:
+    def emit_profile_loop(self, description: str) -> None:
+        self.loop_count += 1
+        if self.instrument:
+            self.emit(f'PY_PROFILE_LOOP("{self.function_name}/{description} #{self.loop_count}");')
+
+    # First statement of a loop body:
+    def emit_profile_iteration(self) -> None:
+        if self.instrument:
+            self.emit("PY_PROFILE_ITERATION();")
+
+    # C++ type of a variable, native when the inference knows it:
+    def variable_type(self, var: str) -> str:
+        return NATIVE_TYPES.get(self.env.get(var), "PyValue")
+
+    # Local variable declaration (native ones start at zero):
+    def declaration(self, var: str) -> str:
+        var_type = self.env.get(var)
+        if var_type in NATIVE_TYPES:
+            return f"{NATIVE_TYPES[var_type]} {var} = {NATIVE_DEFAULTS[var_type]}"
+        return f"PyValue {var}"
+
     # Main function:
     def emit_main(self, stmts: List[Node]) -> None:
         self.emit("int main() {")
         self.indent()
+        self.enter_profile_function("main")
+
+        self.env = self.specializer.main_types
+        self.liveness = Liveness(stmts)
 
         # Get all assigned variables:
         assigned = self.collect_assigned_names_in_stmts(stmts)
@@ -247,7 +461,7 @@ class CppTranspiler:
         
         # Declare all local variables at the beginning:
         for var in sorted(local_vars):
-            self.emit(f"PyValue {var};")
+            self.emit(f"{self.declaration(var)};")
 
         declared: Set[str] = set(local_vars)
 
@@ -260,8 +474,33 @@ class CppTranspiler:
         self.dedent()
         self.emit("}")
 
+        self.env = {}
+        self.liveness = None
+
+    # Variables a simple statement reads for the last time (and only once),
+    # which can be moved into the runtime call that consumes them:
+    def last_uses(self, stmt: Node) -> Set[str]:
+        if self.liveness is None or not isinstance(stmt, (Assign, Call, Return)):
+            return set()
+        reads = statement_reads(stmt)
+        live = self.liveness.live_after(stmt)
+        if isinstance(stmt, Assign) and isinstance(stmt.target, Name):
+            live = live - {stmt.target.id}  # its old value is overwritten
+        return {
+            name for name in reads
+            if reads.count(name) == 1 and name not in live
+            and self.variable_type(name) == "PyValue" and name not in self.by_reference
+        }
+
     # Statement emit:
     def emit_stmt(self, node: Node, declared: Set[str]) -> None:
+        outer_movable, outer_borrow = self.movable, self.borrow
+        self.movable = self.last_uses(node)
+        self.borrow = all(changes_nothing(e) for e in header_expressions(node))
+        self.emit_statement(node, declared)
+        self.movable, self.borrow = outer_movable, outer_borrow
+
+    def emit_statement(self, node: Node, declared: Set[str]) -> None:
         if isinstance(node, Assign):
             self.emit_assign(node, declared)
         elif isinstance(node, Return):
@@ -284,17 +523,28 @@ class CppTranspiler:
             raise NotImplementedError(f"Unsupported statement: {type(node).__name__}")
 
     def emit_assign(self, stmt: Assign, declared: Set[str]) -> None:
+        # Augmented assignment: x op= expr is x = x op expr
+        value = stmt.value
+        if stmt.op != "=":
+            value = BinaryOp(op=AUGMENTED_OPS[stmt.op], left=stmt.target, right=stmt.value)
+
         # Simple variable assignment (x = expr):
         if isinstance(stmt.target, Name):
             var_name = stmt.target.id
-            expr_code = self.expression(stmt.value)
+            var_type = self.env.get(var_name)
+            if var_type in NATIVE_TYPES:
+                expr_code = strip_parens(self.native_expression(value, var_type))
+            elif isinstance(value, Name) and value.id != var_name:
+                expr_code = self.sink(value)
+            else:
+                expr_code = self.expression(value)
 
             if var_name in declared:
                 self.emit(f"{var_name} = {expr_code};")
             else:
                 # In case something was not collected, declare it here as a precaution:
                 declared.add(var_name)
-                self.emit(f"PyValue {var_name} = {expr_code};")
+                self.emit(f"{self.variable_type(var_name)} {var_name} = {expr_code};")
             return
 
         # Indexed element assignment: (list[i] = expr):
@@ -306,7 +556,7 @@ class CppTranspiler:
 
             container_name = stmt.target.value.id
             index_code = self.expression(stmt.target.index)
-            value_code = self.expression(stmt.value)
+            value_code = self.sink(value)
 
             # py_setitem(container, index, value);
             self.emit(f"py_setitem({container_name}, {index_code}, {value_code});")
@@ -321,14 +571,17 @@ class CppTranspiler:
     def emit_return(self, stmt: Return) -> None:
         if stmt.value is None:
             self.emit("return PyValue();")
+        elif self.return_type is not None:
+            expr_code = strip_parens(self.native_expression(stmt.value, self.return_type))
+            self.emit(f"return {expr_code};")
         else:
             expr_code = self.expression(stmt.value)
             self.emit(f"return {expr_code};")
 
     def emit_if(self, stmt: If, declared: Set[str]) -> None:
         # IF:
-        cond_code = self.expression(stmt.condition)
-        self.emit(f"if ({cond_code}.is_truthy()) {{")
+        cond_code = self.condition(stmt.condition)
+        self.emit(f"if ({cond_code}) {{")
         self.indent()
         for s in stmt.body:
             self.emit_stmt(s, declared)
@@ -337,8 +590,8 @@ class CppTranspiler:
 
         # ELIFS:
         for elif_clause in stmt.elifs:
-            cond_code = self.expression(elif_clause.condition)
-            self.emit(f"else if ({cond_code}.is_truthy()) {{")
+            cond_code = self.condition(elif_clause.condition)
+            self.emit(f"else if ({cond_code}) {{")
             self.indent()
             for s in elif_clause.body:
                 self.emit_stmt(s, declared)
@@ -355,13 +608,22 @@ class CppTranspiler:
             self.emit("}")
 
     def emit_while(self, stmt: While, declared: Set[str]) -> None:
-        cond_code = self.expression(stmt.condition)
-        self.emit(f"while ({cond_code}.is_truthy()) {{")
+        cond_code = self.condition(stmt.condition)
+        if self.instrument:
+            # The loop's mark lives in a block around it:
+            self.emit("{")
+            self.indent()
+        self.emit_profile_loop("while")
+        self.emit(f"while ({cond_code}) {{")
         self.indent()
+        self.emit_profile_iteration()
         for s in stmt.body:
             self.emit_stmt(s, declared)
         self.dedent()
         self.emit("}")
+        if self.instrument:
+            self.dedent()
+            self.emit("}")
 
     def emit_for(self, stmt: For, declared: Set[str]) -> None: 
         iterable = stmt.iterable
@@ -380,44 +642,46 @@ class CppTranspiler:
         n = len(args)
         # Turn range into start, stop, step:
         if n == 1:
-            start_code = "PY_ZERO"
-            stop_code = self.expression(args[0])
-            step_code = "PY_ONE"
+            bounds = [None, args[0], None]
         elif n == 2:
-            start_code = self.expression(args[0])
-            stop_code = self.expression(args[1])
-            step_code = "PY_ONE"
+            bounds = [args[0], args[1], None]
         elif n == 3:
-            start_code = self.expression(args[0])
-            stop_code = self.expression(args[1])
-            step_code = self.expression(args[2])
+            bounds = list(args)
         else:
             raise NotImplementedError(
                 "range() with more than 3 arguments is not supported"
             )
+        start_code, stop_code, step_code = (
+            self.range_bound(arg, default) for arg, default in zip(bounds, ("0", None, "1"))
+        )
 
         self.emit("{")
         self.indent()
+        self.emit_profile_loop(f"for {target_name}")
 
         # Evaluate start / stop / step:
-        self.emit(f"PyValue __range_start = {start_code};")
-        self.emit(f"PyValue __range_stop = {stop_code};")
-        self.emit(f"PyValue __range_step = {step_code};")
+        self.emit(f"long long __range_start = {start_code};")
+        self.emit(f"long long __range_stop = {stop_code};")
+        self.emit(f"long long __range_step = {step_code};")
 
         # Check that loop variable is declared:
         if target_name not in declared:
-            self.emit(f"PyValue {target_name};")
+            self.emit(f"{self.declaration(target_name)};")
             declared.add(target_name)
 
         self.emit(
-            "for (long long __i = __range_start.int_value; "
-            "__i < __range_stop.int_value; "
-            "__i += __range_step.int_value) {"
+            "for (long long __i = __range_start; "
+            "__i < __range_stop; "
+            "__i += __range_step) {"
         )
         self.indent()
+        self.emit_profile_iteration()
 
         # Assign new value to the loop variable on each loop:
-        self.emit(f"{target_name} = PyValue(__i);")
+        if self.env.get(target_name) == "int":
+            self.emit(f"{target_name} = __i;")
+        else:
+            self.emit(f"{target_name} = PyValue(__i);")
 
         for s in stmt.body:
             self.emit_stmt(s, declared)
@@ -429,57 +693,73 @@ class CppTranspiler:
         self.dedent()
         self.emit("}")
 
+    # A range() argument as a native integer:
+    def range_bound(self, node: Optional[Node], default: Optional[str]) -> str:
+        if node is None:
+            return default
+        if self.specializer.expr_type(node, self.env) == "int":
+            return strip_parens(self.native_expression(node, "int"))
+        return f"{self.expression(node)}.int_value"
+
+    # Names rebound (x = ... or used as a loop variable) inside a block:
+    def collect_rebound_names_in_stmts(self, stmts: List[Node]) -> Set[str]:
+        names: Set[str] = set()
+
+        for stmt in stmts:
+            if isinstance(stmt, Assign) and isinstance(stmt.target, Name):
+                names.add(stmt.target.id)
+
+            elif isinstance(stmt, If):
+                names |= self.collect_rebound_names_in_stmts(stmt.body)
+                for elif_clause in stmt.elifs:
+                    names |= self.collect_rebound_names_in_stmts(elif_clause.body)
+                names |= self.collect_rebound_names_in_stmts(stmt.orelse)
+
+            elif isinstance(stmt, While):
+                names |= self.collect_rebound_names_in_stmts(stmt.body)
+
+            elif isinstance(stmt, For):
+                names.add(stmt.target.id)
+                names |= self.collect_rebound_names_in_stmts(stmt.body)
+
+        return names
+
     # Iterable for loop:
     def emit_for_iterable(self, stmt: For, declared: Set[str]) -> None:
         target_name = stmt.target.id
-        iter_code = self.expression(stmt.iterable)
+        iter_code = self.read(stmt.iterable)
 
         self.emit("{")
         self.indent()
+        self.emit_profile_loop(f"for {target_name}")
 
-        # Evaluate iterable:
-        self.emit(f"PyValue __iter = {iter_code};")
+        # Walk the iterable by reference, unless the loop rebinds that same
+        # variable (then the loop must keep iterating the original value):
+        if isinstance(stmt.iterable, Index):
+            # The iterator holds the element itself, read in place:
+            self.emit(f"PyIterator __it({iter_code});")
+        else:
+            if (isinstance(stmt.iterable, Name)
+                    and stmt.iterable.id in self.collect_rebound_names_in_stmts([stmt])):
+                self.emit(f"PyValue __iter = {iter_code};")
+            else:
+                # Temporaries get their lifetime extended by the reference:
+                self.emit(f"const PyValue& __iter = {iter_code};")
+            self.emit("PyIterator __it(__iter);")
 
-        # Emit a runtime check: only lists and tuples are supported:
-        self.emit(
-            "if (__iter.type != PyValue::LIST && __iter.type != PyValue::TUPLE) { "
-            'throw std::runtime_error("TypeError: can only iterate over list or tuple in for-loop"); '
-            "}"
-        )
         # Check that loop variable is declared:
         if target_name not in declared:
             self.emit(f"PyValue {target_name};")
             declared.add(target_name)
 
-        # Choose on what to iterate based on type:
-
-        # List:
-        self.emit("if (__iter.type == PyValue::LIST) {")
-        self.indent()
-        self.emit(
-            "for (std::size_t __idx = 0; __idx < __iter.list_value.size(); ++__idx) {"
-        )
-        self.indent()
-        self.emit(f"{target_name} = __iter.list_value[__idx];")
-        for s in stmt.body:
-            self.emit_stmt(s, declared)
-        self.dedent()
-        self.emit("}")
-        self.dedent()
-        # Tuple:
-        self.emit("} else {")
-        self.indent()
-        self.emit(
-            "for (std::size_t __idx = 0; __idx < __iter.tuple_value.size(); ++__idx) {"
-        )
+        # Single loop body for every container type:
+        self.emit(f"while (__it.next({target_name})) {{")
         self.indent()
-        self.emit(f"{target_name} = __iter.tuple_value[__idx];")
+        self.emit_profile_iteration()
         for s in stmt.body:
             self.emit_stmt(s, declared)
         self.dedent()
         self.emit("}")
-        self.dedent()
-        self.emit("}")
 
         self.dedent()
         self.emit("}")
@@ -488,19 +768,89 @@ class CppTranspiler:
     def emit_call_stmt(self, call: Call, declared: Set[str]) -> None:
         # Print case:
         if isinstance(call.func, Name) and call.func.id == "print":
-            if len(call.args) == 1:
-                arg_code = self.expression(call.args[0])
-                self.emit(f"py_print({arg_code});")
-            else:
-                args_code = ", ".join(self.expression(a) for a in call.args)
-                self.emit(f"py_print_many(std::vector<PyValue>{{ {args_code} }});")
+            self.emit(f"{print_call(self.read(a) for a in call.args)};")
         # Any other call:
         else:
             expr_code = self.expression(call)
             self.emit(f"{expr_code};")
 
-    # Expressions:
+    # Expressions (as a PyValue):
     def expression(self, node: Node) -> str:
+        if isinstance(node, Constant):
+            return self.constant(node)
+        code, code_type = self.typed_expression(node)
+        return self.box(code, code_type)
+
+    # Expression that is only read before the statement goes on (an operand,
+    # a condition, a printed value): elements are borrowed from their
+    # container when the statement changes none.
+    def read(self, node: Node) -> str:
+        if isinstance(node, Index) and self.borrow:
+            container_code = self.read(node.value)
+            index_code = self.read(node.index)
+            return f"py_getitem_ref({container_code}, {index_code})"
+        return self.expression(node)
+
+    # Expression as a native value of a type the inference gave it:
+    def native_expression(self, node: Node, native_type: str) -> str:
+        code, code_type = self.typed_expression(node)
+        if code_type == native_type:
+            return code
+        if code_type == "any":
+            if isinstance(node, Index):
+                code = self.read(node)
+            return f"{code}.{native_type}_value"
+        return f"static_cast<{NATIVE_TYPES[native_type]}>({code})"
+
+    def box(self, code: str, code_type: str) -> str:
+        if code_type in NATIVE_TYPES:
+            return f"PyValue({code})"
+        return code
+
+    # Condition of an if / while:
+    def condition(self, node: Node) -> str:
+        if isinstance(node, Index):
+            return f"{self.read(node)}.is_truthy()"
+        code, code_type = self.typed_expression(node)
+        if code_type == "bool":
+            return strip_parens(code)
+        if code_type in ("int", "float"):
+            return f"{code} != 0"
+        return f"{code}.is_truthy()"
+
+    # Expression code plus its C++ type ("int", "float", "bool" or "any" for a PyValue):
+    def typed_expression(self, node: Node) -> Tuple[str, str]:
+        if isinstance(node, Name):
+            var_type = self.env.get(node.id)
+            return node.id, var_type if var_type in NATIVE_TYPES else "any"
+        if isinstance(node, Constant):
+            val = node.value
+            if isinstance(val, bool):
+                return ("true" if val else "false"), "bool"
+            if isinstance(val, int):
+                # long long, like the native int variables, so constant arithmetic doesn't overflow int
+                return f"{val}LL", "int"
+            if isinstance(val, float):
+                return str(val), "float"
+            return self.constant(node), "any"
+        if isinstance(node, BinaryOp):
+            native = self.native_binary_expression(node)
+            if native is not None:
+                return native
+            return self.binary_expression(node), "any"
+        if isinstance(node, UnaryOp):
+            native = self.native_unary_expression(node)
+            if native is not None:
+                return native
+            return self.unary_expression(node), "any"
+        if isinstance(node, Call):
+            target = self.specializer.call_target(node, self.env)
+            if target is not None:
+                return self.user_call(node, target)
+            return self.expression_call(node), "any"
+        return self.generic_expression(node), "any"
+
+    def generic_expression(self, node: Node) -> str:
         if isinstance(node, Name):
             return node.id
         if isinstance(node, Constant):
@@ -519,39 +869,42 @@ class CppTranspiler:
             return self.dictionary_literal(node)
         if isinstance(node, Index):
             return self.index(node)
+        if isinstance(node, Slice):
+            return self.slice(node)
 
         raise NotImplementedError(f"Unsupported expression: {type(node).__name__}")
 
+    # Argument a runtime call keeps or consumes: a variable read for the last
+    # time is moved into it instead of copied.
+    def sink(self, node: Node) -> str:
+        code = self.expression(node)
+        if isinstance(node, Name) and node.id in self.movable:
+            return f"std::move({code})"
+        return code
+
+    # Boxed literal: a shared value from the constant table
     def constant(self, node: Constant) -> str:
         val = node.value
-        # Booleans:
-        if isinstance(val, bool):
-            return "PyValue(true)" if val else "PyValue(false)"
-        # Integers:
-        if isinstance(val, int):
-            # Reuse small integer constants:
-            if val == 0:
-                return "PY_ZERO"
-            if val == 1:
-                return "PY_ONE"
-            if val == 2:
-                return "PY_TWO"
-            return f"PyValue({val})"
-        # Float:
-        if isinstance(val, float):
-            return f"PyValue({val})"
-        # String:
+        # String tokens keep their quotes and escapes:
         if isinstance(val, str):
-            return f"PyValue({val})"
-        # None:
-        return "PyValue()"
+            val = py_ast.literal_eval(val)
+        return self.constants.reference(val)
 
     # Binary operations: Uses runtime functions to help with operation logic
     def binary_expression(self, node: BinaryOp) -> str:
-        left = self.expression(node.left)
-        right = self.expression(node.right)
         op = node.op
 
+        # x ** 2 and x ** 3 are unrolled into multiplications:
+        if op == "POWER" and self.small_exponent(node.right):
+            return self.unrolled_power(node.left, node.right.value)
+
+        # A string on the left is extended in place when it can be moved:
+        if op == "ADD" and isinstance(node.left, Name):
+            left = self.sink(node.left)
+        else:
+            left = self.read(node.left)
+        right = self.read(node.right)
+
         # Arithmetic:
         if op == "ADD":
             return f"py_add({left}, {right})"
@@ -563,6 +916,10 @@ class CppTranspiler:
             return f"py_div({left}, {right})"
         if op == "MODULE":
             return f"py_mod({left}, {right})"
+        if op == "FLOORDIV":
+            return f"py_floordiv({left}, {right})"
+        if op == "POWER":
+            return f"py_pow({left}, {right})"
 
         # Comparisons:
         if op == "EQUAL_EQUAL":
@@ -586,17 +943,109 @@ class CppTranspiler:
 
         raise NotImplementedError(f"Unsupported binary op: {op}")
 
+    # Plain C++ arithmetic and comparisons when both operands are native:
+    def native_binary_expression(self, node: BinaryOp) -> Optional[Tuple[str, str]]:
+        op = node.op
+
+        if op == "POWER" and self.small_exponent(node.right):
+            base_code, base_type = self.typed_expression(node.left)
+            if base_type not in ("int", "float"):
+                return None
+            if isinstance(node.left, (Name, Constant)):
+                return "(" + " * ".join([base_code] * node.right.value) + ")", base_type
+            product = " * ".join(["__base"] * node.right.value)
+            return f"[&]() {{ const auto __base = {base_code}; return {product}; }}()", base_type
+
+        if op not in NATIVE_OPS and op not in ("DIVIDE", "MODULE", "FLOORDIV"):
+            return None
+        left, left_type = self.typed_expression(node.left)
+        right, right_type = self.typed_expression(node.right)
+        numeric = left_type in ("int", "float") and right_type in ("int", "float")
+
+        # Native runtime overloads keep the ZeroDivisionError checks:
+        if op == "DIVIDE" and numeric:
+            left = self.as_double(node.left, left, left_type)
+            right = self.as_double(node.right, right, right_type)
+            return f"py_div({left}, {right})", "float"
+        if op in ("MODULE", "FLOORDIV") and left_type == right_type == "int":
+            function = "py_mod" if op == "MODULE" else "py_floordiv"
+            return f"{function}({left}, {right})", "int"
+
+        if op in ("ADD", "MINUS", "TIMES") and numeric:
+            result_type = "int" if left_type == right_type == "int" else "float"
+            return f"({left} {NATIVE_OPS[op]} {right})", result_type
+        if op in COMPARISONS and numeric:
+            if left_type != right_type:
+                # C++ would round the int to a double
+                return f"py_compare({left}, {right}, {NATIVE_COMPARATORS[op]}())", "bool"
+            return f"({left} {NATIVE_OPS[op]} {right})", "bool"
+        if op in ("EQUAL_EQUAL", "NOT_EQUAL", "AND", "OR") and left_type == right_type == "bool":
+            return f"({left} {NATIVE_OPS[op]} {right})", "bool"
+        return None
+
+    def as_double(self, node: Node, code: str, code_type: str) -> str:
+        if code_type == "float":
+            return code
+        if isinstance(node, Constant):
+            return f"{float(node.value)}"
+        return f"static_cast<double>({code})"
+
+    # Integer literal exponents worth unrolling:
+    def small_exponent(self, node: Node) -> bool:
+        return (isinstance(node, Constant) and type(node.value) is int
+                and node.value in (2, 3))
+
+    def unrolled_power(self, base: Node, exponent: int) -> str:
+        base_code = self.expression(base)
+
+        # Names and literals can simply be repeated:
+        if isinstance(base, (Name, Constant)):
+            product = base_code
+            for _ in range(exponent - 1):
+                product = f"py_mul({product}, {base_code})"
+            return product
+
+        # Anything else is evaluated once:
+        product = "__base"
+        for _ in range(exponent - 1):
+            product = f"py_mul({product}, __base)"
+        return f"[&]() {{ const PyValue& __base = {base_code}; return {product}; }}()"
+
     def unary_expression(self, node: UnaryOp) -> str:
         if node.op == "NOT":
-            operand = self.expression(node.operand)
+            operand = self.read(node.operand)
             return f"py_not({operand})"
         if node.op == "NEG": # Unary minus
-            operand = self.expression(node.operand)
+            operand = self.read(node.operand)
             # -x is implemented as 0 - x with py_sub:
             return f"py_sub(PY_ZERO, {operand})"
 
         raise NotImplementedError(f"Unsupported unary op: {node.op}")
 
+    def native_unary_expression(self, node: UnaryOp) -> Optional[Tuple[str, str]]:
+        operand, operand_type = self.typed_expression(node.operand)
+        if operand_type not in NATIVE_TYPES:
+            return None
+        if node.op == "NOT":
+            if operand_type == "bool":
+                return f"(!{operand})", "bool"
+            return f"({operand} == 0)", "bool"
+        if node.op == "NEG" and operand_type != "bool":
+            return f"(-{operand})", operand_type
+        return None
+
+    # Call to a user function, through its clone for these argument types if any:
+    def user_call(self, node: Call, target: Specialization) -> Tuple[str, str]:
+        args: List[str] = []
+        for arg, param_type in zip(node.args, target.param_types):
+            if param_type in NATIVE_TYPES and not target.is_generic:
+                args.append(strip_parens(self.native_expression(arg, param_type)))
+            else:
+                args.append(self.sink(arg))
+        # Arity mismatches are left for the C++ compiler to report:
+        args.extend(self.expression(a) for a in node.args[len(args):])
+        return f"{target.cpp_name}({', '.join(args)})", target.native_return or "any"
+
 
     def expression_call(self, node: Call) -> str:
         # Function:
@@ -609,7 +1058,7 @@ class CppTranspiler:
                     raise NotImplementedError(
                         "str() with != 1 argument is not supported"
                     )
-                arg_code = self.expression(node.args[0])
+                arg_code = self.read(node.args[0])
                 return f"py_str({arg_code})"
 
             # len(x) --> py_len(x):
@@ -618,7 +1067,7 @@ class CppTranspiler:
                     raise NotImplementedError(
                         "len() with != 1 argument is not supported"
                     )
-                arg_code = self.expression(node.args[0])
+                arg_code = self.read(node.args[0])
                 return f"py_len({arg_code})"
 
             # set(x) --> py_set_from_list(x):
@@ -627,11 +1076,20 @@ class CppTranspiler:
                     raise NotImplementedError(
                         "set() with != 1 argument is not supported"
                     )
-                arg_code = self.expression(node.args[0])
+                arg_code = self.read(node.args[0])
                 return f"py_set_from_list({arg_code})"
 
+            # sorted(x) --> py_sorted(x):
+            if func_name == "sorted":
+                if len(node.args) != 1:
+                    raise NotImplementedError(
+                        "sorted() with != 1 argument is not supported"
+                    )
+                arg_code = self.sink(node.args[0])
+                return f"py_sorted({arg_code})"
+
             # Regular function:
-            args_code = ", ".join(self.expression(a) for a in node.args)
+            args_code = ", ".join(self.sink(a) for a in node.args)
             return f"{func_name}({args_code})"
 
         # Container methods:
@@ -641,9 +1099,15 @@ class CppTranspiler:
                     "Container methods are only supported on simple variables"
                 )
 
-            obj_name = node.func.value.id
+            obj_name = self.expression(node.func.value)
             method_name = node.func.attr.id
-            args = [self.expression(a) for a in node.args]
+            # Stored arguments (append / add) are moved in when possible:
+            if method_name in ("append", "add"):
+                args = [self.sink(a) for a in node.args]
+            elif method_name in READ_ONLY_METHODS:
+                args = [self.read(a) for a in node.args]
+            else:
+                args = [self.expression(a) for a in node.args]
 
             # list.append(x) --> py_list_append(x, y):
             if method_name == "append":
@@ -657,6 +1121,12 @@ class CppTranspiler:
                     raise NotImplementedError("sublist() expects exactly 2 arguments")
                 return f"py_list_sublist({obj_name}, {args[0]}, {args[1]})"
 
+            # list.sort() --> py_list_sort(x):
+            if method_name == "sort":
+                if args:
+                    raise NotImplementedError("sort() expects no arguments")
+                return f"py_list_sort({obj_name})"
+
             # Add (set or dict) --> py_dict_or_set_add():
             if method_name == "add":
                 if len(args) == 1:
@@ -674,6 +1144,12 @@ class CppTranspiler:
                     raise NotImplementedError("get() expects exactly 1 argument")
                 return f"py_dict_or_set_get({obj_name}, {args[0]})"
 
+            # Set algebra --> py_set_union / py_set_intersection / py_set_difference:
+            if method_name in ("union", "intersection", "difference"):
+                if len(args) != 1:
+                    raise NotImplementedError(f"{method_name}() expects exactly 1 argument")
+                return f"py_set_{method_name}({obj_name}, {args[0]})"
+
             # Remove --> py_container_remove:
             if method_name == "remove":
                 if len(args) != 1:
@@ -689,35 +1165,46 @@ class CppTranspiler:
     def list_literal(self, node: ListLiteral) -> str:
         # Convert to PyValue list using vector:
         if not node.elements:
-            return "py_list(std::vector<PyValue>{})"
+            return "py_list(PyItems{})"
 
         elems_code = ", ".join(self.expression(e) for e in node.elements)
-        return f"py_list(std::vector<PyValue>{{ {elems_code} }})"
+        return f"py_list(PyItems{{ {elems_code} }})"
 
     def tuple_literal(self, node: TupleLiteral) -> str:
         # Convert to PyValue tuple using vector:
         if not node.elements:
-            return "py_tuple(std::vector<PyValue>{})"
+            return "py_tuple(PyItems{})"
 
         elems_code = ", ".join(self.expression(e) for e in node.elements)
-        return f"py_tuple(std::vector<PyValue>{{ {elems_code} }})"
+        return f"py_tuple(PyItems{{ {elems_code} }})"
 
     def dictionary_literal(self, node: DictLiteral) -> str:
         # Convert to PyValue dictionary using vector:
         if not node.pairs:
-            return "py_dict(std::vector<std::pair<PyValue, PyValue>>{})"
+            return "py_dict(PyPairs{})"
 
         items_code_parts = []
         for pair in node.pairs:
             key_code = self.expression(pair.key)
             value_code = self.expression(pair.value)
-            items_code_parts.append(f"std::make_pair({key_code}, {value_code})")
+            items_code_parts.append(f"py_pair({key_code}, {value_code})")
 
         items_code = ", ".join(items_code_parts)
-        return "py_dict(std::vector<std::pair<PyValue, PyValue>>{ " + items_code + " })"
+        return "py_dict(PyPairs{ " + items_code + " })"
 
     def index(self, node: Index) -> str:
-        # Convert value[index] --> py_getitem(value, index):
-        container_code = self.expression(node.value)
-        index_code = self.expression(node.index)
+        # Convert value[index] --> py_getitem(value, index), a copy of the
+        # element (a[i][j] only copies the innermost one):
+        container_code = self.read(node.value)
+        index_code = self.read(node.index)
         return f"py_getitem({container_code}, {index_code})"
+
+    def slice(self, node: Slice) -> str:
+        # Convert value[lower:upper] --> py_getslice(value, lower, upper), an
+        # omitted bound is None:
+        container_code = self.read(node.value)
+        bounds = [
+            "PyValue()" if bound is None else self.read(bound)
+            for bound in (node.lower, node.upper)
+        ]
+        return f"py_getslice({container_code}, {bounds[0]}, {bounds[1]})"
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+# Typed SSA intermediate representation.
+#
+# A Module holds one Function per FunctionDef plus "main" for the global
+# statements. Every Function is a list of BasicBlocks, each made of phis,
+# three-address instructions and a single terminator. Every Temp is
+# assigned exactly once.
+
+# Value types (a small lattice, "any" is the top, None the bottom):
+TYPES = ("none", "int", "float", "bool", "str", "list", "dict", "tuple", "set", "iter", "any")
+
+
+def join_types(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+    return "any"
+
+
+ARITHMETIC = ("ADD", "MINUS", "TIMES")
+COMPARISONS = ("EQUAL_EQUAL", "NOT_EQUAL", "LESS", "LESS_EQUAL", "GREATER", "GREATER_EQUAL")
+
+
+# Result type of a binary operator, following the runtime's py_* rules:
+def binary_type(op: str, a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None or b is None:
+        return None
+    if op in COMPARISONS:
+        return "bool"
+    if op in ("AND", "OR"):
+        return join_types(a, b)
+    if op == "DIVIDE":
+        return "float"
+    if op == "MODULE":
+        return "int" if a == b == "int" else "any"
+    if op == "FLOORDIV":
+        if a == b == "int":
+            return "int"
+        if a in ("int", "float") and b in ("int", "float"):
+            return "float"
+        return "any"
+    if op == "POWER":
+        # int ** int is a float for negative exponents
+        if "float" in (a, b) and a in ("int", "float") and b in ("int", "float"):
+            return "float"
+        return "any"
+    if op in ARITHMETIC:
+        if a == b == "int":
+            return "int"
+        if a in ("int", "float") and b in ("int", "float"):
+            return "float"
+        if op == "ADD" and a == b == "str":
+            return "str"
+    return "any"
+
+
+# Values:
+
+class Value:
+    type: Optional[str] = None
+
+
+@dataclass(eq=False)
+class Const(Value):
+    value: Any  # Python value (strings already decoded)
+    type: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.type is None:
+            self.type = const_type(self.value)
+
+    def __str__(self) -> str:
+        if isinstance(self.value, str):
+            return repr(self.value)
+        return str(self.value)
+
+
+@dataclass(eq=False)
+class Temp(Value):
+    id: int
+    hint: Optional[str] = None  # source variable name, if any
+    type: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"%{self.hint}.{self.id}" if self.hint else f"%{self.id}"
+
+
+def const_type(value: Any) -> str:
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "any"
+
+
+# Instructions:
+
+# Ops without observable side effects (safe to delete when unused):
+PURE_OPS = {"copy", "list", "tuple", "iter_value"}
+
+# Key types py_dict hashes without raising:
+HASHABLE_TYPES = {"none", "int", "float", "bool", "str"}
+
+
+# A dict display raises TypeError for an unhashable key, so it is only pure
+# when every key (args alternate key, value) has a known hashable type:
+def is_pure(instr: "Instr") -> bool:
+    if instr.op == "dict":
+        return all(key.type in HASHABLE_TYPES for key in instr.args[::2])
+    return instr.op in PURE_OPS
+
+
+@dataclass(eq=False)
+class Instr:
+    op: str  # binop, unop, copy, call, builtin, method, mutate, setitem, getitem...
+    dest: Optional[Temp]
+    args: List[Value] = field(default_factory=list)
+    attr: Any = None  # operator, callee or method name
+
+    def __str__(self) -> str:
+        head = f"{self.op} {self.attr}" if self.attr is not None else self.op
+        args = ", ".join(str(a) for a in self.args)
+        text = f"{head} {args}" if args else head
+        if self.dest is None:
+            return text
+        return f"{self.dest}:{self.dest.type or '?'} = {text}"
+
+
+@dataclass(eq=False)
+class Phi:
+    dest: Temp
+    incoming: Dict["BasicBlock", Value] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        ops = ", ".join(f"[{b.name}: {v}]" for b, v in self.incoming.items())
+        return f"{self.dest}:{self.dest.type or '?'} = phi {ops}"
+
+
+# Terminators:
+
+@dataclass(eq=False)
+class Jump:
+    target: "BasicBlock"
+
+    def __str__(self) -> str:
+        return f"jmp {self.target.name}"
+
+
+@dataclass(eq=False)
+class CondJump:
+    cond: Value
+    then_block: "BasicBlock"
+    else_block: "BasicBlock"
+
+    def __str__(self) -> str:
+        return f"br {self.cond}, {self.then_block.name}, {self.else_block.name}"
+
+
+@dataclass(eq=False)
+class Ret:
+    value: Value
+
+    def __str__(self) -> str:
+        return f"ret {self.value}"
+
+
+Terminator = Union[Jump, CondJump, Ret]
+
+
+# Blocks, functions and modules:
+
+@dataclass(eq=False)
+class BasicBlock:
+    id: int
+    phis: List[Phi] = field(default_factory=list)
+    instrs: List[Instr] = field(default_factory=list)
+    terminator: Optional[Terminator] = None
+    preds: List["BasicBlock"] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return f"bb{self.id}"
+
+    @property
+    def succs(self) -> List["BasicBlock"]:
+        t = self.terminator
+        if isinstance(t, Jump):
+            return [t.target]
+        if isinstance(t, CondJump):
+            if t.then_block is t.else_block:
+                return [t.then_block]
+            return [t.then_block, t.else_block]
+        return []
+
+
+@dataclass(eq=False)
+class Function:
+    name: str
+    params: List[Temp] = field(default_factory=list)
+    blocks: List[BasicBlock] = field(default_factory=list)
+    is_main: bool = False
+    next_temp: int = 0
+    next_block: int = 0
+
+    @property
+    def entry(self) -> BasicBlock:
+        return self.blocks[0]
+
+    def new_temp(self, hint: Optional[str] = None) -> Temp:
+        self.next_temp += 1
+        return Temp(self.next_temp, hint)
+
+    def new_block(self) -> BasicBlock:
+        block = BasicBlock(self.next_block)
+        self.next_block += 1
+        self.blocks.append(block)
+        return block
+
+    # Every value operand in the function, in a stable order:
+    def operands(self) -> Iterator[Value]:
+        for block in self.blocks:
+            for phi in block.phis:
+                yield from phi.incoming.values()
+            for instr in block.instrs:
+                yield from instr.args
+            t = block.terminator
+            if isinstance(t, CondJump):
+                yield t.cond
+            elif isinstance(t, Ret):
+                yield t.value
+
+    # Rewrites every operand through mapping (values not in it stay):
+    def replace_uses(self, mapping: Dict[Value, Value]) -> None:
+        if not mapping:
+            return
+
+        def resolve(v: Value) -> Value:
+            seen = 0
+            while v in mapping and seen < len(mapping):
+                v = mapping[v]
+                seen += 1
+            return v
+
+        for block in self.blocks:
+            for phi in block.phis:
+                for pred in phi.incoming:
+                    phi.incoming[pred] = resolve(phi.incoming[pred])
+            for instr in block.instrs:
+                instr.args = [resolve(a) for a in instr.args]
+            t = block.terminator
+            if isinstance(t, CondJump):
+                t.cond = resolve(t.cond)
+            elif isinstance(t, Ret):
+                t.value = resolve(t.value)
+
+    # Rebuilds every block's predecessor list from the terminators:
+    def recompute_preds(self) -> None:
+        for block in self.blocks:
+            block.preds = []
+        for block in self.blocks:
+            for succ in block.succs:
+                succ.preds.append(block)
+
+
+@dataclass(eq=False)
+class Module:
+    functions: List[Function] = field(default_factory=list)
+
+
+# Textual dump (used by --dump-ir):
+
+def format_function(func: Function) -> str:
+    params = ", ".join(str(p) for p in func.params)
+    lines = [f"function {func.name}({params}) {{"]
+    for block in func.blocks:
+        preds = ", ".join(p.name for p in block.preds)
+        lines.append(f"{block.name}:" + (f"  ; preds: {preds}" if preds else ""))
+        for phi in block.phis:
+            lines.append(f"    {phi}")
+        for instr in block.instrs:
+            lines.append(f"    {instr}")
+        if block.terminator is not None:
+            lines.append(f"    {block.terminator}")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def format_module(module: Module) -> str:
+    return "\n\n".join(format_function(f) for f in module.functions)
@@ -0,0 +1,502 @@
+from __future__ import annotations
+
+import ast as py_ast
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.ast_nodes import (
+    AUGMENTED_OPS,
+    Program,
+    FunctionDef,
+    Name,
+    Constant,
+    Assign,
+    Return,
+    Pass,
+    Break,
+    Continue,
+    If,
+    While,
+    For,
+    Call,
+    BinaryOp,
+    UnaryOp,
+    ListLiteral,
+    TupleLiteral,
+    DictLiteral,
+    Index,
+    Slice,
+    Attribute,
+    Node,
+)
+from src.ir import (
+    BasicBlock,
+    CondJump,
+    Const,
+    Function,
+    Instr,
+    Jump,
+    Module,
+    Phi,
+    Ret,
+    Temp,
+    Value,
+)
+
+# Container methods that modify their object (defines a new SSA version of it):
+MUTATING_METHODS = ("append", "add", "remove", "sort")
+READING_METHODS = ("get", "sublist", "union", "intersection", "difference")
+
+
+# Lowers the AST into SSA form, building phis on the fly while blocks are
+# filled (Braun et al., "Simple and Efficient Construction of SSA Form").
+class IRBuilder:
+    def __init__(self) -> None:
+        self.func: Optional[Function] = None
+        self.block: Optional[BasicBlock] = None
+        self.current_def: Dict[str, Dict[BasicBlock, Value]] = {}
+        self.sealed: Set[BasicBlock] = set()
+        self.incomplete_phis: Dict[BasicBlock, Dict[str, Phi]] = {}
+        self.forward: Dict[Value, Value] = {}
+        # (continue target, break target) of the enclosing loops:
+        self.loops: List[Tuple[BasicBlock, BasicBlock]] = []
+        self.loop_counter: int = 0
+
+    # Builds one IR function per FunctionDef and a "main" for the rest:
+    def build(self, program: Program) -> Module:
+        module = Module()
+        globals: List[Node] = []
+
+        for node in program.body:
+            if isinstance(node, FunctionDef):
+                module.functions.append(self.build_function(node))
+            else:
+                globals.append(node)
+
+        module.functions.append(self.build_main(globals))
+        return module
+
+    def build_function(self, node: FunctionDef) -> Function:
+        self.start_function(Function(node.name.id))
+        for p in node.params:
+            param = self.func.new_temp(p.name.id)
+            self.func.params.append(param)
+            self.write_variable(p.name.id, self.block, param)
+        return self.finish_function(node.body)
+
+    def build_main(self, stmts: List[Node]) -> Function:
+        self.start_function(Function("main", is_main=True))
+        return self.finish_function(stmts)
+
+    def start_function(self, func: Function) -> None:
+        self.func = func
+        self.current_def = {}
+        self.sealed = set()
+        self.incomplete_phis = {}
+        self.forward = {}
+        self.loops = []
+        self.block = func.new_block()
+        self.seal_block(self.block)
+
+    def finish_function(self, body: List[Node]) -> Function:
+        for stmt in body:
+            self.lower_stmt(stmt)
+
+        # Falling off the end returns None:
+        if self.block.terminator is None:
+            self.block.terminator = Ret(Const(None))
+
+        # Resolve uses of phis removed as trivial while building:
+        self.func.replace_uses(self.forward)
+        for block in self.func.blocks:
+            block.phis = [phi for phi in block.phis if phi.dest not in self.forward]
+        return self.func
+
+    # ---------- SSA variable bookkeeping ----------
+
+    def write_variable(self, name: str, block: BasicBlock, value: Value) -> None:
+        self.current_def.setdefault(name, {})[block] = value
+
+    def read_variable(self, name: str, block: BasicBlock) -> Value:
+        defs = self.current_def.get(name, {})
+        if block in defs:
+            return self.resolve(defs[block])
+        return self.read_variable_recursive(name, block)
+
+    def read_variable_recursive(self, name: str, block: BasicBlock) -> Value:
+        if block not in self.sealed:
+            # Not all predecessors known yet: placeholder phi, completed on sealing
+            phi = self.new_phi(name, block)
+            self.incomplete_phis.setdefault(block, {})[name] = phi
+            value: Value = phi.dest
+        elif len(block.preds) == 1:
+            value = self.read_variable(name, block.preds[0])
+        elif not block.preds:
+            # Read before any assignment: like an uninitialized PyValue (None)
+            value = Const(None)
+        else:
+            # Break cycles with an operandless phi first
+            phi = self.new_phi(name, block)
+            self.write_variable(name, block, phi.dest)
+            value = self.add_phi_operands(name, phi, block)
+        self.write_variable(name, block, value)
+        return value
+
+    def new_phi(self, name: str, block: BasicBlock) -> Phi:
+        phi = Phi(self.func.new_temp(name))
+        block.phis.append(phi)
+        return phi
+
+    def add_phi_operands(self, name: str, phi: Phi, block: BasicBlock) -> Value:
+        for pred in block.preds:
+            phi.incoming[pred] = self.read_variable(name, pred)
+        return self.try_remove_trivial_phi(phi)
+
+    # A phi that only merges itself and one other value is that value:
+    def try_remove_trivial_phi(self, phi: Phi) -> Value:
+        same: Optional[Value] = None
+        for op in phi.incoming.values():
+            op = self.resolve(op)
+            if op is same or op is phi.dest:
+                continue
+            if same is not None:
+                return phi.dest
+            same = op
+        if same is None:
+            same = Const(None)
+
+        self.forward[phi.dest] = same
+
+        # Phis that used this one may have become trivial as well:
+        for block in self.func.blocks:
+            for user in block.phis:
+                if user is phi or user.dest in self.forward:
+                    continue
+                if any(v is phi.dest for v in user.incoming.values()):
+                    for pred, v in user.incoming.items():
+                        user.incoming[pred] = self.resolve(v)
+                    self.try_remove_trivial_phi(user)
+        return same
+
+    def resolve(self, value: Value) -> Value:
+        while value in self.forward:
+            value = self.forward[value]
+        return value
+
+    def seal_block(self, block: BasicBlock) -> None:
+        for name, phi in self.incomplete_phis.pop(block, {}).items():
+            self.add_phi_operands(name, phi, block)
+        self.sealed.add(block)
+
+    # ---------- Blocks and emission ----------
+
+    def new_block(self) -> BasicBlock:
+        return self.func.new_block()
+
+    def add_edge(self, src: BasicBlock, dst: BasicBlock) -> None:
+        dst.preds.append(src)
+
+    def jump(self, target: BasicBlock) -> None:
+        if self.block.terminator is None:
+            self.block.terminator = Jump(target)
+            self.add_edge(self.block, target)
+
+    def branch(self, cond: Value, then_block: BasicBlock, else_block: BasicBlock) -> None:
+        self.block.terminator = CondJump(cond, then_block, else_block)
+        self.add_edge(self.block, then_block)
+        self.add_edge(self.block, else_block)
+
+    # Code after return/break/continue goes into an unreachable block:
+    def start_dead_block(self) -> None:
+        self.block = self.new_block()
+        self.seal_block(self.block)
+
+    def emit(self, op: str, args: List[Value], attr=None, hint: Optional[str] = None,
+             has_result: bool = True) -> Optional[Temp]:
+        dest = self.func.new_temp(hint) if has_result else None
+        self.block.instrs.append(Instr(op, dest, args, attr))
+        return dest
+
+    # ---------- Statements ----------
+
+    def lower_stmt(self, node: Node) -> None:
+        if isinstance(node, Assign):
+            self.lower_assign(node)
+        elif isinstance(node, Return):
+            value = self.lower_expr(node.value) if node.value is not None else Const(None)
+            self.block.terminator = Ret(value)
+            self.start_dead_block()
+        elif isinstance(node, If):
+            self.lower_if(node)
+        elif isinstance(node, While):
+            self.lower_while(node)
+        elif isinstance(node, For):
+            self.lower_for(node)
+        elif isinstance(node, Call):
+            self.lower_call_stmt(node)
+        elif isinstance(node, Pass):
+            pass
+        elif isinstance(node, (Break, Continue)):
+            if not self.loops:
+                raise NotImplementedError(f"'{type(node).__name__.lower()}' outside loop")
+            continue_target, break_target = self.loops[-1]
+            self.jump(break_target if isinstance(node, Break) else continue_target)
+            self.start_dead_block()
+        else:
+            raise NotImplementedError(f"Unsupported statement: {type(node).__name__}")
+
+    def lower_assign(self, stmt: Assign) -> None:
+        # x = expr / x += expr
+        if isinstance(stmt.target, Name):
+            name = stmt.target.id
+            value = self.lower_expr(stmt.value)
+            if stmt.op != "=":
+                current = self.read_variable(name, self.block)
+                value = self.emit("binop", [current, value], AUGMENTED_OPS[stmt.op], name)
+            else:
+                value = self.emit("copy", [value], hint=name)
+            self.write_variable(name, self.block, value)
+            return
+
+        # a[i] = expr / a[i] += expr (defines a new version of a)
+        if isinstance(stmt.target, Index):
+            if not isinstance(stmt.target.value, Name):
+                raise NotImplementedError(
+                    "Only simple indexed assignment like a[i] = value is supported"
+                )
+            name = stmt.target.value.id
+            container = self.read_variable(name, self.block)
+            index = self.lower_expr(stmt.target.index)
+            value = self.lower_expr(stmt.value)
+            if stmt.op != "=":
+                current = self.emit("getitem", [container, index])
+                value = self.emit("binop", [current, value], AUGMENTED_OPS[stmt.op])
+            updated = self.emit("setitem", [container, index, value], hint=name)
+            self.write_variable(name, self.block, updated)
+            return
+
+        raise NotImplementedError(
+            f"Unsupported assignment target type: {type(stmt.target).__name__}"
+        )
+
+    def lower_if(self, stmt: If) -> None:
+        merge = self.new_block()
+        clauses = [(stmt.condition, stmt.body)] + [(e.condition, e.body) for e in stmt.elifs]
+
+        for condition, body in clauses:
+            cond = self.lower_expr(condition)
+            then_block = self.new_block()
+            else_block = self.new_block()
+            self.branch(cond, then_block, else_block)
+            self.seal_block(then_block)
+            self.seal_block(else_block)
+
+            self.block = then_block
+            for s in body:
+                self.lower_stmt(s)
+            self.jump(merge)
+
+            # Next elif (or the else part) starts from the false edge:
+            self.block = else_block
+
+        for s in stmt.orelse:
+            self.lower_stmt(s)
+        self.jump(merge)
+
+        self.seal_block(merge)
+        self.block = merge
+
+    def lower_while(self, stmt: While) -> None:
+        header = self.new_block()
+        body = self.new_block()
+        exit_block = self.new_block()
+        self.jump(header)
+
+        # The header stays unsealed until the back edges are known:
+        self.block = header
+        cond = self.lower_expr(stmt.condition)
+        self.branch(cond, body, exit_block)
+        self.seal_block(body)
+
+        self.block = body
+        self.loops.append((header, exit_block))
+        for s in stmt.body:
+            self.lower_stmt(s)
+        self.loops.pop()
+        self.jump(header)
+
+        self.seal_block(header)
+        self.seal_block(exit_block)
+        self.block = exit_block
+
+    def lower_for(self, stmt: For) -> None:
+        iterable = stmt.iterable
+        if isinstance(iterable, Call) and isinstance(iterable.func, Name) and iterable.func.id == "range":
+            self.lower_for_range(stmt, iterable)
+        else:
+            self.lower_for_iterable(stmt)
+
+    def lower_for_range(self, stmt: For, range_call: Call) -> None:
+        args = [self.lower_expr(a) for a in range_call.args]
+        if len(args) == 1:
+            start, stop, step = Const(0), args[0], Const(1)
+        elif len(args) == 2:
+            start, stop, step = args[0], args[1], Const(1)
+        elif len(args) == 3:
+            start, stop, step = args
+        else:
+            raise NotImplementedError("range() with more than 3 arguments is not supported")
+
+        # Hidden counter, so rebinding the loop variable does not affect the loop:
+        self.loop_counter += 1
+        counter = f".range{self.loop_counter}"
+        self.write_variable(counter, self.block, start)
+
+        header = self.new_block()
+        body = self.new_block()
+        latch = self.new_block()
+        exit_block = self.new_block()
+        self.jump(header)
+
+        self.block = header
+        current = self.read_variable(counter, header)
+        cond = self.emit("binop", [current, stop], "LESS")
+        self.branch(cond, body, exit_block)
+        self.seal_block(body)
+
+        self.block = body
+        self.write_variable(stmt.target.id, body, self.emit("copy", [current], hint=stmt.target.id))
+        self.loops.append((latch, exit_block))
+        for s in stmt.body:
+            self.lower_stmt(s)
+        self.loops.pop()
+        self.jump(latch)
+        self.seal_block(latch)
+
+        self.block = latch
+        current = self.read_variable(counter, latch)
+        self.write_variable(counter, latch, self.emit("binop", [current, step], "ADD"))
+        self.jump(header)
+
+        self.seal_block(header)
+        self.seal_block(exit_block)
+        self.block = exit_block
+
+    def lower_for_iterable(self, stmt: For) -> None:
+        container = self.lower_expr(stmt.iterable)
+        iterator = self.emit("iter", [container])
+        iterator.type = "iter"
+
+        header = self.new_block()
+        body = self.new_block()
+        exit_block = self.new_block()
+        self.jump(header)
+
+        # iter_next also takes the container so it stays alive for the loop:
+        self.block = header
+        has_next = self.emit("iter_next", [iterator, container])
+        self.branch(has_next, body, exit_block)
+        self.seal_block(body)
+
+        self.block = body
+        item = self.emit("iter_value", [iterator], hint=stmt.target.id)
+        self.write_variable(stmt.target.id, body, item)
+        self.loops.append((header, exit_block))
+        for s in stmt.body:
+            self.lower_stmt(s)
+        self.loops.pop()
+        self.jump(header)
+
+        self.seal_block(header)
+        self.seal_block(exit_block)
+        self.block = exit_block
+
+    def lower_call_stmt(self, call: Call) -> None:
+        if isinstance(call.func, Name) and call.func.id == "print":
+            args = [self.lower_expr(a) for a in call.args]
+            self.emit("print", args, has_result=False)
+        else:
+            self.lower_expr(call)
+
+    # ---------- Expressions ----------
+
+    def lower_expr(self, node: Node) -> Value:
+        if isinstance(node, Name):
+            return self.read_variable(node.id, self.block)
+        if isinstance(node, Constant):
+            return self.constant(node)
+        if isinstance(node, BinaryOp):
+            left = self.lower_expr(node.left)
+            right = self.lower_expr(node.right)
+            return self.emit("binop", [left, right], node.op)
+        if isinstance(node, UnaryOp):
+            return self.emit("unop", [self.lower_expr(node.operand)], node.op)
+        if isinstance(node, Call):
+            return self.lower_call(node)
+        if isinstance(node, ListLiteral):
+            return self.emit("list", [self.lower_expr(e) for e in node.elements])
+        if isinstance(node, TupleLiteral):
+            return self.emit("tuple", [self.lower_expr(e) for e in node.elements])
+        if isinstance(node, DictLiteral):
+            args: List[Value] = []
+            for pair in node.pairs:
+                args.append(self.lower_expr(pair.key))
+                args.append(self.lower_expr(pair.value))
+            return self.emit("dict", args)
+        if isinstance(node, Index):
+            container = self.lower_expr(node.value)
+            return self.emit("getitem", [container, self.lower_expr(node.index)])
+        if isinstance(node, Slice):
+            # An omitted bound is None:
+            args = [self.lower_expr(node.value)]
+            for bound in (node.lower, node.upper):
+                args.append(Const(None) if bound is None else self.lower_expr(bound))
+            return self.emit("getslice", args)
+
+        raise NotImplementedError(f"Unsupported expression: {type(node).__name__}")
+
+    def constant(self, node: Constant) -> Const:
+        val = node.value
+        # String tokens keep their quotes and escapes:
+        if isinstance(val, str):
+            return Const(py_ast.literal_eval(val))
+        return Const(val)
+
+    def lower_call(self, node: Call) -> Value:
+        # Function:
+        if isinstance(node.func, Name):
+            func_name = node.func.id
+            args = [self.lower_expr(a) for a in node.args]
+
+            if func_name in ("str", "len", "set", "sorted"):
+                if len(args) != 1:
+                    raise NotImplementedError(
+                        f"{func_name}() with != 1 argument is not supported"
+                    )
+                return self.emit("builtin", args, func_name)
+
+            return self.emit("call", args, func_name)
+
+        # Container methods:
+        if isinstance(node.func, Attribute):
+            if not isinstance(node.func.value, Name):
+                raise NotImplementedError(
+                    "Container methods are only supported on simple variables"
+                )
+            obj_name = node.func.value.id
+            method_name = node.func.attr.id
+            obj = self.read_variable(obj_name, self.block)
+            args = [self.lower_expr(a) for a in node.args]
+
+            if method_name in MUTATING_METHODS:
+                updated = self.emit("mutate", [obj] + args, method_name, obj_name)
+                self.write_variable(obj_name, self.block, updated)
+                return Const(None)
+
+            if method_name in READING_METHODS:
+                return self.emit("method", [obj] + args, method_name)
+
+            raise NotImplementedError(f"Unsupported container method: {method_name}")
+
+        raise NotImplementedError(
+            "Only simple function calls and basic container methods are supported for now"
+        )
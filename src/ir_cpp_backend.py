@@ -0,0 +1,500 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Set
+
+from src.cpp_constants import ConstantTable, print_call
+from src.ir import (
+    BasicBlock,
+    CondJump,
+    Const,
+    Function,
+    Instr,
+    Jump,
+    Module,
+    Ret,
+    Temp,
+    Value,
+)
+
+BINARY_OPS = {
+    # Arithmetic:
+    "ADD": "py_add",
+    "MINUS": "py_sub",
+    "TIMES": "py_mul",
+    "DIVIDE": "py_div",
+    "MODULE": "py_mod",
+    "FLOORDIV": "py_floordiv",
+    "POWER": "py_pow",
+    # Comparisons:
+    "EQUAL_EQUAL": "py_eq",
+    "NOT_EQUAL": "py_ne",
+    "LESS": "py_lt",
+    "LESS_EQUAL": "py_le",
+    "GREATER": "py_gt",
+    "GREATER_EQUAL": "py_ge",
+    # Logical:
+    "AND": "py_and",
+    "OR": "py_or",
+}
+
+# Instructions that only compute a value (no output, no container changes):
+EXPRESSION_OPS = (
+    "binop", "unop", "builtin", "method", "getitem", "getslice", "list", "tuple", "dict",
+)
+
+BUILTINS = {
+    "str": "py_str",
+    "len": "py_len",
+    "set": "py_set_from_list",
+    "sorted": "py_sorted",
+}
+
+
+# Generates C++ from the SSA IR: one C++ variable per SSA value, basic blocks
+# as labels, phis turned into copies at the end of the predecessors.
+class IRCppBackend:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.indent_level: int = 0
+        self.names: Dict[Temp, str] = {}
+        self.live_out: Dict[BasicBlock, Set[Temp]] = {}
+        self.constants = ConstantTable()
+        # Element reads folded into their only user, and what they evaluate to:
+        self.borrowed: Set[Temp] = set()
+        self.inlined: Dict[Temp, str] = {}
+
+    def generate(self, module: Module) -> str:
+        self.lines = []
+        self.indent_level = 0
+        self.constants = ConstantTable()
+
+        self._emit_preamble()
+        table_at = len(self.lines)
+
+        # Forward declarations, so functions may call each other in any order:
+        functions = [f for f in module.functions if not f.is_main]
+        for func in functions:
+            self.emit(f"{self.signature(func)};")
+        if functions:
+            self.emit("")
+
+        for func in module.functions:
+            self.emit_function(func)
+            self.emit("")
+
+        # Literals are known once every function is emitted:
+        self.lines[table_at:table_at] = self.constants.declarations()
+        return "\n".join(self.lines)
+
+    # Adds a line with a 4 space indent:
+    def emit(self, line: str = "") -> None:
+        indent = "    " * self.indent_level
+        self.lines.append(indent + line)
+
+    def indent(self) -> None:
+        self.indent_level += 1
+
+    def dedent(self) -> None:
+        if self.indent_level > 0:
+            self.indent_level -= 1
+
+    # Header statements and includes:
+    def _emit_preamble(self) -> None:
+        self.emit("// Generated by simple Fangless Python transpiler (IR backend)")
+        self.emit('#include "../c++/runtime.hpp"')
+        self.emit("")
+        self.emit("// Compile with something like:")
+        self.emit("//   g++ -std=c++17 -O3 output.cpp -o program")
+        self.emit("")
+
+    def signature(self, func: Function) -> str:
+        params = ", ".join(f"const PyValue& {p.hint}" for p in func.params)
+        return f"PyValue {func.name}({params})"
+
+    # ---------- Functions ----------
+
+    def emit_function(self, func: Function) -> None:
+        self.split_critical_edges(func)
+        self.assign_names(func)
+        self.compute_liveness(func)
+        self.find_borrowed(func)
+
+        header = "int main()" if func.is_main else self.signature(func)
+        self.emit(f"{header} {{")
+        self.indent()
+
+        # Every SSA value is declared up front so gotos never skip an initialization:
+        for block in func.blocks:
+            for phi in block.phis:
+                self.emit(f"PyValue {self.names[phi.dest]};")
+            for instr in block.instrs:
+                if instr.dest is None or instr.dest in self.borrowed:
+                    continue
+                name = self.names[instr.dest]
+                if instr.op == "iter":
+                    self.emit(f"PyIterator {name};")
+                    self.emit(f"PyValue {name}_item;")
+                    self.emit(f"PyValue {name}_source;")
+                else:
+                    self.emit(f"PyValue {name};")
+
+        labels = self.jump_targets(func)
+        for position, block in enumerate(func.blocks):
+            following = func.blocks[position + 1] if position + 1 < len(func.blocks) else None
+            if block in labels:
+                self.dedent()
+                self.emit(f"{block.name}:;")
+                self.indent()
+            self.emit_block(func, block, following)
+
+        self.dedent()
+        self.emit("}")
+
+    # Puts an empty block on every edge from a branch into a block with phis,
+    # so the phi copies of one edge never run on the other:
+    def split_critical_edges(self, func: Function) -> None:
+        for block in list(func.blocks):
+            t = block.terminator
+            if not isinstance(t, CondJump):
+                continue
+            for attr in ("then_block", "else_block"):
+                succ = getattr(t, attr)
+                if not succ.phis or len(succ.preds) < 2:
+                    continue
+                middle = func.new_block()
+                middle.terminator = Jump(succ)
+                setattr(t, attr, middle)
+                for phi in succ.phis:
+                    phi.incoming[middle] = phi.incoming.pop(block)
+        func.recompute_preds()
+
+    def assign_names(self, func: Function) -> None:
+        self.names = {}
+        for p in func.params:
+            self.names[p] = p.hint
+        for block in func.blocks:
+            dests = [phi.dest for phi in block.phis] + [
+                i.dest for i in block.instrs if i.dest is not None
+            ]
+            for temp in dests:
+                # Hidden loop counters (".range1") are not valid identifiers:
+                hint = re.sub(r"\W", "", temp.hint or "") or "t"
+                prefix = "__it" if temp.type == "iter" else f"__{hint}"
+                self.names[temp] = f"{prefix}{temp.id}"
+
+    # Standard backward liveness; phi operands are used at the end of their predecessor.
+    def compute_liveness(self, func: Function) -> None:
+        uses: Dict[BasicBlock, Set[Temp]] = {}
+        defs: Dict[BasicBlock, Set[Temp]] = {}
+        for block in func.blocks:
+            used: Set[Temp] = set()
+            defined: Set[Temp] = {phi.dest for phi in block.phis}
+            for instr in block.instrs:
+                used |= {a for a in instr.args if isinstance(a, Temp) and a not in defined}
+                if instr.dest is not None:
+                    defined.add(instr.dest)
+            for v in self.terminator_operands(block):
+                if isinstance(v, Temp) and v not in defined:
+                    used.add(v)
+            for succ in block.succs:
+                for phi in succ.phis:
+                    v = phi.incoming.get(block)
+                    if isinstance(v, Temp) and v not in defined:
+                        used.add(v)
+            uses[block] = used
+            defs[block] = defined
+
+        live_in: Dict[BasicBlock, Set[Temp]] = {b: set() for b in func.blocks}
+        self.live_out = {b: set() for b in func.blocks}
+        changed = True
+        while changed:
+            changed = False
+            for block in reversed(func.blocks):
+                out: Set[Temp] = set()
+                for succ in block.succs:
+                    out |= live_in[succ] - {phi.dest for phi in succ.phis}
+                new_in = uses[block] | (out - defs[block])
+                if out != self.live_out[block] or new_in != live_in[block]:
+                    self.live_out[block] = out
+                    live_in[block] = new_in
+                    changed = True
+
+    # A getitem read by one later instruction of its block (or by the branch
+    # ending it), and nowhere else, is not copied into its own variable: the
+    # user reads the element in place with py_getitem_ref. Only expressions
+    # may run in between, and users that may change the container (calls,
+    # mutations) or keep the operand still get a copy.
+    def find_borrowed(self, func: Function) -> None:
+        self.borrowed = set()
+        self.inlined = {}
+
+        use_count: Dict[Temp, int] = {}
+        for block in func.blocks:
+            operands = [a for i in block.instrs for a in i.args]
+            operands += self.terminator_operands(block)
+            operands += [v for phi in block.phis for v in phi.incoming.values()]
+            for v in operands:
+                if isinstance(v, Temp):
+                    use_count[v] = use_count.get(v, 0) + 1
+
+        for block in func.blocks:
+            # Temps each folded element read evaluates (container, index, ...):
+            reads: Dict[Temp, Set[Temp]] = {}
+            for position, instr in enumerate(block.instrs):
+                if instr.op != "getitem" or use_count.get(instr.dest) != 1:
+                    continue
+                operands = {a for a in instr.args if isinstance(a, Temp)}
+                for a in list(operands):
+                    operands |= reads.get(a, set())
+
+                for user in block.instrs[position + 1:]:
+                    kept = [user.args[i] for i in self.sink_positions(user)]
+                    if instr.dest in kept or any(a in operands for a in kept):
+                        break
+                    if instr.dest in user.args:
+                        if user.op not in ("call", "mutate", "setitem"):
+                            self.borrowed.add(instr.dest)
+                            reads[instr.dest] = operands
+                        break
+                    if user.op not in EXPRESSION_OPS:
+                        break
+                else:
+                    t = block.terminator
+                    if isinstance(t, CondJump) and t.cond is instr.dest:
+                        self.borrowed.add(instr.dest)
+
+    def terminator_operands(self, block: BasicBlock) -> List[Value]:
+        t = block.terminator
+        if isinstance(t, CondJump):
+            return [t.cond]
+        if isinstance(t, Ret):
+            return [t.value]
+        return []
+
+    # Blocks that need a label (not reached by falling through):
+    def jump_targets(self, func: Function) -> Set[BasicBlock]:
+        targets: Set[BasicBlock] = set()
+        for position, block in enumerate(func.blocks):
+            following = func.blocks[position + 1] if position + 1 < len(func.blocks) else None
+            t = block.terminator
+            if isinstance(t, Jump) and t.target is not following:
+                targets.add(t.target)
+            elif isinstance(t, CondJump):
+                if t.then_block is not following:
+                    targets.add(t.then_block)
+                if t.else_block is not following:
+                    targets.add(t.else_block)
+        return targets
+
+    # ---------- Blocks ----------
+
+    def emit_block(self, func: Function, block: BasicBlock,
+                   following: Optional[BasicBlock]) -> None:
+        # Values still needed after each instruction (walking backwards):
+        live = set(self.live_out[block])
+        for v in self.terminator_operands(block):
+            if isinstance(v, Temp):
+                live.add(v)
+        live_after: List[Set[Temp]] = []
+        for instr in reversed(block.instrs):
+            live_after.append(set(live))
+            if instr.dest is not None:
+                live.discard(instr.dest)
+            live |= {a for a in instr.args if isinstance(a, Temp)}
+        live_after.reverse()
+
+        for instr, live_set in zip(block.instrs, live_after):
+            self.emit_instr(func, instr, live_set)
+
+        t = block.terminator
+        if isinstance(t, Jump):
+            self.emit_phi_copies(func, block, t.target)
+            if t.target is not following:
+                self.emit(f"goto {t.target.name};")
+        elif isinstance(t, CondJump):
+            cond = self.value(t.cond)
+            if t.then_block is following:
+                self.emit(f"if (!{cond}.is_truthy()) goto {t.else_block.name};")
+            else:
+                self.emit(f"if ({cond}.is_truthy()) goto {t.then_block.name};")
+                if t.else_block is not following:
+                    self.emit(f"goto {t.else_block.name};")
+        elif isinstance(t, Ret):
+            if func.is_main:
+                self.emit("return 0;")
+            else:
+                self.emit(f"return {self.value(t.value)};")
+
+    # Phi copies happen in parallel: stage through temporaries if they overlap.
+    def emit_phi_copies(self, func: Function, block: BasicBlock, succ: BasicBlock) -> None:
+        copies = [(phi.dest, phi.incoming[block]) for phi in succ.phis]
+        copies = [(d, s) for d, s in copies if d is not s]
+        if not copies:
+            return
+
+        dests = {d for d, _ in copies}
+        if len(copies) == 1 or not any(s in dests for _, s in copies):
+            for dest, src in copies:
+                # A value only carried into the phi is moved there:
+                if (isinstance(src, Temp) and src not in self.live_out[block]
+                        and src not in func.params
+                        and sum(1 for _, s in copies if s is src) == 1):
+                    self.emit(f"{self.names[dest]} = std::move({self.names[src]});")
+                else:
+                    self.emit(f"{self.names[dest]} = {self.value(src)};")
+            return
+
+        self.emit("{")
+        self.indent()
+        for n, (_, src) in enumerate(copies):
+            self.emit(f"PyValue __phi{n} = {self.value(src)};")
+        for n, (dest, _) in enumerate(copies):
+            self.emit(f"{self.names[dest]} = std::move(__phi{n});")
+        self.dedent()
+        self.emit("}")
+
+    def value(self, v: Value) -> str:
+        if isinstance(v, Const):
+            return self.constants.reference(v.value)
+        if v in self.inlined:
+            return self.inlined[v]
+        return self.names[v]
+
+    # Copies obj into dest, or moves it when obj is not needed afterwards:
+    def take(self, dest: str, obj: Value, live_after: Set[Temp], func: Function) -> str:
+        if isinstance(obj, Temp) and obj not in live_after and obj not in func.params:
+            return f"{dest} = std::move({self.names[obj]});"
+        return f"{dest} = {self.value(obj)};"
+
+    # Operands the runtime keeps (appended, stored, copied) or consumes (the
+    # left string of +, the list given to sorted()):
+    def sink_positions(self, instr: Instr) -> List[int]:
+        if instr.op == "binop" and instr.attr == "ADD":
+            return [0]
+        if instr.op == "copy" or (instr.op == "builtin" and instr.attr == "sorted"):
+            return [0]
+        if instr.op == "mutate" and instr.attr in ("append", "add"):
+            return list(range(1, len(instr.args)))
+        if instr.op == "setitem":
+            return [2]
+        return []
+
+    # ---------- Instructions ----------
+
+    def emit_instr(self, func: Function, instr: Instr, live_after: Set[Temp]) -> None:
+        op = instr.op
+        args = [self.value(a) for a in instr.args]
+        dest = self.names[instr.dest] if instr.dest is not None else None
+
+        if instr.dest in self.borrowed:
+            self.inlined[instr.dest] = f"py_getitem_ref({', '.join(args)})"
+            return
+
+        # Operands the runtime keeps or consumes are moved at their last use:
+        for i in self.sink_positions(instr):
+            a = instr.args[i]
+            if (isinstance(a, Temp) and a not in live_after and a not in func.params
+                    and sum(1 for b in instr.args if b is a) == 1):
+                args[i] = f"std::move({args[i]})"
+
+        if op == "print":
+            self.emit(f"{print_call(args)};")
+            return
+
+        if op in ("mutate", "setitem"):
+            self.emit(self.take(dest, instr.args[0], live_after, func))
+            rest = ", ".join([dest] + args[1:])
+            self.emit(f"{self.mutation_call(instr)}({rest});")
+            return
+
+        if op == "iter":
+            # Constants get a home, the iterator only keeps a pointer:
+            source = args[0]
+            if not isinstance(instr.args[0], Temp):
+                self.emit(f"{dest}_source = {source};")
+                source = f"{dest}_source"
+            self.emit(f"{dest} = PyIterator({source});")
+            return
+
+        if op == "iter_next":
+            self.emit(f"{dest} = PyValue({args[0]}.next({args[0]}_item));")
+            return
+
+        self.emit(f"{dest} = {self.expression(instr, args)};")
+
+    def mutation_call(self, instr: Instr) -> str:
+        n = len(instr.args) - 1
+        if instr.op == "setitem":
+            return "py_setitem"
+        if instr.attr == "append":
+            if n != 1:
+                raise NotImplementedError("append() expects exactly 1 argument")
+            return "py_list_append"
+        if instr.attr == "add":
+            if n not in (1, 2):
+                raise NotImplementedError("add() expects 1 or 2 arguments")
+            return "py_dict_or_set_add"
+        if instr.attr == "sort":
+            if n != 0:
+                raise NotImplementedError("sort() expects no arguments")
+            return "py_list_sort"
+        if n != 1:
+            raise NotImplementedError("remove() expects exactly 1 argument")
+        return "py_container_remove"
+
+    def expression(self, instr: Instr, args: List[str]) -> str:
+        op = instr.op
+        joined = ", ".join(args)
+
+        if op == "binop":
+            # x ** 2 and x ** 3 are unrolled into multiplications:
+            exponent = instr.args[1]
+            if (instr.attr == "POWER" and isinstance(exponent, Const)
+                    and type(exponent.value) is int and exponent.value in (2, 3)):
+                product = args[0]
+                for _ in range(exponent.value - 1):
+                    product = f"py_mul({product}, {args[0]})"
+                return product
+            if instr.attr not in BINARY_OPS:
+                raise NotImplementedError(f"Unsupported binary op: {instr.attr}")
+            return f"{BINARY_OPS[instr.attr]}({joined})"
+        if op == "unop":
+            if instr.attr == "NOT":
+                return f"py_not({args[0]})"
+            if instr.attr == "NEG":
+                return f"py_sub(PY_ZERO, {args[0]})"
+            raise NotImplementedError(f"Unsupported unary op: {instr.attr}")
+        if op == "copy":
+            return args[0]
+        if op == "call":
+            return f"{instr.attr}({joined})"
+        if op == "builtin":
+            return f"{BUILTINS[instr.attr]}({joined})"
+        if op == "method":
+            if instr.attr == "get":
+                if len(args) != 2:
+                    raise NotImplementedError("get() expects exactly 1 argument")
+                return f"py_dict_or_set_get({joined})"
+            if instr.attr in ("union", "intersection", "difference"):
+                if len(args) != 2:
+                    raise NotImplementedError(f"{instr.attr}() expects exactly 1 argument")
+                return f"py_set_{instr.attr}({joined})"
+            if len(args) != 3:
+                raise NotImplementedError("sublist() expects exactly 2 arguments")
+            return f"py_list_sublist({joined})"
+        if op == "getitem":
+            return f"py_getitem({joined})"
+        if op == "getslice":
+            return f"py_getslice({joined})"
+        if op == "list":
+            return f"py_list(PyItems{{ {joined} }})"
+        if op == "tuple":
+            return f"py_tuple(PyItems{{ {joined} }})"
+        if op == "dict":
+            pairs = [f"py_pair({args[i]}, {args[i + 1]})" for i in range(0, len(args), 2)]
+            return "py_dict(PyPairs{ " + ", ".join(pairs) + " })"
+        if op == "iter_value":
+            return f"{args[0]}_item"
+
+        raise NotImplementedError(f"Unsupported IR instruction: {op}")
@@ -0,0 +1,428 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.ir import (
+    COMPARISONS,
+    BasicBlock,
+    CondJump,
+    Const,
+    Function,
+    Instr,
+    Jump,
+    Module,
+    Phi,
+    Ret,
+    Temp,
+    Value,
+    binary_type,
+    format_module,
+    is_pure,
+    join_types,
+)
+
+# A pass rewrites one function in place:
+PassFn = Callable[[Function], None]
+
+
+# ---------- simplify-cfg ----------
+
+# Removes unreachable blocks and merges straight-line block chains.
+def simplify_cfg(func: Function) -> None:
+    # Constant conditions become plain jumps:
+    for block in func.blocks:
+        t = block.terminator
+        if isinstance(t, CondJump) and isinstance(t.cond, Const):
+            block.terminator = Jump(t.then_block if truthy(t.cond.value) else t.else_block)
+        elif isinstance(t, CondJump) and t.then_block is t.else_block:
+            block.terminator = Jump(t.then_block)
+
+    # Drop blocks not reachable from the entry:
+    reachable: Set[BasicBlock] = set()
+    stack = [func.entry]
+    while stack:
+        block = stack.pop()
+        if block in reachable:
+            continue
+        reachable.add(block)
+        stack.extend(block.succs)
+    func.blocks = [b for b in func.blocks if b in reachable]
+    func.recompute_preds()
+    prune_phi_edges(func)
+
+    # Merge a block into its predecessor when that is its only way in:
+    changed = True
+    while changed:
+        changed = False
+        for block in func.blocks:
+            t = block.terminator
+            if not isinstance(t, Jump):
+                continue
+            succ = t.target
+            if succ is block or succ is func.entry or len(succ.preds) != 1:
+                continue
+            # Single predecessor: its phis just forward the only incoming value
+            func.replace_uses({phi.dest: phi.incoming[block] for phi in succ.phis})
+            block.instrs.extend(succ.instrs)
+            block.terminator = succ.terminator
+            func.blocks.remove(succ)
+            for after in block.succs:
+                for phi in after.phis:
+                    if succ in phi.incoming:
+                        phi.incoming[block] = phi.incoming.pop(succ)
+            func.recompute_preds()
+            changed = True
+            break
+
+
+# Phis keep exactly one incoming value per remaining predecessor:
+def prune_phi_edges(func: Function) -> None:
+    for block in func.blocks:
+        for phi in block.phis:
+            phi.incoming = {p: v for p, v in phi.incoming.items() if p in block.preds}
+
+
+# ---------- const-fold ----------
+
+def truthy(value) -> bool:
+    return bool(value)
+
+
+def is_int(value) -> bool:
+    return type(value) is int
+
+
+def is_number(value) -> bool:
+    return type(value) in (int, float)
+
+
+# Evaluates op on constants with the runtime's semantics, (False, None) if
+# it can't be folded (runtime error or unsupported operands).
+def fold_binary(op: str, a, b) -> Tuple[bool, object]:
+    if op == "AND":
+        return True, (a if not truthy(a) else b)
+    if op == "OR":
+        return True, (a if truthy(a) else b)
+
+    # Comparisons take bools as the numbers 0 and 1
+    if op in COMPARISONS:
+        if type(a) is bool and (is_number(b) or type(b) is bool):
+            a = int(a)
+        if type(b) is bool and is_number(a):
+            b = int(b)
+
+    if op == "EQUAL_EQUAL" or op == "NOT_EQUAL":
+        if type(a) is type(b) and type(a) in (int, float, bool, str, type(None)):
+            equal = a == b
+        elif is_number(a) and is_number(b):
+            # Exact, like the runtime: no rounding of ints above 2**53
+            equal = a == b
+        elif type(a) is not type(b):
+            equal = False
+        else:
+            return False, None
+        return True, (equal if op == "EQUAL_EQUAL" else not equal)
+
+    if op in ("LESS", "LESS_EQUAL", "GREATER", "GREATER_EQUAL"):
+        # Numbers exactly, strings lexicographically (UTF-8 bytes and code
+        # points give the same order)
+        if not ((is_number(a) and is_number(b)) or (type(a) is str and type(b) is str)):
+            return False, None
+        return True, {
+            "LESS": a < b,
+            "LESS_EQUAL": a <= b,
+            "GREATER": a > b,
+            "GREATER_EQUAL": a >= b,
+        }[op]
+
+    if not (is_number(a) and is_number(b)):
+        # str + str is the only non-numeric arithmetic the runtime allows
+        if op == "ADD" and type(a) is str and type(b) is str:
+            return True, a + b
+        return False, None
+
+    both_int = is_int(a) and is_int(b)
+    if op == "ADD":
+        return True, (a + b if both_int else float(a) + float(b))
+    if op == "MINUS":
+        return True, (a - b if both_int else float(a) - float(b))
+    if op == "TIMES":
+        return True, (a * b if both_int else float(a) * float(b))
+    if op == "DIVIDE":
+        if b == 0:
+            return False, None
+        return True, float(a) / float(b)
+    if op == "MODULE":
+        # Floored like the runtime's py_mod: the result takes the sign of b
+        if not both_int or b == 0:
+            return False, None
+        return True, a % b
+    if op == "FLOORDIV":
+        if b == 0:
+            return False, None
+        # Python's float // is CPython's float_floor_div, like the runtime's
+        return True, (a // b if both_int else float(a) // float(b))
+    if op == "POWER":
+        if both_int and b >= 0:
+            # Results that don't fit 64 bits are left to the runtime anyway
+            if abs(a) > 1 and b > 64:
+                return False, None
+            return True, a ** b
+        da, db = float(a), float(b)
+        if (da == 0.0 and db < 0.0) or (da < 0.0 and db != math.floor(db)):
+            return False, None
+        try:
+            return True, math.pow(da, db)
+        except OverflowError:
+            return False, None
+    return False, None
+
+
+def fold_unary(op: str, a) -> Tuple[bool, object]:
+    if op == "NOT":
+        return True, not truthy(a)
+    if op == "NEG" and is_number(a):
+        return True, (-a if is_int(a) else -float(a))
+    return False, None
+
+
+# Folded values must fit the runtime (64-bit ints, finite doubles):
+def representable(value) -> bool:
+    if is_int(value):
+        return -2**63 <= value < 2**63
+    if type(value) is float:
+        return math.isfinite(value)
+    return True
+
+
+# Replaces operations on constants by their result.
+def const_fold(func: Function) -> None:
+    changed = True
+    while changed:
+        changed = False
+        mapping: Dict[Value, Value] = {}
+        for block in func.blocks:
+            kept: List[Instr] = []
+            for instr in block.instrs:
+                args = instr.args
+                folded = False
+                if instr.op == "binop" and all(isinstance(a, Const) for a in args):
+                    folded, result = fold_binary(instr.attr, args[0].value, args[1].value)
+                elif instr.op == "unop" and isinstance(args[0], Const):
+                    folded, result = fold_unary(instr.attr, args[0].value)
+                elif instr.op == "copy" and isinstance(args[0], Const):
+                    folded, result = True, args[0].value
+                if folded and not representable(result):
+                    folded = False
+                if folded:
+                    mapping[instr.dest] = Const(result)
+                    changed = True
+                else:
+                    kept.append(instr)
+            block.instrs = kept
+        func.replace_uses(mapping)
+
+
+# ---------- copy-prop ----------
+
+# Forwards copies and phis whose incoming values are all the same.
+def copy_prop(func: Function) -> None:
+    changed = True
+    while changed:
+        changed = False
+        mapping: Dict[Value, Value] = {}
+        for block in func.blocks:
+            kept_phis: List[Phi] = []
+            for phi in block.phis:
+                values = {id(v): v for v in phi.incoming.values() if v is not phi.dest}
+                if len(values) == 1:
+                    mapping[phi.dest] = next(iter(values.values()))
+                elif not values:
+                    mapping[phi.dest] = Const(None)
+                else:
+                    kept_phis.append(phi)
+            block.phis = kept_phis
+
+            kept: List[Instr] = []
+            for instr in block.instrs:
+                if instr.op == "copy":
+                    mapping[instr.dest] = instr.args[0]
+                else:
+                    kept.append(instr)
+            block.instrs = kept
+
+        if mapping:
+            func.replace_uses(mapping)
+            changed = True
+
+
+# ---------- dce ----------
+
+# Mark and sweep: keeps side effects, terminators and whatever they use.
+def dce(func: Function) -> None:
+    defs: Dict[Temp, object] = {}
+    for block in func.blocks:
+        for phi in block.phis:
+            defs[phi.dest] = phi
+        for instr in block.instrs:
+            if instr.dest is not None:
+                defs[instr.dest] = instr
+
+    live: Set[int] = set()
+    work: List[object] = []
+
+    def mark(node) -> None:
+        if id(node) not in live:
+            live.add(id(node))
+            work.append(node)
+
+    for block in func.blocks:
+        for instr in block.instrs:
+            if not is_pure(instr) or instr.dest is None:
+                mark(instr)
+        t = block.terminator
+        if isinstance(t, CondJump) and t.cond in defs:
+            mark(defs[t.cond])
+        elif isinstance(t, Ret) and t.value in defs:
+            mark(defs[t.value])
+
+    while work:
+        node = work.pop()
+        operands = node.incoming.values() if isinstance(node, Phi) else node.args
+        for v in operands:
+            if v in defs:
+                mark(defs[v])
+
+    for block in func.blocks:
+        block.phis = [p for p in block.phis if id(p) in live]
+        block.instrs = [i for i in block.instrs if id(i) in live]
+
+
+# ---------- type-infer ----------
+
+RESULT_TYPES = {
+    "list": "list",
+    "tuple": "tuple",
+    "dict": "dict",
+    "iter": "iter",
+    "iter_next": "bool",
+    "print": None,
+}
+BUILTIN_TYPES = {"str": "str", "len": "int", "set": "set", "sorted": "list"}
+
+
+def instr_type(instr: Instr) -> Optional[str]:
+    types = [a.type for a in instr.args]
+    if instr.op == "binop":
+        return binary_type(instr.attr, types[0], types[1])
+    if instr.op == "unop":
+        if instr.attr == "NOT":
+            return "bool"
+        return types[0] if types[0] in ("int", "float", None) else "any"
+    if instr.op == "copy":
+        return types[0]
+    if instr.op in ("mutate", "setitem"):
+        return types[0]
+    if instr.op == "builtin":
+        return BUILTIN_TYPES.get(instr.attr, "any")
+    if instr.op == "method" and instr.attr == "sublist":
+        return "list"
+    if instr.op == "getslice":
+        return types[0] if types[0] in ("list", "tuple", "str") else "any"
+    if instr.op == "method" and instr.attr in ("union", "intersection", "difference"):
+        return "set"
+    if instr.op in RESULT_TYPES:
+        return RESULT_TYPES[instr.op]
+    return "any"
+
+
+# Annotates every temp with a type from the lattice (fixpoint over phis).
+def type_infer(func: Function) -> None:
+    for p in func.params:
+        p.type = "any"
+    for block in func.blocks:
+        for phi in block.phis:
+            phi.dest.type = None
+        for instr in block.instrs:
+            if instr.dest is not None and instr.dest.type != "iter":
+                instr.dest.type = None
+
+    changed = True
+    while changed:
+        changed = False
+        for block in func.blocks:
+            for phi in block.phis:
+                t = None
+                for v in phi.incoming.values():
+                    t = join_types(t, v.type)
+                if t != phi.dest.type:
+                    phi.dest.type = t
+                    changed = True
+            for instr in block.instrs:
+                if instr.dest is None or instr.op == "iter":
+                    continue
+                t = join_types(instr.dest.type, instr_type(instr))
+                if t != instr.dest.type:
+                    instr.dest.type = t
+                    changed = True
+
+
+# ---------- Pass manager ----------
+
+PASSES: Dict[str, PassFn] = {
+    "simplify-cfg": simplify_cfg,
+    "const-fold": const_fold,
+    "copy-prop": copy_prop,
+    "dce": dce,
+    "type-infer": type_infer,
+}
+
+DEFAULT_PIPELINE = [
+    "simplify-cfg",
+    "copy-prop",
+    "const-fold",
+    "copy-prop",
+    "simplify-cfg",
+    "dce",
+    "type-infer",
+]
+
+
+# Runs named passes in order over every function, timing each one.
+class PassManager:
+    def __init__(self, pipeline: Optional[Iterable[str]] = None,
+                 disabled: Optional[Iterable[str]] = None,
+                 dump: Optional[Callable[[str], None]] = None) -> None:
+        self.pipeline: List[str] = list(pipeline if pipeline is not None else DEFAULT_PIPELINE)
+        self.disabled: Set[str] = set(disabled or ())
+        self.dump = dump
+        self.timings: List[Tuple[str, float]] = []
+
+        for name in list(self.pipeline) + list(self.disabled):
+            if name not in PASSES:
+                raise ValueError(f"Unknown IR pass: {name}")
+
+    def run(self, module: Module) -> Module:
+        self.timings = []
+        if self.dump:
+            self.dump(f"=== IR after build ===\n{format_module(module)}\n")
+
+        for name in self.pipeline:
+            if name in self.disabled:
+                continue
+            start = time.perf_counter()
+            for func in module.functions:
+                PASSES[name](func)
+            self.timings.append((name, time.perf_counter() - start))
+
+            if self.dump:
+                self.dump(f"=== IR after {name} ===\n{format_module(module)}\n")
+        return module
+
+    def report(self) -> str:
+        lines = ["=== IR PASSES ==="]
+        for name, seconds in self.timings:
+            lines.append(f"{name:<14} {seconds * 1000:8.3f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set
+
+from src.ast_nodes import (
+    Name,
+    Assign,
+    Return,
+    Break,
+    Continue,
+    If,
+    While,
+    For,
+    Call,
+    BinaryOp,
+    UnaryOp,
+    ListLiteral,
+    TupleLiteral,
+    DictLiteral,
+    Index,
+    Slice,
+    Attribute,
+    Node,
+)
+
+
+# Names an expression reads, once per occurrence:
+def names_read(node: Optional[Node]) -> List[str]:
+    if node is None:
+        return []
+    if isinstance(node, Name):
+        return [node.id]
+    if isinstance(node, BinaryOp):
+        return names_read(node.left) + names_read(node.right)
+    if isinstance(node, UnaryOp):
+        return names_read(node.operand)
+    if isinstance(node, Call):
+        names = names_read(node.func.value) if isinstance(node.func, Attribute) else []
+        for arg in node.args:
+            names += names_read(arg)
+        return names
+    if isinstance(node, (ListLiteral, TupleLiteral)):
+        names = []
+        for e in node.elements:
+            names += names_read(e)
+        return names
+    if isinstance(node, DictLiteral):
+        names = []
+        for pair in node.pairs:
+            names += names_read(pair.key) + names_read(pair.value)
+        return names
+    if isinstance(node, Index):
+        return names_read(node.value) + names_read(node.index)
+    if isinstance(node, Slice):
+        return names_read(node.value) + names_read(node.lower) + names_read(node.upper)
+    return []
+
+
+# Names a simple statement (assignment, call or return) reads:
+def statement_reads(stmt: Node) -> List[str]:
+    if isinstance(stmt, Assign):
+        names = names_read(stmt.value)
+        if stmt.op != "=" and isinstance(stmt.target, Name):
+            names.append(stmt.target.id)  # x += y reads x
+        elif isinstance(stmt.target, Index):
+            names = names_read(stmt.target) + names
+        return names
+    if isinstance(stmt, Return):
+        return names_read(stmt.value)
+    if isinstance(stmt, Call):
+        return names_read(stmt)
+    return []
+
+
+# Backward liveness over the statements of one function (or of main):
+# which variables may still be read after each statement. Loops are
+# iterated to a fixpoint, break and continue jump to the live set of the
+# loop's exit and head.
+class Liveness:
+    def __init__(self, body: List[Node]) -> None:
+        self.after: Dict[int, Set[str]] = {}
+        self.block(body, set(), None, None)
+
+    # Variables that may be read after stmt runs:
+    def live_after(self, stmt: Node) -> Set[str]:
+        return self.after.get(id(stmt), set())
+
+    # Live set before a block, given the live set after it:
+    def block(self, stmts: List[Node], live: Set[str],
+              loop_exit: Optional[Set[str]], loop_head: Optional[Set[str]]) -> Set[str]:
+        for stmt in reversed(stmts):
+            self.after[id(stmt)] = live
+            live = self.statement(stmt, live, loop_exit, loop_head)
+        return live
+
+    def statement(self, stmt: Node, live: Set[str],
+                  loop_exit: Optional[Set[str]], loop_head: Optional[Set[str]]) -> Set[str]:
+        if isinstance(stmt, Assign):
+            if isinstance(stmt.target, Name):
+                live = live - {stmt.target.id}
+            return live | set(statement_reads(stmt))
+
+        if isinstance(stmt, Call):
+            return live | set(statement_reads(stmt))
+
+        if isinstance(stmt, Return):
+            return set(statement_reads(stmt))
+
+        if isinstance(stmt, Break):
+            return set(loop_exit or ())
+
+        if isinstance(stmt, Continue):
+            return set(loop_head or ())
+
+        if isinstance(stmt, If):
+            result = self.block(stmt.orelse, live, loop_exit, loop_head)
+            for clause in reversed(stmt.elifs):
+                result = (set(names_read(clause.condition))
+                          | self.block(clause.body, live, loop_exit, loop_head)
+                          | result)
+            return (set(names_read(stmt.condition))
+                    | self.block(stmt.body, live, loop_exit, loop_head)
+                    | result)
+
+        if isinstance(stmt, While):
+            condition = set(names_read(stmt.condition))
+            head = condition | live
+            while True:
+                new_head = condition | live | self.block(stmt.body, head, live, head)
+                if new_head == head:
+                    return head
+                head = new_head
+
+        if isinstance(stmt, For):
+            # The iterable may be walked by reference, it stays live for the
+            # whole loop. The target is rebound at the head of every iteration.
+            iterable = set(names_read(stmt.iterable))
+            head = live | iterable
+            while True:
+                body = self.block(stmt.body, head, live, head)
+                new_head = live | iterable | (body - {stmt.target.id})
+                if new_head == head:
+                    return head
+                head = new_head
+
+        # pass
+        return live
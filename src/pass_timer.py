@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+# Wall time and Python memory of each phase of the front end, for main.py
+# --time-passes. Phases nest: the transpiler's phases run inside the
+# driver's "transpile" and are reported indented under it. The memory of a
+# phase is its tracemalloc peak above what was allocated when it started;
+# it is only measured while tracemalloc is tracing (the driver starts it for
+# --time-passes), since tracing slows Python down several times.
+
+
+@dataclass
+class Phase:
+    name: str
+    depth: int
+    seconds: float = 0.0
+    peak_bytes: Optional[int] = None
+
+
+@dataclass
+class OpenPhase:
+    record: Phase
+    start_bytes: int    # traced when it started
+    peak: int = 0       # highest tracemalloc peak seen before nested phases reset it
+
+
+class PassTimer:
+    def __init__(self) -> None:
+        self.phases: List[Phase] = []
+        self._open: List[OpenPhase] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        record = Phase(name, len(self._open))
+        self.phases.append(record)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # The peak counter is global: keep the enclosing phase's so far
+            if self._open:
+                parent = self._open[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = OpenPhase(record, tracemalloc.get_traced_memory()[0] if tracing else 0)
+        self._open.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.seconds = time.perf_counter() - start
+            self._open.pop()
+            if tracing:
+                peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+                record.peak_bytes = max(0, peak - frame.start_bytes)
+                if self._open:
+                    self._open[-1].peak = max(self._open[-1].peak, peak)
+                tracemalloc.reset_peak()
+
+    def report(self) -> str:
+        lines = ["=== PASSES ==="]
+        for p in self.phases:
+            name = "  " * p.depth + p.name
+            memory = "" if p.peak_bytes is None else f" {p.peak_bytes / 1024:12.1f} KB peak"
+            lines.append(f"{name:<24} {p.seconds * 1000:10.3f} ms{memory}")
+        return "\n".join(lines)
+
+    # Machine-readable report, with whatever describes the run (file, sizes):
+    def to_json(self, **info) -> str:
+        phases = [
+            {"name": p.name, "depth": p.depth, "seconds": p.seconds, "peak_bytes": p.peak_bytes}
+            for p in self.phases
+        ]
+        return json.dumps({**info, "phases": phases}, indent=2)
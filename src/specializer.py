@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from src.ast_nodes import (
+    AUGMENTED_OPS,
+    Program,
+    FunctionDef,
+    Name,
+    Constant,
+    Assign,
+    Return,
+    If,
+    While,
+    For,
+    Call,
+    BinaryOp,
+    UnaryOp,
+    ListLiteral,
+    TupleLiteral,
+    DictLiteral,
+    Index,
+    Slice,
+    Attribute,
+    Node,
+)
+from src.ir import binary_type, join_types
+
+# Scalar types that get a native C++ representation:
+NATIVE_TYPES = {"int": "long long", "float": "double", "bool": "bool"}
+
+# Initial value for native locals (Fangless has no uninitialized reads):
+NATIVE_DEFAULTS = {"int": "0", "float": "0.0", "bool": "false"}
+
+# Container methods that modify their object:
+MUTATING_METHODS = ("append", "add", "remove", "sort")
+
+BUILTIN_TYPES = {"str": "str", "len": "int", "set": "set", "sorted": "list"}
+
+# A variable's type source: an expression or an already known type
+Source = Union[Node, str]
+
+
+def is_native(t: Optional[str]) -> bool:
+    return t in NATIVE_TYPES
+
+
+# Argument types only matter when they have a native representation:
+def normalize(t: Optional[str]) -> str:
+    return t if is_native(t) else "any"
+
+
+@dataclass
+class Specialization:
+    func: FunctionDef
+    arg_types: Tuple[str, ...]
+    cpp_name: str
+    return_type: Optional[str] = None
+    var_types: Dict[str, str] = field(default_factory=dict)
+    merged: bool = False  # nothing native left, calls go to the generic version
+
+    @property
+    def is_generic(self) -> bool:
+        return all(t == "any" for t in self.arg_types)
+
+    # Final C++ type of every parameter (a param rebound to other types is a PyValue):
+    @property
+    def param_types(self) -> List[str]:
+        return [self.var_types.get(p.name.id, "any") for p in self.func.params]
+
+    # The generic version keeps the PyValue signature:
+    @property
+    def native_return(self) -> Optional[str]:
+        if self.is_generic or not is_native(self.return_type):
+            return None
+        return self.return_type
+
+    def signature(self) -> str:
+        params = ", ".join(NATIVE_TYPES.get(t, "PyValue") for t in self.param_types)
+        ret = NATIVE_TYPES.get(self.native_return, "PyValue")
+        return f"{ret} {self.cpp_name}({params})"
+
+
+# What a scope (function body or main) looks like to the type inference:
+@dataclass
+class ScopeInfo:
+    assignments: List[Tuple[str, Source]] = field(default_factory=list)
+    containers: Set[str] = field(default_factory=set)
+    returns: List[Optional[Node]] = field(default_factory=list)
+    calls: List[Call] = field(default_factory=list)
+    falls_off: bool = True
+
+
+# Infers scalar types of variables and clones functions per argument-type
+# tuple seen at call sites (monomorphization). Every function keeps its
+# generic version for call sites whose argument types are unknown.
+class Specializer:
+    def __init__(self, program: Program, enabled: bool = True,
+                 max_per_function: int = 8) -> None:
+        self.enabled = enabled
+        self.max_per_function = max_per_function
+        self.functions: Dict[str, FunctionDef] = {}
+        self.main_body: List[Node] = []
+        for node in program.body:
+            if isinstance(node, FunctionDef):
+                self.functions[node.name.id] = node
+            else:
+                self.main_body.append(node)
+
+        self.specs: Dict[Tuple[str, Tuple[str, ...]], Specialization] = {}
+        self.main_types: Dict[str, str] = {}
+        self.scopes: Dict[int, ScopeInfo] = {}
+
+        for name, func in self.functions.items():
+            key = (name, ("any",) * len(func.params))
+            self.specs[key] = Specialization(func, key[1], name, return_type="any")
+
+    # Fixpoint over every scope until types and the set of clones settle:
+    def run(self) -> None:
+        if not self.enabled:
+            return
+
+        changed = True
+        while changed:
+            changed = False
+
+            types, _ = self.infer_scope(self.main_body, {})
+            if types != self.main_types:
+                self.main_types = types
+                changed = True
+            changed |= self.discover(self.main_body, self.main_types)
+
+            for spec in list(self.specs.values()):
+                params = {p.name.id: t for p, t in zip(spec.func.params, spec.arg_types)}
+                types, ret = self.infer_scope(spec.func.body, params)
+                if not spec.is_generic:
+                    ret = join_types(spec.return_type, ret)
+                    if ret != spec.return_type:
+                        spec.return_type = ret
+                        changed = True
+                if types != spec.var_types:
+                    spec.var_types = types
+                    changed = True
+                changed |= self.discover(spec.func.body, spec.var_types)
+
+        for spec in self.specs.values():
+            # Functions that never return a known value (e.g. endless recursion):
+            if spec.return_type is None:
+                spec.return_type = "any"
+            # Params rebound to other types leave nothing to specialize:
+            if (not spec.is_generic and spec.native_return is None
+                    and all(t == "any" for t in spec.param_types)):
+                spec.merged = True
+
+    # Creates clones for the call sites of a scope, True if any is new:
+    def discover(self, body: List[Node], env: Dict[str, str]) -> bool:
+        added = False
+        for call in self.scope(body).calls:
+            func = self.functions.get(call.func.id)
+            if func is None or len(call.args) != len(func.params):
+                continue
+            types = tuple(self.expr_type(a, env) for a in call.args)
+            # Wait until every argument type is known:
+            if None in types:
+                continue
+            key = (func.name.id, tuple(normalize(t) for t in types))
+            if key in self.specs or not self.can_specialize(key):
+                continue
+            cpp_name = f"{func.name.id}__{'_'.join(key[1])}"
+            self.specs[key] = Specialization(func, key[1], cpp_name)
+            added = True
+        return added
+
+    def can_specialize(self, key: Tuple[str, Tuple[str, ...]]) -> bool:
+        if all(t == "any" for t in key[1]):
+            return False
+        count = sum(1 for name, _ in self.specs if name == key[0])
+        return count <= self.max_per_function
+
+    # Generic version first, then clones in discovery order:
+    def specs_for(self, func_name: str) -> List[Specialization]:
+        return [s for (name, _), s in self.specs.items() if name == func_name and not s.merged]
+
+    def specializations(self) -> List[Specialization]:
+        return [s for s in self.specs.values() if not s.is_generic and not s.merged]
+
+    # Version of a user function a call site uses (None for non user functions):
+    def call_target(self, call: Call, env: Dict[str, str]) -> Optional[Specialization]:
+        if not isinstance(call.func, Name) or call.func.id not in self.functions:
+            return None
+        func = self.functions[call.func.id]
+        generic = self.specs[(func.name.id, ("any",) * len(func.params))]
+        if len(call.args) != len(func.params):
+            return generic
+        key = (func.name.id, tuple(normalize(self.expr_type(a, env)) for a in call.args))
+        target = self.specs.get(key, generic)
+        return generic if target.merged else target
+
+    # Flow-insensitive types of a scope's variables, plus its return type:
+    def infer_scope(self, body: List[Node], params: Dict[str, str]) -> Tuple[Dict[str, str], Optional[str]]:
+        info = self.scope(body)
+        env: Dict[str, Optional[str]] = dict(params)
+        for name, _ in info.assignments:
+            env.setdefault(name, None)
+
+        changed = True
+        while changed:
+            changed = False
+            for name, source in info.assignments:
+                t = source if isinstance(source, str) else self.expr_type(source, env)
+                new = join_types(env[name], t)
+                if new != env[name]:
+                    env[name] = new
+                    changed = True
+
+        types = {
+            name: "any" if t is None or name in info.containers else t
+            for name, t in env.items()
+        }
+
+        ret: Optional[str] = "none" if info.falls_off else None
+        for value in info.returns:
+            ret = join_types(ret, "none" if value is None else self.expr_type(value, types))
+        return types, ret
+
+    def expr_type(self, node: Node, env: Dict[str, Optional[str]]) -> Optional[str]:
+        if isinstance(node, Name):
+            return env[node.id] if node.id in env else "any"
+        if isinstance(node, Constant):
+            val = node.value
+            if isinstance(val, bool):
+                return "bool"
+            if isinstance(val, int):
+                return "int"
+            if isinstance(val, float):
+                return "float"
+            if isinstance(val, str):
+                return "str"
+            return "none"
+        if isinstance(node, BinaryOp):
+            left = self.expr_type(node.left, env)
+            right = self.expr_type(node.right, env)
+            return binary_type(node.op, left, right)
+        if isinstance(node, UnaryOp):
+            if node.op == "NOT":
+                return "bool"
+            t = self.expr_type(node.operand, env)
+            return t if t in ("int", "float", None) else "any"
+        if isinstance(node, Call):
+            if isinstance(node.func, Name):
+                if node.func.id in BUILTIN_TYPES:
+                    return BUILTIN_TYPES[node.func.id]
+                func = self.functions.get(node.func.id)
+                if func is None or len(node.args) != len(func.params):
+                    return "any"
+                # Unknown argument or return types stay at the bottom for now:
+                types = [self.expr_type(a, env) for a in node.args]
+                if None in types:
+                    return None
+                key = (func.name.id, tuple(normalize(t) for t in types))
+                target = self.specs.get(key)
+                if target is None:
+                    # The clone gets created once this scope's calls are discovered
+                    return None if self.can_specialize(key) else "any"
+                if target.is_generic:
+                    return "any"
+                if target.return_type is None:
+                    return None
+                return target.native_return or "any"
+            return "any"
+        if isinstance(node, ListLiteral):
+            return "list"
+        if isinstance(node, TupleLiteral):
+            return "tuple"
+        if isinstance(node, DictLiteral):
+            return "dict"
+        return "any"
+
+    # Collects (and caches) what the inference needs from a block of statements:
+    def scope(self, body: List[Node]) -> ScopeInfo:
+        key = id(body)
+        if key not in self.scopes:
+            info = ScopeInfo()
+            self.collect_stmts(body, info)
+            info.falls_off = self.falls_off(body)
+            self.scopes[key] = info
+        return self.scopes[key]
+
+    def collect_stmts(self, stmts: List[Node], info: ScopeInfo) -> None:
+        for stmt in stmts:
+            if isinstance(stmt, Assign):
+                value = stmt.value
+                if stmt.op != "=":
+                    value = BinaryOp(op=AUGMENTED_OPS[stmt.op], left=stmt.target, right=stmt.value)
+                if isinstance(stmt.target, Name):
+                    info.assignments.append((stmt.target.id, value))
+                elif isinstance(stmt.target, Index):
+                    if isinstance(stmt.target.value, Name):
+                        info.containers.add(stmt.target.value.id)
+                    self.collect_expr(stmt.target.index, info)
+                self.collect_expr(value, info)
+
+            elif isinstance(stmt, Return):
+                info.returns.append(stmt.value)
+                if stmt.value is not None:
+                    self.collect_expr(stmt.value, info)
+
+            elif isinstance(stmt, If):
+                self.collect_expr(stmt.condition, info)
+                self.collect_stmts(stmt.body, info)
+                for elif_clause in stmt.elifs:
+                    self.collect_expr(elif_clause.condition, info)
+                    self.collect_stmts(elif_clause.body, info)
+                self.collect_stmts(stmt.orelse, info)
+
+            elif isinstance(stmt, While):
+                self.collect_expr(stmt.condition, info)
+                self.collect_stmts(stmt.body, info)
+
+            elif isinstance(stmt, For):
+                iterable = stmt.iterable
+                # range() loop variables are always ints
+                if isinstance(iterable, Call) and isinstance(iterable.func, Name) and iterable.func.id == "range":
+                    info.assignments.append((stmt.target.id, "int"))
+                    for arg in iterable.args:
+                        self.collect_expr(arg, info)
+                else:
+                    info.assignments.append((stmt.target.id, "any"))
+                    self.collect_expr(iterable, info)
+                self.collect_stmts(stmt.body, info)
+
+            elif isinstance(stmt, Call):
+                self.collect_expr(stmt, info)
+
+    def collect_expr(self, node: Node, info: ScopeInfo) -> None:
+        if isinstance(node, Call):
+            if isinstance(node.func, Name) and node.func.id in self.functions:
+                info.calls.append(node)
+            elif isinstance(node.func, Attribute) and isinstance(node.func.value, Name):
+                if node.func.attr.id in MUTATING_METHODS:
+                    info.containers.add(node.func.value.id)
+            for arg in node.args:
+                self.collect_expr(arg, info)
+        elif isinstance(node, BinaryOp):
+            self.collect_expr(node.left, info)
+            self.collect_expr(node.right, info)
+        elif isinstance(node, UnaryOp):
+            self.collect_expr(node.operand, info)
+        elif isinstance(node, (ListLiteral, TupleLiteral)):
+            for e in node.elements:
+                self.collect_expr(e, info)
+        elif isinstance(node, DictLiteral):
+            for pair in node.pairs:
+                self.collect_expr(pair.key, info)
+                self.collect_expr(pair.value, info)
+        elif isinstance(node, Index):
+            self.collect_expr(node.value, info)
+            self.collect_expr(node.index, info)
+        elif isinstance(node, Slice):
+            self.collect_expr(node.value, info)
+            for bound in (node.lower, node.upper):
+                if bound is not None:
+                    self.collect_expr(bound, info)
+
+    # Whether control can reach the end of a block without a return:
+    def falls_off(self, stmts: List[Node]) -> bool:
+        if not stmts:
+            return True
+        last = stmts[-1]
+        if isinstance(last, Return):
+            return False
+        if isinstance(last, If) and last.orelse:
+            branches = [last.body] + [e.body for e in last.elifs] + [last.orelse]
+            return any(self.falls_off(b) for b in branches)
+        return True
+
+    # Text report of the generated clones:
+    def report(self) -> str:
+        lines = ["=== SPECIALIZATIONS ==="]
+        for spec in self.specializations():
+            args = ", ".join(spec.arg_types)
+            lines.append(f"{spec.func.name.id}({args}) -> {spec.signature()}")
+        if len(lines) == 1:
+            lines.append("(none)")
+        return "\n".join(lines)
@@ -0,0 +1,1032 @@
+from __future__ import annotations
+
+import math
+import struct
+import sys
+from functools import cmp_to_key, lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+from src.bytecode import (
+    ADD,
+    AND,
+    BUILD_DICT,
+    BUILD_LIST,
+    BUILD_TUPLE,
+    BUILTINS,
+    CALL,
+    CALL_BUILTIN,
+    CALL_METHOD,
+    COMPARE_JUMP,
+    DIV,
+    DUP,
+    EQ,
+    FLOORDIV,
+    FOR_ITER,
+    FOR_RANGE,
+    GE,
+    GET_ITEM,
+    GET_ITER,
+    GET_SLICE,
+    GT,
+    INCREMENT,
+    JUMP,
+    JUMP_IF_FALSE,
+    LE,
+    LOAD_CONST,
+    LOAD_LOCAL,
+    LOAD_LOCAL_CONST,
+    LOAD_LOCAL_LOCAL,
+    LT,
+    METHODS,
+    MOD,
+    MUL,
+    NE,
+    NEG,
+    NOT,
+    OR,
+    POP,
+    POW,
+    PRINT,
+    RANGE_INIT,
+    RETURN,
+    SET_ITEM,
+    STORE_LOCAL,
+    SUB,
+    BytecodeProgram,
+    Code,
+)
+
+# Runs bytecode (src/bytecode.py) the way the C++ built from the same
+# program runs: values behave as in runtime.hpp, not as in CPython. Ints
+# wrap at 64 bits, bools are not numbers in arithmetic, == is False
+# between containers, strings print without quotes even inside a
+# container, sets iterate in the slot order of the runtime's hash
+# table, `and` / `or` evaluate both operands like py_and / py_or, and every
+# error has the runtime's message. An error ends the program like an
+# uncaught C++ exception: the output so far is written, then VMError
+# carries the message.
+#
+# Values are plain Python objects (None, int, float, bool, str, list,
+# tuple, dict) except sets, which are PySet: a Python set would iterate in
+# another order.
+
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+MASK = (1 << 64) - 1
+RECURSION_LIMIT = 20000
+OUTPUT_LINES = 1024  # printed lines buffered before a write
+
+
+class VMError(Exception):
+    pass
+
+
+# Two's complement wrap of an int that left the 64-bit range:
+def wrap(i: int) -> int:
+    if INT_MIN <= i <= INT_MAX:
+        return i
+    return ((i - INT_MIN) & MASK) + INT_MIN
+
+
+def type_name(v: Any) -> str:
+    return TYPE_NAMES.get(type(v), "unknown")
+
+
+# Hashing, as py_hash: only the slot order of sets depends on it
+
+def hash_mix(x: int) -> int:
+    x ^= x >> 33
+    x = (x * 0xff51afd7ed558ccd) & MASK
+    x ^= x >> 33
+    x = (x * 0xc4ceb9fe1a85ec53) & MASK
+    x ^= x >> 33
+    return x
+
+
+NONE_HASH = hash_mix(0x9e3779b97f4a7c15)
+HASH_MUL = 0xc6a4a7935bd1e995
+
+
+# std::hash<std::string_view> of libstdc++ (_Hash_bytes, 64-bit):
+@lru_cache(maxsize=4096)
+def string_hash(s: str) -> int:
+    data = s.encode("utf-8")
+    n = len(data)
+    h = 0xc70f6907 ^ ((n * HASH_MUL) & MASK)
+    aligned = n & ~7
+    for i in range(0, aligned, 8):
+        k = (int.from_bytes(data[i:i + 8], "little") * HASH_MUL) & MASK
+        k = ((k ^ (k >> 47)) * HASH_MUL) & MASK
+        h = ((h ^ k) * HASH_MUL) & MASK
+    if n & 7:
+        h = ((h ^ int.from_bytes(data[aligned:], "little")) * HASH_MUL) & MASK
+    h = ((h ^ (h >> 47)) * HASH_MUL) & MASK
+    return h ^ (h >> 47)
+
+
+def value_hash(v: Any) -> int:
+    t = type(v)
+    if t is int:
+        return v & MASK
+    if t is str:
+        return string_hash(v)
+    if t is bool:
+        return 1 if v else 0
+    if t is float:
+        if v.is_integer() and abs(v) < 9.2e18:
+            return int(v) & MASK
+        return hash_mix(struct.unpack("<Q", struct.pack("<d", v))[0])
+    if v is None:
+        return NONE_HASH
+    if t is tuple:
+        h = 0x345678
+        for item in v:
+            h = ((h ^ value_hash(item)) * 1000003) & MASK
+        return h
+    raise VMError(f"TypeError: unhashable type: '{type_name(v)}'")
+
+
+# Sets
+
+SLOT_EMPTY = -1
+SLOT_DUMMY = -2
+REMOVED = object()  # key of a removed entry, until the next rebuild
+DONE = object()     # end of a for loop's iterator
+
+
+# The runtime's PySet: entries in insertion order, and an open-addressing
+# table of their positions that gives the iteration order. Lookups go
+# through a dict of the keys instead of probing (Python equality and
+# hashing agree with py_key_equal on every hashable value), but inserts
+# probe for their slot exactly as the runtime does, and the table is
+# rebuilt at the same sizes.
+class PySet:
+    __slots__ = ("keys", "hashes", "where", "slots", "index", "used")
+    __hash__ = None  # unhashable, as in the runtime
+
+    def __init__(self) -> None:
+        self.keys: List[Any] = []
+        self.hashes: List[int] = []
+        self.where: List[int] = []       # slot of each entry
+        self.slots: List[int] = []
+        self.index: Dict[Any, int] = {}  # key -> entry
+        self.used = 0
+
+    def __len__(self) -> int:
+        return self.used
+
+    # Members in slot order (printing, sorted()):
+    def __iter__(self) -> Iterator[Any]:
+        keys = self.keys
+        return (keys[ix] for ix in self.slots if ix >= 0)
+
+    # (key, hash) of the members in insertion order:
+    def entries(self) -> Iterator[tuple]:
+        return ((k, h) for k, h in zip(self.keys, self.hashes) if k is not REMOVED)
+
+    def copy(self) -> PySet:
+        result = PySet()
+        result.keys = list(self.keys)
+        result.hashes = list(self.hashes)
+        result.where = list(self.where)
+        result.slots = list(self.slots)
+        result.index = dict(self.index)
+        result.used = self.used
+        return result
+
+    def contains(self, value: Any, h: Optional[int] = None) -> bool:
+        if h is None:
+            value_hash(value)  # rejects unhashable values
+        return self.used != 0 and value in self.index
+
+    def add(self, value: Any, h: Optional[int] = None) -> bool:
+        if h is None:
+            h = value_hash(value)
+        if (len(self.keys) + 1) * 3 > len(self.slots) * 2:
+            self.rebuild(self.used + 1)
+        if value in self.index:
+            return False
+
+        # First dummy on the probe sequence, else the empty slot ending it:
+        slots = self.slots
+        mask = len(slots) - 1
+        i = h & mask
+        perturb = h
+        free = -1
+        while True:
+            ix = slots[i]
+            if ix == SLOT_EMPTY:
+                break
+            if ix == SLOT_DUMMY and free < 0:
+                free = i
+            perturb >>= 5
+            i = (i * 5 + perturb + 1) & mask
+        if free >= 0:
+            i = free
+
+        entry = len(self.keys)
+        slots[i] = entry
+        self.index[value] = entry
+        self.keys.append(value)
+        self.hashes.append(h)
+        self.where.append(i)
+        self.used += 1
+        return True
+
+    def remove(self, value: Any) -> bool:
+        value_hash(value)
+        if self.used == 0:
+            return False
+        entry = self.index.pop(value, None)
+        if entry is None:
+            return False
+        self.slots[self.where[entry]] = SLOT_DUMMY
+        self.keys[entry] = REMOVED
+        self.used -= 1
+        if self.used == 0:
+            self.keys, self.hashes, self.where = [], [], []
+            self.slots = [SLOT_EMPTY] * len(self.slots)
+        return True
+
+    def reserve(self, n: int) -> None:
+        if (len(self.keys) + n) * 3 > len(self.slots) * 2:
+            self.rebuild(self.used + n)
+
+    # Drops the holes and sizes the slots for min_used members at 1/3 load:
+    def rebuild(self, min_used: int) -> None:
+        live = list(self.entries())
+        size = 8
+        while size < min_used * 3:
+            size *= 2
+        slots = [SLOT_EMPTY] * size
+        mask = size - 1
+        where = []
+        for entry, (_, h) in enumerate(live):
+            i = h & mask
+            perturb = h
+            while slots[i] != SLOT_EMPTY:
+                perturb >>= 5
+                i = (i * 5 + perturb + 1) & mask
+            slots[i] = entry
+            where.append(i)
+        self.keys = [k for k, _ in live]
+        self.hashes = [h for _, h in live]
+        self.where = where
+        self.slots = slots
+        self.index = {k: entry for entry, k in enumerate(self.keys)}
+
+
+TYPE_NAMES = {
+    type(None): "None",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    str: "str",
+    list: "list",
+    dict: "dict",
+    tuple: "tuple",
+    PySet: "set",
+}
+NUMBER_TYPES = (int, float, bool)   # for comparisons
+SCALAR_TYPES = (int, float, bool, str)
+
+
+# Formatting (PyValue::format_into)
+
+def format_value(v: Any) -> str:
+    t = type(v)
+    if t is str:
+        return v
+    if t is int:
+        return int.__repr__(v)
+    if t is float:
+        return float.__repr__(v)
+    if t is bool:
+        return "True" if v else "False"
+    if v is None:
+        return "None"
+    if t is list:
+        return "[" + ", ".join(map(format_value, v)) + "]"
+    if t is tuple:
+        return "(" + ", ".join(map(format_value, v)) + ("," if len(v) == 1 else "") + ")"
+    if t is dict:
+        return "{" + ", ".join(f"{format_value(k)}: {format_value(x)}" for k, x in v.items()) + "}"
+    if not v:
+        return "set()"  # {} is the empty dict
+    return "{" + ", ".join(map(format_value, v)) + "}"
+
+
+# Arithmetic
+
+def operand_error(op: str, a: Any, b: Any) -> VMError:
+    return VMError(
+        f"TypeError: unsupported operand types for {op}: '{type_name(a)}' and '{type_name(b)}'"
+    )
+
+
+def py_add(a: Any, b: Any) -> Any:
+    ta = type(a)
+    tb = type(b)
+    if ta is int and tb is int:
+        return wrap(a + b)
+    if (ta is float or ta is int) and (tb is float or tb is int):
+        return float(a) + float(b)
+    if ta is str and tb is str:
+        return a + b
+    raise operand_error("+", a, b)
+
+
+def py_sub(a: Any, b: Any) -> Any:
+    ta = type(a)
+    tb = type(b)
+    if ta is int and tb is int:
+        return wrap(a - b)
+    if (ta is float or ta is int) and (tb is float or tb is int):
+        return float(a) - float(b)
+    raise operand_error("-", a, b)
+
+
+def py_mul(a: Any, b: Any) -> Any:
+    ta = type(a)
+    tb = type(b)
+    if ta is int and tb is int:
+        return wrap(a * b)
+    if (ta is float or ta is int) and (tb is float or tb is int):
+        return float(a) * float(b)
+    raise operand_error("*", a, b)
+
+
+def as_double(v: Any) -> float:
+    if type(v) is int or type(v) is float:
+        return float(v)
+    raise VMError(f"TypeError: expected numeric type, got {type_name(v)}")
+
+
+def py_div(a: Any, b: Any) -> float:
+    x = as_double(a)
+    y = as_double(b)
+    if y == 0.0:
+        raise VMError("ZeroDivisionError: division by zero")
+    return x / y
+
+
+def py_mod(a: Any, b: Any) -> int:
+    for v in (a, b):
+        if type(v) is not int:
+            raise VMError(f"TypeError: expected int for modulus, got {type_name(v)}")
+    if b == 0:
+        raise VMError("ZeroDivisionError: integer modulo by zero")
+    return a % b
+
+
+def py_floordiv(a: Any, b: Any) -> Any:
+    ta = type(a)
+    tb = type(b)
+    if ta is int and tb is int:
+        if b == 0:
+            raise VMError("ZeroDivisionError: integer division or modulo by zero")
+        return wrap(a // b)
+    if (ta is float or ta is int) and (tb is float or tb is int):
+        x = float(a)
+        y = float(b)
+        if y == 0.0:
+            raise VMError("ZeroDivisionError: float floor division by zero")
+        return x // y
+    raise operand_error("//", a, b)
+
+
+def py_pow(a: Any, b: Any) -> Any:
+    ta = type(a)
+    tb = type(b)
+    if ta is int and tb is int and b >= 0:
+        return wrap(pow(a, b, 1 << 64))
+    if not ((ta is float or ta is int) and (tb is float or tb is int)):
+        raise operand_error("**", a, b)
+
+    x = float(a)
+    y = float(b)
+    if x == 0.0 and y < 0.0:
+        raise VMError("ZeroDivisionError: 0.0 cannot be raised to a negative power")
+    if x < 0.0 and (y != y or (math.isfinite(y) and not y.is_integer())):
+        raise VMError("ValueError: negative number cannot be raised to a fractional power")
+    try:
+        return math.pow(x, y)
+    except OverflowError:
+        odd = y.is_integer() and y % 2 == 1
+        return -math.inf if x < 0.0 and odd else math.inf
+
+
+def py_neg(v: Any) -> Any:
+    # -x is 0 - x
+    if type(v) is int:
+        return wrap(-v)
+    if type(v) is float:
+        return -v
+    raise operand_error("-", 0, v)
+
+
+# Comparisons
+
+def py_eq(a: Any, b: Any) -> bool:
+    ta = type(a)
+    tb = type(b)
+    if ta is tb:
+        return a == b if ta in SCALAR_TYPES else a is None
+    if ta in NUMBER_TYPES and tb in NUMBER_TYPES:
+        return a == b
+    return False
+
+
+def py_ne(a: Any, b: Any) -> bool:
+    return not py_eq(a, b)
+
+
+def check_order(op: str, a: Any, b: Any) -> None:
+    ta = type(a)
+    tb = type(b)
+    if not ((ta in NUMBER_TYPES and tb in NUMBER_TYPES) or (ta is str and tb is str)):
+        raise VMError(
+            f"TypeError: '{op}' not supported between instances of "
+            f"'{type_name(a)}' and '{type_name(b)}'"
+        )
+
+
+def py_lt(a: Any, b: Any) -> bool:
+    if type(a) is not int or type(b) is not int:
+        check_order("<", a, b)
+    return a < b
+
+
+def py_le(a: Any, b: Any) -> bool:
+    if type(a) is not int or type(b) is not int:
+        check_order("<=", a, b)
+    return a <= b
+
+
+def py_gt(a: Any, b: Any) -> bool:
+    if type(a) is not int or type(b) is not int:
+        check_order(">", a, b)
+    return a > b
+
+
+def py_ge(a: Any, b: Any) -> bool:
+    if type(a) is not int or type(b) is not int:
+        check_order(">=", a, b)
+    return a >= b
+
+
+# Builtins
+
+def py_str(v: Any) -> str:
+    return format_value(v)
+
+
+def py_len(v: Any) -> int:
+    t = type(v)
+    if t is str:
+        # Strings are bytes in the runtime
+        return len(v) if v.isascii() else len(v.encode("utf-8"))
+    if t is list or t is tuple or t is dict or t is PySet:
+        return len(v)
+    raise VMError(f"TypeError: object of type '{type_name(v)}' has no len()")
+
+
+def py_set_from_list(v: Any) -> PySet:
+    if type(v) is not list and type(v) is not tuple:
+        raise VMError("TypeError: set() expects a list or tuple")
+    result = PySet()
+    result.reserve(len(v))
+    for item in v:
+        result.add(item)
+    return result
+
+
+# Python ordering for sort(): numbers with numbers, str with str and lists /
+# tuples element by element
+def sort_less(a: Any, b: Any) -> bool:
+    ta = type(a)
+    tb = type(b)
+    if (ta in NUMBER_TYPES and tb in NUMBER_TYPES) or (ta is str and tb is str):
+        return a < b
+    if ta is tb and (ta is list or ta is tuple):
+        for x, y in zip(a, b):
+            if sort_less(x, y):
+                return True
+            if sort_less(y, x):
+                return False
+        return len(a) < len(b)
+    raise VMError(
+        f"TypeError: '<' not supported between instances of '{type_name(a)}' and '{type_name(b)}'"
+    )
+
+
+def sort_compare(a: Any, b: Any) -> int:
+    if sort_less(a, b):
+        return -1
+    return 1 if sort_less(b, a) else 0
+
+
+SORT_KEY = cmp_to_key(sort_compare)
+
+
+# Sorts in place, stable like the runtime's sort of mixed values
+def sort_list(items: list) -> None:
+    if len(items) < 2:
+        return
+    first = type(items[0])
+    if first in (int, float, str) and all(type(x) is first for x in items):
+        items.sort()
+    else:
+        items.sort(key=SORT_KEY)
+
+
+def py_sorted(v: Any) -> list:
+    t = type(v)
+    if t is list or t is tuple or t is str or t is dict or t is PySet:
+        result = list(v)
+    else:
+        raise VMError(f"TypeError: '{type_name(v)}' object is not iterable")
+    sort_list(result)
+    return result
+
+
+BUILTIN_FUNCTIONS: List[Callable[[Any], Any]] = [
+    {"str": py_str, "len": py_len, "set": py_set_from_list, "sorted": py_sorted}[name]
+    for name in BUILTINS
+]
+
+
+# Containers
+
+SEQUENCE_KINDS = {list: "list", tuple: "tuple", str: "string"}
+
+
+def dict_set(d: dict, key: Any, value: Any) -> None:
+    try:
+        d[key] = value
+    except TypeError:
+        value_hash(key)
+        raise
+
+
+def py_getitem(container: Any, index: Any) -> Any:
+    t = type(container)
+    kind = SEQUENCE_KINDS.get(t)
+    if kind is not None:
+        if type(index) is not int:
+            raise VMError(f"TypeError: {kind} indices must be integers")
+        if 0 <= index < len(container):
+            return container[index]
+        raise VMError(f"IndexError: {kind} index out of range")
+    if t is dict:
+        try:
+            return container[index]
+        except KeyError:
+            raise VMError("KeyError: key not found: " + format_value(index)) from None
+        except TypeError:
+            value_hash(index)
+            raise
+    if t is PySet:
+        raise VMError("TypeError: 'set' object is not subscriptable")
+    raise VMError(f"TypeError: object of type '{type_name(container)}' is not subscriptable")
+
+
+def py_getslice(container: Any, start: Any, end: Any) -> Any:
+    if type(container) not in SEQUENCE_KINDS:
+        raise VMError(f"TypeError: '{type_name(container)}' object is not subscriptable")
+    for bound in (start, end):
+        if bound is not None and type(bound) is not int:
+            raise VMError("TypeError: slice indices must be integers or None")
+    return container[start:end]
+
+
+def py_setitem(container: Any, index: Any, value: Any) -> None:
+    t = type(container)
+    if t is list:
+        if type(index) is not int:
+            raise VMError("TypeError: list indices must be integers")
+        if not 0 <= index < len(container):
+            raise VMError("IndexError: list assignment index out of range")
+        container[index] = value
+    elif t is dict:
+        dict_set(container, index, value)
+    elif t is tuple:
+        raise VMError("TypeError: 'tuple' object does not support item assignment")
+    else:
+        raise VMError(
+            f"TypeError: object of type '{type_name(container)}' does not support item assignment"
+        )
+
+
+# A dict is walked with its own iterator; the runtime reports any change of
+# size, and Python then also stops on a changed key
+def iterate_dict(d: dict) -> Iterator[Any]:
+    try:
+        yield from d
+    except RuntimeError:
+        raise VMError("RuntimeError: dictionary changed size during iteration") from None
+
+
+def iterate_set(s: PySet) -> Iterator[Any]:
+    expected = s.used
+    i = 0
+    while True:
+        if s.used != expected:
+            raise VMError("RuntimeError: set changed size during iteration")
+        slots = s.slots
+        while i < len(slots) and slots[i] < 0:
+            i += 1
+        if i >= len(slots):
+            return
+        i += 1
+        yield s.keys[slots[i - 1]]
+
+
+# Lists (walked by index, so the body may append), tuples and strings use
+# Python's iterators
+def py_iter(v: Any) -> Iterator[Any]:
+    t = type(v)
+    if t is list or t is tuple or t is str:
+        return iter(v)
+    if t is dict:
+        return iterate_dict(v)
+    if t is PySet:
+        return iterate_set(v)
+    raise VMError(f"TypeError: '{type_name(v)}' object is not iterable")
+
+
+# range() bounds are native ints in the C++:
+def range_bound(v: Any) -> int:
+    if type(v) is int or type(v) is bool:
+        return int(v)
+    raise VMError(f"TypeError: '{type_name(v)}' object cannot be interpreted as an integer")
+
+
+# Methods
+
+def py_list_append(lst: Any, item: Any) -> None:
+    if type(lst) is not list:
+        raise VMError("TypeError: append() only valid on list")
+    lst.append(item)
+
+
+def py_list_sublist(lst: Any, start: Any, end: Any) -> list:
+    if type(lst) is not list:
+        raise VMError("TypeError: sublist() only valid on list")
+    if type(start) is not int or type(end) is not int:
+        raise VMError("TypeError: sublist indices must be integers")
+    start = max(start, 0)
+    end = max(min(end, len(lst)), start)
+    return lst[start:end]
+
+
+def py_list_sort(lst: Any) -> None:
+    if type(lst) is not list:
+        raise VMError("TypeError: sort() only valid on list")
+    sort_list(lst)
+
+
+def py_set_add(s: Any, value: Any) -> None:
+    if type(s) is not PySet:
+        raise VMError("TypeError: single-arg add() only valid on set")
+    s.add(value)
+
+
+def py_dict_add(d: Any, key: Any, value: Any) -> None:
+    if type(d) is not dict:
+        raise VMError("TypeError: two-arg add() only valid on dict")
+    dict_set(d, key, value)
+
+
+def py_dict_or_set_get(container: Any, key: Any) -> Any:
+    if type(container) is dict:
+        try:
+            return container.get(key)
+        except TypeError:
+            value_hash(key)
+            raise
+    if type(container) is PySet:
+        return container.contains(key)
+    raise VMError("TypeError: get() only valid on dict or set")
+
+
+def set_operand(a: Any, b: Any, method: str) -> PySet:
+    if type(a) is not PySet:
+        raise VMError(f"AttributeError: '{type_name(a)}' object has no attribute '{method}'")
+    if type(b) is PySet:
+        return b
+    if type(b) is not list and type(b) is not tuple:
+        raise VMError(f"TypeError: '{type_name(b)}' object is not iterable")
+    return py_set_from_list(b)
+
+
+def py_set_union(a: Any, b: Any) -> PySet:
+    other = set_operand(a, b, "union")
+    result = a.copy()
+    result.reserve(len(other))
+    for key, h in other.entries():
+        result.add(key, h)
+    return result
+
+
+def py_set_intersection(a: Any, b: Any) -> PySet:
+    other = set_operand(a, b, "intersection")
+    # Walk the smaller set, probe the larger one
+    small, large = (a, other) if len(a) <= len(other) else (other, a)
+    result = PySet()
+    for key, h in small.entries():
+        if large.contains(key, h):
+            result.add(key, h)
+    return result
+
+
+def py_set_difference(a: Any, b: Any) -> PySet:
+    other = set_operand(a, b, "difference")
+    result = PySet()
+    result.reserve(len(a))
+    for key, h in a.entries():
+        if not other.contains(key, h):
+            result.add(key, h)
+    return result
+
+
+def py_container_remove(container: Any, key: Any) -> None:
+    t = type(container)
+    if t is list:
+        if type(key) is not int:
+            raise VMError("TypeError: list remove() index must be int")
+        if not 0 <= key < len(container):
+            raise VMError("IndexError: list index out of range in remove()")
+        del container[key]
+    elif t is dict:
+        try:
+            del container[key]
+        except KeyError:
+            raise VMError("KeyError: key not found in dict remove()") from None
+        except TypeError:
+            value_hash(key)
+            raise
+    elif t is PySet:
+        if not container.remove(key):
+            raise VMError("KeyError: value not found in set remove()")
+    else:
+        raise VMError("TypeError: remove() only valid on list, dict or set")
+
+
+METHOD_FUNCTIONS: Dict[tuple, Callable[..., Any]] = {
+    ("append", 1): py_list_append,
+    ("sublist", 2): py_list_sublist,
+    ("sort", 0): py_list_sort,
+    ("add", 1): py_set_add,
+    ("add", 2): py_dict_add,
+    ("get", 1): py_dict_or_set_get,
+    ("union", 1): py_set_union,
+    ("intersection", 1): py_set_intersection,
+    ("difference", 1): py_set_difference,
+    ("remove", 1): py_container_remove,
+}
+METHOD_TABLE = [(METHOD_FUNCTIONS[m], m[1] + 1) for m in METHODS]
+
+BINARY_FUNCTIONS: List[Optional[Callable[[Any, Any], Any]]] = [None] * (GE + 1)
+for _opcode, _function in [
+    (ADD, py_add), (SUB, py_sub), (MUL, py_mul), (DIV, py_div), (MOD, py_mod),
+    (FLOORDIV, py_floordiv), (POW, py_pow), (EQ, py_eq), (NE, py_ne),
+    (LT, py_lt), (LE, py_le), (GT, py_gt), (GE, py_ge),
+]:
+    BINARY_FUNCTIONS[_opcode] = _function
+
+
+# A Code ready to run: its instructions as a list (indexing an array boxes
+# every int it reads) and the None of its non-parameter slots
+class Function:
+    __slots__ = ("code", "ops", "constants", "params", "padding")
+
+    def __init__(self, code: Code) -> None:
+        self.code = code
+        self.ops = code.ops.tolist()
+        self.constants = code.constants
+        self.params = code.params
+        self.padding = [None] * (len(code.slots) - code.params)
+
+
+class VM:
+    def __init__(self, program: BytecodeProgram, out: Optional[TextIO] = None) -> None:
+        self.functions = [Function(code) for code in program.functions]
+        self.main = Function(program.main)
+        self.out = out
+        self.lines: List[str] = []
+
+    def run(self) -> None:
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, RECURSION_LIMIT))
+        try:
+            self.execute(self.main, list(self.main.padding))
+        except RecursionError:
+            raise VMError("RecursionError: maximum recursion depth exceeded") from None
+        finally:
+            sys.setrecursionlimit(limit)
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            out = self.out or sys.stdout
+            out.write("\n".join(self.lines) + "\n")
+            out.flush()
+            self.lines = []
+
+    # The interpreter loop, one call per function call. The commonest
+    # instructions are tested first.
+    def execute(self, function: Function, frame: list) -> Any:
+        ops = function.ops
+        constants = function.constants
+        stack: list = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+        while True:
+            op = ops[pc]
+            if op == LOAD_LOCAL:
+                push(frame[ops[pc + 1]])
+                pc += 2
+            elif op == LOAD_LOCAL_LOCAL:
+                push(frame[ops[pc + 1]])
+                push(frame[ops[pc + 2]])
+                pc += 3
+            elif op == LOAD_LOCAL_CONST:
+                push(frame[ops[pc + 1]])
+                push(constants[ops[pc + 2]])
+                pc += 3
+            elif op == LOAD_CONST:
+                push(constants[ops[pc + 1]])
+                pc += 2
+            elif op == STORE_LOCAL:
+                frame[ops[pc + 1]] = pop()
+                pc += 2
+            elif op == COMPARE_JUMP:
+                b = pop()
+                a = pop()
+                if BINARY_FUNCTIONS[ops[pc + 1]](a, b):
+                    pc += 3
+                else:
+                    pc = ops[pc + 2]
+            elif ADD <= op <= GE:
+                # Binary operators, ints first
+                b = pop()
+                a = stack[-1]
+                if op == ADD and type(a) is int and type(b) is int:
+                    r = a + b
+                    stack[-1] = r if INT_MIN <= r <= INT_MAX else wrap(r)
+                elif op == SUB and type(a) is int and type(b) is int:
+                    r = a - b
+                    stack[-1] = r if INT_MIN <= r <= INT_MAX else wrap(r)
+                else:
+                    stack[-1] = BINARY_FUNCTIONS[op](a, b)
+                pc += 1
+            elif op == FOR_RANGE:
+                i = frame[ops[pc + 1]]
+                if i < frame[ops[pc + 1] + 1]:
+                    frame[ops[pc + 1]] = i + frame[ops[pc + 1] + 2]
+                    frame[ops[pc + 2]] = i
+                    pc += 4
+                else:
+                    pc = ops[pc + 3]
+            elif op == INCREMENT:
+                slot = ops[pc + 1]
+                a = frame[slot]
+                b = constants[ops[pc + 2]]
+                if type(a) is int and type(b) is int:
+                    r = a + b
+                    frame[slot] = r if INT_MIN <= r <= INT_MAX else wrap(r)
+                else:
+                    frame[slot] = py_add(a, b)
+                pc += 3
+            elif op == JUMP:
+                pc = ops[pc + 1]
+            elif op == GET_ITEM:
+                index = pop()
+                container = stack[-1]
+                if type(container) is list and type(index) is int and 0 <= index < len(container):
+                    stack[-1] = container[index]
+                else:
+                    stack[-1] = py_getitem(container, index)
+                pc += 1
+            elif op == FOR_ITER:
+                value = next(frame[ops[pc + 1]], DONE)
+                if value is DONE:
+                    pc = ops[pc + 3]
+                else:
+                    frame[ops[pc + 2]] = value
+                    pc += 4
+            elif op == JUMP_IF_FALSE:
+                if pop():
+                    pc += 2
+                else:
+                    pc = ops[pc + 1]
+            elif op == CALL:
+                callee = self.functions[ops[pc + 1]]
+                n = callee.params
+                if n:
+                    args = stack[-n:]
+                    del stack[-n:]
+                else:
+                    args = []
+                args += callee.padding
+                push(self.execute(callee, args))
+                pc += 2
+            elif op == RETURN:
+                return pop()
+            elif op == CALL_METHOD:
+                method, n = METHOD_TABLE[ops[pc + 1]]
+                args = stack[-n:]
+                del stack[-n:]
+                push(method(*args))
+                pc += 2
+            elif op == SET_ITEM:
+                value = pop()
+                index = pop()
+                container = pop()
+                if type(container) is list and type(index) is int and 0 <= index < len(container):
+                    container[index] = value
+                else:
+                    py_setitem(container, index, value)
+                pc += 1
+            elif op == PRINT:
+                n = ops[pc + 1]
+                if n:
+                    args = stack[-n:]
+                    del stack[-n:]
+                    self.lines.append(" ".join(map(format_value, args)))
+                else:
+                    self.lines.append("")
+                if len(self.lines) >= OUTPUT_LINES:
+                    self.flush()
+                pc += 2
+            elif op == CALL_BUILTIN:
+                stack[-1] = BUILTIN_FUNCTIONS[ops[pc + 1]](stack[-1])
+                pc += 2
+            elif op == POP:
+                pop()
+                pc += 1
+            elif op == DUP:
+                push(stack[-1])
+                pc += 1
+            elif op == AND:
+                b = pop()
+                if stack[-1]:
+                    stack[-1] = b
+                pc += 1
+            elif op == OR:
+                b = pop()
+                if not stack[-1]:
+                    stack[-1] = b
+                pc += 1
+            elif op == NOT:
+                stack[-1] = not stack[-1]
+                pc += 1
+            elif op == NEG:
+                stack[-1] = py_neg(stack[-1])
+                pc += 1
+            elif op == BUILD_LIST:
+                n = ops[pc + 1]
+                if n:
+                    items = stack[-n:]
+                    del stack[-n:]
+                else:
+                    items = []
+                push(items)
+                pc += 2
+            elif op == BUILD_TUPLE:
+                n = ops[pc + 1]
+                if n:
+                    items = tuple(stack[-n:])
+                    del stack[-n:]
+                else:
+                    items = ()
+                push(items)
+                pc += 2
+            elif op == BUILD_DICT:
+                n = 2 * ops[pc + 1]
+                d: dict = {}
+                if n:
+                    items = stack[-n:]
+                    del stack[-n:]
+                    for i in range(0, n, 2):
+                        dict_set(d, items[i], items[i + 1])
+                push(d)
+                pc += 2
+            elif op == GET_SLICE:
+                end = pop()
+                start = pop()
+                stack[-1] = py_getslice(stack[-1], start, end)
+                pc += 1
+            elif op == RANGE_INIT:
+                slot = ops[pc + 1]
+                frame[slot + 2] = range_bound(pop())
+                frame[slot + 1] = range_bound(pop())
+                frame[slot] = range_bound(pop())
+                pc += 2
+            elif op == GET_ITER:
+                frame[ops[pc + 1]] = py_iter(pop())
+                pc += 2
+            else:
+                raise VMError(f"bad opcode {op} at {pc} in {function.code.name}")
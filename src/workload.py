@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from src.ast_nodes import (
+    Program,
+    FunctionDef,
+    Name,
+    Constant,
+    Assign,
+    Return,
+    If,
+    While,
+    For,
+    Call,
+    BinaryOp,
+    UnaryOp,
+    ListLiteral,
+    TupleLiteral,
+    DictLiteral,
+    Index,
+    Slice,
+    Node,
+)
+
+# Static estimate of how many statements a program runs, for main.py
+# --engine auto: the bytecode VM starts at once but runs every statement far
+# slower than the compiled C++, which first costs seconds of g++. A loop
+# over range() with literal bounds, or a `while x < N` with a literal N,
+# counts its trips; any other loop counts LOOP_TRIPS. A parameter never
+# assigned in its function is as literal as the argument of the call
+# (histogram(3000000, 10007)), and the target of such a range() loop is
+# taken at its largest. The body of a recursive function counts n times
+# per outside call, or 2 ** n when it calls itself twice as fib does, for
+# the largest known int n among the arguments its recursive calls change
+# (fib(n - 1)); RECURSIVE_CALLS times without one.
+LOOP_TRIPS = 100
+RECURSIVE_CALLS = 1000
+MAX_DEPTH = 40   # of the call tree of fib(n)
+
+# Statements the VM runs in about the time g++ takes to build a small
+# program (a few seconds); bigger estimates are compiled
+VM_BUDGET = 1_000_000
+
+
+def literal_int(node: Optional[Node]) -> Optional[int]:
+    if isinstance(node, Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, UnaryOp) and node.op == "NEG":
+        value = literal_int(node.operand)
+        return None if value is None else -value
+    return None
+
+
+# How many times each variable is assigned in stmts (a for target counts twice):
+def assignment_counts(stmts: List[Node]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+
+    def count(stmts: List[Node]) -> None:
+        for stmt in stmts:
+            if isinstance(stmt, Assign) and isinstance(stmt.target, Name):
+                counts[stmt.target.id] = counts.get(stmt.target.id, 0) + 1
+            elif isinstance(stmt, For):
+                counts[stmt.target.id] = counts.get(stmt.target.id, 0) + 2
+                count(stmt.body)
+            elif isinstance(stmt, While):
+                count(stmt.body)
+            elif isinstance(stmt, If):
+                count(stmt.body)
+                for elif_clause in stmt.elifs:
+                    count(elif_clause.body)
+                count(stmt.orelse)
+
+    count(stmts)
+    return counts
+
+
+# Variables of main assigned exactly once, at its top level, to an int literal:
+def main_constants(main: List[Node]) -> Dict[str, int]:
+    counts = assignment_counts(main)
+    constants: Dict[str, int] = {}
+    for stmt in main:
+        if (isinstance(stmt, Assign) and stmt.op == "=" and isinstance(stmt.target, Name)
+                and counts[stmt.target.id] == 1):
+            value = literal_int(stmt.value)
+            if value is not None:
+                constants[stmt.target.id] = value
+    return constants
+
+
+class WorkloadEstimator:
+    def __init__(self, program: Program) -> None:
+        self.program = program
+        self.functions: Dict[str, FunctionDef] = {
+            node.name.id: node for node in program.body if isinstance(node, FunctionDef)
+        }
+        self.costs: Dict[tuple, float] = {}
+        self.active: List[str] = []   # functions being estimated
+        self.scopes: List[Dict[str, int]] = []   # their known parameters
+        self.self_calls: Dict[str, List[List[Node]]] = {}   # arguments of recursive calls
+        self.constants: Dict[str, int] = {}
+
+    def estimate(self) -> int:
+        main = [node for node in self.program.body if not isinstance(node, FunctionDef)]
+        self.constants = main_constants(main)
+        return int(self.block(main))
+
+    # Statements one call of a function runs:
+    def function(self, name: str, args: List[Node]) -> float:
+        node = self.functions[name]
+        if name in self.active:
+            self.self_calls.setdefault(name, []).append(args)
+            return 0.0
+        counts = assignment_counts(node.body)
+        scope = {}
+        for param, arg in zip(node.params, args):
+            value = self.known_int(arg)
+            if value is not None and param.name.id not in counts:
+                scope[param.name.id] = value
+        key = (name, tuple(sorted(scope.items())))
+        if key in self.costs:
+            return self.costs[key]
+        self.active.append(name)
+        self.scopes.append(scope)
+        cost = 1 + self.block(node.body)
+        self.scopes.pop()
+        self.active.pop()
+        self_calls = self.self_calls.pop(name, [])
+        if self_calls:
+            cost *= self.recursive_calls(node, self_calls, scope)
+        self.costs[key] = cost
+        return cost
+
+    @staticmethod
+    def recursive_calls(node: FunctionDef, self_calls: List[List[Node]], scope: Dict[str, int]) -> float:
+        # Known parameters some recursive call passes on changed
+        sizes = [
+            abs(scope[param.name.id]) for i, param in enumerate(node.params)
+            if param.name.id in scope and any(
+                i >= len(args) or not (isinstance(args[i], Name) and args[i].id == param.name.id)
+                for args in self_calls)
+        ]
+        if not sizes:
+            return RECURSIVE_CALLS
+        n = max(sizes)
+        if len(self_calls) > 1:
+            return 2 ** min(n, MAX_DEPTH)
+        return min(max(n, 1), RECURSIVE_CALLS)
+
+    def block(self, stmts: List[Node]) -> float:
+        return sum(self.statement(stmt) for stmt in stmts)
+
+    def statement(self, node: Node) -> float:
+        if isinstance(node, Assign):
+            return 1 + self.expression(node.target) + self.expression(node.value)
+        if isinstance(node, Return):
+            return 1 + self.expression(node.value)
+        if isinstance(node, Call):
+            return 1 + self.expression(node)
+        if isinstance(node, If):
+            clauses = [(node.condition, node.body)] + [(c.condition, c.body) for c in node.elifs]
+            conditions = sum(1 + self.expression(condition) for condition, _ in clauses)
+            bodies = [self.block(body) for _, body in clauses] + [self.block(node.orelse)]
+            return conditions + max(bodies)
+        if isinstance(node, While):
+            per_trip = 1 + self.expression(node.condition) + self.block(node.body)
+            return self.while_trips(node.condition) * per_trip
+        if isinstance(node, For):
+            trips = self.for_trips(node.iterable)
+            per_trip = 1 + self.loop_body(node)
+            return 1 + self.expression(node.iterable) + trips * per_trip
+        return 1
+
+    # A for body, with the target of range() over known bounds bound to
+    # its largest value:
+    def loop_body(self, node: For) -> float:
+        largest = self.range_largest(node.iterable)
+        name = node.target.id
+        if largest is None or name in assignment_counts(node.body):
+            return self.block(node.body)
+        scope = self.scopes[-1] if self.scopes else self.constants
+        saved = scope.get(name)
+        scope[name] = largest
+        cost = self.block(node.body)
+        if saved is None:
+            del scope[name]
+        else:
+            scope[name] = saved
+        return cost
+
+    # Cost of the calls inside an expression:
+    def expression(self, node: Optional[Node]) -> float:
+        if isinstance(node, Call):
+            cost = sum(self.expression(arg) for arg in node.args)
+            if isinstance(node.func, Name) and node.func.id in self.functions:
+                cost += self.function(node.func.id, node.args)
+            return cost
+        if isinstance(node, BinaryOp):
+            return self.expression(node.left) + self.expression(node.right)
+        if isinstance(node, UnaryOp):
+            return self.expression(node.operand)
+        if isinstance(node, (ListLiteral, TupleLiteral)):
+            return sum(self.expression(e) for e in node.elements)
+        if isinstance(node, DictLiteral):
+            return sum(self.expression(p.key) + self.expression(p.value) for p in node.pairs)
+        if isinstance(node, Index):
+            return self.expression(node.value) + self.expression(node.index)
+        if isinstance(node, Slice):
+            return sum(self.expression(n) for n in (node.value, node.lower, node.upper))
+        return 0.0
+
+    # A literal, a global of main set once to one (N = 1000), or a parameter
+    # bound to one:
+    def known_int(self, node: Optional[Node]) -> Optional[int]:
+        if isinstance(node, Name):
+            return self.scopes[-1].get(node.id) if self.scopes else self.constants.get(node.id)
+        return literal_int(node)
+
+    # range() of an iterable with known bounds:
+    def known_range(self, iterable: Node) -> Optional[range]:
+        if isinstance(iterable, Call) and isinstance(iterable.func, Name) and iterable.func.id == "range":
+            bounds = [self.known_int(arg) for arg in iterable.args]
+            if 1 <= len(bounds) <= 3 and None not in bounds and bounds[2:] != [0]:
+                return range(*bounds)
+        return None
+
+    def range_largest(self, iterable: Node) -> Optional[int]:
+        trips = self.known_range(iterable)
+        if not trips:
+            return None
+        return max(abs(trips[0]), abs(trips[-1]))
+
+    def for_trips(self, iterable: Node) -> float:
+        trips = self.known_range(iterable)
+        if trips is not None:
+            return len(trips)
+        if isinstance(iterable, (ListLiteral, TupleLiteral)):
+            return len(iterable.elements)
+        return LOOP_TRIPS
+
+    def while_trips(self, condition: Node) -> float:
+        if isinstance(condition, BinaryOp) and condition.op in (
+                "LESS", "LESS_EQUAL", "GREATER", "GREATER_EQUAL", "NOT_EQUAL"):
+            for side in (condition.right, condition.left):
+                limit = self.known_int(side)
+                if limit is not None and abs(limit) > 1:
+                    return abs(limit)
+        return LOOP_TRIPS
+
+
+def estimate_steps(program: Program) -> int:
+    return WorkloadEstimator(program).estimate()
@@ -0,0 +1,42 @@
+# Containers built and dropped every iteration reuse the same memory
+def pair(a, b):
+    return (a, b)
+
+total = 0
+for i in range(1000):
+    p = pair(i, i + 1)
+    row = [i, i * 2, i * 3]
+    record = {"first": p[0], "row": row}
+    total = total + p[1] + row[2] + record["first"]
+print(total)
+
+# Kept containers must not share memory with the ones dropped later
+kept = []
+for i in range(5):
+    item = [i, i + 10]
+    scratch = [i * 100, i * 200, i * 300]
+    kept.append(item)
+print(kept)
+
+# Lists growing past the pooled sizes, then emptied and filled again
+values = []
+for i in range(200):
+    values.append(i * 1.5)
+print(len(values), values[199])
+values = []
+for i in range(3):
+    values.append([i])
+print(values)
+
+# Dicts and sets growing through several rehashes
+squares = {}
+seen = set([])
+for i in range(300):
+    squares[i] = i * i
+    seen.add(i % 17)
+print(len(squares), squares[299], len(seen))
+
+nested = []
+for i in range(4):
+    nested.append((i, [i, {i: i + 1}]))
+print(nested)
@@ -0,0 +1,21 @@
+# Ints compare exactly, also above 2**53
+big = 9007199254740993
+print(big > 9007199254740992, big == 9007199254740992.0, big >= 9007199254740992.0)
+print(3 < 3.5, 4.0 <= 4, 2 > 1.5, 7 == 7.0, 7 != 7.5)
+
+# Strings compare lexicographically
+words = ["pear", "apple", "fig", "banana"]
+smallest = words[0]
+for w in words:
+    if w < smallest:
+        smallest = w
+print(smallest)
+print("abc" < "abd", "b" > "abc", "ab" <= "ab", "" < "a", "Z" < "a")
+
+# Bools compare as 0 and 1
+print(True == 1, False < 1, 1.0 == True, True > 0.5, False != 0)
+
+# Mixed arithmetic
+x = 3
+y = 0.5
+print(x + y, x - y, x * y, y * x, x // 2, 7.5 // 2)
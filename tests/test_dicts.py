@@ -0,0 +1,43 @@
+# Keys keep insertion order
+d = {3: "c", 1: "a", 2: "b"}
+d[0] = "z"
+for k in d:
+    print(k, d[k])
+print(sorted(d))
+
+# 1 and "1" are different keys; 1, 1.0 and True are the same one
+m = {}
+m[1] = "int"
+m["1"] = "str"
+m[1.0] = "float"
+m[True] = "bool"
+print(len(m))
+print(m[1])
+print(m["1"])
+
+# Tuple keys
+grid = {}
+for x in range(3):
+    for y in range(3):
+        grid[(x, y)] = x * y
+print(grid[(2, 2)])
+print(len(grid))
+
+# Overwriting keeps the original position
+grid[(0, 0)] = 100
+first = True
+for k in grid:
+    if first:
+        print(k, grid[k])
+        first = False
+
+# Many keys
+squares = {}
+for i in range(1000):
+    squares[i] = i * i
+total = 0
+for k in squares:
+    total = total + squares[k]
+print(total)
+print(squares.get(999))
+print(squares.get(1000))
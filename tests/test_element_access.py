@@ -0,0 +1,64 @@
+# Elements that are only read are not copied out of their container
+grid = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+total = 0
+for i in range(3):
+    for j in range(3):
+        total = total + grid[i][j] * grid[j][i]
+print(total)
+
+if grid[1][1] > grid[0][2]:
+    print("center wins", grid[1][1])
+
+numbers = [1.5, 2.5, 4.0]
+print(numbers[0] + numbers[2], numbers[1] < numbers[0])
+counts = [0, 3, 0, 7]
+while counts[0] < counts[1]:
+    counts[0] = counts[0] + 1
+print(counts)
+
+# Tuples, dicts and strings
+point = (3, 4)
+print(point[0] * point[0] + point[1] * point[1])
+ages = {"ana": 31, "luis": 27}
+if ages["ana"] > ages["luis"]:
+    print("ana", ages["ana"] - ages["luis"])
+word = "hello"
+print(word[0] + word[4], word[1] == "e")
+print(len(grid[2]), str(grid[0][1]) + "!", -grid[2][2], not counts[2])
+
+# Walking an element of a container
+for row in [grid[0], grid[2]]:
+    print(row)
+for value in grid[2]:
+    print(value)
+tags = {"odd": [1, 3], "even": [2, 4]}
+for value in tags["even"]:
+    print(value)
+
+# The container keeps walking the element it had when the loop started
+for value in grid[0]:
+    grid[0] = [0]
+    print(value, grid[0])
+
+# A copy is still made when the statement changes a container
+first = grid[1]
+first.append(10)
+print(first, grid[1])
+stack = [[1], [2]]
+stack.append(stack[0])
+top = stack[2]
+top.append(5)
+print(stack)
+pairs = [[1, 2], [3, 4]]
+pairs[0] = pairs[1]
+pairs[1] = [pairs[0], pairs[1][0]]
+print(pairs)
+
+def grow(items, value):
+    items.append(value)
+    return len(items)
+
+lists = [[1, 2]]
+print(grow(lists, lists[0][1]), lists)
+inner = lists[0]
+print(grow(inner, lists[0][0]), lists)
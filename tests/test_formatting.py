@@ -0,0 +1,23 @@
+print(3.0)
+print(0.1 + 0.2)
+print(1 / 3)
+print(-2.5)
+print(10.0 ** 16)
+print(10.0 ** 15)
+print(0.0001)
+print(0.00001)
+print(123456789.125)
+print(2 ** (0 - 3))
+print(7 // 2.0)
+
+print([1.0, 2.5, -0.0])
+print([[1, 2], [3.5, [4, (5,)]], True, False])
+print((1.0, 2))
+
+# 1 and 1.0 are the same key
+counts = {}
+counts[1] = 2.0
+counts[1.0] = 3
+print(counts)
+print(counts[1])
+print(str(1.5) + "x")
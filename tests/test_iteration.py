@@ -0,0 +1,37 @@
+# Iteration over every container type with for loops
+
+# ---- Lists and tuples ----
+a = [1, 2, 3]
+for x in a:
+    print(x)
+
+for x in (4, 5, 6):
+    print(x)
+
+# ---- Strings ----
+for ch in "abc":
+    print(ch)
+
+# ---- Dicts (keys) and sets (values) ----
+d = {"x": 10, "y": 20}
+for k in d:
+    print(k, d[k])
+
+s = set([7, 8])
+for v in s:
+    print(v)
+
+# ---- Nested loops ----
+grid = [[1, 2], [3, 4], [5, 6]]
+total = 0
+for row in grid:
+    for cell in row:
+        total = total + cell
+print(total)
+
+# ---- Rebinding the iterated variable keeps the original sequence ----
+items = [1, 2, 3]
+for i in items:
+    items = "done"
+    print(i)
+print(items)
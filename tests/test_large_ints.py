@@ -0,0 +1,17 @@
+# Int literals are 64-bit: arithmetic on constants must not overflow 32 bits
+print(2000000000 + 2000000000)
+print(100000 * 100000)
+print(3000000000 * 3000000000)
+print(-2147483648 - 1)
+
+# The same through native int variables
+x = 2000000000
+y = x + 2000000000
+print(y, x * 100000)
+
+def scale(n):
+    return n * 3000000000
+
+print(scale(3))
+big = [4000000000, 5000000000]
+print(big[0] + big[1], big)
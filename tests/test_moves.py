@@ -0,0 +1,49 @@
+# Strings built in a loop are extended in place...
+text = "start:"
+for i in range(20):
+    text = text + str(i)
+    text += ","
+print(text, len(text))
+
+# ...but never when another name still holds the old value
+base = "a long enough base string"
+copy = base
+base = base + "!"
+print(base)
+print(copy)
+
+parts = []
+line = "value of the line number "
+for i in range(3):
+    parts.append(line)
+    line = line + str(i)
+print(parts[0], parts[2], line)
+
+# A list given to sorted() for the last time can be sorted in place
+def sorted_copy(items):
+    result = sorted(items)
+    return result
+
+numbers = [5, 3, 9, 1]
+print(sorted_copy(numbers), numbers)
+print(sorted([4, 2, 8, 6]))
+
+# Values stored in containers after their last use
+rows = []
+for i in range(3):
+    row = [i, i * i]
+    rows.append(row)
+print(rows)
+
+index = {}
+for word in ["one", "two", "three"]:
+    key = word + "!"
+    index[key] = len(word)
+print(index["one!"], index["three!"])
+
+# A name rebound inside a loop that walks it
+values = [3, 1, 2]
+for v in values:
+    values = sorted(values)
+    print(v)
+print(values)
@@ -0,0 +1,46 @@
+# Exponentiation and floor division with Python semantics
+
+# ---- ** ----
+x = 7
+print(x ** 2, x ** 3, 2 ** 10, 2 ** 0)
+print(2 ** (-1), 2.0 ** 3, 9 ** 0.5)
+print((x + 1) ** 2)
+
+def cube(n):
+    return n ** 3
+
+print(cube(3), cube(1.5))
+
+# ---- // ----
+print(7 // 2, -7 // 2, 7 // -2, -7 // -2)
+print(7.5 // 2, -7.5 // 2)
+
+# 1.0 / 0.1 rounds up to 10.0, but 0.1 fits only 9 times into 1.0
+print(1.0 // 0.1, 7.0 // 0.1, -1.0 // 0.1, 1.0 // -0.1)
+
+def floor_div(a, b):
+    return a // b
+
+print(floor_div(1.0, 0.1), floor_div(7.0, 0.1), floor_div(-7.0, 0.1), floor_div(0.0, -3.0))
+
+# ---- % floors too: a == (a // b) * b + a % b ----
+print(7 % 2, -7 % 2, 7 % -2, -7 % -2)
+
+def check(a, b):
+    return (a // b) * b + a % b == a
+
+print(check(-7, 2), check(7, -3), check(-9, -4), check(12, 5))
+smallest = -9223372036854775807 - 1
+print(smallest % -1, smallest // -1 == smallest)
+
+# ---- Augmented assignments ----
+p = 3
+p **= 4
+print(p)
+q = -17
+q //= 5
+print(q)
+r = [10, 20]
+r[1] //= 3
+r[0] **= 2
+print(r)
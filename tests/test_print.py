@@ -0,0 +1,20 @@
+print("uno")
+print("dos", 2, 2.5, True)
+print()
+print(1, [1, 2], (3, 4), {"a": 1})
+
+def square(n):
+    return n * n
+
+x = 7
+print("square of", x, "is", square(x))
+
+# More output than the runtime buffer holds before flushing
+total = 0
+for i in range(20000):
+    print(i, "abcdef")
+    total = total + i
+print("total", total)
+
+# Everything printed so far must appear before the error
+print(1 + "a")
@@ -0,0 +1,20 @@
+# print() evaluates its arguments left to right, like any other call
+def show(n):
+    print("evaluating", n)
+    return n * 10
+
+print(show(1), show(2), show(3))
+
+def record(log, x):
+    log.append(x)
+    return len(log)
+
+log = []
+print(record(log, "a"), record(log, "b"), log)
+
+def bump(items):
+    items.append(len(items))
+    return items[-1:]
+
+items = [0]
+print(bump(items), bump(items), items)
@@ -2,72 +2,95 @@
 #include "../c++/runtime.hpp"
 
 // Compile with something like:
-//   g++ -std=c++17 output.cpp -o program
+//   g++ -std=c++17 -O3 output.cpp -o program
 
-PyValue hola(PyValue a, PyValue b) {
+// Literals, constructed once:
+static const PyValue __const0 = PyValue(4);
+static const PyValue __const1 = PyValue(5);
+static const PyValue __const2 = PyValue("hola");
+static const PyValue __const3 = PyValue("z");
+static const PyValue __const4 = PyValue("x");
+static const PyValue __const5 = PyValue("ECCI");
+static const PyValue __const6 = PyValue(3);
+static const PyValue __const7 = PyValue("Fibonacci");
+static const PyValue __const8 = PyValue(10);
+static const PyValue __const9 = PyValue("Si printeo mis probabilidades de graduarme suben :)");
+
+PyValue hola(const PyValue& a, const PyValue& b);
+long long hola__int_int(long long a, long long b);
+PyValue fib(const PyValue& n);
+long long fib__int(long long n);
+
+PyValue hola(const PyValue& a, const PyValue& b) {
     return py_add(a, b);
     return PyValue();
 }
 
-PyValue fib(PyValue n) {
-    if (py_or(py_eq(n, PyValue(1)), py_eq(n, PyValue(2))).is_truthy()) {
-        return PyValue(1);
+long long hola__int_int(long long a, long long b) {
+    return a + b;
+    return 0;
+}
+
+PyValue fib(const PyValue& n) {
+    if (py_or(py_eq(n, PY_ONE), py_eq(n, PY_TWO)).is_truthy()) {
+        return PY_ONE;
     }
     else {
-        return py_add(fib(py_sub(n, PyValue(1))), fib(py_sub(n, PyValue(2))));
+        return py_add(fib(py_sub(n, PY_ONE)), fib(py_sub(n, PY_TWO)));
     }
     return PyValue();
 }
 
+long long fib__int(long long n) {
+    if ((n == 1LL) || (n == 2LL)) {
+        return 1LL;
+    }
+    else {
+        return fib__int(n - 1LL) + fib__int(n - 2LL);
+    }
+    return 0;
+}
+
 int main() {
     PyValue a;
     PyValue b;
     PyValue c;
     PyValue e;
-    PyValue i;
-    py_print(hola(PyValue(1), PyValue(2)));
-    py_print(fib(PyValue(5)));
-    a = PyValue(4);
+    long long i = 0;
+    py_print(PyValue(hola__int_int(1LL, 2LL)));
+    py_print(PyValue(fib__int(5LL)));
+    a = __const0;
     py_print(a);
-    b = PyValue(5);
-    a = PyValue("hola");
-    b = py_add(a, py_str(b));
+    b = __const1;
+    a = __const2;
+    b = py_add(std::move(a), py_str(b));
     py_print(b);
-    a = py_list(std::vector<PyValue>{ PyValue(1), PyValue("hola"), py_dict(std::vector<std::pair<PyValue, PyValue>>{ std::make_pair(PyValue("z"), PyValue(1)), std::make_pair(PyValue("x"), PyValue("ECCI")) }), py_list(std::vector<PyValue>{ PyValue(1), PyValue(2), PyValue(3), PyValue(4) }), py_tuple(std::vector<PyValue>{ PyValue(1), PyValue(2), PyValue(3), PyValue(4) }) });
+    a = py_list(PyItems{ PY_ONE, __const2, py_dict(PyPairs{ py_pair(__const3, PY_ONE), py_pair(__const4, __const5) }), py_list(PyItems{ PY_ONE, PY_TWO, __const6, __const0 }), py_tuple(PyItems{ PY_ONE, PY_TWO, __const6, __const0 }) });
     py_print(a);
-    py_print(PyValue("Fibonacci"));
+    py_print(__const7);
     {
-        PyValue __range_start = PyValue(0);
-        PyValue __range_stop = py_sub(py_len(a), PyValue(1));
-        PyValue __range_step = PyValue(1);
-        for (long long __i = __range_start.int_value; __i < __range_stop.int_value; __i += __range_step.int_value) {
-            i = PyValue(__i);
-            py_print(py_getitem(a, i));
+        long long __range_start = 0;
+        long long __range_stop = py_sub(py_len(a), PY_ONE).int_value;
+        long long __range_step = 1;
+        for (long long __i = __range_start; __i < __range_stop; __i += __range_step) {
+            i = __i;
+            py_print(py_getitem_ref(a, PyValue(i)));
         }
     }
     {
-        PyValue __iter = py_getitem(a, PyValue(3));
-        if (__iter.type != PyValue::LIST && __iter.type != PyValue::TUPLE) { throw std::runtime_error("TypeError: can only iterate over list or tuple in for-loop"); }
-        if (__iter.type == PyValue::LIST) {
-            for (std::size_t __idx = 0; __idx < __iter.list_value.size(); ++__idx) {
-                e = __iter.list_value[__idx];
-                py_print(e);
-            }
-        } else {
-            for (std::size_t __idx = 0; __idx < __iter.tuple_value.size(); ++__idx) {
-                e = __iter.tuple_value[__idx];
-                py_print(e);
-            }
+        PyIterator __it(py_getitem_ref(a, __const6));
+        while (__it.next(e)) {
+            py_print(e);
         }
     }
-    a = PyValue(5);
-    b = PyValue(10);
+    a = __const1;
+    b = __const8;
     while (py_lt(a, b).is_truthy()) {
-        py_print(fib(py_sub(b, PyValue(5))));
-        c = b;
-        b = PyValue("hola");
-        b = py_sub(c, PyValue(2));
+        py_print(fib(py_sub(b, __const1)));
+        c = std::move(b);
+        b = __const2;
+        b = py_sub(c, PY_TWO);
     }
-    py_print(PyValue("Si printeo mis probabilidades de graduarme suben :)"));
+    py_print(__const9);
     return 0;
 }
\ No newline at end of file
@@ -0,0 +1,38 @@
+a = set([1, 2, 3, 4, 2, 1])
+b = set((3, 4, 5, 6))
+print(len(a))
+print(a.union(b))
+print(sorted(a.union(b)))
+print(sorted(a.intersection(b)))
+print(sorted(a.difference(b)))
+print(sorted(b.difference(a)))
+
+# Lists and tuples work as the other operand
+print(sorted(a.union([10, 1])))
+print(sorted(a.intersection((4, 40))))
+
+# 1, 1.0 and True are one member, "1" is another
+m = set([1, 1.0, True, "1"])
+print(len(m))
+
+# Tuples as members
+points = set([(0, 0), (1, 2), (0, 0)])
+points.add((1, 2))
+points.add((2, 1))
+print(len(points))
+points.remove((0, 0))
+print(sorted(points))
+
+empty = a.difference(a)
+print(empty)
+print(len(empty))
+
+# Many members
+big = set([])
+for i in range(5000):
+    big.add(i % 1000)
+print(len(big))
+total = 0
+for x in big:
+    total = total + x
+print(total)
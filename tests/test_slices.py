@@ -0,0 +1,73 @@
+# Slices of lists, tuples and strings
+numbers = []
+for i in range(40):
+    numbers.append(i * 3)
+print(numbers[2:6], numbers[:3], numbers[37:], numbers[10:10], numbers[30:20])
+print(numbers[-3:], numbers[:-37], numbers[-100:2], numbers[38:100])
+print(len(numbers[:]), len(numbers[5:35]), numbers[5:35][0], numbers[5:35][29])
+print(numbers[5:35][3:20][1:4])
+word = "transpiler"
+print(word[2:5], word[:5], word[-3:], word[4:2] == "")
+point = (1, 2, 3, 4)
+print(point[1:3], point[:1], point[2:])
+
+# A slice is a new list: changing either side leaves the other alone
+window = numbers[0:20]
+numbers[0] = -1
+print(window[0], numbers[0])
+window.append(99)
+print(len(window), len(numbers), window[20], numbers[20])
+middle = numbers[10:30]
+inner = middle[2:18]
+middle[2] = "changed"
+print(inner[0], middle[2], numbers[12])
+tail = numbers[20:]
+numbers.append(1000)
+numbers[1] = 4
+print(len(tail), tail[0], len(numbers), numbers[-1:])
+copy = numbers[:]
+copy.sort()
+print(copy[:3], numbers[:3])
+numbers.append(numbers[:16])
+print(len(numbers), numbers[40], numbers[-1:])
+
+# Divide and conquer on slices
+def merge_sort(items):
+    if len(items) <= 1:
+        return items
+    mid = len(items) // 2
+    left = merge_sort(items[:mid])
+    right = merge_sort(items[mid:])
+    merged = []
+    i = 0
+    j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i = i + 1
+        else:
+            merged.append(right[j])
+            j = j + 1
+    for value in left[i:]:
+        merged.append(value)
+    for value in right[j:]:
+        merged.append(value)
+    return merged
+
+values = []
+for i in range(100):
+    values.append((i * 37) % 101)
+ordered = merge_sort(values)
+print(ordered[:10], ordered[-5:], values[:5])
+
+def contains(items, target):
+    if len(items) == 0:
+        return False
+    mid = len(items) // 2
+    if items[mid] == target:
+        return True
+    if items[mid] < target:
+        return contains(items[mid + 1:], target)
+    return contains(items[:mid], target)
+
+print(contains(ordered, 42), contains(ordered, 101), contains(ordered, 0))
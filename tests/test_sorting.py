@@ -0,0 +1,36 @@
+ints = [5, 3, 9, 1, 7]
+print(sorted(ints))
+print(ints)
+ints.sort()
+print(ints)
+
+floats = [2.5, -1.0, 0.5]
+print(sorted(floats))
+
+words = ["pera", "manzana", "uva", "banano"]
+words.sort()
+print(words)
+
+# Mixed numbers keep the original order of equal values
+mixed = [3, 1.5, True, 0, 2]
+print(sorted(mixed))
+
+pairs = [(2, "b"), (1, "z"), (2, "a")]
+print(sorted(pairs))
+
+print(sorted((3, 2, 1)))
+print(sorted("fangless"))
+print(sorted({"b": 1, "a": 2}))
+print(sorted(set([3, 1, 2])))
+
+big = []
+for i in range(20):
+    big.append((i * 7) % 20)
+big.sort()
+print(big)
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+print(median([9, 4, 7, 1, 5]))
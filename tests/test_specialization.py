@@ -0,0 +1,77 @@
+def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+
+def scale(x, factor):
+    return x * factor
+
+def halve(x):
+    return x / 2
+
+def describe(value):
+    if value > 10:
+        return "big"
+    return "small"
+
+def countdown(n):
+    while n > 0:
+        n = n - 1
+    n = "done"
+    return n
+
+def is_even(n):
+    return n % 2 == 0
+
+def both(a, b):
+    return a and b
+
+def negate(x):
+    return -x
+
+def collatz_steps(n):
+    steps = 0
+    while n != 1:
+        if is_even(n):
+            n = n // 2
+        else:
+            n = 3 * n + 1
+        steps += 1
+    return steps
+
+def show(x):
+    print(x)
+
+# Same functions called with ints, floats, bools and strings
+for i in range(10):
+    print(fibonacci(i))
+
+print(scale(3, 4))
+print(scale(1.5, 2))
+print(scale(2, 0.25))
+
+print(halve(7))
+print(halve(7.0))
+print(describe(42))
+print(describe(3.5))
+print(describe(7))
+print(countdown(5))
+print(is_even(10))
+print(is_even(7))
+print(both(True, False))
+print(both(3, 4))
+print(both(0, 4))
+print(negate(5))
+print(negate(2.5))
+print(collatz_steps(27))
+show(12)
+show("text")
+
+total = 0
+for i in range(1, 6):
+    total += fibonacci(i) * scale(i, 2)
+print(total)
+
+mixed = 1
+mixed = 2.5
+print(scale(mixed, 2))
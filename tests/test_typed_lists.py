@@ -0,0 +1,46 @@
+# Lists of only ints / only floats use unboxed storage, anything else
+# switches them to generic storage.
+ints = [3, 1, 2]
+ints.append(10)
+ints[0] = 7
+print(ints)
+print(ints[3])
+print(len(ints))
+
+floats = [1.5, 2.5]
+floats.append(0.25)
+print(floats)
+
+# Mixing element types must keep every value as it was
+ints.append(2.5)
+print(ints)
+ints[1] = "one"
+print(ints)
+
+floats[0] = 4
+print(floats)
+
+mixed = [1, "a", True]
+print(mixed)
+
+# An emptied list picks its storage again
+nums = [1]
+nums.remove(0)
+nums.append(0.5)
+nums.append(1.5)
+print(nums)
+
+empty = []
+for i in range(5):
+    empty.append(i * i)
+print(empty)
+print(empty.sublist(1, 3))
+print(empty.sublist(3, 10))
+
+total = 0
+for x in empty:
+    total = total + x
+print(total)
+
+as_set = set([1, 2, 2, 3])
+print(len(as_set))
@@ -0,0 +1,9 @@
+# A dict display hashes its keys even when the dict is never used, so the
+# unhashable key below stops the program with
+# "TypeError: unhashable type: 'list'" on every engine. Through the IR,
+# dead code elimination must keep the display:
+#   python main.py tests/test_unhashable_keys.py --ir --run
+unused = {"a": 1, "b": 2}
+print("before")
+d = {[1]: 2}
+print("not reached")
@@ -0,0 +1,54 @@
+# Two names bound to the same list see each other's changes
+a = [1, 2, 3]
+b = a
+b.append(4)
+print(a)
+print(len(b))
+
+# Lists passed to a function are changed in place
+def fill(items, n):
+    for i in range(n):
+        items.append(i * i)
+    return len(items)
+
+squares = []
+print(fill(squares, 5))
+print(squares)
+
+# A list stored in another container is still the same list
+rows = []
+row = [0, 0, 0]
+rows.append(row)
+row[0] = 5
+print(rows)
+
+groups = {0: [], 1: []}
+for n in range(6):
+    target = groups[n % 2]
+    target.append(n)
+print(groups)
+
+# Short strings are stored inline, longer ones on the heap
+inline_text = "fourteen chars"
+heap_text = "fifteen chars!!"
+print(len(inline_text), len(heap_text))
+print(inline_text + "!")
+print("ab" + "cd")
+joined = ""
+for word in ["one", "two", "three", "four", "five"]:
+    joined = joined + word
+print(joined, len(joined))
+
+# Both kinds work as dict keys and set members
+counts = {inline_text: 0, heap_text: 0}
+for key in [inline_text, heap_text, inline_text + "", "fifteen" + " chars!!"]:
+    counts[key] = counts[key] + 1
+print(counts[inline_text], counts[heap_text])
+print(len(set([inline_text, heap_text, "fourteen" + " chars"])))
+
+# Indexing and iterating a long string yields 1-char strings
+letters = []
+for c in "a longer string":
+    if c != " ":
+        letters.append(c)
+print(len(letters), letters[0], heap_text[14])